@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from bybit_trading_bot.config.settings import Config
+from bybit_trading_bot.utils.logger import get_logger
+from bybit_trading_bot.utils.rest_registry import shared_rest_registry
+from bybit_trading_bot.core.order_manager_futures import FuturesOrderManager
+
+
+class AsyncFuturesOrderManager:
+    """Awaitable FuturesOrderManager for the v2 engine (USDT-M, mainnet like the sync one).
+
+    Requests go through AsyncRateLimitedHTTP from the shared REST registry, so they share the
+    process budget with the sync clients. Instrument filters, formatting and sizing math are
+    delegated to a FuturesOrderManager whose filter cache is filled asynchronously first, so none
+    of its methods touch the network from here.
+    """
+
+    def __init__(self, config: Config, filters: Optional[FuturesOrderManager] = None) -> None:
+        self.config = config
+        self.logger = get_logger(self.__class__.__name__)
+        self.filters = filters or FuturesOrderManager(config)
+        self._http: Any = None
+        try:
+            self._http = shared_rest_registry(config).async_client(
+                "v2_futures",
+                testnet=False,
+                api_key=self.config.bybit_api_key or "",
+                api_secret=self.config.bybit_api_secret or "",
+                recv_window=30000,
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to init async Bybit REST client: {e}")
+        self._last_leverage_set: Dict[str, float] = {}
+
+    async def close(self) -> None:
+        if self._http is not None:
+            await self._http.close()
+
+    # ---- instrument filters ----
+    async def load_filters(self, symbol: str) -> None:
+        if symbol in self.filters._instrument_cache:
+            return
+        resp = None
+        if self._http is not None:
+            try:
+                resp = await self._http.request("get_instruments_info", category="linear", symbol=symbol)
+            except Exception as e:
+                self.logger.debug(f"Failed to fetch futures instrument filters {symbol}: {e}")
+        self.filters._cache_filters(symbol, resp)
+
+    async def snap_down_to_step(self, symbol: str, qty_float: float) -> float:
+        await self.load_filters(symbol)
+        return self.filters.snap_down_to_step(symbol, qty_float)
+
+    def calc_risk_based_qty(self, symbol: str, entry_price: float, stop_price: float, equity_usdt: float) -> float:
+        return self.filters.calc_risk_based_qty(symbol, entry_price, stop_price, equity_usdt)
+
+    # ---- orders ----
+    async def _place(self, symbol: str, label: str, **params: Any) -> Optional[Dict]:
+        try:
+            resp = await self._http.request("place_order", category="linear", symbol=symbol, **params)
+            if int(resp.get("retCode", -1)) != 0:
+                self.logger.error(f"{label} failed {symbol}: {resp}")
+                return None
+            return resp
+        except Exception as e:
+            self.logger.error(f"{label} error {symbol}: {e}")
+            return None
+
+    async def place_market(self, symbol: str, side: str, qty: float, reduce_only: bool = False) -> Optional[Dict]:
+        if self._http is None:
+            self.logger.info(f"(DEV) Futures market {side} {symbol} qty={qty}")
+            return {"orderId": f"DEV-{symbol}-{side}-{qty}", "symbol": symbol}
+        # Best-effort set leverage once per symbol
+        try:
+            lev = float(self.config.scalp_leverage)
+            if lev > 0 and symbol not in self._last_leverage_set:
+                await self._http.request(
+                    "set_leverage", category="linear", symbol=symbol, buyLeverage=str(lev), sellLeverage=str(lev)
+                )
+                self._last_leverage_set[symbol] = lev
+        except Exception:
+            pass
+        await self.load_filters(symbol)
+        return await self._place(
+            symbol,
+            "Futures market order",
+            side=side,
+            orderType="Market",
+            qty=self.filters._format_qty(symbol, qty),
+            reduceOnly=reduce_only,
+        )
+
+    async def place_reduce_only_limit(self, symbol: str, side: str, qty: float, price: float) -> Optional[Dict]:
+        if self._http is None:
+            self.logger.info(f"(DEV) Futures reduce-only limit {side} {symbol} qty={qty} price={price}")
+            return {"orderId": f"DEV-RO-{symbol}-{side}-{qty}-{price}"}
+        await self.load_filters(symbol)
+        return await self._place(
+            symbol,
+            "Reduce-only limit",
+            side=side,
+            orderType="Limit",
+            qty=self.filters._format_qty(symbol, qty),
+            price=self.filters._format_price(symbol, price),
+            reduceOnly=True,
+        )
+
+    async def place_limit(self, symbol: str, side: str, qty: float, price: float) -> Optional[Dict]:
+        if self._http is None:
+            self.logger.info(f"(DEV) Futures limit {side} {symbol} qty={qty} price={price}")
+            return {"orderId": f"DEV-LIM-{symbol}-{side}-{qty}-{price}"}
+        await self.load_filters(symbol)
+        return await self._place(
+            symbol,
+            "Limit order",
+            side=side,
+            orderType="Limit",
+            qty=self.filters._format_qty(symbol, qty),
+            price=self.filters._format_price(symbol, price),
+        )
+
+    async def cancel_order(self, symbol: str, order_id: str) -> bool:
+        if self._http is None:
+            return True
+        try:
+            resp = await self._http.request("cancel_order", category="linear", symbol=symbol, orderId=order_id)
+            return int(resp.get("retCode", -1)) == 0
+        except Exception as e:
+            self.logger.error(f"cancel_order error {symbol}/{order_id}: {e}")
+            return False
+
+    # ---- queries ----
+    async def get_open_orders(self, symbol: str) -> Optional[Dict]:
+        if self._http is None:
+            return None
+        try:
+            resp = await self._http.request("get_open_orders", category="linear", symbol=symbol)
+            return resp if isinstance(resp, dict) else None
+        except Exception as e:
+            self.logger.error(f"get_open_orders error {symbol}: {e}")
+            return None
+
+    async def get_position(self, symbol: str) -> Optional[Dict]:
+        if self._http is None:
+            return None
+        try:
+            resp = await self._http.request("get_positions", category="linear", symbol=symbol)
+            return FuturesOrderManager._position_from_response(resp)
+        except Exception as e:
+            self.logger.error(f"get_position error {symbol}: {e}")
+            return None
+
+    async def get_mark_price_safe(self, symbol: str) -> Optional[float]:
+        try:
+            if self._http is None:
+                return None
+            resp = await self._http.request("get_tickers", category="linear", symbol=symbol)
+            return FuturesOrderManager._mark_from_response(resp)
+        except Exception:
+            return None
@@ -7,17 +7,24 @@ from bybit_trading_bot.config.settings import Config
 from bybit_trading_bot.utils.logger import get_logger
 from bybit_trading_bot.utils.db_manager import DBManager
 from bybit_trading_bot.utils.notifier import Notifier
-from bybit_trading_bot.core.order_manager_futures import FuturesOrderManager
+from .async_order_manager import AsyncFuturesOrderManager
 from ..utils.commission_calculator import CommissionCalculator
 
 
 class ExecutionEngine:
-    def __init__(self, config: Config, db: DBManager, notifier: Notifier) -> None:
+    def __init__(
+        self,
+        config: Config,
+        db: DBManager,
+        notifier: Notifier,
+        order_manager: Optional[AsyncFuturesOrderManager] = None,
+    ) -> None:
         self.config = config
         self.db = db
         self.notifier = notifier
         self.logger = get_logger(self.__class__.__name__)
-        self._om = FuturesOrderManager(config)
+        # Every exchange call is awaited: the engine's loop never blocks on REST I/O
+        self._om = order_manager or AsyncFuturesOrderManager(config)
         # Commission model (can be overridden by env later)
         self._fees = CommissionCalculator(
             maker_fee=float(getattr(self.config, "bybit_maker_fee", 0.0002)),
@@ -32,11 +39,11 @@ class ExecutionEngine:
             return None
         try:
             # Place market order live only
-            resp = self._om.place_market(symbol, side=side, qty=qty)
+            resp = await self._om.place_market(symbol, side=side, qty=qty)
             if not resp:
                 return None
             # Approx entry price via mark price
-            mp = self._om.get_mark_price_safe(symbol)
+            mp = await self._om.get_mark_price_safe(symbol)
             await self._notify(f"ENTRY {symbol} {side} qty={qty}")
             return mp or None
         except Exception as e:
@@ -63,7 +70,7 @@ class ExecutionEngine:
                 # Commission validation: only place TP1 if net expected profit > 0
                 _ok1, _net1 = self._fees.validate_trade_profitability(entry, tp1, "long" if side == "Buy" else "short")
                 if _ok1:
-                    self._om.place_reduce_only_limit(symbol, side=side_close, qty=self._om.snap_down_to_step(symbol, qty1), price=tp1)
+                    await self._om.place_reduce_only_limit(symbol, side=side_close, qty=await self._om.snap_down_to_step(symbol, qty1), price=tp1)
             if qty2 > 0:
                 _ok2, _net2 = self._fees.validate_trade_profitability(entry, tp2, "long" if side == "Buy" else "short")
                 if not _ok2:
@@ -72,7 +79,7 @@ class ExecutionEngine:
                         entry, "long" if side == "Buy" else "short", buffer=float(getattr(self.config, "min_profit_buffer", 0.001))
                     )
                     tp2 = target
-                resp = self._om.place_reduce_only_limit(symbol, side=side_close, qty=self._om.snap_down_to_step(symbol, qty2), price=tp2)
+                resp = await self._om.place_reduce_only_limit(symbol, side=side_close, qty=await self._om.snap_down_to_step(symbol, qty2), price=tp2)
                 try:
                     if isinstance(resp, dict):
                         oid = str(resp.get("orderId") or resp.get("result", {}).get("orderId") or "")
@@ -80,17 +87,9 @@ class ExecutionEngine:
                             self._runner_orders[symbol] = oid
                 except Exception:
                     pass
-            # Register Software SL monitoring
+            # Register Software SL monitoring (sync manager: off the loop)
             try:
-                from bybit_trading_bot.core.software_sl_manager import SoftwareSLManager
-                slm = SoftwareSLManager(self.config, self.db, self.notifier)
-                # Ensure the manager is running (idempotent)
-                try:
-                    slm.start()
-                except Exception:
-                    pass
-                trade_id = f"{symbol}-{int(entry*1e6)}"
-                slm.add_sl_position(trade_id=trade_id, symbol=symbol, quantity=qty, entry_price=entry, sl_price=sl_price)
+                await asyncio.to_thread(self._register_software_sl, symbol, qty, entry, sl_price)
             except Exception as e:
                 self.logger.debug(f"Software SL registration failed: {e}")
             await self._notify(f"EXITS {symbol} tp1={tp1:.6f} tp2={tp2:.6f} sl={sl_price:.6f}")
@@ -127,7 +126,7 @@ class ExecutionEngine:
             last_placed_price: float | None = None
             while True:
                 await asyncio.sleep(2.0)
-                mp = self._om.get_mark_price_safe(symbol)
+                mp = await self._om.get_mark_price_safe(symbol)
                 if mp is None or mp <= 0:
                     continue
                 try:
@@ -148,11 +147,11 @@ class ExecutionEngine:
                 oid = self._runner_orders.get(symbol)
                 if oid:
                     try:
-                        self._om.cancel_order(symbol, oid)
+                        await self._om.cancel_order(symbol, oid)
                     except Exception:
                         pass
                 # Place new reduce-only limit at target
-                resp = self._om.place_reduce_only_limit(symbol, side=close_side, qty=self._om.snap_down_to_step(symbol, qty), price=target)
+                resp = await self._om.place_reduce_only_limit(symbol, side=close_side, qty=await self._om.snap_down_to_step(symbol, qty), price=target)
                 try:
                     if isinstance(resp, dict):
                         new_id = str(resp.get("orderId") or resp.get("result", {}).get("orderId") or "")
@@ -166,9 +165,21 @@ class ExecutionEngine:
         except Exception as e:
             self.logger.debug(f"_trail_runner error {symbol}: {e}")
 
+    def _register_software_sl(self, symbol: str, qty: float, entry: float, sl_price: float) -> None:
+        from bybit_trading_bot.core.software_sl_manager import SoftwareSLManager
+        slm = SoftwareSLManager(self.config, self.db, self.notifier)
+        # Ensure the manager is running (idempotent)
+        try:
+            slm.start()
+        except Exception:
+            pass
+        trade_id = f"{symbol}-{int(entry*1e6)}"
+        slm.add_sl_position(trade_id=trade_id, symbol=symbol, quantity=qty, entry_price=entry, sl_price=sl_price)
+
     async def _notify(self, text: str) -> None:
         try:
-            self.notifier.send_telegram(text)
+            # Telegram send is a blocking HTTP call
+            await asyncio.to_thread(self.notifier.send_telegram, text)
         except Exception:
             pass
 
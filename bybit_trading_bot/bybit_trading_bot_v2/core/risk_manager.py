@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Tuple
+from typing import Optional, Tuple
 
 from bybit_trading_bot.config.settings import Config
 from bybit_trading_bot.utils.logger import get_logger
@@ -11,11 +11,11 @@ from ..strategies.volume_breakout import StrategySignal
 
 
 class RiskManager:
-    def __init__(self, config: Config, tracker: PerformanceTracker) -> None:
+    def __init__(self, config: Config, tracker: PerformanceTracker, order_manager: Optional[FuturesOrderManager] = None) -> None:
         self.config = config
         self.tracker = tracker
         self.logger = get_logger(self.__class__.__name__)
-        self._om = FuturesOrderManager(config)
+        self._om = order_manager or FuturesOrderManager(config)
 
     def can_trade_today(self, db: DBManager) -> bool:
         try:
@@ -16,6 +16,7 @@ from .signal_generator import SignalGenerator
 from .risk_manager import RiskManager
 from .position_manager import PositionManager
 from .execution_engine import ExecutionEngine
+from .async_order_manager import AsyncFuturesOrderManager
 
 
 @dataclass
@@ -44,9 +45,12 @@ class StrategyEngine:
         self.data = DataFetcher(config)
         self.tracker = PerformanceTracker(config, db)
         self.strategy = VolumeBreakoutStrategy(config)
-        self.risk = RiskManager(config, self.tracker)
+        # One async futures client (instrument cache + REST budget) shared by sizing and execution;
+        # sizing math is synchronous and I/O-free, orders/marks are awaited on the loop
+        self.futures_om = AsyncFuturesOrderManager(config)
+        self.risk = RiskManager(config, self.tracker, order_manager=self.futures_om.filters)
         self.positions = PositionManager(config, db)
-        self.exec = ExecutionEngine(config, db, notifier)
+        self.exec = ExecutionEngine(config, db, notifier, order_manager=self.futures_om)
         self.signal_gen = SignalGenerator(config, self.data, self.strategy, db)
 
         self._stop = asyncio.Event()
@@ -150,6 +154,7 @@ class StrategyEngine:
                 t.cancel()
             await self.data.stop()
             await self.tracker.stop()
+            await self.futures_om.close()
             try:
                 getattr(self, "tg_listener", None) and self.tg_listener.stop()
             except Exception:
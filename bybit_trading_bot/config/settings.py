@@ -16,6 +16,9 @@ class Config:
     bybit_api_key: Optional[str]
     bybit_api_secret: Optional[str]
     bybit_testnet: bool
+    # Endpoint overrides (e.g. the local simulator); empty = Bybit hosts
+    bybit_rest_url: str
+    bybit_ws_url: str
 
     max_position_size_percent: float
     max_simultaneous_positions: int
@@ -23,6 +26,13 @@ class Config:
     oi_change_threshold: float
     take_profit_percent: float
     monitoring_interval_seconds: int
+    # OI poller: thread pool size and REST budget (requests/s) shared by the fan-out
+    oi_poll_workers: int
+    oi_poll_rate_per_second: int
+    # Shared REST budget per endpoint class (requests/s across all subsystems, burst = 3s worth)
+    rest_market_rate_per_second: int
+    rest_trade_rate_per_second: int
+    rest_account_rate_per_second: int
 
     database_path: str
     account_equity_usdt: float
@@ -190,6 +200,32 @@ class Config:
     min_profit_buffer: float
     slippage_buffer: float
     emergency_exit_threshold: float
+    # Market data storage (in-memory tick buffer + downsampled persistence)
+    tick_buffer_capacity: int
+    tick_buffer_resolution_ms: int
+    price_persist_interval_seconds: float
+    # Write-behind batching for market-data inserts (prices, OI, signals)
+    db_write_behind_enabled: bool
+    db_write_batch_size: int
+    db_write_flush_ms: int
+    db_write_queue_size: int
+    db_read_pool_size: int
+    # Separate SQLite file for price/OI series (same as database_path keeps them in the main file)
+    series_database_path: str
+    # Memory-mapped per-symbol/per-day archive of public trades (see utils/tick_archive.py)
+    tick_archive_enabled: bool
+    tick_archive_dir: str
+    # Ticker callback workers; each symbol is pinned to one worker by hash
+    ws_tick_workers: int
+    # Public market-data streams over one asyncio loop (handlers/async_stream.py) instead of pybit sockets
+    ws_async_client: bool
+    # Track orders/positions/wallet from the authenticated private WS stream (REST fallback when down)
+    private_ws_enabled: bool
+    # Retention: raw price/OI rows older than the horizon are rolled into 1m/5m OHLC tables
+    retention_enabled: bool
+    raw_retention_minutes: int
+    retention_interval_minutes: int
+    retention_chunk_rows: int
 
 
 def _get_bool(value: str | None, default: bool) -> bool:
@@ -221,6 +257,8 @@ def load_settings() -> Config:
     bybit_api_key = os.getenv("BYBIT_API_KEY")
     bybit_api_secret = os.getenv("BYBIT_API_SECRET")
     bybit_testnet = _get_bool(os.getenv("BYBIT_TESTNET"), True)
+    bybit_rest_url = os.getenv("BYBIT_REST_URL", "").strip()
+    bybit_ws_url = os.getenv("BYBIT_WS_URL", "").strip()
 
     max_position_size_percent = float(os.getenv("MAX_POSITION_SIZE_PERCENT", "1.0"))
     max_simultaneous_positions = int(os.getenv("MAX_SIMULTANEOUS_POSITIONS", "3"))
@@ -228,6 +266,11 @@ def load_settings() -> Config:
     oi_change_threshold = float(os.getenv("OI_CHANGE_THRESHOLD", "1.5"))
     take_profit_percent = float(os.getenv("TAKE_PROFIT_PERCENT", "1.2"))
     monitoring_interval_seconds = int(os.getenv("MONITORING_INTERVAL", "60"))
+    oi_poll_workers = max(1, _get_int_env("OI_POLL_WORKERS", 8))
+    oi_poll_rate_per_second = max(1, _get_int_env("OI_POLL_RATE_PER_SECOND", 10))
+    rest_market_rate_per_second = max(1, _get_int_env("REST_MARKET_RATE_PER_SECOND", 20))
+    rest_trade_rate_per_second = max(1, _get_int_env("REST_TRADE_RATE_PER_SECOND", 10))
+    rest_account_rate_per_second = max(1, _get_int_env("REST_ACCOUNT_RATE_PER_SECOND", 10))
 
     database_path = os.getenv(
         "DATABASE_PATH",
@@ -398,6 +441,34 @@ def load_settings() -> Config:
     min_profit_buffer = float(os.getenv("MIN_PROFIT_BUFFER", "0.001"))
     slippage_buffer = float(os.getenv("SLIPPAGE_BUFFER", "0.0005"))
     emergency_exit_threshold = float(os.getenv("EMERGENCY_EXIT_THRESHOLD", "0.002"))
+    # Market data storage: ring buffer per symbol; 0 disables SQLite price persistence
+    tick_buffer_resolution_ms = _get_int_env("TICK_BUFFER_RESOLUTION_MS", 250)
+    # Default holds the analyzer window (plus a minute) at full resolution, so window reads stay in memory
+    window_slots = (int(signal_window_minutes) + 1) * 60_000 // max(1, tick_buffer_resolution_ms)
+    tick_buffer_capacity = _get_int_env("TICK_BUFFER_CAPACITY", max(2048, window_slots))
+    price_persist_interval_seconds = float(os.getenv("PRICE_PERSIST_INTERVAL_SECONDS", "5"))
+    # Write-behind DB writer: inserts are batched by size or flush interval on a background thread
+    db_write_behind_enabled = _get_bool(os.getenv("DB_WRITE_BEHIND_ENABLED"), True)
+    db_write_batch_size = _get_int_env("DB_WRITE_BATCH_SIZE", 500)
+    db_write_flush_ms = _get_int_env("DB_WRITE_FLUSH_MS", 250)
+    db_write_queue_size = _get_int_env("DB_WRITE_QUEUE_SIZE", 50000)
+    # Read-only SQLite connections (mode=ro, query_only) shared by reader threads
+    db_read_pool_size = _get_int_env("DB_READ_POOL_SIZE", 4)
+    # Market series (price_data/oi_data) live in their own file so analyzer reads never queue behind trade writes
+    series_database_path = os.getenv(
+        "SERIES_DATABASE_PATH",
+        os.path.join(os.path.dirname(database_path), "market_series.sqlite"),
+    )
+    tick_archive_enabled = _get_bool(os.getenv("TICK_ARCHIVE_ENABLED"), True)
+    tick_archive_dir = os.getenv("TICK_ARCHIVE_DIR", os.path.join(os.path.dirname(database_path), "ticks"))
+    ws_tick_workers = max(1, _get_int_env("WS_TICK_WORKERS", 4))
+    ws_async_client = _get_bool(os.getenv("WS_ASYNC_CLIENT"), False)
+    private_ws_enabled = _get_bool(os.getenv("PRIVATE_WS_ENABLED"), True)
+    # Retention service: roll up and delete raw price/OI rows past the horizon, then incremental vacuum
+    retention_enabled = _get_bool(os.getenv("RETENTION_ENABLED"), True)
+    raw_retention_minutes = _get_int_env("RAW_RETENTION_MINUTES", 1440)
+    retention_interval_minutes = _get_int_env("RETENTION_INTERVAL_MINUTES", 15)
+    retention_chunk_rows = _get_int_env("RETENTION_CHUNK_ROWS", 5000)
     if drawdown_exit_threshold_pct <= 0 or drawdown_exit_threshold_pct > 50:
         try:
             print(f"WARNING: Invalid DRAWDOWN_EXIT_THRESHOLD_PCT={drawdown_exit_threshold_pct}, using 10.0%")
@@ -409,12 +480,19 @@ def load_settings() -> Config:
         bybit_api_key=bybit_api_key,
         bybit_api_secret=bybit_api_secret,
         bybit_testnet=bybit_testnet,
+        bybit_rest_url=bybit_rest_url,
+        bybit_ws_url=bybit_ws_url,
         max_position_size_percent=max_position_size_percent,
         max_simultaneous_positions=max_simultaneous_positions,
         price_change_threshold=price_change_threshold,
         oi_change_threshold=oi_change_threshold,
         take_profit_percent=take_profit_percent,
         monitoring_interval_seconds=monitoring_interval_seconds,
+        oi_poll_workers=oi_poll_workers,
+        oi_poll_rate_per_second=oi_poll_rate_per_second,
+        rest_market_rate_per_second=rest_market_rate_per_second,
+        rest_trade_rate_per_second=rest_trade_rate_per_second,
+        rest_account_rate_per_second=rest_account_rate_per_second,
         database_path=database_path,
         account_equity_usdt=account_equity_usdt,
         trade_notional_usdt=trade_notional_usdt,
@@ -564,4 +642,22 @@ def load_settings() -> Config:
         min_profit_buffer=min_profit_buffer,
         slippage_buffer=slippage_buffer,
         emergency_exit_threshold=emergency_exit_threshold,
+        tick_buffer_capacity=tick_buffer_capacity,
+        tick_buffer_resolution_ms=tick_buffer_resolution_ms,
+        price_persist_interval_seconds=price_persist_interval_seconds,
+        db_write_behind_enabled=db_write_behind_enabled,
+        db_write_batch_size=db_write_batch_size,
+        db_write_flush_ms=db_write_flush_ms,
+        db_write_queue_size=db_write_queue_size,
+        db_read_pool_size=db_read_pool_size,
+        series_database_path=series_database_path,
+        tick_archive_enabled=tick_archive_enabled,
+        tick_archive_dir=tick_archive_dir,
+        ws_tick_workers=ws_tick_workers,
+        ws_async_client=ws_async_client,
+        private_ws_enabled=private_ws_enabled,
+        retention_enabled=retention_enabled,
+        raw_retention_minutes=raw_retention_minutes,
+        retention_interval_minutes=retention_interval_minutes,
+        retention_chunk_rows=retention_chunk_rows,
     ) 
\ No newline at end of file
@@ -8,7 +8,8 @@ def calculate_percentage_change_from_series(values: Sequence[float]) -> float:
 
     If fewer than 2 points, returns 0.0.
     """
-    if not values or len(values) < 2:
+    # len() rather than truthiness: values may be a NumPy array
+    if values is None or len(values) < 2:
         return 0.0
     first = float(values[0])
     last = float(values[-1])
@@ -4,7 +4,9 @@ import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Tuple, Dict
+from typing import List, Optional, Sequence, Tuple, Dict
+
+import numpy as np
 
 from bybit_trading_bot.config.settings import Config
 from bybit_trading_bot.utils.logger import get_logger
@@ -15,21 +17,26 @@ except Exception:  # pragma: no cover
     GradientMomentumDetector = None  # type: ignore
     MomentumExhaustionDetector = None  # type: ignore
 from bybit_trading_bot.utils.db_manager import DBManager
+from bybit_trading_bot.utils import endpoints
+from bybit_trading_bot.utils.rest_registry import shared_rest_registry
+from bybit_trading_bot.utils.tick_archive import TickArchiver
+from bybit_trading_bot.utils.tick_buffer import TickBuffer
+from bybit_trading_bot.utils.order_book import L2OrderBook
 from bybit_trading_bot.utils.notifier import Notifier, TelegramCommandListener
-from bybit_trading_bot.core.data_processor import calculate_percentage_change
+from bybit_trading_bot.core.data_processor import calculate_percentage_change_from_series
 from bybit_trading_bot.indicators.technical import calculate_rsi, calculate_macd
 from bybit_trading_bot.core.symbol_mapper import SymbolMapper
 from bybit_trading_bot.core.order_manager import OrderManager
 from bybit_trading_bot.core.software_sl_manager import SoftwareSLManager
 from bybit_trading_bot.core.oco_manager import OCOManager
+from bybit_trading_bot.core.oi_poller import OIPoller
 from bybit_trading_bot.handlers.spot_handler import SpotHandler
 from bybit_trading_bot.handlers.futures_handler import FuturesHandler
 from bybit_trading_bot.core.spike_detector import SpikeDetector
 
-try:
-    from pybit.unified_trading import HTTP as BYBIT_HTTP
-except Exception:
-    BYBIT_HTTP = None  # type: ignore
+
+# Stand-in for symbols with no rows in the bulk windows
+_EMPTY_WINDOW = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
 
 
 @dataclass
@@ -60,7 +67,33 @@ class MarketMonitor:
         self.is_running: bool = False
 
         # Infra
-        self.db = DBManager(self.config.database_path)
+        self.db = DBManager(
+            self.config.database_path,
+            write_behind=bool(getattr(self.config, "db_write_behind_enabled", True)),
+            write_batch_size=int(getattr(self.config, "db_write_batch_size", 500)),
+            write_flush_interval=float(getattr(self.config, "db_write_flush_ms", 250)) / 1000.0,
+            write_queue_size=int(getattr(self.config, "db_write_queue_size", 50000)),
+            read_pool_size=int(getattr(self.config, "db_read_pool_size", 4)),
+            series_path=getattr(self.config, "series_database_path", None),
+        )
+        # In-memory price ring buffers are the primary store for recent prices;
+        # SQLite only receives a downsampled flush from the PriceFlush worker
+        self.tick_buffer = TickBuffer(
+            capacity=int(getattr(self.config, "tick_buffer_capacity", 2048)),
+            resolution_seconds=float(getattr(self.config, "tick_buffer_resolution_ms", 250)) / 1000.0,
+        )
+        self.db.attach_tick_buffer(self.tick_buffer)
+        # Raw public trades for offline replay/analytics (tmp/momentum_snapshot.py, backtests)
+        self.tick_archiver: Optional[TickArchiver] = None
+        if getattr(self.config, "tick_archive_enabled", False):
+            try:
+                self.tick_archiver = TickArchiver(self.config.tick_archive_dir)
+            except Exception as e:
+                self.logger.warning(f"Tick archive disabled: {e}")
+        # Endpoint overrides must be in place before any HTTP/WebSocket client is created
+        endpoints.configure(self.config)
+        # One process-wide REST budget (REST_*_RATE_PER_SECOND) for every client created below
+        shared_rest_registry(self.config)
         self.symbol_mapper = SymbolMapper(self.config, self.db)
         self.order_manager = OrderManager(self.config, self.db)
         self.notifier = Notifier(self.config)
@@ -78,10 +111,22 @@ class MarketMonitor:
         self.software_sl = SoftwareSLManager(self.config, self.db, self.notifier)
         # OCO manager (with notifier for Telegram)
         self.oco_manager = OCOManager(self.config, self.db, notifier=self.notifier)
-        self.spot = SpotHandler(testnet=self.config.bybit_testnet)
+        self.spot = SpotHandler(
+            testnet=self.config.bybit_testnet,
+            tick_workers=int(getattr(self.config, "ws_tick_workers", 1)),
+            use_async_client=bool(getattr(self.config, "ws_async_client", False)),
+        )
         # in-memory recent trades with side per symbol for order-flow delta
         self._recent_trades: Dict[str, List[Tuple[float, float, float, str | None]]] = {}
-        self.futures = FuturesHandler(testnet=self.config.bybit_testnet)
+        self.futures = FuturesHandler(
+            testnet=self.config.bybit_testnet,
+            rate_per_second=float(getattr(self.config, "oi_poll_rate_per_second", 10)),
+            config=self.config,
+        )
+        self.oi_poller = OIPoller(self.futures, workers=int(getattr(self.config, "oi_poll_workers", 8)))
+        # Analyzer's distance to the signal thresholds per futures symbol (1.0 = at threshold);
+        # replaced wholesale once per analyzer pass and never mutated, so readers need no lock
+        self._signal_proximity: Dict[str, float] = {}
         # Split mode state
         self._split_detectors: dict[str, SpikeDetector] = {}
         self._split_last_price: dict[str, float] = {}
@@ -107,9 +152,14 @@ class MarketMonitor:
     def _build_rate_report(self) -> str:
         try:
             balance_str = "N/A"
-            if BYBIT_HTTP is not None and self.config.bybit_api_key and self.config.bybit_api_secret:
-                http = BYBIT_HTTP(testnet=self.config.bybit_testnet, api_key=self.config.bybit_api_key, api_secret=self.config.bybit_api_secret)
-                d = http.get_wallet_balance(accountType='UNIFIED')
+            if self.config.bybit_api_key and self.config.bybit_api_secret:
+                http = shared_rest_registry(self.config).client(
+                    "report",
+                    testnet=self.config.bybit_testnet,
+                    api_key=self.config.bybit_api_key,
+                    api_secret=self.config.bybit_api_secret,
+                )
+                d = http.request("get_wallet_balance", accountType='UNIFIED')
                 lst = (d or {}).get('result', {}).get('list', [])
                 coins = lst[0].get('coin', []) if lst else []
                 usdt = [c for c in coins if c.get('coin') == 'USDT']
@@ -558,10 +608,10 @@ class MarketMonitor:
                                             # Try to find existing trade record
                                             existing_trade = None
                                             try:
-                                                conn = self.db._get_conn()
-                                                cur = conn.cursor()
-                                                cur.execute("SELECT * FROM trades WHERE order_id = ? LIMIT 1", (order_id,))
-                                                row = cur.fetchone()
+                                                with self.db._read() as conn:
+                                                    row = conn.execute(
+                                                        "SELECT * FROM trades WHERE order_id = ? LIMIT 1", (order_id,)
+                                                    ).fetchone()
                                                 if row:
                                                     existing_trade = row
                                             except Exception:
@@ -841,10 +891,24 @@ class MarketMonitor:
             threading.Thread(target=self._run_executor, name="Executor", daemon=True),
             threading.Thread(target=self._run_api_sync, name="APISync", daemon=True),
         ]
+        if float(getattr(self.config, "price_persist_interval_seconds", 5.0)) > 0:
+            self._threads.append(threading.Thread(target=self._run_price_flush, name="PriceFlush", daemon=True))
 
         for t in self._threads:
             t.start()
 
+        if getattr(self.config, "retention_enabled", True):
+            # Keep raw windows at least as long as the analyzer's lookback
+            horizon = max(
+                int(getattr(self.config, "raw_retention_minutes", 1440)),
+                int(self.config.signal_window_minutes) * 2,
+            )
+            self.db.start_retention(
+                raw_horizon_minutes=horizon,
+                interval_seconds=float(getattr(self.config, "retention_interval_minutes", 15)) * 60.0,
+                chunk_rows=int(getattr(self.config, "retention_chunk_rows", 5000)),
+            )
+
         self.is_running = True
         self.logger.info("MarketMonitor started")
 
@@ -857,6 +921,10 @@ class MarketMonitor:
 
         self.logger.info("Stopping market monitoring...")
         self._stop_event.set()
+        try:
+            self.oi_poller.close()
+        except Exception:
+            pass
         # stop scalp engine if running
         try:
             eng = getattr(self, "_scalp_engine", None)
@@ -873,6 +941,30 @@ class MarketMonitor:
                 t.join(timeout=5)
 
         self._threads.clear()
+        try:
+            self.db.stop_retention()
+        except Exception:
+            pass
+        # Commit anything still queued in the write-behind writer
+        try:
+            if not self.db.flush(timeout=10.0):
+                self.logger.warning("DB writer did not drain within 10s on shutdown")
+            stats = self.db.get_writer_stats()
+            if stats:
+                self.logger.info(
+                    f"DB writer stats: written={int(stats['written'])} batches={int(stats['batches'])}"
+                    f" failed={int(stats['failed'])} blocked={int(stats['blocked_submits'])}"
+                    f" max_depth={int(stats['max_depth'])}"
+                )
+        except Exception:
+            pass
+        if self.tick_archiver is not None:
+            try:
+                st = self.tick_archiver.stats()
+                self.tick_archiver.close()
+                self.logger.info(f"Tick archive closed: records={st['records']} errors={st['errors']}")
+            except Exception:
+                pass
         self.is_running = False
         self.logger.info("MarketMonitor stopped")
 
@@ -888,6 +980,17 @@ class MarketMonitor:
         except Exception:
             pass
 
+        # Close pooled DB connections last; the pool reopens lazily if anything still queries it
+        try:
+            for name, st in self.db.get_pool_stats().items():
+                self.logger.info(
+                    f"DB conn {name}: queries={int(st['queries'])} checkouts={int(st['checkouts'])}"
+                    f" busy_waits={int(st['busy_waits'])} wait={st['wait_seconds']:.3f}s held={st['held_seconds']:.3f}s"
+                )
+            self.db.close()
+        except Exception:
+            pass
+
     def _can_open_new_position(self, symbol_id: int) -> bool:
         if self.db.count_open_positions() >= self.config.max_simultaneous_positions:
             return False
@@ -899,16 +1002,28 @@ class MarketMonitor:
             return False
         return True
 
-    def check_trading_conditions(self, symbol_id: int) -> Tuple[bool, float, float]:
+    def check_trading_conditions(
+        self,
+        symbol_id: int,
+        price_window: Optional[Tuple[Sequence[int], Sequence[float]]] = None,
+        oi_window: Optional[Tuple[Sequence[int], Sequence[float]]] = None,
+    ) -> Tuple[bool, float, float]:
         """Проверка условий: цена +X% И OI +Y%.
 
         OI считается по времени относительно 5‑минутных баров: берём текущее значение и
         значение на момент (now - N*5 минут), где N = SIGNAL_WINDOW_MINUTES // 5.
         Если подходящей точки нет, используем первую в окне; при недостатке точек возвращаем 0%.
         """
-        price_series = self.db.get_recent_price_series(symbol_id, minutes=self.config.signal_window_minutes)
-        oi_series = self.db.get_recent_oi_series(symbol_id, minutes=self.config.signal_window_minutes)
-        price_change = calculate_percentage_change(price_series)
+        # Primitive (epoch_ms, value) arrays; the analyzer passes windows prefetched in bulk for all symbols
+        if price_window is None:
+            price_window = self.db.get_price_window(symbol_id, minutes=self.config.signal_window_minutes)
+        if oi_window is None:
+            oi_window = self.db.get_oi_window(symbol_id, minutes=self.config.signal_window_minutes)
+        price_ts, price_vals = price_window
+        oi_ts, oi_vals = oi_window
+        # (ts_ms, price) pairs for detectors that index series[i][1]
+        price_series = list(zip(price_ts, price_vals))
+        price_change = calculate_percentage_change_from_series(price_vals)
 
         # Momentum mode: early impulse detection prioritizes early gradient over legacy dual condition
         try:
@@ -926,15 +1041,14 @@ class MarketMonitor:
                     ex = MomentumExhaustionDetector(self.config)
                     # Resolve symbol string for notifications/logs
                     try:
-                        _recs = self.db.get_active_symbols()
-                        _rec = next((r for r in _recs if int(r.id) == int(symbol_id)), None)
+                        _rec = self.db.get_symbol_by_id(symbol_id)
                         _symbol = _rec.spot_symbol if _rec else f"id={symbol_id}"
                     except Exception:
                         _symbol = f"id={symbol_id}"
                     # RSI from recent prices
                     rsi_block = False
                     try:
-                        prices_only = [p for (_, p) in price_series]
+                        prices_only = price_vals.tolist()
                         if len(prices_only) >= max(16, int(self.config.rsi_period) + 1):
                             rsi_vals = calculate_rsi(prices_only, period=int(self.config.rsi_period))
                             if rsi_vals:
@@ -1037,8 +1151,7 @@ class MarketMonitor:
                 try:
                     from bybit_trading_bot.momentum_enhancements.order_flow_delta import OrderFlowDeltaAnalyzer
                     if getattr(self.config, "order_flow_momentum_filter", True):
-                        recs = self.db.get_active_symbols()
-                        rec = next((r for r in recs if int(r.id) == int(symbol_id)), None)
+                        rec = self.db.get_symbol_by_id(symbol_id)
                         sym = rec.spot_symbol if rec else None
                         trades = self._recent_trades.get(sym, []) if sym else []
                         of = OrderFlowDeltaAnalyzer(self.config)
@@ -1058,7 +1171,7 @@ class MarketMonitor:
                 # Relax block policy: require at least 2 independent reasons to block
                 # (we already combined rsi/volume/candle into early_ok above; double-check here)
                 # In momentum mode we only require early_ok; OI is advisory
-                oi_change = calculate_percentage_change(oi_series)
+                oi_change = calculate_percentage_change_from_series(oi_vals)
                 return early_ok, price_change, oi_change
         except Exception as _e:  # fallback to legacy flow on any error
             pass
@@ -1066,7 +1179,7 @@ class MarketMonitor:
         # RSI filter (trade mode): block buys on overbought
         if getattr(self.config, "enable_rsi_filter", False) and self.config.switch_mode == "trade":
             try:
-                prices_only = [p for (_, p) in price_series]
+                prices_only = price_vals.tolist()
                 if len(prices_only) >= max(16, int(self.config.rsi_period) + 1):
                     rsi_vals = calculate_rsi(prices_only, period=int(self.config.rsi_period))
                     if rsi_vals:
@@ -1079,7 +1192,7 @@ class MarketMonitor:
         # MACD filter (trade mode): confirm trend, with breakout override
         if getattr(self.config, "enable_macd_filter", False) and self.config.switch_mode == "trade":
             try:
-                prices_only = [p for (_, p) in price_series]
+                prices_only = price_vals.tolist()
                 fast = int(self.config.macd_fast)
                 slow = int(self.config.macd_slow)
                 sig = int(self.config.macd_signal)
@@ -1129,21 +1242,18 @@ class MarketMonitor:
                 pass
 
         # Дедуп OI по 5м барам (квантование по времени) и расчёт с учётом настроек
-        def _dedup_5m_bars(series: List[Tuple[datetime, float]]) -> List[Tuple[int, float]]:
+        def _dedup_5m_bars(ts_ms, vals) -> List[Tuple[int, float]]:
             seen: set[int] = set()
             out: List[Tuple[int, float]] = []
-            for ts, val in series:
-                try:
-                    bar = int((ts.timestamp() * 1000) // (5 * 60_000))
-                except Exception:
-                    continue
+            for ts, val in zip(ts_ms, vals):
+                bar = int(ts) // (5 * 60_000)
                 if bar in seen:
                     continue
                 seen.add(bar)
                 out.append((bar, float(val)))
             return out
 
-        bars = _dedup_5m_bars(oi_series)
+        bars = _dedup_5m_bars(oi_ts, oi_vals)
         n_bars = max(1, int(self.config.signal_window_minutes) // 5)
         oi_change: float | None = None
         if len(bars) >= max(self.config.min_unique_oi_bars, n_bars + 1):
@@ -1153,7 +1263,6 @@ class MarketMonitor:
         elif bars:
             # мягкая оценка по имеющимся точкам
             seq = [v for _, v in bars]
-            from bybit_trading_bot.core.data_processor import calculate_percentage_change_from_series
             oi_change = calculate_percentage_change_from_series(seq)
 
         # Проверки OI-ограничений/деградации
@@ -1181,7 +1290,7 @@ class MarketMonitor:
         try:
             if not self._can_open_new_position(symbol_id):
                 return
-            symbol_rec = next((r for r in self.db.get_active_symbols() if r.id == symbol_id), None)
+            symbol_rec = self.db.get_symbol_by_id(symbol_id)
             if not symbol_rec:
                 return
             symbol = symbol_rec.spot_symbol
@@ -1422,12 +1531,11 @@ class MarketMonitor:
     # ---- Callbacks ----
     def _on_spot_ticker(self, symbol: str, price: float, ts_epoch: float) -> None:
         try:
-            records = self.db.get_active_symbols()
-            rec = next((r for r in records if r.spot_symbol == symbol), None)
+            rec = self.db.get_symbol_by_spot(symbol)
             if rec:
-                self.db.insert_price(rec.id, price)
+                self.tick_buffer.append(rec.id, price, ts_epoch)
         except Exception as e:
-            self.logger.debug(f"Failed to persist price for {symbol}: {e}")
+            self.logger.debug(f"Failed to buffer price for {symbol}: {e}")
 
     def _on_trade_tick(self, symbol: str, price: float, qty: float, ts: float) -> None:
         """Aggregate per-trade data into 1m quote-volume buckets in memory."""
@@ -1447,9 +1555,9 @@ class MarketMonitor:
         except Exception:
             pass
 
-    def _on_orderbook_quote(self, symbol: str, best_bid: float, best_ask: float, _bids, _asks) -> None:
+    def _on_orderbook_quote(self, symbol: str, book: L2OrderBook) -> None:
         try:
-            self._best_quotes[symbol] = (float(best_bid), float(best_ask))
+            self._best_quotes[symbol] = (float(book.best_bid), float(book.best_ask))
         except Exception:
             pass
 
@@ -1474,6 +1582,8 @@ class MarketMonitor:
                 del arr[: len(arr) - 500]
         except Exception:
             pass
+        if self.tick_archiver is not None:
+            self.tick_archiver.append(symbol, ts, price, qty, side)
 
     def _compute_rvol(self, symbol: str, period: int) -> float | None:
         """Return relative volume ratio = current_minute / avg(previous period minutes)."""
@@ -1572,13 +1682,13 @@ class MarketMonitor:
         except Exception as e:
             self.logger.error(f"Split ticker handler error for {symbol}: {e}")
 
-    def _on_split_orderbook(self, symbol: str, best_bid: float, best_ask: float, bids: list, asks: list) -> None:
+    def _on_split_orderbook(self, symbol: str, book: L2OrderBook) -> None:
         try:
             det = self._split_detectors.get(symbol)
             if det is None:
                 det = SpikeDetector(self.config, order_manager=self.order_manager)
                 self._split_detectors[symbol] = det
-            det.update_orderbook(best_bid, best_ask, bids=bids, asks=asks, levels=5)
+            det.update_orderbook(book, levels=5)
         except Exception as e:
             self.logger.debug(f"Split orderbook error {symbol}: {e}")
 
@@ -1594,52 +1704,85 @@ class MarketMonitor:
         except Exception as e:
             self.logger.debug(f"Split trade error {symbol}: {e}")
 
+    def _run_price_flush(self) -> None:
+        """Persist the latest buffered price per symbol every PRICE_PERSIST_INTERVAL_SECONDS."""
+        self.logger.info("Price flush worker started")
+        interval = max(0.5, float(getattr(self.config, "price_persist_interval_seconds", 5.0)))
+        while not self._stop_event.wait(interval):
+            self._flush_buffered_prices()
+        # final flush so the last prices survive a restart
+        self._flush_buffered_prices()
+        self.logger.info("Price flush worker stopped")
+
+    def _flush_buffered_prices(self) -> None:
+        try:
+            rows = self.tick_buffer.drain_latest()
+            if rows:
+                self.db.insert_prices(rows)
+        except Exception as e:
+            self.logger.error(f"Price flush error: {e}")
+
     def _run_oi_poll(self) -> None:
+        """OI poll scheduler: one deadline-bounded OIPoller cycle per monitoring interval."""
         self.logger.info("OI polling worker started")
         interval = max(1, int(self.config.monitoring_interval_seconds))
         while not self._stop_event.is_set():
+            cycle_start = time.time()
             try:
-                for rec in self.db.get_active_symbols():
-                    # Monetary OI
-                    oi_val = self.futures.get_open_interest(rec.futures_symbol)
-                    # Contracts (tokens) directly from Bybit
-                    oi_contracts = self.futures.get_open_interest_contracts(rec.futures_symbol)
-                    # Tokens derived from markPrice of the same moment
-                    mark = self.futures.get_mark_price(rec.futures_symbol)
-                    oi_tokens_mark = None
-                    if oi_val is not None and mark is not None and mark > 0:
-                        try:
-                            oi_tokens_mark = float(oi_val) / float(mark)
-                        except Exception:
-                            oi_tokens_mark = None
+                symbols = self.db.get_active_symbols()
+                # One bulk read of the nOI windows per cycle instead of one query per symbol
+                oi_windows = self.db.get_oi_windows([rec.id for rec in symbols], minutes=self.config.signal_window_minutes)
+
+                def _store(rec, snap) -> None:
+                    oi_val = snap.oi_value
                     # Compute nOI against window
                     noi_percent = None
                     try:
-                        series = self.db.get_recent_oi_series(rec.id, minutes=self.config.signal_window_minutes)
-                        vals = [v for (_, v) in series]
-                        if oi_val is not None:
-                            vals.append(float(oi_val))
-                        if vals:
-                            vmin = min(vals)
-                            vmax = max(vals)
-                            if vmax > vmin and oi_val is not None:
-                                noi_percent = (float(oi_val) - vmin) / (vmax - vmin) * 100.0
+                        vals = oi_windows.get(rec.id, _EMPTY_WINDOW)[1].tolist()
+                        vals.append(float(oi_val))
+                        vmin = min(vals)
+                        vmax = max(vals)
+                        if vmax > vmin:
+                            noi_percent = (float(oi_val) - vmin) / (vmax - vmin) * 100.0
                     except Exception:
                         noi_percent = None
-                    if oi_val is not None:
-                        self.db.insert_oi(
-                            rec.id,
-                            oi_val,
-                            oi_value=oi_val,
-                            oi_tokens=oi_contracts,
-                            oi_tokens_mark=oi_tokens_mark,
-                            noi_percent=noi_percent,
-                        )
+                    self.db.insert_oi(
+                        rec.id,
+                        oi_val,
+                        oi_value=oi_val,
+                        oi_tokens=snap.oi_contracts,
+                        oi_tokens_mark=snap.oi_tokens_mark,
+                        noi_percent=noi_percent,
+                    )
+
+                stats = self.oi_poller.run_cycle(
+                    [(rec, rec.futures_symbol) for rec in symbols],
+                    _store,
+                    deadline=cycle_start + interval,
+                    proximity=self._signal_proximity,
+                )
+                req = self.oi_poller.request_ms.snapshot()
+                log = self.logger.warning if stats["skipped"] else self.logger.info
+                log(
+                    f"OI poll cycle: polled={stats['polled']}/{stats['symbols']} "
+                    f"coverage={stats['coverage'] * 100:.0f}% hot={stats['hot']} skipped={stats['skipped']} "
+                    f"failed={stats['failed']} duration={stats['duration_s']:.1f}s/{interval}s "
+                    f"req_p50={req['p50']}ms req_p99={req['p99']}ms"
+                )
             except Exception as e:
                 self.logger.error(f"OI polling error: {e}")
-            time.sleep(interval)
+            time.sleep(max(0.0, cycle_start + interval - time.time()))
+        self.oi_poller.close()
         self.logger.info("OI polling worker stopped")
 
+    def get_oi_poll_stats(self) -> Dict[str, object]:
+        """OI poll cycle duration/coverage and request latency histograms."""
+        return self.oi_poller.stats()
+
+    def get_rest_stats(self) -> Dict[str, object]:
+        """Shared REST budget: per-class limits, limits learned from X-Bapi-Limit headers, tokens per subsystem."""
+        return shared_rest_registry(self.config).stats()
+
     def _check_loss_streak_and_stop(self) -> None:
         try:
             # Check if safety50 is enabled
@@ -1687,8 +1830,22 @@ class MarketMonitor:
                 if self._is_emergency():
                     time.sleep(2.0)
                     continue
+                # Two queries per cycle for all symbols instead of two per symbol
+                ids = [rec.id for rec in symbols]
+                price_windows = self.db.get_price_windows(ids, minutes=self.config.signal_window_minutes)
+                oi_windows = self.db.get_oi_windows(ids, minutes=self.config.signal_window_minutes)
+                proximity: Dict[str, float] = {}
                 for rec in symbols:
-                    ok, pchg, oichg = self.check_trading_conditions(rec.id)
+                    ok, pchg, oichg = self.check_trading_conditions(
+                        rec.id,
+                        price_window=price_windows.get(rec.id, _EMPTY_WINDOW),
+                        oi_window=oi_windows.get(rec.id, _EMPTY_WINDOW),
+                    )
+                    # Feeds the OI poller's priority: symbols near a threshold are polled first
+                    proximity[rec.futures_symbol] = max(
+                        pchg / self.config.price_change_threshold if self.config.price_change_threshold > 0 else 0.0,
+                        oichg / self.config.oi_change_threshold if self.config.oi_change_threshold > 0 else 0.0,
+                    )
                     # lightweight observability: log when near thresholds
                     if not ok and (pchg >= self.config.price_change_threshold * 0.8 or oichg >= self.config.oi_change_threshold * 0.8):
                         self.logger.debug(f"Near thresholds for {rec.spot_symbol}: price {pchg:.2f}% oi {oichg:.2f}%")
@@ -1707,8 +1864,9 @@ class MarketMonitor:
                             self._pending_signals.append(
                                 Signal(symbol_id=rec.id, price_change_percent=pchg, oi_change_percent=oichg)
                             )
-                        self.db.insert_signal(rec.id, pchg, oichg, action_taken="queued")
+                        self.db.insert_signal(rec.id, pchg, oichg, action_taken="queued", wait=False)
                         ok_found += 1
+                self._signal_proximity = proximity
                 now = time.time()
                 if now - self._last_analyzer_summary >= 30.0:
                     self.logger.info(f"Analyzer summary: scanned={len(symbols)} signals_found={ok_found}")
@@ -1985,8 +2143,14 @@ class MarketMonitor:
         self.logger.info("Executor worker stopped")
 
     def _run_api_sync(self) -> None:
-        """API synchronization worker - syncs all orders every 10 seconds."""
+        """API synchronization worker.
+
+        With a live private stream the sync runs on order events from the stream store and REST is
+        only a reconciliation every 300s and after each stream reconnect; otherwise all orders are
+        synced from REST every 10 seconds.
+        """
         self.logger.info("API Sync worker started")
+        stream = getattr(self.order_manager, "private_stream", None) if self.order_manager else None
         
         # Initial sync immediately after startup
         try:
@@ -1995,15 +2159,29 @@ class MarketMonitor:
             self._check_and_start_panic_monitoring()
         except Exception as e:
             self.logger.error(f"Initial API sync failed: {e}")
+        self._last_api_sync_time = time.time()
+        stream_version = stream.store.version if stream is not None else 0
+        stream_reconnects = stream.store.reconnects if stream is not None else 0
         
         while not self._stop_event.is_set():
             try:
                 current_time = time.time()
+                live = stream is not None and stream.is_live
+                reconnected = stream is not None and stream.store.reconnects != stream_reconnects
                 
-                # Sync every 10 seconds
-                if current_time - self._last_api_sync_time >= 10.0:
+                if reconnected or current_time - self._last_api_sync_time >= (300.0 if live else 10.0):
                     self._sync_all_orders_from_api()
                     self._last_api_sync_time = current_time
+                    if stream is not None:
+                        stream_version = stream.store.version
+                        stream_reconnects = stream.store.reconnects
+                elif live:
+                    # Event-driven: wake on any private-stream update instead of polling REST
+                    version = stream.store.wait_for_change(stream_version, timeout=1.0)
+                    if version != stream_version:
+                        stream_version = version
+                        self._sync_all_orders_from_api(open_orders=stream.store.open_orders("spot"))
+                    continue
                 
                 time.sleep(1.0)
             except Exception as e:
@@ -2012,28 +2190,38 @@ class MarketMonitor:
         
         self.logger.info("API Sync worker stopped")
 
-    def _sync_all_orders_from_api(self) -> None:
-        """Sync all orders from API to database."""
+    def _sync_all_orders_from_api(self, open_orders: Optional[List[dict]] = None) -> None:
+        """Sync all orders from API to database.
+
+        `open_orders` comes from the private stream store; when None the open spot orders are
+        fetched over REST and reconciled into the stream store. Only a REST snapshot may mark an
+        order cancelled for being absent; with store rows that needs a terminal status from the stream.
+        """
+        stream = getattr(self.order_manager, "private_stream", None) if self.order_manager else None
+        from_stream = open_orders is not None
         try:
-            if not self.order_manager or not hasattr(self.order_manager, '_http') or not self.order_manager._http:
-                return
-            
-            # Get all open spot orders from API
-            resp = self.order_manager._http.request("get_open_orders", category="spot")
-            if int(resp.get("retCode", -1)) != 0:
-                self.logger.warning(f"API sync failed: {resp.get('retCode')} {resp.get('retMsg')}")
-                return
-            
-            open_orders = (resp.get("result", {}) or {}).get("list", [])
+            if open_orders is None:
+                if not self.order_manager or not hasattr(self.order_manager, '_http') or not self.order_manager._http:
+                    return
+                
+                # Get all open spot orders from API
+                resp = self.order_manager._http.request("get_open_orders", category="spot")
+                if int(resp.get("retCode", -1)) != 0:
+                    self.logger.warning(f"API sync failed: {resp.get('retCode')} {resp.get('retMsg')}")
+                    return
+                
+                open_orders = (resp.get("result", {}) or {}).get("list", [])
+                if stream is not None:
+                    stream.store.reconcile_orders(({**o, "category": "spot"} for o in open_orders), category="spot")
             self.logger.debug(f"API SYNC: Found {len(open_orders)} open orders on exchange")
             
             # Get all trades from database
             all_trades = []
             try:
-                conn = self.db._get_conn()
-                cur = conn.cursor()
-                cur.execute("SELECT order_id, symbol_id, status FROM trades ORDER BY created_at DESC")
-                all_trades = cur.fetchall()
+                with self.db._read() as conn:
+                    all_trades = conn.execute(
+                        "SELECT order_id, symbol_id, status FROM trades ORDER BY created_at DESC"
+                    ).fetchall()
             except Exception as e:
                 self.logger.error(f"API SYNC: Failed to get trades from DB: {e}")
                 return
@@ -2052,15 +2240,16 @@ class MarketMonitor:
             for order_id in missing_in_api:
                 try:
                     # Check if it's an open trade
-                    conn = self.db._get_conn()
-                    cur = conn.cursor()
-                    cur.execute("SELECT status, side FROM trades WHERE order_id = ?", (order_id,))
-                    row = cur.fetchone()
+                    with self.db._read() as conn:
+                        row = conn.execute("SELECT status, side FROM trades WHERE order_id = ?", (order_id,)).fetchone()
                     if row and row["status"] == "open":
                         # Don't mark buy orders as cancelled - they might be filled
                         # Only mark sell orders (TP/SL) as cancelled
                         if row["side"] and row["side"].upper() == "BUY":
                             self.logger.debug(f"API SYNC: Buy order {order_id} not found in API - likely filled, keeping status")
+                        elif from_stream and not self._stream_reports_cancelled(stream, order_id):
+                            # Absent from the store is not proof: it may have been evicted or missed; REST decides
+                            continue
                         else:
                             self.logger.info(f"API SYNC: Marking sell order {order_id} as cancelled (not found in API)")
                             self.db.set_trade_status(order_id, "cancelled")
@@ -2088,13 +2277,11 @@ class MarketMonitor:
                         # For sell orders (TP/SL), try to link to existing buy order
                         if side.upper() == "SELL":
                             # Look for existing buy order for this symbol
-                            conn = self.db._get_conn()
-                            cur = conn.cursor()
-                            cur.execute(
-                                "SELECT order_id, entry_price, quantity FROM trades WHERE symbol_id = ? AND side = 'Buy' AND status = 'open' ORDER BY created_at DESC LIMIT 1",
-                                (symbol_id,)
-                            )
-                            buy_row = cur.fetchone()
+                            with self.db._read() as conn:
+                                buy_row = conn.execute(
+                                    "SELECT order_id, entry_price, quantity FROM trades WHERE symbol_id = ? AND side = 'Buy' AND status = 'open' ORDER BY created_at DESC LIMIT 1",
+                                    (symbol_id,)
+                                ).fetchone()
                             
                             if buy_row:
                                 # Link this sell order to the buy order
@@ -2102,12 +2289,8 @@ class MarketMonitor:
                                 _ = buy_row["entry_price"]
                                 
                                 # Update the buy order with TP order ID
-                                cur.execute(
-                                    "UPDATE trades SET tp_order_id = ? WHERE order_id = ?",
-                                    (order_id, buy_order_id)
-                                )
-                                conn.commit()
-                                
+                                self.db.set_trade_tp_order(buy_order_id, order_id)
+
                                 self.logger.info(f"API SYNC: Linked TP order {order_id} to buy order {buy_order_id} for {symbol}")
                                 continue  # Don't create separate trade record for TP
                         
@@ -2142,13 +2325,7 @@ class MarketMonitor:
                         
                         if avg_price > 0:
                             # Update entry price if we have average price
-                            conn = self.db._get_conn()
-                            cur = conn.cursor()
-                            cur.execute(
-                                "UPDATE trades SET entry_price = ?, quantity = ? WHERE order_id = ?",
-                                (avg_price, qty, order_id)
-                            )
-                            conn.commit()
+                            self.db.update_trade_entry_qty(order_id, avg_price, qty)
                             
                     except Exception as e:
                         self.logger.error(f"API SYNC: Failed to update order {order_id}: {e}")
@@ -2161,6 +2338,11 @@ class MarketMonitor:
         except Exception as e:
             self.logger.error(f"API sync error: {e}")
 
+    @staticmethod
+    def _stream_reports_cancelled(stream, order_id: str) -> bool:
+        row = stream.store.get_order(order_id) if stream is not None else None
+        return row is not None and row.get("orderStatus") in ("Cancelled", "Rejected", "PartiallyFilledCanceled", "Deactivated")
+
     def _check_and_start_panic_monitoring(self) -> None:
         """Check if we have open orders and start panic monitoring if needed."""
         try:
@@ -2230,8 +2412,7 @@ class MarketMonitor:
             left = line0.split("|")[0].strip() if "|" in line0 else line0
             spot_symbol = left.replace("-", "")
             # Find our symbol id by spot symbol mapping
-            recs = self.db.get_active_symbols()
-            rec = next((r for r in recs if r.spot_symbol.upper() == spot_symbol.upper()), None)
+            rec = self.db.get_symbol_by_spot(spot_symbol.upper())
             if not rec:
                 msg = f"TG signal symbol not found in mapping: {spot_symbol}"
                 self.logger.warning(msg)
@@ -10,13 +10,10 @@ from decimal import Decimal, ROUND_DOWN, InvalidOperation
 from bybit_trading_bot.config.settings import Config
 from bybit_trading_bot.utils.logger import get_logger
 from bybit_trading_bot.utils.db_manager import DBManager
-from bybit_trading_bot.utils.http_client import RateLimitedHTTP
+from bybit_trading_bot.utils.endpoints import rest_url
+from bybit_trading_bot.utils.rest_registry import shared_rest_registry
 from bybit_trading_bot.utils.notifier import Notifier
-
-try:
-    from pybit.unified_trading import HTTP
-except Exception:  # pragma: no cover
-    HTTP = None  # type: ignore
+from bybit_trading_bot.handlers.private_stream import PrivateStreamHandler, shared_private_stream
 
 
 @dataclass(frozen=True)
@@ -61,22 +58,25 @@ class OCOManager:
         self._oco_lock = threading.Lock()
         self._monitoring_thread: Optional[threading.Thread] = None
         self._stop_monitoring = threading.Event()
+        # Private WS order updates: the monitor wakes on pushes instead of polling every 2s
+        self.private_stream: Optional[PrivateStreamHandler] = None
         
         # Initialize HTTP client
-        if HTTP is not None:
-            try:
-                self._raw_http = HTTP(
-                    testnet=self.config.bybit_testnet,
-                    api_key=self.config.bybit_api_key or "",
-                    api_secret=self.config.bybit_api_secret or "",
-                    recv_window=30000,  # Increased to 30 seconds
-                )
-                self._http = RateLimitedHTTP(self._raw_http, max_requests=90, per_seconds=3.0)
-                
-                # Sync time with server before first request
-                self._sync_server_time()
-            except Exception as e:
-                self.logger.error(f"Failed to init Bybit HTTP client for OCO: {e}")
+        try:
+            self._http = shared_rest_registry(config).client(
+                "oco",
+                testnet=self.config.bybit_testnet,
+                api_key=self.config.bybit_api_key or "",
+                api_secret=self.config.bybit_api_secret or "",
+                recv_window=30000,  # Increased to 30 seconds
+            )
+            self._raw_http = self._http.http
+
+            # Sync time with server before first request
+            self._sync_server_time()
+            self.private_stream = shared_private_stream(self.config)
+        except Exception as e:
+            self.logger.error(f"Failed to init Bybit HTTP client for OCO: {e}")
 
     def _sync_server_time(self) -> None:
         """Sync local time with Bybit server to avoid timestamp errors."""
@@ -84,9 +84,7 @@ class OCOManager:
             import requests
             
             # Get server time from Bybit
-            url = "https://api.bybit.com/v5/market/time"
-            if self.config.bybit_testnet:
-                url = "https://api-testnet.bybit.com/v5/market/time"
+            url = f"{rest_url(self.config.bybit_testnet)}/v5/market/time"
             
             response = requests.get(url, timeout=10)
             if response.status_code == 200:
@@ -414,6 +412,7 @@ class OCOManager:
     def _monitor_oco_orders(self) -> None:
         """Мониторинг исполнения OCO ордеров."""
         self.logger.info("OCO monitoring worker started")
+        version = -1
         
         while not self._stop_monitoring.is_set():
             try:
@@ -423,7 +422,12 @@ class OCOManager:
                 for symbol in symbols_to_check:
                     self._check_oco_order_execution(symbol)
                 
-                time.sleep(2.0)  # Check every 2 seconds
+                stream = self.private_stream
+                if stream is not None and stream.is_live:
+                    # Wake on the next pushed update; the timeout re-checks orders the stream has not reported
+                    version = stream.store.wait_for_change(version, timeout=5.0)
+                else:
+                    time.sleep(2.0)  # Check every 2 seconds
                 
             except Exception as e:
                 self.logger.error(f"OCO monitoring error: {e}")
@@ -551,6 +555,9 @@ class OCOManager:
         try:
             if self._http is None:
                 return None
+            row = self._stream_order(order_id)
+            if row is not None and row.get("avgPrice"):
+                return float(row["avgPrice"])
             
             resp = self._http.request("get_open_orders", category="spot", orderId=order_id)
             if not self._is_success(resp):
@@ -575,6 +582,9 @@ class OCOManager:
         try:
             if self._http is None:
                 return 'Unknown'  # Dev mode
+            row = self._stream_order(order_id)
+            if row is not None and row.get("orderStatus"):
+                return str(row["orderStatus"])
             
             resp = self._http.request(
                 "get_open_orders",
@@ -596,6 +606,14 @@ class OCOManager:
             self.logger.error(f"Failed to get order status for {order_id}: {e}")
             return 'Unknown'
 
+    def _stream_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """Latest private-stream row for the order; None (use REST) if the stream is down, has not seen
+        the order, or the order is still open and was last updated before a reconnect."""
+        stream = self.private_stream
+        if stream is None or not stream.is_live:
+            return None
+        return stream.store.get_current_order(order_id)
+
     def _is_success(self, resp: Dict) -> bool:
         """Проверяет успешность API ответа."""
         if not isinstance(resp, dict):
@@ -733,37 +751,37 @@ class OCOManager:
     def _save_oco_order_to_db(self, oco_order: OCOOrder) -> None:
         """Сохраняет OCO ордер в базу данных."""
         try:
-            conn = self.db._get_conn()
-            cur = conn.cursor()
+            with self.db._write() as conn:
+                cur = conn.cursor()
             
-            # Get symbol_id
-            symbol_id = self.db.get_symbol_id(oco_order.symbol)
-            if symbol_id is None:
-                self.logger.warning(f"Unknown symbol {oco_order.symbol} for OCO order")
-                return
+                # Get symbol_id
+                symbol_id = self.db.get_symbol_id(oco_order.symbol)
+                if symbol_id is None:
+                    self.logger.warning(f"Unknown symbol {oco_order.symbol} for OCO order")
+                    return
             
-            # Insert OCO order record
-            cur.execute(
-                """
-                INSERT INTO oco_orders (
-                    symbol_id, symbol, quantity, entry_price, tp_order_id, sl_order_id,
-                    tp_price, sl_price, status, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    symbol_id,
-                    oco_order.symbol,
-                    oco_order.quantity,
-                    oco_order.entry_price,
-                    oco_order.tp_order_id,
-                    oco_order.sl_order_id,
-                    oco_order.tp_price,
-                    oco_order.sl_price,
-                    oco_order.status,
-                    oco_order.created_at
+                # Insert OCO order record
+                cur.execute(
+                    """
+                    INSERT INTO oco_orders (
+                        symbol_id, symbol, quantity, entry_price, tp_order_id, sl_order_id,
+                        tp_price, sl_price, status, created_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        symbol_id,
+                        oco_order.symbol,
+                        oco_order.quantity,
+                        oco_order.entry_price,
+                        oco_order.tp_order_id,
+                        oco_order.sl_order_id,
+                        oco_order.tp_price,
+                        oco_order.sl_price,
+                        oco_order.status,
+                        oco_order.created_at
+                    )
                 )
-            )
-            conn.commit()
+                conn.commit()
             
         except Exception as e:
             self.logger.error(f"Failed to save OCO order to DB: {e}")
@@ -771,14 +789,14 @@ class OCOManager:
     def _update_oco_order_status(self, symbol: str, status: str) -> None:
         """Обновляет статус OCO ордера в базе данных."""
         try:
-            conn = self.db._get_conn()
-            cur = conn.cursor()
+            with self.db._write() as conn:
+                cur = conn.cursor()
             
-            cur.execute(
-                "UPDATE oco_orders SET status = ?, closed_at = CURRENT_TIMESTAMP WHERE symbol = ? AND status = 'active'",
-                (status, symbol)
-            )
-            conn.commit()
+                cur.execute(
+                    "UPDATE oco_orders SET status = ?, closed_at = CURRENT_TIMESTAMP WHERE symbol = ? AND status = 'active'",
+                    (status, symbol)
+                )
+                conn.commit()
             
         except Exception as e:
             self.logger.error(f"Failed to update OCO order status: {e}")
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from bybit_trading_bot.handlers.futures_handler import OISnapshot
+from bybit_trading_bot.utils.histogram import DURATION_S_BOUNDS, LATENCY_MS_BOUNDS, Histogram
+from bybit_trading_bot.utils.logger import get_logger
+
+
+SnapshotCallback = Callable[[Any, OISnapshot], None]
+
+
+class OIPoller:
+    """Deadline-bounded OI poll cycles fanned out over a small thread pool.
+
+    - Requests go through the FuturesHandler's RateLimitedHTTP, so the pool only overlaps
+      round-trips up to the shared token-bucket budget; it never exceeds it
+    - Order per cycle: hot symbols first (signal proximity >= hot_ratio, highest first),
+      then the rest by staleness (least recently polled first)
+    - Symbols not started before the deadline are skipped and move up next cycle by staleness
+    - on_snapshot runs on the calling thread as results complete (DB writes stay single-threaded)
+    """
+
+    def __init__(self, futures: Any, workers: int = 8, hot_ratio: float = 0.8) -> None:
+        self.futures = futures
+        self.workers = max(1, int(workers))
+        self.hot_ratio = float(hot_ratio)
+        self.logger = get_logger(self.__class__.__name__)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="OIPoll")
+        self._last_polled: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.cycle_seconds = Histogram(DURATION_S_BOUNDS)
+        self.request_ms = Histogram(LATENCY_MS_BOUNDS)
+        self.cycles = 0
+        self.last_cycle: Dict[str, float] = {}
+
+    def order(self, items: Iterable[Tuple[Any, str]], proximity: Dict[str, float]) -> List[Tuple[Any, str]]:
+        """Poll order for (record, futures_symbol) pairs; see class docstring."""
+        hot: List[Tuple[float, Tuple[Any, str]]] = []
+        cold: List[Tuple[float, Tuple[Any, str]]] = []
+        with self._lock:
+            for item in items:
+                p = float(proximity.get(item[1], 0.0) or 0.0)
+                if p >= self.hot_ratio:
+                    hot.append((-p, item))
+                else:
+                    cold.append((self._last_polled.get(item[1], 0.0), item))
+        hot.sort(key=lambda x: x[0])
+        cold.sort(key=lambda x: x[0])
+        return [item for _, item in hot] + [item for _, item in cold]
+
+    def run_cycle(
+        self,
+        items: Iterable[Tuple[Any, str]],
+        on_snapshot: SnapshotCallback,
+        deadline: float,
+        proximity: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, float]:
+        """Poll one cycle until `deadline` (epoch seconds); returns the cycle metrics."""
+        started = time.time()
+        ordered = self.order(items, proximity or {})
+        marks = self.futures.get_mark_prices()
+        hot = sum(1 for _, sym in ordered if float((proximity or {}).get(sym, 0.0) or 0.0) >= self.hot_ratio)
+
+        def _fetch(symbol: str) -> Tuple[Optional[OISnapshot], bool]:
+            if time.time() >= deadline:
+                return None, False
+            t0 = time.perf_counter()
+            snap = self.futures.get_oi_snapshot(symbol, marks=marks)
+            self.request_ms.observe((time.perf_counter() - t0) * 1000.0)
+            with self._lock:
+                self._last_polled[symbol] = time.time()
+            return snap, True
+
+        futures = {self._pool.submit(_fetch, sym): rec for rec, sym in ordered}
+        polled = skipped = failed = 0
+        for fut in as_completed(futures):
+            try:
+                snap, attempted = fut.result()
+            except Exception as e:
+                self.logger.debug(f"OI fetch error: {e}")
+                failed += 1
+                continue
+            if not attempted:
+                skipped += 1
+                continue
+            if snap is None:
+                failed += 1
+                continue
+            polled += 1
+            try:
+                on_snapshot(futures[fut], snap)
+            except Exception as e:
+                self.logger.error(f"OI snapshot handler error for {snap.symbol}: {e}")
+        duration = time.time() - started
+        self.cycle_seconds.observe(duration)
+        self.cycles += 1
+        total = len(ordered)
+        self.last_cycle = {
+            "symbols": total,
+            "hot": hot,
+            "polled": polled,
+            "failed": failed,
+            "skipped": skipped,
+            "coverage": (polled / total) if total else 1.0,
+            "duration_s": duration,
+        }
+        return self.last_cycle
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "cycles": self.cycles,
+            "last_cycle": dict(self.last_cycle),
+            "cycle_seconds": self.cycle_seconds.snapshot(),
+            "request_ms": self.request_ms.snapshot(),
+        }
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
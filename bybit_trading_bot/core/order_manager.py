@@ -7,12 +7,9 @@ import time
 from bybit_trading_bot.config.settings import Config
 from bybit_trading_bot.utils.logger import get_logger
 from bybit_trading_bot.utils.db_manager import DBManager
-from bybit_trading_bot.utils.http_client import RateLimitedHTTP
-
-try:
-    from pybit.unified_trading import HTTP
-except Exception:  # pragma: no cover
-    HTTP = None  # type: ignore
+from bybit_trading_bot.utils.endpoints import rest_url
+from bybit_trading_bot.utils.rest_registry import shared_rest_registry
+from bybit_trading_bot.handlers.private_stream import PrivateStreamHandler, shared_private_stream
 
 
 class OrderManager:
@@ -25,20 +22,23 @@ class OrderManager:
         self._raw_http = None
         self._http = None
         self._symbol_cache: Dict[str, Dict[str, Decimal | str]] = {}
-        if HTTP is not None:
-            try:
-                self._raw_http = HTTP(
-                    testnet=self.config.bybit_testnet,
-                    api_key=self.config.bybit_api_key or "",
-                    api_secret=self.config.bybit_api_secret or "",
-                    recv_window=30000,  # Increased to 30 seconds
-                )
-                self._http = RateLimitedHTTP(self._raw_http, max_requests=90, per_seconds=3.0)
-                
-                # Sync time with server before first request
-                self._sync_server_time()
-            except Exception as e:
-                self.logger.error(f"Failed to init Bybit HTTP trading client: {e}")
+        # Order/execution updates pushed over the private WS; REST polling only when it is down
+        self.private_stream: Optional[PrivateStreamHandler] = None
+        try:
+            self._http = shared_rest_registry(config).client(
+                "spot_orders",
+                testnet=self.config.bybit_testnet,
+                api_key=self.config.bybit_api_key or "",
+                api_secret=self.config.bybit_api_secret or "",
+                recv_window=30000,  # Increased to 30 seconds
+            )
+            self._raw_http = self._http.http
+
+            # Sync time with server before first request
+            self._sync_server_time()
+            self.private_stream = shared_private_stream(self.config)
+        except Exception as e:
+            self.logger.error(f"Failed to init Bybit HTTP trading client: {e}")
 
     def _sync_server_time(self) -> None:
         """Sync local time with Bybit server to avoid timestamp errors."""
@@ -58,9 +58,7 @@ class OrderManager:
             import json
             
             # Get server time from Bybit
-            url = "https://api.bybit.com/v5/market/time"
-            if self.config.bybit_testnet:
-                url = "https://api-testnet.bybit.com/v5/market/time"
+            url = f"{rest_url(self.config.bybit_testnet)}/v5/market/time"
             
             response = requests.get(url, timeout=10)
             if response.status_code == 200:
@@ -438,9 +436,19 @@ class OrderManager:
             return None
 
     def wait_for_filled(self, order_id: str, timeout_s: float = 30.0) -> Optional[Dict]:
-        """Poll order history until Filled or timeout. Returns history row dict if filled."""
+        """Wait until Filled or timeout. Returns history row dict if filled.
+
+        With the private stream up this is an event wait; otherwise order history is polled.
+        """
         if self._http is None:
             return {"orderStatus": "Filled", "avgPrice": None}
+        stream = self.private_stream
+        if stream is not None and stream.is_live:
+            row = stream.store.wait_for_order(order_id, ("Filled",), timeout_s)
+            if row is not None:
+                return row
+            # No terminal update pushed within the timeout: confirm once over REST
+            return self.get_order_fill_row(order_id)
         deadline = time.time() + timeout_s
         last_row: Optional[Dict] = None
         while time.time() < deadline:
@@ -593,7 +601,8 @@ class OrderManager:
             # Fetch last price and filters
             last_price: float | None = None
             try:
-                sym_id = next((rec.id for rec in self.db.get_active_symbols() if rec.spot_symbol == symbol), None)
+                rec = self.db.get_symbol_by_spot(symbol)
+                sym_id = rec.id if rec else None
             except Exception:
                 sym_id = None
             if sym_id is not None:
@@ -5,19 +5,7 @@ from decimal import Decimal, ROUND_DOWN, InvalidOperation
 
 from ..config.settings import Config
 from ..utils.logger import get_logger
-from ..utils.http_client import RateLimitedHTTP
-
-try:
-    from pybit.unified_trading import HTTP
-    try:
-        import requests
-        from requests.adapters import HTTPAdapter
-        from urllib3.util.retry import Retry  # type: ignore
-    except Exception:
-        requests = None  # type: ignore
-        HTTPAdapter = None  # type: ignore
-except Exception:  # pragma: no cover
-    HTTP = None  # type: ignore
+from ..utils.rest_registry import shared_rest_registry
 
 
 class FuturesOrderManager:
@@ -29,38 +17,17 @@ class FuturesOrderManager:
         self._raw_http = None
         self._http = None
         self._instrument_cache: Dict[str, Dict[str, Decimal | str]] = {}
-        if HTTP is not None:
-            try:
-                if 'requests' in globals() and requests is not None and HTTPAdapter is not None:
-                    try:
-                        session = requests.Session()
-                        adapter = HTTPAdapter(pool_connections=50, pool_maxsize=100, max_retries=Retry(total=2, backoff_factor=0.1))
-                        session.mount('https://', adapter)
-                        session.mount('http://', adapter)
-                        self._raw_http = HTTP(
-                            testnet=False,
-                            api_key=self.config.bybit_api_key or "",
-                            api_secret=self.config.bybit_api_secret or "",
-                            recv_window=30000,
-                            session=session,
-                        )
-                    except Exception:
-                        self._raw_http = HTTP(
-                            testnet=False,
-                            api_key=self.config.bybit_api_key or "",
-                            api_secret=self.config.bybit_api_secret or "",
-                            recv_window=30000,
-                        )
-                else:
-                    self._raw_http = HTTP(
-                        testnet=False,
-                        api_key=self.config.bybit_api_key or "",
-                        api_secret=self.config.bybit_api_secret or "",
-                        recv_window=30000,
-                    )
-                self._http = RateLimitedHTTP(self._raw_http, max_requests=30, per_seconds=3.0)
-            except Exception as e:
-                self.logger.error(f"Failed to init Bybit HTTP futures client: {e}")
+        try:
+            self._http = shared_rest_registry(config).client(
+                "futures_orders",
+                testnet=False,
+                api_key=self.config.bybit_api_key or "",
+                api_secret=self.config.bybit_api_secret or "",
+                recv_window=30000,
+            )
+            self._raw_http = self._http.http
+        except Exception as e:
+            self.logger.error(f"Failed to init Bybit HTTP futures client: {e}")
         # Cache for symbol leverage (best-effort)
         self._last_leverage_set: Dict[str, float] = {}
 
@@ -77,17 +44,23 @@ class FuturesOrderManager:
     def _get_filters(self, symbol: str) -> Dict[str, Decimal | str]:
         if symbol in self._instrument_cache:
             return self._instrument_cache[symbol]
+        resp = None
+        if self._http is not None:
+            try:
+                resp = self._http.request("get_instruments_info", category="linear", symbol=symbol)
+            except Exception as e:
+                self.logger.debug(f"Failed to fetch futures instrument filters {symbol}: {e}")
+        return self._cache_filters(symbol, resp)
+
+    def _cache_filters(self, symbol: str, resp: Optional[Dict]) -> Dict[str, Decimal | str]:
+        """Parse an instruments-info response (defaults when missing) into the filter cache."""
         filters: Dict[str, Decimal | str] = {
             "qty_step": Decimal("0.001"),
             "min_qty": Decimal("0.0"),
             "tick_size": Decimal("0.5"),
             "min_notional": Decimal("0.0"),
         }
-        if self._http is None:
-            self._instrument_cache[symbol] = filters
-            return filters
         try:
-            resp = self._http.request("get_instruments_info", category="linear", symbol=symbol)
             result = resp.get("result", {}) if isinstance(resp, dict) else {}
             lst = result.get("list", []) if isinstance(result, dict) else []
             if lst:
@@ -111,7 +84,7 @@ class FuturesOrderManager:
                 if price.get("tickSize"):
                     filters["tick_size"] = Decimal(str(price.get("tickSize")))
         except Exception as e:
-            self.logger.debug(f"Failed to fetch futures instrument filters {symbol}: {e}")
+            self.logger.debug(f"Failed to parse futures instrument filters {symbol}: {e}")
         self._instrument_cache[symbol] = filters
         return filters
 
@@ -356,48 +329,56 @@ class FuturesOrderManager:
             return None
         try:
             resp = self._http.request("get_positions", category="linear", symbol=symbol)
-            if not isinstance(resp, dict):
-                return None
-            result = resp.get("result", {}) if isinstance(resp, dict) else {}
-            rows = result.get("list", []) if isinstance(result, dict) else []
-            if not isinstance(rows, list) or not rows:
-                return {"size": 0.0}
-            # Prefer net position if provided, otherwise infer from long/short
-            # Unified response often includes entries for both sides; pick the one with non-zero size
-            chosen = None
-            for r in rows:
-                try:
-                    sz = float(r.get("size") or r.get("positionAmt") or 0.0)
-                except Exception:
-                    sz = 0.0
-                if abs(sz) > 0:
-                    chosen = r
-                    break
-            if chosen is None:
-                chosen = rows[0]
-            out = {
-                "size": float(chosen.get("size") or chosen.get("positionAmt") or 0.0),
-                "avgPrice": float(chosen.get("avgPrice") or chosen.get("entryPrice") or 0.0),
-                "side": (str(chosen.get("side")) if chosen.get("side") else ("Buy" if float(chosen.get("size") or 0.0) > 0 else ("Sell" if float(chosen.get("size") or 0.0) < 0 else ""))),
-            }
-            return out
+            return self._position_from_response(resp)
         except Exception as e:
             self.logger.error(f"get_position error {symbol}: {e}")
             return None
 
+    @staticmethod
+    def _position_from_response(resp: Optional[Dict]) -> Optional[Dict]:
+        if not isinstance(resp, dict):
+            return None
+        result = resp.get("result", {}) if isinstance(resp, dict) else {}
+        rows = result.get("list", []) if isinstance(result, dict) else []
+        if not isinstance(rows, list) or not rows:
+            return {"size": 0.0}
+        # Prefer net position if provided, otherwise infer from long/short
+        # Unified response often includes entries for both sides; pick the one with non-zero size
+        chosen = None
+        for r in rows:
+            try:
+                sz = float(r.get("size") or r.get("positionAmt") or 0.0)
+            except Exception:
+                sz = 0.0
+            if abs(sz) > 0:
+                chosen = r
+                break
+        if chosen is None:
+            chosen = rows[0]
+        out = {
+            "size": float(chosen.get("size") or chosen.get("positionAmt") or 0.0),
+            "avgPrice": float(chosen.get("avgPrice") or chosen.get("entryPrice") or 0.0),
+            "side": (str(chosen.get("side")) if chosen.get("side") else ("Buy" if float(chosen.get("size") or 0.0) > 0 else ("Sell" if float(chosen.get("size") or 0.0) < 0 else ""))),
+        }
+        return out
+
     def get_mark_price_safe(self, symbol: str) -> Optional[float]:
         """Lightweight mark price fetcher for PnL calculations if needed."""
         try:
             if self._http is None:
                 return None
             resp = self._http.request("get_tickers", category="linear", symbol=symbol)
-            result = resp.get("result", {}) if isinstance(resp, dict) else {}
-            rows = result.get("list", []) if isinstance(result, dict) else []
-            if not rows:
-                return None
-            mp = rows[0].get("markPrice") or rows[0].get("lastPrice")
-            return float(mp) if mp is not None else None
+            return self._mark_from_response(resp)
         except Exception:
             return None
 
+    @staticmethod
+    def _mark_from_response(resp: Optional[Dict]) -> Optional[float]:
+        result = resp.get("result", {}) if isinstance(resp, dict) else {}
+        rows = result.get("list", []) if isinstance(result, dict) else []
+        if not rows:
+            return None
+        mp = rows[0].get("markPrice") or rows[0].get("lastPrice")
+        return float(mp) if mp is not None else None
+
 
@@ -11,6 +11,7 @@ from ..utils.db_manager import DBManager
 from ..utils.notifier import Notifier
 from ..handlers.futures_handler import FuturesHandler
 from ..handlers.futures_ws import FuturesWS
+from ..handlers.private_stream import TERMINAL_STATUSES, shared_private_stream
 from .symbol_mapper import SymbolMapper
 from .order_manager_futures import FuturesOrderManager
 from ..indicators.technical import (
@@ -41,13 +42,19 @@ class Scalp5mEngine:
         self.db = db
         self.notifier = notifier
         self.logger = get_logger(self.__class__.__name__)
-        self._fh = FuturesHandler(testnet=self.config.bybit_testnet)
+        self._fh = FuturesHandler(testnet=self.config.bybit_testnet, config=self.config)
         self._ws = FuturesWS(testnet=self.config.bybit_testnet, config=self.config)
         self._symbols: List[str] = []
         self._buffers: Dict[str, List[Candle]] = {}
         self._positions: Dict[str, str] = {}  # symbol -> side ("Long"/"Short")
         self._om = FuturesOrderManager(self.config)
         self._stop = False
+        # Private WS: fills and position closes arrive as events instead of REST polls
+        self._private = shared_private_stream(self.config)
+        # Set by the stream callback thread; the run loop does the settlement
+        self._position_event = threading.Event()
+        if self._private is not None:
+            self._private.store.add_listener("position", self._on_position_event)
         # simple JSONL log path
         self._jsonl_path = "bybit_trading_bot/storage/scalp_signals.jsonl"
         # position state for trailing stop updates
@@ -127,7 +134,9 @@ class Scalp5mEngine:
             except Exception:
                 pass
             while not self._stop:
-                time.sleep(0.5)
+                if self._position_event.wait(0.5):
+                    self._position_event.clear()
+                    self._poll_positions()
         except Exception as e:
             self.logger.error(f"Scalp5mEngine stopped with error: {e}")
 
@@ -648,7 +657,8 @@ class Scalp5mEngine:
                     resp = self._om.place_limit(symbol, side=side, qty=adj_qty, price=price)
                     order_id = self._extract_order_id(resp)
                     filled, ap, fq = self._wait_for_limit_fill(symbol, order_id, side, timeout_sec=int(self.config.scalp_limit_timeout_sec)) if order_id else (False, 0.0, 0.0)
-                    if not filled and order_id:
+                    # Unfilled or partially filled: cancel what is left so it cannot fill on top
+                    if order_id and (not filled or fq < adj_qty):
                         try:
                             self._om.cancel_order(symbol, order_id)
                         except Exception:
@@ -1221,21 +1231,46 @@ class Scalp5mEngine:
             return True
 
 
+    def _on_position_event(self, row: Dict) -> None:
+        """Private-stream position push: wake the run loop to settle a tracked position that reports size 0.
+
+        Runs on the stream's callback thread, so it only signals; settlement stays off this thread.
+        """
+        try:
+            if str(row.get("symbol")) in self._positions and abs(float(row.get("size") or 0.0)) == 0.0:
+                self._position_event.set()
+        except Exception:
+            pass
+
+    def _live_position(self, symbol: str) -> Dict | None:
+        """Position row from the private stream when it has one, else a REST lookup."""
+        if self._private is not None and self._private.is_live:
+            pos = self._private.store.get_position(symbol, "linear")
+            if pos is not None:
+                return pos
+        return self._om.get_position(symbol)
+
     def _poll_positions(self) -> None:
         """Best-effort lifecycle sync: if position closed on exchange, clear local state and compute PnL.
 
-        This is a lightweight poll based on get_position() and mark price; for production, prefer WS private fills.
+        Position sizes come from the private stream when live (REST get_position otherwise).
+        Called from the run loop, kline callbacks and the heartbeat thread: a closed position is
+        popped from _positions first and only the caller whose pop succeeds settles it.
         """
         try:
             if not self._positions:
                 return
-            for sym, side in list(self._positions.items()):
-                pos = self._om.get_position(sym)
+            for sym in list(self._positions):
+                pos = self._live_position(sym)
                 size = 0.0 if not pos else abs(float(pos.get("size") or 0.0))
                 if size > 0:
                     continue
+                # Claim the settlement; another thread that got here first already popped it
+                side = self._positions.pop(sym, None)
+                if side is None:
+                    continue
                 # position is closed — compute PnL best-effort from entry and current mark
-                st = self._pos_state.get(sym) or {}
+                st = self._pos_state.pop(sym, None) or {}
                 entry = float(st.get("entry") or 0.0)
                 qty = float(st.get("qty") or 0.0)
                 if entry > 0 and qty > 0:
@@ -1254,9 +1289,6 @@ class Scalp5mEngine:
                                 self.db.close_trade(order_id_eff, pnl)
                     except Exception:
                         pass
-                # clear state
-                self._positions.pop(sym, None)
-                self._pos_state.pop(sym, None)
         except Exception:
             pass
 
@@ -1274,53 +1306,71 @@ class Scalp5mEngine:
             return ""
 
     def _wait_for_limit_fill(self, symbol: str, order_id: str, side: str, timeout_sec: int) -> tuple[bool, float, float]:
-        """Poll order/position until filled or timeout.
+        """Wait for the order to fill (private-stream event, else order/position polling) or timeout.
 
-        Returns (filled, avg_price, filled_qty).
+        Any executed quantity counts as filled (the caller cancels the remainder), so a partial fill
+        is never topped up with a full-size market order. Returns (filled, avg_price, filled_qty).
         """
-        deadline = time.time() + max(1, int(timeout_sec))
+        timeout = float(max(1, int(timeout_sec)))
+        if self._private is not None and self._private.is_live:
+            row = self._private.store.wait_for_order(order_id, ("Filled",), timeout)
+            if row is not None:
+                try:
+                    ap = float(row.get("avgPrice") or 0.0)
+                    qty = float(row.get("cumExecQty") or 0.0)
+                except Exception:
+                    ap, qty = 0.0, 0.0
+                if qty > 0 or str(row.get("orderStatus")) in TERMINAL_STATUSES:
+                    return qty > 0, ap, qty
+            # Timed out (possibly partially filled): one explicit REST check of position and order
+            _, ap, qty = self._check_fill_once(symbol, order_id)
+            return qty > 0, ap, qty
+        deadline = time.time() + timeout
         last_avg = 0.0
         last_qty = 0.0
         while time.time() < deadline and not self._stop:
-            try:
-                pos = self._om.get_position(symbol)
-                if pos and abs(float(pos.get("size") or 0.0)) > 0.0:
-                    # consider position opened
-                    sz = abs(float(pos.get("size") or 0.0))
-                    ap = float(pos.get("avgPrice") or 0.0)
-                    return True, ap, sz
-                # fallback: check order history status if available
-                hist = self._om.get_order_history(symbol, order_id)
-                if isinstance(hist, dict):
-                    res = hist.get("result", {}) if isinstance(hist.get("result"), dict) else {}
-                    lst = res.get("list", []) if isinstance(res, dict) else []
-                    if isinstance(lst, list) and lst:
-                        row = lst[0]
-                        st = str(row.get("orderStatus") or row.get("status") or "")
-                        if st.lower() in {"filled", "partiallyfilled"}:
-                            try:
-                                ap = float(row.get("avgPrice") or row.get("cumExecAvgPrice") or 0.0)
-                            except Exception:
-                                ap = 0.0
-                            try:
-                                qty = float(row.get("cumExecQty") or row.get("qty") or 0.0)
-                            except Exception:
-                                qty = 0.0
-                            last_avg, last_qty = ap, qty
-                            if st.lower() == "filled" and qty > 0:
-                                return True, ap, qty
-            except Exception:
-                pass
+            status, ap, qty = self._check_fill_once(symbol, order_id)
+            if qty > 0:
+                last_avg, last_qty = ap, qty
+            if status in ("Position", "Filled") and qty > 0:
+                return True, ap, qty
+            if status in TERMINAL_STATUSES:
+                break
             time.sleep(0.5)
-        return False, last_avg, last_qty
+        return last_qty > 0, last_avg, last_qty
+
+    def _check_fill_once(self, symbol: str, order_id: str) -> tuple[str, float, float]:
+        """One REST look at an entry order: ("Position" or the order status or "", avg_price, filled_qty)."""
+        try:
+            pos = self._om.get_position(symbol)
+            if pos and abs(float(pos.get("size") or 0.0)) > 0.0:
+                # consider position opened
+                return "Position", float(pos.get("avgPrice") or 0.0), abs(float(pos.get("size") or 0.0))
+            # fallback: check order history status if available
+            hist = self._om.get_order_history(symbol, order_id)
+            if isinstance(hist, dict):
+                res = hist.get("result", {}) if isinstance(hist.get("result"), dict) else {}
+                lst = res.get("list", []) if isinstance(res, dict) else []
+                if isinstance(lst, list) and lst:
+                    row = lst[0]
+                    st = str(row.get("orderStatus") or row.get("status") or "")
+                    try:
+                        ap = float(row.get("avgPrice") or row.get("cumExecAvgPrice") or 0.0)
+                    except Exception:
+                        ap = 0.0
+                    try:
+                        qty = float(row.get("cumExecQty") or 0.0)
+                    except Exception:
+                        qty = 0.0
+                    return st, ap, qty
+        except Exception:
+            pass
+        return "", 0.0, 0.0
 
     def _get_symbol_id_by_futures(self, futures_symbol: str) -> int | None:
         try:
-            recs = self.db.get_active_symbols()
-            for r in recs:
-                if str(r.futures_symbol).upper() == futures_symbol.upper():
-                    return int(r.id)
+            rec = self.db.get_symbol_by_futures(futures_symbol.upper())
+            return int(rec.id) if rec else None
         except Exception:
             return None
-        return None
 
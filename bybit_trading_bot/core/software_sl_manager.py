@@ -128,8 +128,7 @@ class SoftwareSLManager:
 
         # Получить из БД
         try:
-            records = self.db.get_active_symbols()
-            symbol_rec = next((r for r in records if r.spot_symbol == symbol), None)
+            symbol_rec = self.db.get_symbol_by_spot(symbol)
             if symbol_rec:
                 price = self.db.get_last_price(symbol_rec.id)
                 if price and price > 0:
@@ -7,6 +7,7 @@ from typing import Deque, Dict, Optional, Tuple
 
 from bybit_trading_bot.config.settings import Config
 from bybit_trading_bot.utils.logger import get_logger
+from bybit_trading_bot.utils.order_book import L2OrderBook
 from bybit_trading_bot.core.order_manager import OrderManager
 from bybit_trading_bot.indicators.technical import calculate_rsi, calculate_macd, calculate_relative_volume
 
@@ -78,19 +79,13 @@ class SpikeDetector:
                 strength = min(1.0, strength + 0.15)
         return min(1.0, strength)
 
-    def update_orderbook(self, best_bid: float, best_ask: float, bids: Optional[list] = None, asks: Optional[list] = None, levels: int = 5) -> None:
-        self.best_bid = best_bid
-        self.best_ask = best_ask
+    def update_orderbook(self, book: L2OrderBook, levels: int = 5) -> None:
+        # Read straight from the maintained book: best quotes are O(1), depth sums touch `levels` rows
+        self.best_bid = book.best_bid
+        self.best_ask = book.best_ask
         try:
-            spread = 0.0 if best_ask <= 0 else (best_ask - best_bid) / best_ask
-            self.last_spread = spread
-            imb = None
-            if bids and asks:
-                bvol = sum(float(q) for _, q in bids[:levels]) if bids else 0.0
-                avol = sum(float(q) for _, q in asks[:levels]) if asks else 0.0
-                denom = (bvol + avol)
-                imb = (bvol - avol) / denom if denom > 0 else 0.0
-            self.last_imbalance = imb
+            self.last_spread = book.spread_pct
+            self.last_imbalance = book.imbalance(levels)
         except Exception:
             pass
 
@@ -5,12 +5,7 @@ from typing import Dict, List, Set
 from bybit_trading_bot.config.settings import Config
 from bybit_trading_bot.utils.logger import get_logger
 from bybit_trading_bot.utils.db_manager import DBManager
-from bybit_trading_bot.utils.http_client import RateLimitedHTTP
-
-try:
-    from pybit.unified_trading import HTTP
-except Exception:  # pragma: no cover - allows running without pybit installed at dev time
-    HTTP = None  # type: ignore
+from bybit_trading_bot.utils.rest_registry import shared_rest_registry
 
 
 class SymbolMapper:
@@ -22,12 +17,11 @@ class SymbolMapper:
         self.logger = get_logger(self.__class__.__name__)
         self._raw_http = None
         self._http = None
-        if HTTP is not None:
-            try:
-                self._raw_http = HTTP(testnet=self.config.bybit_testnet)
-                self._http = RateLimitedHTTP(self._raw_http, max_requests=90, per_seconds=3.0)
-            except Exception as e:
-                self.logger.warning(f"Failed to init Bybit HTTP client: {e}")
+        try:
+            self._http = shared_rest_registry(config).client("symbol_mapper", testnet=self.config.bybit_testnet)
+            self._raw_http = self._http.http
+        except Exception as e:
+            self.logger.warning(f"Failed to init Bybit HTTP client: {e}")
 
     def _fetch_all_symbols(self, category: str) -> Set[str]:
         if self._http is None:
@@ -1,28 +1,146 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Callable, Optional
+import json
+import random
+import time
+from typing import Callable, Dict, List, Optional, Set
 
 from bybit_trading_bot.utils.logger import get_logger
+from bybit_trading_bot.utils.ws_codec import loads
+
+try:
+    import websockets
+except Exception:  # pragma: no cover
+    websockets = None  # type: ignore
 
 
 class WebSocketClient:
-    def __init__(self, url: str) -> None:
+    """One asyncio connection to a Bybit v5 stream.
+
+    - Sends {"op": "ping"} every ping_interval; a connection silent for ping_interval + pong_timeout
+      is dropped and reconnected
+    - Reconnects with full-jitter exponential backoff and re-sends every subscribed topic
+    - Subscribe frames carry at most args_per_frame topics
+    - Decoded data frames are handed to the message handler on the event loop thread
+    """
+
+    def __init__(
+        self,
+        url: str,
+        name: str = "ws",
+        ping_interval: float = 20.0,
+        pong_timeout: float = 10.0,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 30.0,
+        args_per_frame: int = 10,
+    ) -> None:
         self.url = url
+        self.name = name
         self.logger = get_logger(self.__class__.__name__)
+        self.ping_interval = ping_interval
+        self.pong_timeout = pong_timeout
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.args_per_frame = max(1, int(args_per_frame))
+        self.topics: Set[str] = set()
+        self._ws = None
         self._stop = asyncio.Event()
+        self._connected = asyncio.Event()
         self._on_message: Optional[Callable[[dict], None]] = None
+        self.last_message_ts = 0.0
+        self.stats: Dict[str, float] = {"connects": 0, "reconnects": 0, "messages": 0, "pings": 0, "errors": 0}
 
     def set_message_handler(self, handler: Callable[[dict], None]) -> None:
         self._on_message = handler
 
-    async def connect(self) -> None:
-        # Placeholder for real websockets connection
-        self.logger.info(f"WS connect to {self.url} (stub)")
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    async def subscribe(self, topics: List[str]) -> None:
+        fresh = [t for t in topics if t not in self.topics]
+        self.topics.update(fresh)
+        if fresh and self._ws is not None and self.connected:
+            await self._send_subscribe(fresh)
+
+    async def _send_subscribe(self, topics: List[str]) -> None:
+        for i in range(0, len(topics), self.args_per_frame):
+            await self._ws.send(json.dumps({"op": "subscribe", "args": topics[i:i + self.args_per_frame]}))
+
+    async def run(self) -> None:
+        """Connect and pump messages until close(); reconnects on any failure."""
+        if websockets is None:
+            raise RuntimeError("websockets package is not installed")
+        attempt = 0
+        while not self._stop.is_set():
+            try:
+                async with websockets.connect(self.url, ping_interval=None, close_timeout=2, max_size=2**22) as ws:
+                    self._ws = ws
+                    self.stats["connects"] += 1
+                    if attempt:
+                        self.stats["reconnects"] += 1
+                    self.last_message_ts = time.time()
+                    if self.topics:
+                        await self._send_subscribe(sorted(self.topics))
+                    self._connected.set()
+                    attempt = 0
+                    heartbeat = asyncio.create_task(self._heartbeat(ws))
+                    try:
+                        async for raw in ws:
+                            self._handle(raw)
+                    finally:
+                        heartbeat.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                self.logger.warning(f"{self.name}: connection error: {e}")
+            finally:
+                self._connected.clear()
+                self._ws = None
+            if self._stop.is_set():
+                break
+            attempt += 1
+            delay = random.uniform(0.0, min(self.backoff_cap, self.backoff_base * (2 ** min(attempt, 10))))
+            self.logger.info(f"{self.name}: reconnecting in {delay:.1f}s ({len(self.topics)} topics)")
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _handle(self, raw) -> None:
+        self.last_message_ts = time.time()
+        try:
+            msg = loads(raw)
+        except Exception:
+            self.stats["errors"] += 1
+            return
+        if not isinstance(msg, dict) or "topic" not in msg:
+            # pong / subscribe acks
+            if isinstance(msg, dict) and msg.get("op") == "subscribe" and msg.get("success") is False:
+                self.logger.warning(f"{self.name}: subscribe rejected: {msg.get('ret_msg')}")
+            return
+        self.stats["messages"] += 1
+        handler = self._on_message
+        if handler is not None:
+            try:
+                handler(msg)
+            except Exception as e:
+                self.logger.debug(f"{self.name}: handler error for {msg.get('topic')}: {e}")
 
-    async def subscribe_channels(self, symbol: str) -> None:
-        self.logger.info(f"WS subscribe (stub): {symbol}")
+    async def _heartbeat(self, ws) -> None:
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            if time.time() - self.last_message_ts > self.ping_interval + self.pong_timeout:
+                self.logger.warning(f"{self.name}: no messages for {time.time() - self.last_message_ts:.0f}s; reconnecting")
+                await ws.close()
+                return
+            await ws.send('{"op":"ping"}')
+            self.stats["pings"] += 1
 
     async def close(self) -> None:
         self._stop.set()
-        self.logger.info("WS closed (stub)")
+        ws = self._ws
+        if ws is not None:
+            await ws.close()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Callable, Dict, List, Optional
+
+from bybit_trading_bot.core.websocket_client import WebSocketClient
+from bybit_trading_bot.utils.endpoints import ws_url
+from bybit_trading_bot.utils.logger import get_logger
+from bybit_trading_bot.utils.ws_codec import TopicRouter
+
+
+MessageCallback = Callable[[dict], None]
+
+
+class AsyncStreamClient:
+    """All shards of one public channel (spot/linear) multiplexed on a single asyncio loop thread.
+
+    - Topics are packed onto WebSocketClient shards of at most topics_per_shard
+    - Frames are routed by topic to the callback given at subscribe time; callbacks run on the
+      loop thread, so they must hand heavy work off (WebSocketHandler queues ticks to its workers)
+    - One OS thread regardless of the number of shards
+    """
+
+    def __init__(
+        self,
+        channel_type: str = "spot",
+        testnet: bool = False,
+        url: Optional[str] = None,
+        topics_per_shard: int = 200,
+        ping_interval: float = 20.0,
+    ) -> None:
+        self.channel_type = channel_type
+        self.url = url or ws_url(f"public/{channel_type}", testnet=testnet)
+        self.topics_per_shard = max(1, int(topics_per_shard))
+        self.ping_interval = ping_interval
+        self.logger = get_logger(self.__class__.__name__)
+        self.router = TopicRouter()
+        self._shards: List[WebSocketClient] = []
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    # ---- lifecycle (any thread) ----
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run_loop, name=f"AsyncStream-{self.channel_type}", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=5.0)
+
+    def _run_loop(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_all(), loop).result(timeout=timeout)
+        except Exception as e:
+            self.logger.debug(f"Async stream close error: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        self._loop = None
+        self._ready.clear()
+
+    def subscribe(self, topics: List[str], callback: MessageCallback, timeout: float = 10.0) -> None:
+        """Route `topics` to `callback` and subscribe them on the shards (blocks until queued)."""
+        for topic in topics:
+            self.router.route(topic, callback)
+        self.start()
+        asyncio.run_coroutine_threadsafe(self._subscribe(list(topics)), self._loop).result(timeout=timeout)
+
+    # ---- loop thread ----
+    def _dispatch(self, msg: dict) -> None:
+        handler = self.router.lookup(msg["topic"])
+        if handler is None:
+            self.router.unrouted += 1
+            return
+        self.router.routed += 1
+        handler(msg)
+
+    async def _subscribe(self, topics: List[str]) -> None:
+        pending = [t for t in topics if not any(t in s.topics for s in self._shards)]
+        while pending:
+            shard = self._shards[-1] if self._shards else None
+            room = self.topics_per_shard - len(shard.topics) if shard is not None else 0
+            if room <= 0:
+                shard = WebSocketClient(
+                    self.url, name=f"{self.channel_type}#{len(self._shards)}", ping_interval=self.ping_interval
+                )
+                shard.set_message_handler(self._dispatch)
+                self._shards.append(shard)
+                self._tasks.append(asyncio.get_running_loop().create_task(shard.run()))
+                room = self.topics_per_shard
+            batch, pending = pending[:room], pending[room:]
+            await shard.subscribe(batch)
+
+    async def _close_all(self) -> None:
+        for shard in self._shards:
+            await shard.close()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        # A later start() opens fresh shards; routes stay, so subscribe() can be called again
+        self._shards = []
+        self._tasks = []
+
+    def stats(self) -> Dict[str, float]:
+        shards = list(self._shards)
+        return {
+            "shards": len(shards),
+            "connected": sum(1 for s in shards if s.connected),
+            "topics": sum(len(s.topics) for s in shards),
+            "messages": sum(s.stats["messages"] for s in shards),
+            "reconnects": sum(s.stats["reconnects"] for s in shards),
+            "routed": self.router.routed,
+            "unrouted": self.router.unrouted,
+        }
@@ -1,84 +1,103 @@
 from __future__ import annotations
 
-from typing import Optional, Tuple, List, Dict
+from typing import Any, NamedTuple, Optional, Tuple, List, Dict
 import time
 
 from ..utils.logger import get_logger
-from ..utils.http_client import RateLimitedHTTP
-
-try:
-    from pybit.unified_trading import HTTP
-    # Optional: requests adapter tuning when pybit uses requests under the hood
-    try:
-        import requests
-        from requests.adapters import HTTPAdapter
-        from urllib3.util.retry import Retry  # type: ignore
-    except Exception:
-        requests = None  # type: ignore
-        HTTPAdapter = None  # type: ignore
-except Exception:  # pragma: no cover
-    HTTP = None  # type: ignore
+from ..utils.rest_registry import shared_rest_registry
+
+
+class OISnapshot(NamedTuple):
+    symbol: str
+    oi_value: float
+    oi_contracts: Optional[float]
+    mark_price: Optional[float]
+    ts: float
+
+    @property
+    def oi_tokens_mark(self) -> Optional[float]:
+        """OI value expressed in tokens at the mark price."""
+        if self.mark_price is None or self.mark_price <= 0:
+            return None
+        return self.oi_value / self.mark_price
 
 
 class FuturesHandler:
-    def __init__(self, testnet: bool) -> None:
+    def __init__(self, testnet: bool, rate_per_second: float = 10.0, config: Any | None = None) -> None:
         self.logger = get_logger(self.__class__.__name__)
         self._raw_http = None
         self._http = None
-        if HTTP is not None:
-            try:
-                # Force mainnet regardless of input
-                # If requests is available, increase pool size for the default session used by pybit
-                if 'requests' in globals() and requests is not None and HTTPAdapter is not None:
-                    try:
-                        session = requests.Session()
-                        adapter = HTTPAdapter(pool_connections=50, pool_maxsize=100, max_retries=Retry(total=2, backoff_factor=0.1))
-                        session.mount('https://', adapter)
-                        session.mount('http://', adapter)
-                        self._raw_http = HTTP(testnet=False, session=session)
-                    except Exception:
-                        self._raw_http = HTTP(testnet=False)
-                else:
-                    self._raw_http = HTTP(testnet=False)
-                # Extra-tight rate limiting to avoid bursts during backfill
-                self._http = RateLimitedHTTP(self._raw_http, max_requests=30, per_seconds=3.0)
-            except Exception as e:
-                self.logger.error(f"Failed to init HTTP for futures: {e}")
+        try:
+            # Force mainnet regardless of input; market-data bucket shared process-wide,
+            # plus a private cap so OI polling leaves headroom for other subsystems (default 10/s)
+            self._http = shared_rest_registry(config).client("futures_data", testnet=False, cap_per_second=rate_per_second)
+            self._raw_http = self._http.http
+        except Exception as e:
+            self.logger.error(f"Failed to init HTTP for futures: {e}")
+
+    def _latest_oi_row(self, symbol: str) -> Optional[Dict]:
+        """Newest 5min open-interest point (limit=1: the list is newest-first)."""
+        resp = self._http.request("get_open_interest", category="linear", symbol=symbol, intervalTime="5min", limit=1)
+        result = resp.get("result", {}) if isinstance(resp, dict) else {}
+        rows = result.get("list", []) if isinstance(result, dict) else []
+        return rows[0] if rows else None
 
     def get_open_interest(self, symbol: str) -> Optional[float]:
+        snap = self.get_oi_snapshot(symbol, marks={})
+        return snap.oi_value if snap is not None else None
+
+    def get_open_interest_contracts(self, symbol: str) -> Optional[float]:
+        snap = self.get_oi_snapshot(symbol, marks={})
+        return snap.oi_contracts if snap is not None else None
+
+    def get_mark_prices(self) -> Dict[str, float]:
+        """Mark price of every linear symbol from one bulk get_tickers call; {} on failure."""
         if self._http is None:
-            return None
+            return {}
         try:
-            resp = self._http.request("get_open_interest", category="linear", symbol=symbol, intervalTime="5min")
+            resp = self._http.request("get_tickers", category="linear")
             result = resp.get("result", {}) if isinstance(resp, dict) else {}
             rows = result.get("list", []) if isinstance(result, dict) else []
-            if not rows:
-                return None
-            latest = rows[-1]
-            # Prefer monetary OI value; return both as tuple-like via encoding string? No: return mon value here.
-            oi_val = latest.get("openInterestValue") or latest.get("open_interest_value")
-            if oi_val is not None:
-                return float(oi_val)
-            oi_contracts = latest.get("openInterest") or latest.get("open_interest")
-            return float(oi_contracts) if oi_contracts is not None else None
+            marks: Dict[str, float] = {}
+            for row in rows:
+                mp = row.get("markPrice") or row.get("lastPrice")
+                try:
+                    if mp is not None:
+                        marks[str(row.get("symbol"))] = float(mp)
+                except (TypeError, ValueError):
+                    continue
+            return marks
         except Exception as e:
-            self.logger.error(f"Failed to fetch OI for {symbol}: {e}")
-            return None
+            self.logger.error(f"Failed to fetch linear mark prices: {e}")
+            return {}
 
-    def get_open_interest_contracts(self, symbol: str) -> Optional[float]:
+    def get_oi_snapshot(self, symbol: str, marks: Optional[Dict[str, float]] = None) -> Optional[OISnapshot]:
+        """OI value, OI contracts and mark price for one symbol.
+
+        One get_open_interest request; the mark comes from `marks` (pass get_mark_prices() once per
+        poll cycle) or, when marks is None, from a per-symbol ticker request. An empty dict skips it.
+        """
         if self._http is None:
             return None
         try:
-            resp = self._http.request("get_open_interest", category="linear", symbol=symbol, intervalTime="5min")
-            result = resp.get("result", {}) if isinstance(resp, dict) else {}
-            rows = result.get("list", []) if isinstance(result, dict) else []
-            if not rows:
+            row = self._latest_oi_row(symbol)
+            if row is None:
                 return None
-            latest = rows[-1]
-            oi_contracts = latest.get("openInterest") or latest.get("open_interest")
-            return float(oi_contracts) if oi_contracts is not None else None
+            contracts = row.get("openInterest") or row.get("open_interest")
+            oi_contracts = float(contracts) if contracts is not None else None
+            # Monetary OI when the row carries it, else contracts (the value the OI series has always stored)
+            value = row.get("openInterestValue") or row.get("open_interest_value")
+            oi_value = float(value) if value is not None else oi_contracts
+            if oi_value is None:
+                return None
+            mark = marks.get(symbol) if marks is not None else self.get_mark_price(symbol)
+            try:
+                ts = float(row.get("timestamp")) / 1000.0
+            except (TypeError, ValueError):
+                ts = time.time()
+            return OISnapshot(symbol, oi_value, oi_contracts, mark, ts)
         except Exception as e:
-            self.logger.error(f"Failed to fetch OI (contracts) for {symbol}: {e}")
+            self.logger.error(f"Failed to fetch OI for {symbol}: {e}")
             return None
 
     def get_mark_price(self, symbol: str) -> Optional[float]:
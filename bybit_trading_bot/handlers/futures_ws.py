@@ -4,10 +4,12 @@ from typing import Callable, Optional, List, Dict, Any
 import threading
 import time
 
+from .async_stream import AsyncStreamClient
 from ..utils.logger import get_logger
+from ..utils.ws_codec import decode_klines, install_fast_path
 
 try:
-    from pybit.unified_trading import WebSocket
+    from ..utils.endpoints import WebSocket
 except Exception:  # pragma: no cover
     WebSocket = None  # type: ignore
 
@@ -49,8 +51,15 @@ class FuturesWS:
         self._last_kline_time: float = 0.0
         self._last_resubscribe_ts: float = 0.0
         self._subscribed_topics: set[str] = set()
+        # Optional asyncio transport shared by all kline shards
+        self._async: Optional[AsyncStreamClient] = None
+        if bool(getattr(config, "ws_async_client", False)):
+            try:
+                self._async = AsyncStreamClient("linear", testnet=False, topics_per_shard=self._shard_size * 10)
+            except Exception as e:
+                self.logger.error(f"FuturesWS async client init failed: {e}")
 
-        if WebSocket is not None:
+        if WebSocket is not None and self._async is None:
             try:
                 # Force mainnet regardless of input
                 self._ws = WebSocket(testnet=False, channel_type="linear")
@@ -58,6 +67,12 @@ class FuturesWS:
                 self.logger.error(f"FuturesWS init failed: {e}")
 
     def subscribe_kline_5m(self, symbols: List[str], on_kline: Optional[KlineCallback]) -> None:
+        if self._async is not None:
+            with self._lock:
+                self._symbols = list(symbols)
+                self._on_kline = on_kline
+            self._subscribe_kline_async(symbols, "5", lambda msg: self._on_raw_kline(msg, self._topic_symbol(msg)))
+            return
         if WebSocket is None:
             self.logger.warning("FuturesWS not available; running in stub mode")
             return
@@ -81,6 +96,15 @@ class FuturesWS:
             return
         if not callable(on_kline):
             return
+        if self._async is not None:
+            self._subscribe_kline_async(
+                symbols,
+                interval,
+                lambda msg: self._on_raw_kline_generic(
+                    msg, self._topic_symbol(msg), (lambda sym, k: on_kline(sym, k, interval)), interval
+                ),
+            )
+            return
         try:
             # Reuse existing sockets (append) to avoid tearing down 5m subscriptions
             self._create_sharded_sockets_and_subscribe(
@@ -92,6 +116,21 @@ class FuturesWS:
         except Exception as e:
             self.logger.error(f"FuturesWS subscribe_kline error: {e}")
 
+    @staticmethod
+    def _topic_symbol(message) -> str:
+        return str(message.get("topic", "")).rpartition(".")[2]
+
+    def _subscribe_kline_async(self, symbols: List[str], interval: str, callback: Callable[[dict], None]) -> None:
+        """Klines over AsyncStreamClient; no subscribe pacing needed since frames carry 10 topics each."""
+        topics = [f"kline.{interval}.{s.upper()}" for s in symbols]
+        try:
+            self._async.subscribe([t for t in topics if t not in self._subscribed_topics], callback)
+            self._subscribed_topics.update(topics)
+            self._last_kline_time = time.time()
+            self.logger.info(f"Subscribed {len(symbols)} futures klines ({interval}m) over {self._async.stats()['shards']} async shards")
+        except Exception as e:
+            self.logger.error(f"FuturesWS async subscribe error: {e}")
+
     def _create_sharded_sockets_and_subscribe(self, symbols: List[str], on_kline: Optional[KlineCallback], interval: str = "5", append: bool = False) -> None:
         if WebSocket is None:
             raise RuntimeError("WebSocket API not available")
@@ -134,6 +173,7 @@ class FuturesWS:
                     if topic_key in self._subscribed_topics:
                         continue
                     ws = self._sockets[idx % sock_count]
+                    install_fast_path(ws)
                     try:
                         if interval == "5":
                             ws.kline_stream(callback=(lambda msg, s=sym: self._on_raw_kline(msg, s)), symbol=sym, interval="5")
@@ -148,6 +188,7 @@ class FuturesWS:
             # Create new sockets for these subscriptions
             for idx, chunk in enumerate(chunks):
                 ws = WebSocket(testnet=False, channel_type="linear")
+                install_fast_path(ws)
                 self._sockets.append(ws)
                 if idx > 0:
                     time.sleep(self._subscribe_delay_between_shards)
@@ -180,97 +221,16 @@ class FuturesWS:
         try:
             if not isinstance(message, dict):
                 return {}
-            container = message.get("data") or message.get("result") or message
-            rows: List[Dict[str, Any]] = []
-            if isinstance(container, list):
-                rows = container
-            elif isinstance(container, dict):
-                rows = container.get("list") or container.get("kline") or container.get("data") or []  # type: ignore
-            if isinstance(rows, list) and rows:
-                row = rows[-1]
-                def _f(v):
-                    try:
-                        return float(v)
-                    except Exception:
-                        return None
-                # Support dict and list row formats
-                if isinstance(row, dict):
-                    start_v = _f(row.get("start") or row.get("t") or row.get("startTime"))
-                    end_v = _f(row.get("end") or row.get("T") or row.get("endTime"))
-                    open_v = _f(row.get("open") or row.get("o"))
-                    high_v = _f(row.get("high") or row.get("h"))
-                    low_v = _f(row.get("low") or row.get("l"))
-                    close_v = _f(row.get("close") or row.get("c"))
-                    vol_v = _f(row.get("volume") or row.get("v") or row.get("turnover"))
-                    confirm_raw = row.get("confirm") or row.get("isClosed")
-                    confirm_v = False
-                    if confirm_raw is not None:
-                        try:
-                            if isinstance(confirm_raw, bool):
-                                confirm_v = confirm_raw
-                            else:
-                                confirm_v = str(confirm_raw).strip().lower() in {"1", "true", "yes"}
-                        except Exception:
-                            confirm_v = False
-                    k = {
-                        "start": start_v,
-                        "end": end_v,
-                        "open": open_v,
-                        "high": high_v,
-                        "low": low_v,
-                        "close": close_v,
-                        "volume": vol_v,
-                        "confirm": confirm_v,
-                    }
-                elif isinstance(row, (list, tuple)):
-                    # Try to map by common Bybit array order: [start, open, high, low, close, volume, ..., confirm?]
-                    arr = list(row)
-                    start_v = _f(arr[0] if len(arr) > 0 else None)
-                    open_v = _f(arr[1] if len(arr) > 1 else None)
-                    high_v = _f(arr[2] if len(arr) > 2 else None)
-                    low_v = _f(arr[3] if len(arr) > 3 else None)
-                    close_v = _f(arr[4] if len(arr) > 4 else None)
-                    vol_v = _f(arr[5] if len(arr) > 5 else None)
-                    # end may not be present in array rows; try to compute later
-                    end_v = _f(arr[6]) if len(arr) > 6 else None
-                    confirm_v = False
-                    if len(arr) > 7:
-                        try:
-                            confirm_v = bool(arr[7])
-                        except Exception:
-                            confirm_v = False
-                    k = {
-                        "start": start_v,
-                        "end": end_v,
-                        "open": open_v,
-                        "high": high_v,
-                        "low": low_v,
-                        "close": close_v,
-                        "volume": vol_v,
-                        "confirm": confirm_v,
-                    }
-                else:
-                    return {}
-                # Fallback confirm: if 'end' not provided by stream, consider bar closed when end <= now-2s
-                try:
-                    if not k.get("confirm"):
-                        now_ms = time.time() * 1000.0
-                        end_v = k.get("end") or 0.0
-                        if end_v and (now_ms - float(end_v)) >= 2000.0:
-                            k["confirm"] = True
-                        else:
-                            # If 'end' is missing, approximate expected end as start + 5m (default stream interval here)
-                            st = k.get("start") or 0.0
-                            if st:
-                                expected_end = float(st) + 5 * 60 * 1000.0
-                                if (now_ms - expected_end) >= 2000.0:
-                                    k["confirm"] = True
-                except Exception:
-                    pass
-                return k
+            rows = decode_klines(message)
+            if not rows:
+                return {}
+            k = rows[-1]._asdict()
+            # Fallback confirm: consider the bar closed once its end is more than 2s in the past
+            if not k["confirm"] and (time.time() * 1000.0 - k["end"]) >= 2000.0:
+                k["confirm"] = True
+            return k
         except Exception:
             return {}
-        return {}
 
     def _on_raw_kline(self, message, symbol: str) -> None:
         cb = self._on_kline
@@ -308,6 +268,8 @@ class FuturesWS:
 
     def stop(self) -> None:
         self._stop.set()
+        if self._async is not None:
+            self._async.stop()
         # Close sockets on stop
         try:
             for ws in self._sockets:
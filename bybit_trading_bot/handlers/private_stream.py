@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from bybit_trading_bot.utils.logger import get_logger
+from bybit_trading_bot.utils.ws_codec import install_fast_path
+
+try:
+    from bybit_trading_bot.utils.endpoints import WebSocket
+except Exception:  # pragma: no cover
+    WebSocket = None  # type: ignore
+
+
+EventCallback = Callable[[Dict[str, Any]], None]
+
+# v5 order statuses after which an order never changes again
+TERMINAL_STATUSES = frozenset({"Filled", "Cancelled", "Rejected", "PartiallyFilledCanceled", "Deactivated"})
+_TOPICS = ("order", "execution", "position", "wallet")
+
+
+class OrderStateStore:
+    """In-memory view of the account fed by the private stream (order/execution/position/wallet).
+
+    - Order rows are merged by orderId; waiters block on a condition instead of polling REST
+    - Positions are keyed by (category, symbol, positionIdx), wallet by coin
+    - Listeners per kind ('order', 'execution', 'position', 'wallet') get every row as it arrives
+    - Memory is bounded: oldest orders and per-order executions beyond the caps are evicted
+    - REST is the authority: reconcile_orders() overwrites rows from a snapshot, and open rows not
+      refreshed since the last reconnect are stale (events may have been missed while down)
+    """
+
+    def __init__(self, max_orders: int = 5000, max_executions_per_order: int = 50) -> None:
+        self.max_orders = max(1, int(max_orders))
+        self.max_executions_per_order = max(1, int(max_executions_per_order))
+        self._cond = threading.Condition()
+        self._orders: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # orderId -> time.time() of the last stream event or REST snapshot for that row
+        self._order_seen: Dict[str, float] = {}
+        self.reconnected_at = 0.0
+        self.reconnects = 0
+        self._executions: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._positions: Dict[Tuple[str, str, int], Dict[str, Any]] = {}
+        self._wallet: Dict[str, Dict[str, Any]] = {}
+        self._listeners: Dict[str, List[EventCallback]] = {k: [] for k in _TOPICS}
+        self.version = 0
+        self.counts: Dict[str, int] = {k: 0 for k in _TOPICS}
+        self.logger = get_logger(self.__class__.__name__)
+
+    # ---- updates ----
+    def apply(self, topic: str, rows: Iterable[Dict[str, Any]]) -> None:
+        """Apply one private-stream payload; topic may be categorised ('order.spot')."""
+        kind = topic.partition(".")[0]
+        if kind not in self._listeners:
+            return
+        rows = [r for r in rows if isinstance(r, dict)]
+        with self._cond:
+            for row in rows:
+                if kind == "order":
+                    self._merge_order(row)
+                elif kind == "execution":
+                    self._add_execution(row)
+                elif kind == "position":
+                    key = (str(row.get("category") or "linear"), str(row.get("symbol")), int(row.get("positionIdx") or 0))
+                    self._positions[key] = row
+                elif kind == "wallet":
+                    for coin in row.get("coin") or []:
+                        self._wallet[str(coin.get("coin"))] = coin
+                self.counts[kind] += 1
+            self.version += 1
+            self._cond.notify_all()
+            listeners = list(self._listeners[kind])
+        for cb in listeners:
+            for row in rows:
+                try:
+                    cb(row)
+                except Exception as e:
+                    self.logger.debug(f"{kind} listener error: {e}")
+
+    def reconcile_orders(self, rows: Iterable[Dict[str, Any]], category: Optional[str] = None) -> None:
+        """Apply a complete REST snapshot of open orders (for `category`, or all when None).
+
+        Snapshot rows overwrite the stream's fields; open rows the snapshot no longer lists are
+        dropped, since their terminal event may have been lost across a reconnect.
+        """
+        with self._cond:
+            listed = set()
+            for row in rows:
+                oid = str(row.get("orderId") or "")
+                if oid:
+                    listed.add(oid)
+                    self._merge_order(row)
+            stale = [
+                oid
+                for oid, r in self._orders.items()
+                if oid not in listed
+                and r.get("orderStatus") not in TERMINAL_STATUSES
+                and (category is None or r.get("category") == category)
+            ]
+            for oid in stale:
+                self._forget_order(oid)
+            self.version += 1
+            self._cond.notify_all()
+
+    def mark_reconnect(self) -> None:
+        """Called when the socket reopens; open rows seen before now need a REST refresh."""
+        with self._cond:
+            self.reconnected_at = time.time()
+            self.reconnects += 1
+            self.version += 1
+            self._cond.notify_all()
+
+    def _merge_order(self, row: Dict[str, Any]) -> None:
+        oid = str(row.get("orderId") or "")
+        if not oid:
+            return
+        cur = self._orders.get(oid)
+        if cur is None:
+            self._orders[oid] = dict(row)
+            while len(self._orders) > self.max_orders:
+                old, _ = self._orders.popitem(last=False)
+                self._executions.pop(old, None)
+                self._order_seen.pop(old, None)
+        else:
+            cur.update(row)
+            self._orders.move_to_end(oid)
+        self._order_seen[oid] = time.time()
+
+    def _forget_order(self, oid: str) -> None:
+        self._orders.pop(oid, None)
+        self._executions.pop(oid, None)
+        self._order_seen.pop(oid, None)
+
+    def _add_execution(self, row: Dict[str, Any]) -> None:
+        oid = str(row.get("orderId") or "")
+        if not oid:
+            return
+        q = self._executions.get(oid)
+        if q is None:
+            q = self._executions[oid] = deque(maxlen=self.max_executions_per_order)
+        q.append(row)
+
+    # ---- reads ----
+    def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        with self._cond:
+            row = self._orders.get(str(order_id))
+            return dict(row) if row is not None else None
+
+    def get_current_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """get_order, but None for an open row not refreshed since the last reconnect (ask REST)."""
+        oid = str(order_id)
+        with self._cond:
+            row = self._orders.get(oid)
+            if row is None:
+                return None
+            if row.get("orderStatus") not in TERMINAL_STATUSES and self._order_seen.get(oid, 0.0) < self.reconnected_at:
+                return None
+            return dict(row)
+
+    def open_orders(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._cond:
+            return [
+                dict(r)
+                for r in self._orders.values()
+                if r.get("orderStatus") not in TERMINAL_STATUSES and (category is None or r.get("category") == category)
+            ]
+
+    def executions(self, order_id: str) -> List[Dict[str, Any]]:
+        with self._cond:
+            return list(self._executions.get(str(order_id), ()))
+
+    def get_position(self, symbol: str, category: str = "linear") -> Optional[Dict[str, Any]]:
+        """Position row for a symbol (the open leg first in hedge mode); None if never seen."""
+        with self._cond:
+            rows = [r for (cat, sym, _), r in self._positions.items() if cat == category and sym == symbol]
+        if not rows:
+            return None
+        for r in rows:
+            try:
+                if abs(float(r.get("size") or 0.0)) > 0:
+                    return dict(r)
+            except Exception:
+                continue
+        return dict(rows[0])
+
+    def get_coin(self, coin: str) -> Optional[Dict[str, Any]]:
+        with self._cond:
+            row = self._wallet.get(coin)
+            return dict(row) if row is not None else None
+
+    # ---- waits ----
+    def wait_for_order(
+        self, order_id: str, statuses: Iterable[str] = ("Filled",), timeout: float = 30.0
+    ) -> Optional[Dict[str, Any]]:
+        """Block until the order reaches one of `statuses` or any terminal status; None on timeout."""
+        wanted = set(statuses) | TERMINAL_STATUSES
+        oid = str(order_id)
+
+        def _ready() -> bool:
+            row = self._orders.get(oid)
+            return row is not None and row.get("orderStatus") in wanted
+
+        with self._cond:
+            if not self._cond.wait_for(_ready, timeout=max(0.0, timeout)):
+                return None
+            return dict(self._orders[oid])
+
+    def wait_for_change(self, since_version: int, timeout: float) -> int:
+        """Block until any update after `since_version`; returns the current version."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.version != since_version, timeout=max(0.0, timeout))
+            return self.version
+
+    def add_listener(self, kind: str, callback: EventCallback) -> None:
+        with self._cond:
+            self._listeners.setdefault(kind, []).append(callback)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            out = {f"{k}_events": v for k, v in self.counts.items()}
+            out.update({
+                "orders": len(self._orders),
+                "positions": len(self._positions),
+                "reconnects": self.reconnects,
+                "version": self.version,
+            })
+            return out
+
+
+class PrivateStreamHandler:
+    """Authenticated v5 private stream feeding an OrderStateStore."""
+
+    def __init__(self, testnet: bool, api_key: str, api_secret: str) -> None:
+        self.testnet = testnet
+        self.logger = get_logger(self.__class__.__name__)
+        self.store = OrderStateStore()
+        self._api_key = api_key
+        self._api_secret = api_secret
+        self._ws = None
+        self.started_at = 0.0
+
+    def start(self) -> bool:
+        if WebSocket is None or self._ws is not None:
+            return self._ws is not None
+        try:
+            ws = WebSocket(testnet=self.testnet, channel_type="private", api_key=self._api_key, api_secret=self._api_secret)
+            install_fast_path(ws)
+            self._hook_reconnects(ws)
+            for kind in _TOPICS:
+                getattr(ws, f"{kind}_stream")(callback=self._on_message)
+            self._ws = ws
+            self.started_at = time.time()
+            self.logger.info("Private stream subscribed: order, execution, position, wallet")
+            return True
+        except Exception as e:
+            self.logger.error(f"Private stream start failed: {e}")
+            return False
+
+    def _hook_reconnects(self, ws) -> None:
+        """pybit connects in its constructor and reopens the socket by itself; every later open is a reconnect."""
+        on_open = getattr(ws, "_on_open", None)
+        if not callable(on_open):
+            return
+
+        def _on_open(*args) -> None:
+            try:
+                on_open(*args)
+            finally:
+                self.logger.info("Private stream reconnected; open orders will be reconciled over REST")
+                self.store.mark_reconnect()
+
+        ws._on_open = _on_open
+
+    def _on_message(self, message) -> None:
+        try:
+            if isinstance(message, dict):
+                self.store.apply(str(message.get("topic") or ""), message.get("data") or [])
+        except Exception as e:
+            self.logger.debug(f"Private stream message error: {e}")
+
+    @property
+    def is_live(self) -> bool:
+        """True while the socket is connected; callers fall back to REST otherwise."""
+        ws = self._ws
+        if ws is None:
+            return False
+        try:
+            is_connected = getattr(ws, "is_connected", None)
+            return bool(is_connected()) if callable(is_connected) else True
+        except Exception:
+            return False
+
+    def stop(self) -> None:
+        ws, self._ws = self._ws, None
+        try:
+            if ws is not None and hasattr(ws, "exit"):
+                ws.exit()
+        except Exception:
+            pass
+
+
+_shared_lock = threading.Lock()
+_shared: Dict[Tuple[str, bool], PrivateStreamHandler] = {}
+
+
+def shared_private_stream(config: Any) -> Optional[PrivateStreamHandler]:
+    """Process-wide private stream for the configured account (one socket for all managers).
+
+    Returns None when disabled (PRIVATE_WS_ENABLED=false), without API keys, or if it cannot start;
+    callers then keep their REST polling.
+    """
+    if not bool(getattr(config, "private_ws_enabled", True)):
+        return None
+    key = getattr(config, "bybit_api_key", None)
+    secret = getattr(config, "bybit_api_secret", None)
+    if not isinstance(key, str) or not isinstance(secret, str) or not key or not secret or WebSocket is None:
+        return None
+    testnet = bool(getattr(config, "bybit_testnet", False))
+    with _shared_lock:
+        stream = _shared.get((key, testnet))
+        if stream is None:
+            stream = PrivateStreamHandler(testnet, key, secret)
+            if not stream.start():
+                return None
+            _shared[(key, testnet)] = stream
+        return stream
@@ -7,9 +7,9 @@ from bybit_trading_bot.utils.logger import get_logger
 
 
 class SpotHandler:
-    def __init__(self, testnet: bool) -> None:
+    def __init__(self, testnet: bool, tick_workers: int = 1, use_async_client: bool = False) -> None:
         self.logger = get_logger(self.__class__.__name__)
-        self.ws = WebSocketHandler(testnet=testnet)
+        self.ws = WebSocketHandler(testnet=testnet, tick_workers=tick_workers, use_async_client=use_async_client)
 
     def subscribe_tickers(self, symbols: List[str]) -> None:
         self.ws.connect_to_spot_stream(symbols)
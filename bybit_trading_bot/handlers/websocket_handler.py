@@ -1,37 +1,50 @@
 from __future__ import annotations
 
-from typing import Callable, List, Optional
+import heapq
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
+from bybit_trading_bot.handlers.async_stream import AsyncStreamClient
 from bybit_trading_bot.utils.logger import get_logger
+from bybit_trading_bot.utils.order_book import L2OrderBook, OrderBookStore
+from bybit_trading_bot.utils.histogram import DEPTH_BOUNDS, LATENCY_MS_BOUNDS, Histogram
+from bybit_trading_bot.utils.tick_mailbox import TickMailbox
+from bybit_trading_bot.utils.ws_codec import decode_book, decode_ticker, decode_trades, install_fast_path
 
 try:
-    from pybit.unified_trading import WebSocket
+    from bybit_trading_bot.utils.endpoints import WebSocket
 except Exception:  # pragma: no cover
     WebSocket = None  # type: ignore
 
 import time
 import threading
 import random
-import queue
 
 
 TickerCallback = Callable[[str, float, float], None]
-OrderbookCallback = Callable[[str, float, float, list, list], None]
+OrderbookCallback = Callable[[str, L2OrderBook], None]
 TradeCallback = Callable[[str, float, float, float, Optional[str]], None]
 
+# Rough steady-state pushes per second per symbol for Bybit spot public topics; used to balance shards
+_EXPECTED_RATES: Dict[str, float] = {"tickers": 2.0, "orderbook": 20.0, "publicTrade": 5.0}
+
 
 class WebSocketHandler:
     """Обработка WebSocket соединений для спот-рынка (с авто‑переподключением)."""
 
-    def __init__(self, testnet: bool) -> None:
+    def __init__(self, testnet: bool, tick_workers: int = 1, use_async_client: bool = False) -> None:
         self.logger = get_logger(self.__class__.__name__)
         self.testnet = testnet
-        # Multiple websocket shards to reduce per-connection load
-        self._sockets: List[object] = []
+        # Multiple websocket shards to reduce per-connection load; positional (shard idx), None while
+        # a shard's socket failed to open so the health monitor reopens it in place
+        self._sockets: List[Optional[object]] = []
         self._symbols: List[str] = []
         self._on_ticker: Optional[TickerCallback] = None
         self._on_orderbook: Optional[OrderbookCallback] = None
         self._on_trade: Optional[TradeCallback] = None
+        # Local L2 books maintained from orderbook snapshot/delta messages
+        self.books = OrderBookStore()
         self._last_tick_time: float = 0.0
         self._lock = threading.Lock()
 
@@ -43,19 +56,70 @@ class WebSocketHandler:
         # Allow more headroom under load to avoid false reconnects
         self._stale_seconds = 300.0  # no ticks for this duration → reconnect
 
-        # Offload ticker callback work to a queue processed by a consumer thread
-        self._tick_queue = queue.Queue(maxsize=10000)
-        self._consumer_thread: Optional[threading.Thread] = None
+        # Offload ticker callback work to consumer threads; only the freshest pending tick per symbol is kept.
+        # Each symbol is pinned to one worker (stable hash) so its ticks stay ordered while a slow
+        # callback on one symbol only delays the symbols sharing its worker.
+        self._tick_workers = max(1, int(tick_workers))
+        self._tick_mailboxes = [TickMailbox(max_symbols=10000) for _ in range(self._tick_workers)]
+        self._worker_depth = [Histogram(DEPTH_BOUNDS) for _ in range(self._tick_workers)]
+        self._worker_latency_ms = [Histogram(LATENCY_MS_BOUNDS) for _ in range(self._tick_workers)]
+        self._consumer_threads: List[threading.Thread] = []
 
         # Sharding and throttling parameters (tuned for stability and rate limits)
         self._shard_size = 10  # symbols per socket (smaller load per connection)
-        self._subscribe_delay_per_symbol = 0.15  # seconds between subscribe frames (~6-7 msgs/sec per socket)
-        self._subscribe_delay_between_shards = 3.0  # seconds between shard connections
+        self._subscribe_args_per_frame = 10  # Bybit spot accepts at most 10 args per subscribe request
+        self._subscribe_delay_per_frame = 0.1  # seconds between subscribe frames on one socket
+        self._subscribe_delay_per_symbol = 0.15  # per-topic fallback when a batched frame is rejected
+        self._max_parallel_shards = 8  # shards connected/subscribed concurrently
+        self._max_shard_rate = 500.0  # expected msgs/sec per socket before another socket is opened
+
+        # Per-shard load: expected rate of assigned topics and observed message counters
+        self._shard_expected: List[float] = []
+        self._shard_topics: List[int] = []
+        self._shard_msgs: List[int] = []
+        self._shard_rate_snapshot: Tuple[float, List[int]] = (time.time(), [])
+        # Per-shard health: last message time, ticker symbols owned, targeted reconnect bookkeeping
+        self._shard_last_msg: List[float] = []
+        self._shard_tickers: List[Set[str]] = []
+        self._shard_reconnects: List[int] = []
+        self._shard_failures: List[int] = []  # consecutive reconnects that did not revive the shard
+        self._shard_retry_at: List[float] = []
+        self._shard_msgs_at_reconnect: List[int] = []
+        self._shard_stale_seconds = 60.0  # shard silent this long → reconnect just that shard
+        self._shard_disconnect_grace = 10.0  # socket reports disconnected and silent this long → reconnect
+        self._shard_backoff_cap = 900.0  # retry spacing cap for shards that stay silent (illiquid symbols)
+        # Ticker messages per symbol: relative activity used to weigh orderbook/trade placement
+        self._symbol_msgs: Dict[str, int] = {}
+        # symbol -> shard carrying its orderbook/trade topics
+        self._depth_shard: Dict[str, int] = {}
+        self._last_shard_log_ts: float = 0.0
+
+        # Time to full subscription: from the start of a (re)subscribe round until every symbol ticked
+        self._sub_lock = threading.Lock()
+        self._awaiting_first_tick: Set[str] = set()
+        self._sub_started_at: float = 0.0
+        self._sub_stats: Dict[str, float] = {
+            "rounds": 0,
+            "symbols": 0,
+            "frames": 0,
+            "frame_failures": 0,
+            "frames_sent_seconds": 0.0,
+            "time_to_full_subscription": 0.0,
+            "pending_symbols": 0,
+        }
 
         # Resubscribe cooldown to avoid thrashing with pybit's own reconnects
         self._last_resubscribe_ts: float = 0.0
 
-        if WebSocket is not None:
+        # Optional asyncio transport: every shard on one event-loop thread instead of pybit's per-socket threads
+        self._async: Optional[AsyncStreamClient] = None
+        if use_async_client:
+            try:
+                self._async = AsyncStreamClient("spot", testnet=False)
+            except Exception as e:
+                self.logger.error(f"Failed to init async stream client: {e}")
+
+        if WebSocket is not None and self._async is None:
             try:
                 # Create a probe socket to validate environment; real shards created on subscribe
                 self._sockets = [WebSocket(testnet=False, channel_type="spot")]
@@ -64,6 +128,9 @@ class WebSocketHandler:
 
     def connect_to_spot_stream(self, symbols: List[str], on_ticker: Optional[TickerCallback] = None) -> None:
         """Подключение к потоку спот-данных (тикеры) и запуск мониторинга."""
+        if self._async is not None:
+            self._connect_async(symbols, on_ticker)
+            return
         if WebSocket is None:
             self.logger.warning("WebSocket not available; running in stub mode")
             return
@@ -80,10 +147,8 @@ class WebSocketHandler:
         if self._monitor_thread is None:
             self._monitor_thread = threading.Thread(target=self._monitor_loop, name="WSMonitor", daemon=True)
             self._monitor_thread.start()
-        # Start consumer thread for ticks
-        if self._consumer_thread is None:
-            self._consumer_thread = threading.Thread(target=self._consume_ticks_loop, name="WSTickConsumer", daemon=True)
-            self._consumer_thread.start()
+        # Start consumer threads for ticks
+        self._start_tick_consumers()
 
     def subscribe_orderbook_and_trades(
         self,
@@ -91,6 +156,9 @@ class WebSocketHandler:
         on_orderbook: Optional[OrderbookCallback] = None,
         on_trade: Optional[TradeCallback] = None,
     ) -> None:
+        if self._async is not None:
+            self._subscribe_depth_async(symbols, on_orderbook, on_trade)
+            return
         if WebSocket is None:
             self.logger.warning("WebSocket not available; running in stub mode (orderbook/trades)")
             return
@@ -99,75 +167,70 @@ class WebSocketHandler:
             self._on_orderbook = on_orderbook
             self._on_trade = on_trade
         try:
-            # Subscribe orderbook/trades only on the first shard to limit total load
-            ws0 = self._sockets[0] if self._sockets else WebSocket(testnet=self.testnet, channel_type="spot")
-            if not self._sockets:
-                self._sockets = [ws0]
-            for sym in symbols:
-                # Orderbook 50 levels
-                try:
-                    ws0.orderbook_stream(callback=(lambda msg, s=sym: self._on_raw_orderbook(msg, s, on_orderbook)), symbol=sym, depth=50)  # type: ignore[attr-defined]
-                except Exception:
-                    try:
-                        ws0.orderbook_50_stream(callback=(lambda msg, s=sym: self._on_raw_orderbook(msg, s, on_orderbook)), symbol=sym)  # type: ignore[attr-defined]
-                    except Exception as e:
-                        self.logger.debug(f"Orderbook subscribe not available for {sym}: {e}")
-                # Public trades
-                try:
-                    ws0.public_trade_stream(callback=(lambda msg, s=sym: self._on_raw_trade(msg, s, on_trade)), symbol=sym)  # type: ignore[attr-defined]
-                except Exception as e:
-                    self.logger.debug(f"Trade subscribe not available for {sym}: {e}")
+            # Orderbook/trade topics are the heaviest streams: balance them across shards by expected rate
+            self._subscribe_depth_balanced(list(symbols), on_orderbook, on_trade)
             self._last_tick_time = time.time()
-            self.logger.info(f"Subscribed orderbook/trades for {len(symbols)} symbols on shard #0")
+            used = len(set(self._depth_shard.get(sym, 0) for sym in symbols))
+            self.logger.info(f"Subscribed orderbook/trades for {len(symbols)} symbols across {used} shards")
         except Exception as e:
             self.logger.error(f"Failed to subscribe orderbook/trades: {e}")
         if self._monitor_thread is None:
             self._monitor_thread = threading.Thread(target=self._monitor_loop, name="WSMonitor", daemon=True)
             self._monitor_thread.start()
-        if self._consumer_thread is None:
-            self._consumer_thread = threading.Thread(target=self._consume_ticks_loop, name="WSTickConsumer", daemon=True)
-            self._consumer_thread.start()
+        self._start_tick_consumers()
+
+    # ---- asyncio transport ----
+    def _connect_async(self, symbols: List[str], on_ticker: Optional[TickerCallback]) -> None:
+        """Tickers over AsyncStreamClient; reconnect/resubscribe is handled by the client itself."""
+        with self._lock:
+            self._symbols = list(symbols)
+            self._on_ticker = on_ticker
+        self._begin_subscription_round(list(symbols))
+        try:
+            self._async.subscribe(
+                [f"tickers.{s}" for s in symbols],
+                lambda msg: self._on_raw_ticker(msg, self._topic_symbol(msg), on_ticker),
+            )
+            self._finish_subscription_frames()
+            self._last_tick_time = time.time()
+            self.logger.info(f"Subscribed to {len(symbols)} spot tickers over {self._async.stats()['shards']} async shards")
+        except Exception as e:
+            self.logger.error(f"Failed to subscribe to ticker stream (async): {e}")
+        self._start_tick_consumers()
+
+    def _subscribe_depth_async(
+        self, symbols: List[str], on_orderbook: Optional[OrderbookCallback], on_trade: Optional[TradeCallback]
+    ) -> None:
+        with self._lock:
+            self._symbols = list(set(self._symbols + list(symbols)))
+            self._on_orderbook = on_orderbook
+            self._on_trade = on_trade
+        try:
+            if on_orderbook:
+                self._async.subscribe(
+                    [f"orderbook.50.{s}" for s in symbols],
+                    lambda msg: self._on_raw_orderbook(msg, self._topic_symbol(msg), on_orderbook),
+                )
+            if on_trade:
+                self._async.subscribe(
+                    [f"publicTrade.{s}" for s in symbols],
+                    lambda msg: self._on_raw_trade(msg, self._topic_symbol(msg), on_trade),
+                )
+            self.logger.info(f"Subscribed orderbook/trades for {len(symbols)} symbols (async)")
+        except Exception as e:
+            self.logger.error(f"Failed to subscribe orderbook/trades (async): {e}")
 
     def _on_raw_ticker(self, message, symbol: str, on_ticker: Optional[TickerCallback]) -> None:
         try:
-            data = None
-            if isinstance(message, dict):
-                data = message.get("data") or message.get("result") or message
-            price = None
-            # Data can be a dict (single row) or a list of rows (snapshot/delta)
-            if isinstance(data, dict):
-                lp = data.get("lastPrice") or data.get("lp") or data.get("price")
-                if lp is not None:
-                    try:
-                        price = float(lp)
-                    except Exception:
-                        price = None
-            elif isinstance(data, list) and data:
-                row = data[-1] if isinstance(data[-1], dict) else data[0]
-                if isinstance(row, dict):
-                    lp = row.get("lastPrice") or row.get("lp") or row.get("price")
-                    if lp is not None:
-                        try:
-                            price = float(lp)
-                        except Exception:
-                            price = None
-            if price is not None:
+            tick = decode_ticker(message)
+            if tick is not None:
+                price = tick.last_price
                 ts = time.time()
                 self._last_tick_time = ts
-                try:
-                    self._tick_queue.put_nowait((symbol, price, ts))
-                except queue.Full:
-                    # Drop oldest items to relieve pressure, then enqueue newest
-                    try:
-                        drain = max(1, self._tick_queue.qsize() // 2)
-                        for _ in range(drain):
-                            self._tick_queue.get_nowait()
-                    except Exception:
-                        pass
-                    try:
-                        self._tick_queue.put_nowait((symbol, price, ts))
-                    except Exception:
-                        pass
+                self._symbol_msgs[symbol] = self._symbol_msgs.get(symbol, 0) + 1
+                if self._awaiting_first_tick:
+                    self._mark_symbol_live(symbol, ts)
+                self._tick_mailboxes[self._tick_worker_of(symbol)].put(symbol, price, ts)
         except Exception as e:
             self.logger.debug(f"Ticker parse error for {symbol}: {e}")
 
@@ -214,7 +277,7 @@ class WebSocketHandler:
         backoff = self._base_backoff
         while not self._stop_event.is_set():
             try:
-                # Avoid reconnects based on lack of ticks (illiquid symbols). Only reconnect if all sockets are gone.
+                # Full rebuild only if all sockets are gone; otherwise silent shards are reconnected one by one
                 needs_reconnect = not self._sockets
                 if needs_reconnect:
                     self.logger.warning(
@@ -230,87 +293,135 @@ class WebSocketHandler:
                             backoff = min(self._backoff_cap, max(self._base_backoff, backoff * 2))
                     else:
                         backoff = min(self._backoff_cap, max(self._base_backoff, backoff * 2))
+                else:
+                    self._check_shard_health()
+                if time.time() - self._last_shard_log_ts >= 60.0:
+                    self._log_shard_rates()
                 time.sleep(2.0)
             except Exception as e:
                 self.logger.error(f"WS monitor error: {e}")
                 time.sleep(2.0)
 
-    def _consume_ticks_loop(self) -> None:
-        while not self._stop_event.is_set():
+    # ---- Per-shard health ----
+    def _dead_shards(self, now: float) -> List[int]:
+        """Shards that never opened, or with topics that went silent (or whose socket reports
+        disconnected), and are due a retry."""
+        dead: List[int] = []
+        sockets = list(self._sockets)
+        for idx, ws in enumerate(sockets):
+            if idx >= len(self._shard_last_msg) or now < self._shard_retry_at[idx]:
+                continue
+            if ws is None:
+                dead.append(idx)
+                continue
+            if not self._shard_topics[idx] and not self._shard_tickers[idx]:
+                continue
+            idle = now - self._shard_last_msg[idx]
+            connected = True
             try:
-                symbol, price, ts = self._tick_queue.get(timeout=1.0)
+                is_connected = getattr(ws, "is_connected", None)
+                if callable(is_connected):
+                    connected = bool(is_connected())
             except Exception:
+                connected = False
+            if idle > self._shard_stale_seconds or (not connected and idle > self._shard_disconnect_grace):
+                dead.append(idx)
+        return dead
+
+    def _check_shard_health(self) -> None:
+        now = time.time()
+        for idx in self._dead_shards(now):
+            idle = now - self._shard_last_msg[idx]
+            # A shard still silent after our last reconnect backs off (it may just carry illiquid symbols)
+            if self._shard_reconnects[idx] and self._shard_msgs[idx] == self._shard_msgs_at_reconnect[idx]:
+                self._shard_failures[idx] += 1
+            else:
+                self._shard_failures[idx] = 0
+            delay = min(self._shard_backoff_cap, self._shard_stale_seconds * (2 ** self._shard_failures[idx]))
+            self._shard_retry_at[idx] = now + delay * (0.5 + random.random() / 2)
+            self.logger.warning(f"WS shard #{idx} silent for {idle:.0f}s; reconnecting this shard only")
+            try:
+                self._reconnect_shard(idx)
+            except Exception as e:
+                self.logger.error(f"WS shard #{idx} reconnect failed: {e}")
+
+    def _reconnect_shard(self, idx: int) -> None:
+        """Replace one shard's socket and resubscribe only the topics it owned."""
+        if WebSocket is None:
+            return
+        old = self._sockets[idx]
+        try:
+            if hasattr(old, "exit"):
+                old.exit()
+        except Exception:
+            pass
+        ws = WebSocket(testnet=False, channel_type="spot")
+        self._sockets[idx] = ws
+        tickers = sorted(self._shard_tickers[idx])
+        if tickers:
+            self._subscribe_tickers(ws, idx, tickers, self._on_ticker, count_load=False)
+        depth = sorted(sym for sym, i in self._depth_shard.items() if i == idx)
+        if depth and (self._on_orderbook or self._on_trade):
+            self._subscribe_depth_and_trades(ws, idx, depth, self._on_orderbook, self._on_trade)
+        self._shard_reconnects[idx] += 1
+        self._shard_msgs_at_reconnect[idx] = self._shard_msgs[idx]
+        # Grace period: the shard is judged again only after a full stale window
+        self._shard_last_msg[idx] = time.time()
+        self.logger.info(f"WS shard #{idx} reconnected: {len(tickers)} tickers, {len(depth)} orderbook/trade symbols")
+
+    def _tick_worker_of(self, symbol: str) -> int:
+        if self._tick_workers == 1:
+            return 0
+        return zlib.crc32(symbol.encode()) % self._tick_workers
+
+    def _start_tick_consumers(self) -> None:
+        with self._lock:
+            if self._consumer_threads:
+                return
+            for i in range(self._tick_workers):
+                t = threading.Thread(target=self._consume_ticks_loop, args=(i,), name=f"WSTickConsumer-{i}", daemon=True)
+                t.start()
+                self._consumer_threads.append(t)
+
+    def _consume_ticks_loop(self, worker: int = 0) -> None:
+        mailbox = self._tick_mailboxes[worker]
+        depth = self._worker_depth[worker]
+        latency_ms = self._worker_latency_ms[worker]
+        while not self._stop_event.is_set():
+            tick = mailbox.get(timeout=1.0)
+            if tick is None:
                 continue
+            symbol, price, ts = tick
+            # Symbols still waiting behind this one on the same worker
+            depth.observe(mailbox.qsize())
             try:
                 cb = self._on_ticker
                 if callable(cb):
+                    t0 = time.perf_counter()
                     cb(symbol, price, ts)
+                    latency_ms.observe((time.perf_counter() - t0) * 1000.0)
             except Exception as e:
                 self.logger.debug(f"Tick consumer error for {symbol}: {e}")
 
     def _on_raw_orderbook(self, message, symbol: str, on_orderbook: Optional[OrderbookCallback]) -> None:
-        if not callable(on_orderbook):
-            return
         try:
-            data = None
-            if isinstance(message, dict):
-                data = message.get("data") or message.get("result") or message
-            bids = []
-            asks = []
-            best_bid = None
-            best_ask = None
-            if isinstance(data, dict):
-                b = data.get("b") or data.get("bid") or data.get("bids")
-                a = data.get("a") or data.get("ask") or data.get("asks")
-                if isinstance(b, list):
-                    for row in b:
-                        try:
-                            price = float(row[0]) if isinstance(row, (list, tuple)) else float(row.get("price"))
-                            qty = float(row[1]) if isinstance(row, (list, tuple)) else float(row.get("size"))
-                            bids.append((price, qty))
-                        except Exception:
-                            continue
-                if isinstance(a, list):
-                    for row in a:
-                        try:
-                            price = float(row[0]) if isinstance(row, (list, tuple)) else float(row.get("price"))
-                            qty = float(row[1]) if isinstance(row, (list, tuple)) else float(row.get("size"))
-                            asks.append((price, qty))
-                        except Exception:
-                            continue
-                if bids:
-                    best_bid = bids[0][0]
-                if asks:
-                    best_ask = asks[0][0]
-            if best_bid is not None and best_ask is not None:
-                on_orderbook(symbol, best_bid, best_ask, bids, asks)
+            update = decode_book(message)
+            if update is None:
+                return
+            symbol = update.symbol or symbol
+            book = self.books.apply(symbol, update.type, update.data)
+            # Out-of-sequence books stay silent until the next snapshot resyncs them
+            if book.is_valid and callable(on_orderbook):
+                on_orderbook(symbol, book)
         except Exception as e:
-            self.logger.debug(f"Orderbook parse error for {symbol}: {e}")
+            self.logger.debug(f"Orderbook update error for {symbol}: {e}")
 
     def _on_raw_trade(self, message, symbol: str, on_trade: Optional[TradeCallback]) -> None:
         if not callable(on_trade):
             return
         try:
-            data = None
-            if isinstance(message, dict):
-                data = message.get("data") or message.get("result") or message
-            if isinstance(data, dict):
-                rows = data.get("list") or data.get("data") or []
-                if isinstance(rows, list):
-                    for row in rows:
-                        try:
-                            p = float(row.get("p") or row.get("price"))
-                            v = float(row.get("v") or row.get("size") or row.get("qty") or 0.0)
-                            t = float(row.get("T") or row.get("ts") or 0.0)
-                            side_field = row.get("S") or row.get("side")
-                            side = None
-                            if isinstance(side_field, str):
-                                s = side_field.strip().lower()
-                                if s in {"buy", "sell"}:
-                                    side = s.capitalize()
-                            on_trade(symbol, p, v, t, side)
-                        except Exception:
-                            continue
+            for t in decode_trades(message):
+                on_trade(t.symbol or symbol, t.price, t.qty, t.ts, t.side)
         except Exception as e:
             self.logger.debug(f"Trade parse error for {symbol}: {e}")
 
@@ -320,6 +431,8 @@ class WebSocketHandler:
 
     def stop(self) -> None:
         self._stop_event.set()
+        if self._async is not None:
+            self._async.stop()
         # Best-effort: allow monitor thread to exit
         try:
             if self._monitor_thread and self._monitor_thread.is_alive():
@@ -329,14 +442,335 @@ class WebSocketHandler:
         self._monitor_thread = None
         self._sockets = []
         try:
-            if self._consumer_thread and self._consumer_thread.is_alive():
-                # Allow consumer to see stop_event and exit
+            if any(t.is_alive() for t in self._consumer_threads):
+                # Allow consumers to see stop_event and exit
                 time.sleep(0.2)
         except Exception:
             pass
-        self._consumer_thread = None
+        self._consumer_threads = []
+
+    # ---- Subscription metrics ----
+    def _begin_subscription_round(self, symbols: List[str]) -> None:
+        with self._sub_lock:
+            self._awaiting_first_tick = set(symbols)
+            self._sub_started_at = time.time()
+            self._sub_stats["rounds"] += 1
+            self._sub_stats["symbols"] = len(symbols)
+            self._sub_stats["pending_symbols"] = len(symbols)
+
+    def _finish_subscription_frames(self) -> None:
+        with self._sub_lock:
+            self._sub_stats["frames_sent_seconds"] = round(time.time() - self._sub_started_at, 3)
+        self.logger.info(
+            f"Subscribe frames sent for {int(self._sub_stats['symbols'])} symbols in"
+            f" {self._sub_stats['frames_sent_seconds']:.2f}s ({int(self._sub_stats['frames'])} frames total)"
+        )
+
+    def _mark_symbol_live(self, symbol: str, ts: float) -> None:
+        with self._sub_lock:
+            if symbol not in self._awaiting_first_tick:
+                return
+            self._awaiting_first_tick.discard(symbol)
+            self._sub_stats["pending_symbols"] = len(self._awaiting_first_tick)
+            if self._awaiting_first_tick:
+                return
+            self._sub_stats["time_to_full_subscription"] = round(ts - self._sub_started_at, 3)
+        self.logger.info(
+            f"All {int(self._sub_stats['symbols'])} tickers live"
+            f" {self._sub_stats['time_to_full_subscription']:.2f}s after subscribe start"
+        )
+
+    def get_subscription_stats(self) -> Dict[str, float]:
+        with self._sub_lock:
+            return dict(self._sub_stats)
+
+    def get_tick_stats(self) -> Dict[str, int]:
+        """Ticker mailbox counters summed over workers: pending symbols, coalesced (superseded) and dropped updates."""
+        total: Dict[str, int] = {}
+        for box in self._tick_mailboxes:
+            for k, v in box.stats().items():
+                total[k] = max(total.get(k, 0), v) if k == "max_pending" else total.get(k, 0) + v
+        return total
+
+    def get_worker_stats(self) -> List[Dict[str, object]]:
+        """Per consumer worker: mailbox counters plus queue-depth and callback-latency (ms) histograms."""
+        out: List[Dict[str, object]] = []
+        for i, box in enumerate(self._tick_mailboxes):
+            st: Dict[str, object] = {"worker": i}
+            st.update(box.stats())
+            st["queue_depth"] = self._worker_depth[i].snapshot()
+            st["callback_ms"] = self._worker_latency_ms[i].snapshot()
+            out.append(st)
+        return out
 
     # ---- helpers ----
+    @staticmethod
+    def _chunk(items: List[str], size: int) -> List[List[str]]:
+        size = max(1, int(size))
+        return [items[i:i + size] for i in range(0, len(items), size)]
+
+    @staticmethod
+    def _topic_symbol(message, fallback: str = "") -> str:
+        """Symbol from a v5 topic such as 'tickers.BTCUSDT' or 'orderbook.50.BTCUSDT'."""
+        topic = message.get("topic") if isinstance(message, dict) else None
+        if isinstance(topic, str) and "." in topic:
+            return topic.rsplit(".", 1)[1]
+        return fallback
+
+    def _subscribe_frames(self, idx: int, subscribe: Callable[[object], None], symbols: List[str], label: str) -> None:
+        """subscribe(symbol_or_list) in multi-topic frames; per-topic fallback if a frame is rejected."""
+        for n, batch in enumerate(self._chunk(symbols, self._subscribe_args_per_frame)):
+            if n > 0:
+                time.sleep(self._subscribe_delay_per_frame)
+            try:
+                subscribe(batch)
+                with self._sub_lock:
+                    self._sub_stats["frames"] += 1
+                continue
+            except Exception as e:
+                with self._sub_lock:
+                    self._sub_stats["frame_failures"] += 1
+                self.logger.debug(f"Batched {label} subscribe failed on shard {idx} ({len(batch)} topics): {e}")
+            # e.g. a topic already registered on this socket (pybit rejects the whole frame)
+            for sym in batch:
+                try:
+                    subscribe(sym)
+                    with self._sub_lock:
+                        self._sub_stats["frames"] += 1
+                except Exception as e:
+                    self.logger.debug(f"{label} subscribe failed for {sym} on shard {idx}: {e}")
+                time.sleep(self._subscribe_delay_per_symbol)
+
+    def _subscribe_tickers(
+        self, ws, idx: int, symbols: List[str], on_ticker: Optional[TickerCallback], count_load: bool = True
+    ) -> None:
+        """Subscribe tickers for one shard with multi-topic frames."""
+        if count_load:
+            self._add_shard_load(idx, len(symbols), _EXPECTED_RATES["tickers"] * len(symbols))
+        self._ensure_shard_slots(idx + 1)
+        self._shard_tickers[idx].update(symbols)
+        if ws is None:
+            # Slot whose socket failed to open: _reconnect_shard subscribes these once it reopens
+            return
+
+        def _cb(msg) -> None:
+            self._count_shard_msg(idx)
+            self._on_raw_ticker(msg, self._topic_symbol(msg), on_ticker)
+
+        install_fast_path(ws)
+        self._subscribe_frames(idx, lambda sym: ws.ticker_stream(callback=_cb, symbol=sym), symbols, "ticker")
+
+    def _subscribe_depth_and_trades(
+        self,
+        ws,
+        idx: int,
+        symbols: List[str],
+        on_orderbook: Optional[OrderbookCallback],
+        on_trade: Optional[TradeCallback],
+    ) -> None:
+        """Subscribe 50-level orderbook and public trades for one shard's symbols."""
+        if ws is None:
+            # Placement is kept in _depth_shard; _reconnect_shard subscribes them once the slot reopens
+            return
+
+        def _ob(msg) -> None:
+            self._count_shard_msg(idx)
+            self._on_raw_orderbook(msg, self._topic_symbol(msg), on_orderbook)
+
+        def _tr(msg) -> None:
+            self._count_shard_msg(idx)
+            self._on_raw_trade(msg, self._topic_symbol(msg), on_trade)
+
+        # Raw snapshot/delta frames go straight to _ob; pybit's own book merge is skipped
+        install_fast_path(ws)
+        if on_orderbook:
+            self._subscribe_frames(
+                idx, lambda sym: ws.orderbook_stream(depth=50, symbol=sym, callback=_ob), symbols, "orderbook"
+            )
+        if on_trade:
+            # pybit v5 names it trade_stream; older wrappers used public_trade_stream
+            trade_stream = getattr(ws, "trade_stream", None) or getattr(ws, "public_trade_stream")
+            self._subscribe_frames(idx, lambda sym: trade_stream(symbol=sym, callback=_tr), symbols, "trade")
+
+    def _depth_rate(self, symbol: str, on_orderbook: bool, on_trade: bool) -> float:
+        """Expected orderbook+trade msgs/sec for a symbol, scaled by its observed ticker activity."""
+        base = (_EXPECTED_RATES["orderbook"] if on_orderbook else 0.0) + (_EXPECTED_RATES["publicTrade"] if on_trade else 0.0)
+        counts = self._symbol_msgs
+        if not counts:
+            return base
+        mean = sum(counts.values()) / float(len(counts))
+        if mean <= 0:
+            return base
+        # Busy symbols push more book deltas and trades; clamp so one outlier cannot dominate
+        return base * max(0.5, min(4.0, counts.get(symbol, 0) / mean))
+
+    def _plan_depth_shards(self, symbols: List[str], rates: Dict[str, float]) -> Dict[int, List[str]]:
+        """Greedy least-loaded placement; shards past _max_shard_rate spill onto new sockets."""
+        plan: Dict[int, List[str]] = {}
+        self._ensure_shard_slots(len(self._sockets))
+        heap = [(self._shard_expected[i], i) for i in range(len(self._sockets))]
+        heapq.heapify(heap)
+        next_idx = len(self._sockets)
+        for sym in sorted(symbols, key=lambda x: rates[x], reverse=True):
+            load, idx = heap[0] if heap else (0.0, -1)
+            if idx < 0 or (load > 0 and load + rates[sym] > self._max_shard_rate):
+                idx, load = next_idx, 0.0
+                next_idx += 1
+            else:
+                heapq.heappop(heap)
+            plan.setdefault(idx, []).append(sym)
+            heapq.heappush(heap, (load + rates[sym], idx))
+        return plan
+
+    def _subscribe_depth_balanced(
+        self,
+        symbols: List[str],
+        on_orderbook: Optional[OrderbookCallback],
+        on_trade: Optional[TradeCallback],
+        resubscribe: bool = False,
+    ) -> None:
+        if not (on_orderbook or on_trade) or not symbols:
+            return
+        if not self._sockets:
+            self._sockets = [WebSocket(testnet=self.testnet, channel_type="spot")]
+        plan: Dict[int, List[str]] = {}
+        fresh: List[str] = []
+        for sym in symbols:
+            idx = self._depth_shard.get(sym)
+            # Keep an existing placement so a repeated subscribe hits the socket that owns the topic
+            if idx is not None and idx < len(self._sockets):
+                if resubscribe:
+                    plan.setdefault(idx, []).append(sym)
+            else:
+                fresh.append(sym)
+        if fresh:
+            rates = {sym: self._depth_rate(sym, bool(on_orderbook), bool(on_trade)) for sym in fresh}
+            for idx, syms in self._plan_depth_shards(fresh, rates).items():
+                plan.setdefault(idx, []).extend(syms)
+                for sym in syms:
+                    self._depth_shard[sym] = idx
+                self._ensure_shard_slots(idx + 1)
+                self._add_shard_load(idx, 0, sum(rates[sym] for sym in syms))
+        # Open spill-over sockets (in parallel) before subscribing
+        missing = max(plan) + 1 - len(self._sockets) if plan else 0
+        if missing > 0:
+            extra: List[Optional[object]] = [None] * missing
+
+            def _open(i: int, _chunk: List[str]) -> None:
+                extra[i] = WebSocket(testnet=False, channel_type="spot")
+
+            self._run_per_shard(_open, [[] for _ in range(missing)])
+            self._sockets.extend(extra)
+        sockets = list(self._sockets)
+        chunks = [plan.get(i, []) for i in range(len(sockets))]
+        self._run_per_shard(
+            lambda idx, chunk: self._subscribe_depth_and_trades(sockets[idx], idx, chunk, on_orderbook, on_trade)
+            if chunk
+            else None,
+            chunks,
+        )
+
+    # ---- Shard load counters ----
+    def _ensure_shard_slots(self, n: int) -> None:
+        while len(self._shard_msgs) < n:
+            self._shard_msgs.append(0)
+            self._shard_topics.append(0)
+            self._shard_expected.append(0.0)
+            self._shard_last_msg.append(time.time())
+            self._shard_tickers.append(set())
+            self._shard_reconnects.append(0)
+            self._shard_failures.append(0)
+            self._shard_retry_at.append(0.0)
+            self._shard_msgs_at_reconnect.append(0)
+
+    def _add_shard_load(self, idx: int, topics: int, expected_rate: float) -> None:
+        self._ensure_shard_slots(idx + 1)
+        self._shard_topics[idx] += topics
+        self._shard_expected[idx] += expected_rate
+
+    def _count_shard_msg(self, idx: int) -> None:
+        msgs = self._shard_msgs
+        # Sockets dropped by a rebuild may still deliver a few messages
+        if idx < len(msgs):
+            msgs[idx] += 1
+            self._shard_last_msg[idx] = time.time()
+
+    def _reset_shard_counters(self) -> None:
+        self._shard_msgs = []
+        self._shard_topics = []
+        self._shard_expected = []
+        self._depth_shard = {}
+        self._shard_rate_snapshot = (time.time(), [])
+        self._shard_last_msg = []
+        self._shard_tickers = []
+        self._shard_reconnects = []
+        self._shard_failures = []
+        self._shard_retry_at = []
+        self._shard_msgs_at_reconnect = []
+
+    def get_shard_stats(self) -> List[Dict[str, float]]:
+        """Per-shard topics, expected and observed msgs/sec (observed since the previous call)."""
+        now = time.time()
+        counts = list(self._shard_msgs)
+        prev_ts, prev_counts = self._shard_rate_snapshot
+        self._shard_rate_snapshot = (now, counts)
+        elapsed = max(1e-6, now - prev_ts)
+        out: List[Dict[str, float]] = []
+        for i, n in enumerate(counts):
+            before = prev_counts[i] if i < len(prev_counts) else 0
+            out.append(
+                {
+                    "shard": i,
+                    "topics": self._shard_topics[i],
+                    "expected_rate": round(self._shard_expected[i], 1),
+                    "messages": n,
+                    "msgs_per_sec": round((n - before) / elapsed, 2),
+                    "idle_seconds": round(now - self._shard_last_msg[i], 1),
+                    "reconnects": self._shard_reconnects[i],
+                }
+            )
+        return out
+
+    def _log_shard_rates(self) -> None:
+        self._last_shard_log_ts = time.time()
+        stats = self.get_shard_stats()
+        if not stats:
+            return
+        busiest = max(stats, key=lambda st: st["msgs_per_sec"])
+        total = sum(st["msgs_per_sec"] for st in stats)
+        self.logger.info(
+            f"WS shards: {len(stats)} sockets, {total:.1f} msg/s total; busiest #{busiest['shard']}"
+            f" {busiest['msgs_per_sec']:.1f} msg/s ({busiest['topics']} topics, expected {busiest['expected_rate']:.0f})"
+        )
+        ticks = self.get_tick_stats()
+        self.logger.info(
+            f"WS ticks: {ticks['delivered']} delivered, {ticks['coalesced']} coalesced, {ticks['dropped']} dropped,"
+            f" {ticks['pending']} pending (max {ticks['max_pending']})"
+        )
+        if self._tick_workers > 1:
+            workers = self.get_worker_stats()
+            slowest = max(workers, key=lambda w: w["callback_ms"]["p99"] or 0.0)
+            self.logger.info(
+                f"WS tick workers: {len(workers)}; slowest #{slowest['worker']} callback p99<={slowest['callback_ms']['p99']}ms"
+                f" max {slowest['callback_ms']['max']:.1f}ms, depth p99<={slowest['queue_depth']['p99']}"
+            )
+
+    def _run_per_shard(self, work: Callable[[int, List[str]], None], chunks: List[List[str]]) -> None:
+        """Run work(idx, chunk) for every shard, up to _max_parallel_shards at a time."""
+        if not chunks:
+            return
+
+        def _safe(idx: int, chunk: List[str]) -> None:
+            try:
+                work(idx, chunk)
+            except Exception as e:
+                self.logger.error(f"Shard {idx} subscribe failed: {e}")
+
+        workers = max(1, min(self._max_parallel_shards, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="WSSubscribe") as pool:
+            for idx, chunk in enumerate(chunks):
+                pool.submit(_safe, idx, chunk)
+
     def _create_sharded_sockets_and_subscribe(self, symbols: List[str], on_ticker: Optional[TickerCallback]) -> None:
         if WebSocket is None:
             raise RuntimeError("WebSocket API not available")
@@ -345,30 +779,23 @@ class WebSocketHandler:
         if not symbols:
             self._sockets = [WebSocket(testnet=False, channel_type="spot")]
             return
-        # Chunk symbols
-        chunks: List[List[str]] = []
-        batch: List[str] = []
-        for s in symbols:
-            batch.append(s)
-            if len(batch) >= self._shard_size:
-                chunks.append(batch)
-                batch = []
-        if batch:
-            chunks.append(batch)
-        # Create sockets and subscribe per chunk (staggered and throttled)
-        for idx, chunk in enumerate(chunks):
+        chunks = self._chunk(list(symbols), self._shard_size)
+        self._begin_subscription_round(list(symbols))
+        self._reset_shard_counters()
+        self._ensure_shard_slots(len(chunks))
+        opened: List[Optional[object]] = [None] * len(chunks)
+
+        def _open_and_subscribe(idx: int, chunk: List[str]) -> None:
+            # Claim the shard's tickers first, so a failed open leaves them for _reconnect_shard
+            self._subscribe_tickers(None, idx, chunk, on_ticker)
             ws = WebSocket(testnet=False, channel_type="spot")
-            self._sockets.append(ws)
-            # Small gap before starting a new shard to avoid simultaneous spikes
-            if idx > 0:
-                time.sleep(self._subscribe_delay_between_shards)
-            for sym in chunk:
-                try:
-                    ws.ticker_stream(callback=(lambda msg, s=sym: self._on_raw_ticker(msg, s, on_ticker)), symbol=sym)
-                except Exception as e:
-                    self.logger.error(f"Subscribe failed for {sym} on shard {idx}: {e}")
-                # Respect rate limits: throttle per-symbol subscription messages
-                time.sleep(self._subscribe_delay_per_symbol)
+            opened[idx] = ws
+            self._subscribe_tickers(ws, idx, chunk, on_ticker, count_load=False)
+
+        # Shards connect and subscribe in parallel instead of one after another
+        self._run_per_shard(_open_and_subscribe, chunks)
+        self._sockets = opened
+        self._finish_subscription_frames()
 
     def _resubscribe_across_existing_sockets(
         self,
@@ -383,44 +810,27 @@ class WebSocketHandler:
         if not self._sockets:
             self._sockets = [WebSocket(testnet=self.testnet, channel_type="spot")]
         # Split symbols into chunks targeting existing sockets
-        chunks: List[List[str]] = []
-        batch: List[str] = []
-        for s in symbols:
-            batch.append(s)
-            if len(batch) >= self._shard_size:
-                chunks.append(batch)
-                batch = []
-        if batch:
-            chunks.append(batch)
+        chunks = self._chunk(list(symbols), self._shard_size)
+        self._begin_subscription_round(list(symbols))
         # Create more sockets if needed
-        while len(self._sockets) < len(chunks):
-            self._sockets.append(WebSocket(testnet=False, channel_type="spot"))
-            time.sleep(self._subscribe_delay_between_shards)
-        # Subscribe tickers per socket chunk
-        for idx, chunk in enumerate(chunks):
-            ws = self._sockets[idx]
-            for sym in chunk:
-                try:
-                    ws.ticker_stream(callback=(lambda msg, s=sym: self._on_raw_ticker(msg, s, on_ticker)), symbol=sym)
-                except Exception as e:
-                    self.logger.debug(f"Resubscribe failed for {sym} on shard {idx}: {e}")
-                time.sleep(self._subscribe_delay_per_symbol)
-        # Re-subscribe OB/trades on shard #0 if handlers present
+        missing = len(chunks) - len(self._sockets)
+        if missing > 0:
+            extra: List[Optional[object]] = [None] * missing
+
+            def _open(i: int, _chunk: List[str]) -> None:
+                extra[i] = WebSocket(testnet=False, channel_type="spot")
+
+            self._run_per_shard(_open, [[] for _ in range(missing)])
+            self._sockets.extend(extra)
+        # Subscribe tickers per socket chunk, shards in parallel
+        sockets = list(self._sockets)
+        self._run_per_shard(
+            lambda idx, chunk: self._subscribe_tickers(
+                sockets[idx % len(sockets)], idx % len(sockets), chunk, on_ticker, count_load=False
+            ),
+            chunks,
+        )
+        self._finish_subscription_frames()
+        # Re-subscribe OB/trades on the shards that own them (new symbols are balanced by rate)
         if on_orderbook or on_trade:
-            ws0 = self._sockets[0]
-            for sym in symbols:
-                if on_orderbook:
-                    try:
-                        ws0.orderbook_stream(callback=(lambda msg, s=sym: self._on_raw_orderbook(msg, s, on_orderbook)), symbol=sym, depth=50)  # type: ignore[attr-defined]
-                    except Exception:
-                        try:
-                            ws0.orderbook_50_stream(callback=(lambda msg, s=sym: self._on_raw_orderbook(msg, s, on_orderbook)), symbol=sym)  # type: ignore[attr-defined]
-                        except Exception:
-                            pass
-                    time.sleep(self._subscribe_delay_per_symbol)
-                if on_trade:
-                    try:
-                        ws0.public_trade_stream(callback=(lambda msg, s=sym: self._on_raw_trade(msg, s, on_trade)), symbol=sym)  # type: ignore[attr-defined]
-                    except Exception:
-                        pass
-                    time.sleep(self._subscribe_delay_per_symbol)
\ No newline at end of file
+            self._subscribe_depth_balanced(list(symbols), on_orderbook, on_trade, resubscribe=True)
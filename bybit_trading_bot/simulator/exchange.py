@@ -0,0 +1,676 @@
+from __future__ import annotations
+
+import itertools
+import math
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from bybit_trading_bot.utils.logger import get_logger
+
+
+PrivateListener = Callable[[str, List[Dict[str, Any]]], None]
+
+# v5 error codes the bot looks at
+OK = 0
+PARAMS_ERROR = 10001
+TOO_MANY_VISITS = 10006
+ORDER_NOT_FOUND = 110001
+INSUFFICIENT_BALANCE_LINEAR = 110007
+INSUFFICIENT_BALANCE_SPOT = 170131
+
+_MINUTE_MS = 60_000
+_KLINE_MINUTES = {"1": 1, "3": 3, "5": 5, "15": 15, "30": 30, "60": 60, "120": 120, "240": 240, "D": 1440}
+_OI_MINUTES = {"5min": 5, "15min": 15, "30min": 30, "1h": 60, "4h": 240, "1d": 1440}
+_BASE_NAMES = ("BTC", "ETH", "SOL", "XRP", "DOGE", "ADA", "AVAX", "LINK", "DOT", "LTC")
+
+
+def _fmt(x: float) -> str:
+    return f"{x:.10g}"
+
+
+def default_symbols(n: int) -> List[str]:
+    """First the usual majors, then SYM{i}USDT fillers."""
+    names = [f"{b}USDT" for b in _BASE_NAMES[:n]]
+    names.extend(f"SYM{i}USDT" for i in range(len(names), n))
+    return names
+
+
+class PriceSource:
+    """Synthetic trades: geometric random walk per symbol (seeded, reproducible)."""
+
+    def __init__(self, seed: Optional[int] = None, volatility: float = 0.0008) -> None:
+        self._rng = random.Random(seed)
+        self.volatility = volatility
+
+    def start_price(self, symbol: str) -> float:
+        return round(10 ** self._rng.uniform(-2.0, 4.5), 6)
+
+    def next_trade(self, symbol: str, price: float) -> Tuple[float, float, str]:
+        """(price, qty, side) of the next trade after `price`."""
+        move = self._rng.gauss(0.0, self.volatility)
+        new_price = max(price * math.exp(move), 1e-8)
+        qty = self._rng.expovariate(1.0) * 1000.0 / new_price
+        return new_price, qty, "Buy" if move >= 0 else "Sell"
+
+
+class ArchiveSource(PriceSource):
+    """Replays trades recorded by the tick archive (utils/tick_archive.py), looping per symbol.
+
+    Symbols without recorded trades fall back to the synthetic walk.
+    """
+
+    def __init__(self, root: str, day: Optional[str] = None, seed: Optional[int] = None) -> None:
+        super().__init__(seed)
+        from bybit_trading_bot.utils.tick_archive import TickArchive
+
+        self.archive = TickArchive(root)
+        self.day = day
+        self._records: Dict[str, np.ndarray] = {}
+        self._pos: Dict[str, int] = {}
+
+    def symbols(self) -> List[str]:
+        return self.archive.symbols()
+
+    def _recs(self, symbol: str) -> np.ndarray:
+        recs = self._records.get(symbol)
+        if recs is None:
+            days = self.archive.days(symbol)
+            day = self.day if self.day in days else (days[-1] if days else None)
+            recs = self.archive.read_day(symbol, day) if day else np.empty(0)
+            self._records[symbol] = recs
+            self._pos[symbol] = 0
+        return recs
+
+    def start_price(self, symbol: str) -> float:
+        recs = self._recs(symbol)
+        return float(recs["price"][0]) if len(recs) else super().start_price(symbol)
+
+    def next_trade(self, symbol: str, price: float) -> Tuple[float, float, str]:
+        recs = self._recs(symbol)
+        if not len(recs):
+            return super().next_trade(symbol, price)
+        i = self._pos[symbol]
+        self._pos[symbol] = (i + 1) % len(recs)
+        rec = recs[i]
+        side = int(rec["side"])
+        return float(rec["price"]), float(rec["qty"]), "Sell" if side < 0 else "Buy"
+
+
+class _Market:
+    """Per-symbol market state: last trade, 24h stats, open interest and 1m bars."""
+
+    def __init__(self, symbol: str, price: float, history_minutes: int, rng: random.Random) -> None:
+        self.symbol = symbol
+        self.price = price
+        exp = math.floor(math.log10(price))
+        self.tick = 10.0 ** (exp - 4)
+        self.qty_step = 10.0 ** min(0, -(exp - 1))
+        self.oi = 1_000_000.0 / price
+        self.trade_id = 0
+        self.book_u = 1
+        self.book: Optional[Tuple[Dict[float, float], Dict[float, float]]] = None
+        self.bars: Deque[List[float]] = deque(maxlen=max(history_minutes, 1) + 1)
+        self._backfill(history_minutes, rng)
+        self._roll()
+
+    def _backfill(self, minutes: int, rng: random.Random) -> None:
+        """Random-walk 1m bars ending at the start price so klines/OI have history from the first request."""
+        now_min = int(time.time() * 1000) // _MINUTE_MS * _MINUTE_MS
+        closes = [self.price]
+        for _ in range(minutes):
+            closes.append(closes[-1] * math.exp(rng.gauss(0.0, 0.002)))
+        closes.reverse()
+        oi = self.oi
+        for i, c in enumerate(closes[:-1]):
+            o = c
+            cl = closes[i + 1]
+            vol = rng.expovariate(1.0) * 50_000.0 / c
+            self.bars.append([now_min - (minutes - i) * _MINUTE_MS, o, max(o, cl), min(o, cl), cl, vol, vol * c, oi])
+        self.bars.append([now_min, self.price, self.price, self.price, self.price, 0.0, 0.0, oi])
+
+    def on_trade(self, ts_ms: int, price: float, qty: float, oi_drift: float) -> None:
+        self.price = price
+        self.trade_id += 1
+        self.oi = max(self.oi * (1.0 + oi_drift), 0.0)
+        start = ts_ms // _MINUTE_MS * _MINUTE_MS
+        bar = self.bars[-1]
+        if start > bar[0]:
+            bar = [start, price, price, price, price, 0.0, 0.0, self.oi]
+            self.bars.append(bar)
+            self._roll()
+        bar[2] = max(bar[2], price)
+        bar[3] = min(bar[3], price)
+        bar[4] = price
+        bar[5] += qty
+        bar[6] += qty * price
+        bar[7] = self.oi
+
+    def bid_ask(self) -> Tuple[float, float]:
+        return self.price - self.tick, self.price + self.tick
+
+    def _roll(self) -> None:
+        """Re-aggregate the closed bars once per minute so stats24() only folds in the live bar."""
+        closed = list(self.bars)[:-1] or list(self.bars)
+        self.prev24 = closed[0][1]
+        self._closed = (
+            max(b[2] for b in closed), min(b[3] for b in closed), sum(b[5] for b in closed), sum(b[6] for b in closed)
+        )
+
+    def stats24(self) -> Tuple[float, float, float, float]:
+        """(high, low, volume, turnover) over the retained bars (24h by default)."""
+        high, low, vol, turnover = self._closed
+        bar = self.bars[-1]
+        return max(high, bar[2]), min(low, bar[3]), vol + bar[5], turnover + bar[6]
+
+    def ladder(self, depth: int) -> Tuple[Dict[float, float], Dict[float, float]]:
+        """Synthetic book: `depth` levels each side on the tick grid, thinner near the touch."""
+        bid, ask = self.bid_ask()
+        base = 500.0 / self.price
+        bids = {round(bid - k * self.tick, 12): round(base * (k + 1), 8) for k in range(depth)}
+        asks = {round(ask + k * self.tick, 12): round(base * (k + 1), 8) for k in range(depth)}
+        return bids, asks
+
+
+class SimExchange:
+    """Bybit v5 stand-in for offline runs: market state, order matching and one unified account.
+
+    - Every public trade (on_trade) moves the last price, fills crossing limit orders and
+      triggers TP/SL (spot conditional orders, linear position trading stops)
+    - Market orders fill at the touch; marketable limits fill at their limit price
+    - Spot keeps coin balances; linear keeps one-way positions with realised PnL in USDT
+    - Private updates (order/execution/position/wallet rows) go to the registered listeners
+    All methods are thread-safe; REST handlers and the feed call in from different threads.
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        source: Optional[PriceSource] = None,
+        quote_balance: float = 100_000.0,
+        fee_rate: float = 0.001,
+        history_minutes: int = 1440,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.logger = get_logger(self.__class__.__name__)
+        self.source = source or PriceSource(seed)
+        self.fee_rate = fee_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+        self.markets: Dict[str, _Market] = {
+            s: _Market(s, self.source.start_price(s), history_minutes, self._rng) for s in symbols
+        }
+        self._orders: Dict[str, Dict[str, Any]] = {}
+        self._open: Dict[str, Dict[str, Any]] = {}
+        self._conditional: Dict[str, Dict[str, Any]] = {}
+        self._positions: Dict[str, Dict[str, Any]] = {}
+        self._leverage: Dict[str, float] = {}
+        self.balances: Dict[str, float] = {"USDT": float(quote_balance)}
+        self._ids = itertools.count(1)
+        self._listeners: List[PrivateListener] = []
+        self.counts: Dict[str, int] = {"trades": 0, "orders": 0, "fills": 0, "cancels": 0, "rejects": 0}
+
+    def add_private_listener(self, callback: PrivateListener) -> None:
+        self._listeners.append(callback)
+
+    def _emit(self, topic: str, rows: List[Dict[str, Any]]) -> None:
+        for cb in self._listeners:
+            try:
+                cb(topic, rows)
+            except Exception as e:
+                self.logger.debug(f"private listener error: {e}")
+
+    # ---- market data ----
+    def step(self, symbol: str, ts_ms: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Advance `symbol` by one trade from the price source; returns the trade row."""
+        m = self.markets.get(symbol)
+        if m is None:
+            return None
+        price, qty, side = self.source.next_trade(symbol, m.price)
+        return self.on_trade(symbol, price, qty, side, ts_ms)
+
+    def on_trade(self, symbol: str, price: float, qty: float, side: str, ts_ms: Optional[int] = None) -> Dict[str, Any]:
+        ts_ms = int(ts_ms or time.time() * 1000)
+        with self._lock:
+            m = self.markets[symbol]
+            m.on_trade(ts_ms, price, qty, self._rng.gauss(0.0, 0.0005))
+            self.counts["trades"] += 1
+            self._match(m, ts_ms)
+            return {"i": str(m.trade_id), "T": ts_ms, "p": _fmt(price), "v": _fmt(qty), "S": side, "s": symbol, "BT": False}
+
+    def ticker_row(self, symbol: str, category: str = "spot") -> Dict[str, Any]:
+        with self._lock:
+            m = self.markets[symbol]
+            high, low, vol, turnover = m.stats24()
+            bid, ask = m.bid_ask()
+            row = {
+                "symbol": symbol,
+                "lastPrice": _fmt(m.price),
+                "bid1Price": _fmt(bid),
+                "ask1Price": _fmt(ask),
+                "prevPrice24h": _fmt(m.prev24),
+                "price24hPcnt": _fmt(m.price / m.prev24 - 1.0),
+                "highPrice24h": _fmt(high),
+                "lowPrice24h": _fmt(low),
+                "volume24h": _fmt(vol),
+                "turnover24h": _fmt(turnover),
+            }
+            if category == "linear":
+                row.update({
+                    "markPrice": _fmt(m.price),
+                    "indexPrice": _fmt(m.price),
+                    "openInterest": _fmt(m.oi),
+                    "openInterestValue": _fmt(m.oi * m.price),
+                    "fundingRate": "0.0001",
+                })
+            return row
+
+    def book_update(self, symbol: str, depth: int = 50) -> Tuple[int, List[List[str]], List[List[str]]]:
+        """Next book delta as (u, bids, asks); removed levels carry size '0'."""
+        with self._lock:
+            m = self.markets[symbol]
+            new_bids, new_asks = m.ladder(depth)
+            old_bids, old_asks = m.book or ({}, {})
+            m.book = (new_bids, new_asks)
+            m.book_u += 1
+            return m.book_u, _diff(old_bids, new_bids), _diff(old_asks, new_asks)
+
+    def book_snapshot(self, symbol: str, depth: int = 50) -> Tuple[int, List[List[str]], List[List[str]]]:
+        with self._lock:
+            m = self.markets[symbol]
+            if m.book is None:
+                m.book = m.ladder(depth)
+            bids, asks = m.book
+            return (
+                m.book_u,
+                [[_fmt(p), _fmt(q)] for p, q in sorted(bids.items(), reverse=True)[:depth]],
+                [[_fmt(p), _fmt(q)] for p, q in sorted(asks.items())[:depth]],
+            )
+
+    def klines(self, symbol: str, interval: str = "1", limit: int = 200) -> List[List[float]]:
+        """Bars [start_ms, o, h, l, c, volume, turnover, oi], oldest first, aggregated from 1m bars."""
+        step = _KLINE_MINUTES.get(str(interval), 1) * _MINUTE_MS
+        with self._lock:
+            bars = list(self.markets[symbol].bars)
+        out: List[List[float]] = []
+        for b in bars:
+            start = b[0] // step * step
+            if out and out[-1][0] == start:
+                cur = out[-1]
+                cur[2] = max(cur[2], b[2])
+                cur[3] = min(cur[3], b[3])
+                cur[4] = b[4]
+                cur[5] += b[5]
+                cur[6] += b[6]
+                cur[7] = b[7]
+            else:
+                out.append([start] + list(b[1:]))
+        return out[-max(1, int(limit)):]
+
+    # ---- REST: market ----
+    def get_tickers(self, category: str = "spot", symbol: Optional[str] = None, **_: Any) -> Tuple[int, str, Dict]:
+        names = [symbol] if symbol else list(self.markets)
+        if symbol and symbol not in self.markets:
+            return PARAMS_ERROR, "Not supported symbols", {}
+        return OK, "OK", {"category": category, "list": [self.ticker_row(s, category) for s in names]}
+
+    def get_instruments_info(self, category: str = "spot", symbol: Optional[str] = None, **_: Any) -> Tuple[int, str, Dict]:
+        names = [symbol] if symbol else list(self.markets)
+        rows = []
+        for s in names:
+            m = self.markets.get(s)
+            if m is None:
+                continue
+            lot = {"minOrderQty": _fmt(m.qty_step), "maxOrderQty": "1000000000", "minOrderAmt": "1", "maxOrderAmt": "2000000"}
+            if category == "spot":
+                lot["basePrecision"] = _fmt(m.qty_step)
+                lot["quotePrecision"] = "0.0001"
+            else:
+                lot["qtyStep"] = _fmt(m.qty_step)
+            rows.append({
+                "symbol": s,
+                "status": "Trading",
+                "baseCoin": s[:-4],
+                "quoteCoin": "USDT",
+                "lotSizeFilter": lot,
+                "priceFilter": {"tickSize": _fmt(m.tick)},
+            })
+        return OK, "OK", {"category": category, "list": rows, "nextPageCursor": ""}
+
+    def get_orderbook(self, category: str = "spot", symbol: str = "", limit: Any = 50, **_: Any) -> Tuple[int, str, Dict]:
+        if symbol not in self.markets:
+            return PARAMS_ERROR, "Not supported symbols", {}
+        u, bids, asks = self.book_snapshot(symbol, int(limit))
+        return OK, "OK", {"s": symbol, "b": bids, "a": asks, "u": u, "ts": int(time.time() * 1000)}
+
+    def get_kline(self, category: str = "spot", symbol: str = "", interval: str = "1", limit: Any = 200, **_: Any) -> Tuple[int, str, Dict]:
+        if symbol not in self.markets:
+            return PARAMS_ERROR, "Not supported symbols", {}
+        bars = self.klines(symbol, interval, int(limit))
+        rows = [[str(int(b[0])), _fmt(b[1]), _fmt(b[2]), _fmt(b[3]), _fmt(b[4]), _fmt(b[5]), _fmt(b[6])] for b in reversed(bars)]
+        return OK, "OK", {"category": category, "symbol": symbol, "list": rows}
+
+    def get_open_interest(self, category: str = "linear", symbol: str = "", intervalTime: str = "5min", limit: Any = 50, **_: Any) -> Tuple[int, str, Dict]:
+        if symbol not in self.markets:
+            return PARAMS_ERROR, "Not supported symbols", {}
+        minutes = _OI_MINUTES.get(str(intervalTime), 5)
+        bars = self.klines(symbol, "1", len(self.markets[symbol].bars))
+        step = minutes * _MINUTE_MS
+        points: Dict[int, float] = {}
+        for b in bars:
+            points[int(b[0]) // step * step] = b[7]
+        rows = [{"openInterest": _fmt(oi), "timestamp": str(ts)} for ts, oi in sorted(points.items(), reverse=True)]
+        return OK, "OK", {"category": category, "symbol": symbol, "list": rows[: max(1, int(limit))], "nextPageCursor": ""}
+
+    # ---- REST: trading ----
+    def place_order(self, **p: Any) -> Tuple[int, str, Dict]:
+        category = str(p.get("category") or "spot")
+        symbol = str(p.get("symbol") or "")
+        side = str(p.get("side") or "")
+        order_type = str(p.get("orderType") or "")
+        m = self.markets.get(symbol)
+        try:
+            qty = float(p.get("qty") or 0.0)
+            price = float(p.get("price") or 0.0)
+        except (TypeError, ValueError):
+            return self._reject("qty/price invalid")
+        if m is None or side not in ("Buy", "Sell") or order_type not in ("Market", "Limit") or qty <= 0:
+            return self._reject("params error")
+        if order_type == "Limit" and price <= 0:
+            return self._reject("price invalid")
+        now = int(time.time() * 1000)
+        with self._lock:
+            if category == "spot" and order_type == "Market" and side == "Buy" and p.get("marketUnit", "quoteCoin") == "quoteCoin":
+                qty = qty / m.bid_ask()[1]
+            code = self._check_balance(category, m, side, qty, price or m.price, _truthy(p.get("reduceOnly")))
+            if code:
+                self.counts["rejects"] += 1
+                return code, "Insufficient balance.", {}
+            order = {
+                "orderId": f"sim-{next(self._ids)}",
+                "orderLinkId": str(p.get("orderLinkId") or ""),
+                "category": category,
+                "symbol": symbol,
+                "side": side,
+                "orderType": order_type,
+                "price": _fmt(price) if order_type == "Limit" else "0",
+                "qty": _fmt(qty),
+                "timeInForce": str(p.get("timeInForce") or ("IOC" if order_type == "Market" else "GTC")),
+                "reduceOnly": _truthy(p.get("reduceOnly")),
+                "takeProfit": str(p.get("takeProfit") or ""),
+                "stopLoss": str(p.get("stopLoss") or ""),
+                "triggerPrice": "",
+                "orderStatus": "New",
+                "cumExecQty": "0",
+                "cumExecValue": "0",
+                "cumExecFee": "0",
+                "avgPrice": "",
+                "leavesQty": _fmt(qty),
+                "createdTime": str(now),
+                "updatedTime": str(now),
+            }
+            self._orders[order["orderId"]] = order
+            self.counts["orders"] += 1
+            bid, ask = m.bid_ask()
+            if order_type == "Market":
+                self._fill(order, ask if side == "Buy" else bid, now)
+            elif (side == "Buy" and price >= ask) or (side == "Sell" and price <= bid):
+                self._fill(order, price, now)
+            else:
+                self._open[order["orderId"]] = order
+                self._emit("order", [dict(order)])
+            return OK, "OK", {"orderId": order["orderId"], "orderLinkId": order["orderLinkId"]}
+
+    def cancel_order(self, category: str = "spot", symbol: str = "", orderId: str = "", orderLinkId: str = "", **_: Any) -> Tuple[int, str, Dict]:
+        with self._lock:
+            order = None
+            for book in (self._open, self._conditional):
+                for o in book.values():
+                    if (orderId and o["orderId"] == orderId) or (orderLinkId and o["orderLinkId"] == orderLinkId):
+                        order = o
+                        break
+                if order is not None:
+                    break
+            if order is None:
+                return ORDER_NOT_FOUND, "Order does not exist.", {}
+            self._open.pop(order["orderId"], None)
+            self._conditional.pop(order["orderId"], None)
+            order["orderStatus"] = "Deactivated" if order.get("triggerPrice") else "Cancelled"
+            order["updatedTime"] = str(int(time.time() * 1000))
+            self.counts["cancels"] += 1
+            self._emit("order", [dict(order)])
+            return OK, "OK", {"orderId": order["orderId"], "orderLinkId": order["orderLinkId"]}
+
+    def get_open_orders(self, category: str = "spot", symbol: Optional[str] = None, orderId: Optional[str] = None, **_: Any) -> Tuple[int, str, Dict]:
+        with self._lock:
+            rows = [
+                dict(o)
+                for o in list(self._open.values()) + list(self._conditional.values())
+                if o["category"] == category and (not symbol or o["symbol"] == symbol) and (not orderId or o["orderId"] == orderId)
+            ]
+        rows.sort(key=lambda o: int(o["createdTime"]), reverse=True)
+        return OK, "OK", {"category": category, "list": rows, "nextPageCursor": ""}
+
+    def get_order_history(self, category: str = "spot", symbol: Optional[str] = None, orderId: Optional[str] = None, limit: Any = 20, **_: Any) -> Tuple[int, str, Dict]:
+        with self._lock:
+            if orderId:
+                rows = [dict(self._orders[orderId])] if orderId in self._orders else []
+            else:
+                rows = [dict(o) for o in self._orders.values() if o["category"] == category and (not symbol or o["symbol"] == symbol)]
+        rows.sort(key=lambda o: int(o["updatedTime"]), reverse=True)
+        return OK, "OK", {"category": category, "list": rows[: max(1, int(limit))], "nextPageCursor": ""}
+
+    def get_positions(self, category: str = "linear", symbol: Optional[str] = None, **_: Any) -> Tuple[int, str, Dict]:
+        with self._lock:
+            names = [symbol] if symbol else list(self._positions)
+            rows = [self._position_row(s) for s in names if s in self.markets]
+        return OK, "OK", {"category": category, "list": rows, "nextPageCursor": ""}
+
+    def set_leverage(self, category: str = "linear", symbol: str = "", buyLeverage: Any = 1, **_: Any) -> Tuple[int, str, Dict]:
+        with self._lock:
+            self._leverage[symbol] = float(buyLeverage)
+        return OK, "OK", {}
+
+    def set_trading_stop(self, category: str = "linear", symbol: str = "", takeProfit: Any = None, stopLoss: Any = None, **_: Any) -> Tuple[int, str, Dict]:
+        with self._lock:
+            pos = self._positions.get(symbol)
+            if pos is None or pos["size"] == 0:
+                return PARAMS_ERROR, "can not set tp/sl/ts for zero position", {}
+            if takeProfit is not None:
+                pos["takeProfit"] = float(takeProfit or 0.0)
+            if stopLoss is not None:
+                pos["stopLoss"] = float(stopLoss or 0.0)
+            self._emit("position", [self._position_row(symbol)])
+        return OK, "OK", {}
+
+    def get_wallet_balance(self, accountType: str = "UNIFIED", **_: Any) -> Tuple[int, str, Dict]:
+        with self._lock:
+            return OK, "OK", {"list": [self._wallet_row(accountType)]}
+
+    # ---- matching ----
+    def _match(self, m: _Market, ts_ms: int) -> None:
+        price = m.price
+        for order in [o for o in self._open.values() if o["symbol"] == m.symbol]:
+            limit = float(order["price"])
+            if (order["side"] == "Buy" and price <= limit) or (order["side"] == "Sell" and price >= limit):
+                self._open.pop(order["orderId"], None)
+                self._fill(order, limit, ts_ms)
+        for order in [o for o in self._conditional.values() if o["symbol"] == m.symbol]:
+            trigger = float(order["triggerPrice"])
+            rising = order["triggerDirection"] == 1
+            if (rising and price >= trigger) or (not rising and price <= trigger):
+                self._trigger(order, m, ts_ms)
+        pos = self._positions.get(m.symbol)
+        if pos is not None and pos["size"] != 0:
+            long = pos["size"] > 0
+            tp, sl = pos.get("takeProfit") or 0.0, pos.get("stopLoss") or 0.0
+            hit_tp = tp > 0 and (price >= tp if long else price <= tp)
+            hit_sl = sl > 0 and (price <= sl if long else price >= sl)
+            if hit_tp or hit_sl:
+                self.place_order(
+                    category="linear", symbol=m.symbol, side="Sell" if long else "Buy", orderType="Market",
+                    qty=_fmt(abs(pos["size"])), reduceOnly=True,
+                )
+
+    def _trigger(self, order: Dict[str, Any], m: _Market, ts_ms: int) -> None:
+        self._conditional.pop(order["orderId"], None)
+        sibling = self._conditional.pop(order.get("ocoWith", ""), None)
+        if sibling is not None:
+            sibling["orderStatus"] = "Deactivated"
+            sibling["updatedTime"] = str(ts_ms)
+            self._emit("order", [dict(sibling)])
+        order["orderStatus"] = "Triggered"
+        bid, ask = m.bid_ask()
+        self._fill(order, ask if order["side"] == "Buy" else bid, ts_ms)
+
+    def _fill(self, order: Dict[str, Any], price: float, ts_ms: int) -> None:
+        qty = float(order["qty"])
+        if order["category"] == "linear" and order["reduceOnly"]:
+            pos = self._positions.get(order["symbol"])
+            qty = min(qty, abs(pos["size"])) if pos else 0.0
+            if qty <= 0:
+                order.update(orderStatus="Cancelled", updatedTime=str(ts_ms))
+                self._emit("order", [dict(order)])
+                return
+        value = qty * price
+        fee = value * self.fee_rate
+        order.update(
+            orderStatus="Filled", cumExecQty=_fmt(qty), cumExecValue=_fmt(value), cumExecFee=_fmt(fee),
+            avgPrice=_fmt(price), leavesQty="0", updatedTime=str(ts_ms),
+        )
+        self.counts["fills"] += 1
+        execution = {
+            "category": order["category"], "symbol": order["symbol"], "orderId": order["orderId"],
+            "orderLinkId": order["orderLinkId"], "side": order["side"], "orderType": order["orderType"],
+            "execId": f"exec-{next(self._ids)}", "execPrice": _fmt(price), "execQty": _fmt(qty),
+            "execValue": _fmt(value), "execFee": _fmt(fee), "execTime": str(ts_ms), "isMaker": order["orderType"] == "Limit",
+        }
+        if order["category"] == "spot":
+            self._settle_spot(order, qty, value, fee)
+        else:
+            self._settle_linear(order["symbol"], qty if order["side"] == "Buy" else -qty, price, fee)
+        self._emit("order", [dict(order)])
+        self._emit("execution", [execution])
+        if order["category"] == "linear":
+            self._emit("position", [self._position_row(order["symbol"])])
+        self._emit("wallet", [self._wallet_row("UNIFIED")])
+
+    def _settle_spot(self, order: Dict[str, Any], qty: float, value: float, fee: float) -> None:
+        coin = order["symbol"][:-4]
+        if order["side"] == "Buy":
+            self.balances["USDT"] = self.balances.get("USDT", 0.0) - value - fee
+            self.balances[coin] = self.balances.get(coin, 0.0) + qty
+            tp, sl = _float_or_zero(order.get("takeProfit")), _float_or_zero(order.get("stopLoss"))
+            tp_id = self._add_conditional(order, qty, tp, 1) if tp > 0 else ""
+            sl_id = self._add_conditional(order, qty, sl, 2) if sl > 0 else ""
+            if tp_id and sl_id:
+                self._conditional[tp_id]["ocoWith"] = sl_id
+                self._conditional[sl_id]["ocoWith"] = tp_id
+        else:
+            self.balances[coin] = self.balances.get(coin, 0.0) - qty
+            self.balances["USDT"] = self.balances.get("USDT", 0.0) + value - fee
+
+    def _add_conditional(self, parent: Dict[str, Any], qty: float, trigger: float, direction: int) -> str:
+        """Spot TP/SL attached to a filled buy: a market sell waiting for its trigger (1 = rise, 2 = fall)."""
+        now = str(int(time.time() * 1000))
+        oid = f"sim-{next(self._ids)}"
+        self._conditional[oid] = {
+            "orderId": oid, "orderLinkId": "", "category": "spot", "symbol": parent["symbol"], "side": "Sell",
+            "orderType": "Market", "price": "0", "qty": _fmt(qty), "timeInForce": "IOC", "reduceOnly": False,
+            "takeProfit": "", "stopLoss": "", "triggerPrice": _fmt(trigger), "triggerDirection": direction,
+            "stopOrderType": "TakeProfit" if direction == 1 else "StopLoss", "orderFilter": "tpslOrder",
+            "parentOrderId": parent["orderId"], "orderStatus": "Untriggered", "cumExecQty": "0",
+            "cumExecValue": "0", "cumExecFee": "0", "avgPrice": "", "leavesQty": _fmt(qty),
+            "createdTime": now, "updatedTime": now,
+        }
+        self._orders[oid] = self._conditional[oid]
+        self._emit("order", [dict(self._conditional[oid])])
+        return oid
+
+    def _settle_linear(self, symbol: str, signed_qty: float, price: float, fee: float) -> None:
+        pos = self._positions.setdefault(symbol, {"size": 0.0, "avgPrice": 0.0, "takeProfit": 0.0, "stopLoss": 0.0})
+        size, avg = pos["size"], pos["avgPrice"]
+        realised = 0.0
+        if size == 0 or (size > 0) == (signed_qty > 0):
+            new_size = size + signed_qty
+            pos["avgPrice"] = (abs(size) * avg + abs(signed_qty) * price) / abs(new_size)
+        else:
+            closed = min(abs(size), abs(signed_qty))
+            realised = closed * (price - avg) * (1 if size > 0 else -1)
+            new_size = size + signed_qty
+            if new_size == 0 or (new_size > 0) != (size > 0):
+                pos["avgPrice"] = price if new_size != 0 else 0.0
+                pos["takeProfit"] = pos["stopLoss"] = 0.0
+        pos["size"] = round(new_size, 12)
+        self.balances["USDT"] = self.balances.get("USDT", 0.0) + realised - fee
+
+    def _check_balance(self, category: str, m: _Market, side: str, qty: float, price: float, reduce_only: bool) -> int:
+        if category == "spot":
+            if side == "Buy":
+                return INSUFFICIENT_BALANCE_SPOT if qty * price * (1 + self.fee_rate) > self.balances.get("USDT", 0.0) + 1e-9 else OK
+            return INSUFFICIENT_BALANCE_SPOT if qty > self.balances.get(m.symbol[:-4], 0.0) + 1e-12 else OK
+        if reduce_only:
+            return OK
+        margin = qty * price / max(self._leverage.get(m.symbol, 1.0), 1.0)
+        return INSUFFICIENT_BALANCE_LINEAR if margin > self.balances.get("USDT", 0.0) else OK
+
+    def _reject(self, msg: str) -> Tuple[int, str, Dict]:
+        self.counts["rejects"] += 1
+        return PARAMS_ERROR, msg, {}
+
+    # ---- rows ----
+    def _position_row(self, symbol: str) -> Dict[str, Any]:
+        m = self.markets[symbol]
+        pos = self._positions.get(symbol) or {"size": 0.0, "avgPrice": 0.0, "takeProfit": 0.0, "stopLoss": 0.0}
+        size = pos["size"]
+        return {
+            "category": "linear", "symbol": symbol, "positionIdx": 0,
+            "side": "Buy" if size > 0 else ("Sell" if size < 0 else ""),
+            "size": _fmt(abs(size)), "avgPrice": _fmt(pos["avgPrice"]), "markPrice": _fmt(m.price),
+            "positionValue": _fmt(abs(size) * pos["avgPrice"]),
+            "unrealisedPnl": _fmt(size * (m.price - pos["avgPrice"])) if size else "0",
+            "leverage": _fmt(self._leverage.get(symbol, 1.0)),
+            "takeProfit": _fmt(pos.get("takeProfit") or 0.0), "stopLoss": _fmt(pos.get("stopLoss") or 0.0),
+            "updatedTime": str(int(time.time() * 1000)),
+        }
+
+    def _wallet_row(self, account_type: str) -> Dict[str, Any]:
+        coins = []
+        equity = 0.0
+        for coin, amount in sorted(self.balances.items()):
+            usd = amount if coin == "USDT" else amount * self.markets[f"{coin}USDT"].price if f"{coin}USDT" in self.markets else 0.0
+            equity += usd
+            coins.append({
+                "coin": coin, "walletBalance": _fmt(amount), "equity": _fmt(amount), "usdValue": _fmt(usd),
+                "availableToWithdraw": _fmt(amount), "free": _fmt(amount), "locked": "0",
+            })
+        return {"accountType": account_type, "totalEquity": _fmt(equity), "totalWalletBalance": _fmt(equity), "coin": coins}
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            out = dict(self.counts)
+            out.update({"symbols": len(self.markets), "open_orders": len(self._open) + len(self._conditional)})
+            return out
+
+
+def _diff(old: Dict[float, float], new: Dict[float, float]) -> List[List[str]]:
+    rows = [[_fmt(p), "0"] for p in old if p not in new]
+    rows.extend([_fmt(p), _fmt(q)] for p, q in new.items() if old.get(p) != q)
+    return rows
+
+
+def _truthy(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in {"1", "true", "yes"}
+    return bool(value)
+
+
+def _float_or_zero(value: Any) -> float:
+    try:
+        return float(value or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
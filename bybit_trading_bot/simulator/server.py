@@ -0,0 +1,427 @@
+"""Local Bybit v5 stand-in: REST + public/private WS served from a SimExchange.
+
+Usage:
+    python -m bybit_trading_bot.simulator.server --symbols 500 --rate 10
+    BYBIT_REST_URL=http://127.0.0.1:8600 BYBIT_WS_URL=ws://127.0.0.1:8601 python -m bybit_trading_bot.main
+
+--rate is trades per symbol per second; every trade is published to each subscribed topic of
+its symbol (tickers, publicTrade, orderbook.N, kline.I). --replay-dir replays the tick archive.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from bybit_trading_bot.simulator.exchange import (
+    OK,
+    PARAMS_ERROR,
+    TOO_MANY_VISITS,
+    ArchiveSource,
+    PriceSource,
+    SimExchange,
+    default_symbols,
+)
+from bybit_trading_bot.utils.logger import get_logger
+
+try:
+    import websockets
+except Exception:  # pragma: no cover
+    websockets = None  # type: ignore
+
+
+# pybit records a subscription's req_id only after send() returns; an ack that beats that
+# raises KeyError in its reader thread, which then closes the socket for good.
+_SUBSCRIBE_ACK_DELAY = 0.05
+
+_KLINE_MS = {"1": 60_000, "3": 180_000, "5": 300_000, "15": 900_000, "30": 1_800_000, "60": 3_600_000}
+
+
+class _RestRoutes:
+    """v5 REST paths -> SimExchange methods, with Bybit-style per-path rate limit headers."""
+
+    PATHS: Dict[str, str] = {
+        "/v5/market/tickers": "get_tickers",
+        "/v5/market/instruments-info": "get_instruments_info",
+        "/v5/market/orderbook": "get_orderbook",
+        "/v5/market/kline": "get_kline",
+        "/v5/market/open-interest": "get_open_interest",
+        "/v5/order/create": "place_order",
+        "/v5/order/cancel": "cancel_order",
+        "/v5/order/realtime": "get_open_orders",
+        "/v5/order/history": "get_order_history",
+        "/v5/position/list": "get_positions",
+        "/v5/position/set-leverage": "set_leverage",
+        "/v5/position/trading-stop": "set_trading_stop",
+        "/v5/account/wallet-balance": "get_wallet_balance",
+    }
+
+    def __init__(self, exchange: SimExchange, limit_per_second: int = 0) -> None:
+        self.exchange = exchange
+        self.limit_per_second = max(0, int(limit_per_second))
+        self._windows: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = defaultdict(int)
+
+    def _take(self, path: str) -> Tuple[bool, int, int]:
+        """One-second window per path; returns (allowed, remaining, reset_ms)."""
+        now_s = int(time.time())
+        with self._lock:
+            start, used = self._windows.get(path, (now_s, 0))
+            if start != now_s:
+                start, used = now_s, 0
+            used += 1
+            self._windows[path] = (start, used)
+        limit = self.limit_per_second
+        return used <= limit, max(0, limit - used), (start + 1) * 1000
+
+    def handle(self, path: str, params: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        now_ms = int(time.time() * 1000)
+        headers: Dict[str, str] = {}
+        self.counts[path] += 1
+        if path == "/v5/market/time":
+            body = {"timeSecond": str(now_ms // 1000), "timeNano": str(now_ms * 1_000_000)}
+            return _envelope(OK, "OK", body, now_ms), headers
+        name = self.PATHS.get(path)
+        if name is None:
+            return _envelope(PARAMS_ERROR, f"unknown path {path}", {}, now_ms), headers
+        if self.limit_per_second:
+            allowed, remaining, reset_ms = self._take(path)
+            headers = {
+                "X-Bapi-Limit": str(self.limit_per_second),
+                "X-Bapi-Limit-Status": str(remaining),
+                "X-Bapi-Limit-Reset-Timestamp": str(reset_ms),
+            }
+            if not allowed:
+                return _envelope(TOO_MANY_VISITS, "Too many visits!", {}, now_ms), headers
+        try:
+            code, msg, result = getattr(self.exchange, name)(**params)
+        except TypeError as e:
+            code, msg, result = PARAMS_ERROR, f"params error: {e}", {}
+        return _envelope(code, msg, result, now_ms), headers
+
+
+def _envelope(code: int, msg: str, result: Dict[str, Any], now_ms: int) -> Dict[str, Any]:
+    return {"retCode": code, "retMsg": msg, "result": result, "retExtInfo": {}, "time": now_ms}
+
+
+def _make_http_handler(routes: _RestRoutes):
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, params: Dict[str, Any]) -> None:
+            body, headers = routes.handle(urlsplit(self.path).path, params)
+            raw = json.dumps(body).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def do_GET(self) -> None:  # noqa: N802
+            self._reply(dict(parse_qsl(urlsplit(self.path).query)))
+
+        def do_POST(self) -> None:  # noqa: N802
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            try:
+                params = json.loads(raw) if raw else {}
+            except ValueError:
+                params = {}
+            self._reply(params if isinstance(params, dict) else {})
+
+        def log_message(self, format: str, *args: Any) -> None:  # silence per-request stderr lines
+            return
+
+    return _Handler
+
+
+class SimulatorServer:
+    """Runs the REST server (thread pool) and the WS server + market feed (one asyncio loop thread).
+
+    Public WS: /v5/public/{spot,linear}; private WS: /v5/private (any auth is accepted).
+    Port 0 picks a free port; rest_url / ws_url are valid after start().
+    """
+
+    def __init__(
+        self,
+        exchange: SimExchange,
+        host: str = "127.0.0.1",
+        rest_port: int = 8600,
+        ws_port: int = 8601,
+        rate: float = 10.0,
+        book_depth: int = 50,
+        rest_limit_per_second: int = 0,
+    ) -> None:
+        self.exchange = exchange
+        self.host = host
+        self.rest_port = rest_port
+        self.ws_port = ws_port
+        self.rate = float(rate)
+        self.book_depth = max(1, int(book_depth))
+        self.logger = get_logger(self.__class__.__name__)
+        self.routes = _RestRoutes(exchange, rest_limit_per_second)
+        self._http: Optional[ThreadingHTTPServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._stopping: Optional[asyncio.Event] = None
+        # "category|topic" -> connections; symbol -> subscribed keys (only those are generated)
+        self._subs: Dict[str, Set[Any]] = defaultdict(set)
+        self._symbol_topics: Dict[str, Set[str]] = defaultdict(set)
+        self._private: Set[Any] = set()
+        self._private_subs: Dict[Any, Set[str]] = {}
+        self.counts: Dict[str, int] = defaultdict(int)
+        exchange.add_private_listener(self._on_private)
+
+    @property
+    def rest_url(self) -> str:
+        return f"http://{self.host}:{self.rest_port}"
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.host}:{self.ws_port}"
+
+    # ---- lifecycle ----
+    def start(self, timeout: float = 10.0) -> None:
+        if websockets is None:
+            raise RuntimeError("websockets package is not installed")
+        self._http = ThreadingHTTPServer((self.host, self.rest_port), _make_http_handler(self.routes))
+        self._http.daemon_threads = True
+        self.rest_port = self._http.server_address[1]
+        threading.Thread(target=self._http.serve_forever, name="SimREST", daemon=True).start()
+        self._thread = threading.Thread(target=self._run_loop, name="SimWS", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            raise RuntimeError("simulator WS server did not start")
+        self.logger.info(f"Simulator up: REST {self.rest_url} WS {self.ws_url} ({len(self.exchange.markets)} symbols @ {self.rate:g}/s)")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._http is not None:
+            self._http.shutdown()
+            self._http.server_close()
+            self._http = None
+        loop = self._loop
+        if loop is not None and self._stopping is not None:
+            loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run_loop(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._serve())
+        finally:
+            loop.close()
+            self._loop = None
+
+    async def _serve(self) -> None:
+        self._stopping = asyncio.Event()
+        async with websockets.serve(self._on_connection, self.host, self.ws_port, max_size=2**22) as server:
+            self.ws_port = list(server.sockets)[0].getsockname()[1]
+            self._ready.set()
+            feed = asyncio.get_running_loop().create_task(self._feed())
+            await self._stopping.wait()
+            feed.cancel()
+            await asyncio.gather(feed, return_exceptions=True)
+
+    # ---- WS connections ----
+    async def _on_connection(self, ws) -> None:
+        path = urlsplit(getattr(getattr(ws, "request", None), "path", "") or "").path
+        private = path.rstrip("/") == "/v5/private"
+        category = "linear" if path.endswith("/linear") else "spot"
+        topics: Set[str] = set()
+        if private:
+            self._private.add(ws)
+            self._private_subs[ws] = topics
+        self.counts["connections"] += 1
+        try:
+            async for raw in ws:
+                try:
+                    msg = json.loads(raw)
+                except ValueError:
+                    continue
+                op = msg.get("op")
+                reply = {"success": True, "ret_msg": "", "conn_id": str(id(ws)), "req_id": msg.get("req_id", ""), "op": op}
+                if op == "ping":
+                    reply["ret_msg"] = "pong"
+                    await ws.send(json.dumps(reply))
+                elif op == "auth":
+                    await ws.send(json.dumps(reply))
+                elif op in ("subscribe", "unsubscribe"):
+                    args = [str(a) for a in msg.get("args") or []]
+                    # Topics take effect now; only the ack is held back
+                    asyncio.get_running_loop().call_later(_SUBSCRIBE_ACK_DELAY, websockets.broadcast, [ws], json.dumps(reply))
+                    for topic in args:
+                        if op == "subscribe":
+                            await self._subscribe(ws, topic, category, topics, private)
+                        else:
+                            self._unsubscribe(ws, topic, category, topics)
+        except Exception as e:
+            self.logger.debug(f"connection closed: {e}")
+        finally:
+            for topic in list(topics):
+                self._unsubscribe(ws, topic, category, topics)
+            self._private.discard(ws)
+            self._private_subs.pop(ws, None)
+
+    async def _subscribe(self, ws, topic: str, category: str, topics: Set[str], private: bool) -> None:
+        topics.add(topic)
+        if private:
+            return
+        symbol = topic.rsplit(".", 1)[-1]
+        if symbol not in self.exchange.markets:
+            return
+        key = f"{category}|{topic}"
+        self._subs[key].add(ws)
+        self._symbol_topics[symbol].add(key)
+        if topic.startswith("orderbook."):
+            depth = int(topic.split(".")[1])
+            u, bids, asks = self.exchange.book_snapshot(symbol, min(depth, self.book_depth))
+            await ws.send(json.dumps({
+                "topic": topic, "type": "snapshot", "ts": int(time.time() * 1000),
+                "data": {"s": symbol, "b": bids, "a": asks, "u": u, "seq": u},
+            }))
+
+    def _unsubscribe(self, ws, topic: str, category: str, topics: Set[str]) -> None:
+        topics.discard(topic)
+        key = f"{category}|{topic}"
+        subs = self._subs.get(key)
+        if subs is None:
+            return
+        subs.discard(ws)
+        if not subs:
+            self._subs.pop(key, None)
+            self._symbol_topics.get(topic.rsplit(".", 1)[-1], set()).discard(key)
+
+    # ---- feed ----
+    async def _feed(self, interval: float = 0.05) -> None:
+        """Round-robin trades over all symbols at `rate` per symbol per second."""
+        symbols = list(self.exchange.markets)
+        budget = 0.0
+        cursor = 0
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(interval)
+            now = time.perf_counter()
+            budget += (now - last) * self.rate * len(symbols)
+            last = now
+            n = int(budget)
+            budget -= n
+            ts_ms = int(time.time() * 1000)
+            for _ in range(n):
+                symbol = symbols[cursor]
+                cursor = (cursor + 1) % len(symbols)
+                trade = self.exchange.step(symbol, ts_ms)
+                if trade is not None and self._symbol_topics.get(symbol):
+                    self._publish(symbol, trade, ts_ms)
+            self.counts["trades"] += n
+
+    def _publish(self, symbol: str, trade: Dict[str, Any], ts_ms: int) -> None:
+        book = None  # one book update per trade shared by every orderbook.N topic (keeps u contiguous)
+        for key in list(self._symbol_topics.get(symbol, ())):
+            category, _, topic = key.partition("|")
+            conns = self._subs.get(key)
+            if not conns:
+                continue
+            kind = topic.partition(".")[0]
+            if kind == "tickers":
+                frame = {"topic": topic, "type": "snapshot", "ts": ts_ms, "cs": trade["i"], "data": self.exchange.ticker_row(symbol, category)}
+            elif kind == "publicTrade":
+                frame = {"topic": topic, "type": "snapshot", "ts": ts_ms, "data": [trade]}
+            elif kind == "orderbook":
+                if book is None:
+                    book = self.exchange.book_update(symbol, self.book_depth)
+                u, bids, asks = book
+                frame = {"topic": topic, "type": "delta", "ts": ts_ms, "data": {"s": symbol, "b": bids, "a": asks, "u": u, "seq": u}}
+            elif kind == "kline":
+                frame = {"topic": topic, "type": "snapshot", "ts": ts_ms, "data": [self._kline_row(symbol, topic.split(".")[1], ts_ms)]}
+            else:
+                continue
+            websockets.broadcast(conns, json.dumps(frame))
+            self.counts["frames"] += len(conns)
+
+    def _kline_row(self, symbol: str, interval: str, ts_ms: int) -> Dict[str, Any]:
+        bar = self.exchange.klines(symbol, interval, 1)[-1]
+        step = _KLINE_MS.get(interval, 60_000)
+        start = int(bar[0])
+        return {
+            "start": start, "end": start + step - 1, "interval": interval,
+            "open": f"{bar[1]:.10g}", "close": f"{bar[4]:.10g}", "high": f"{bar[2]:.10g}", "low": f"{bar[3]:.10g}",
+            "volume": f"{bar[5]:.10g}", "turnover": f"{bar[6]:.10g}", "confirm": False, "timestamp": ts_ms,
+        }
+
+    # ---- private ----
+    def _on_private(self, topic: str, rows: List[Dict[str, Any]]) -> None:
+        loop = self._loop
+        if loop is None or not self._private:
+            return
+        frame = json.dumps({"id": f"sim-{topic}-{time.time_ns()}", "topic": topic, "creationTime": int(time.time() * 1000), "data": rows})
+        loop.call_soon_threadsafe(self._send_private, topic, frame)
+
+    def _send_private(self, topic: str, frame: str) -> None:
+        conns = [ws for ws, topics in self._private_subs.items() if topic in topics]
+        if conns:
+            websockets.broadcast(conns, frame)
+            self.counts["private_frames"] += len(conns)
+
+    def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = dict(self.counts)
+        out.update(self.exchange.stats())
+        out["topics"] = len(self._subs)
+        out["rest"] = dict(self.routes.counts)
+        return out
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local Bybit v5 exchange simulator")
+    parser.add_argument("--symbols", type=int, default=50, help="number of synthetic symbols")
+    parser.add_argument("--symbol-list", default="", help="comma-separated symbols (overrides --symbols)")
+    parser.add_argument("--rate", type=float, default=10.0, help="trades per symbol per second")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--rest-port", type=int, default=8600)
+    parser.add_argument("--ws-port", type=int, default=8601)
+    parser.add_argument("--replay-dir", default="", help="tick archive root to replay recorded trades from")
+    parser.add_argument("--replay-day", default=None, help="YYYYMMDD day to replay (default: latest per symbol)")
+    parser.add_argument("--rest-limit", type=int, default=0, help="requests per second per REST path (0 = unlimited)")
+    parser.add_argument("--balance", type=float, default=100_000.0, help="starting USDT balance")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    source: PriceSource
+    if args.replay_dir:
+        source = ArchiveSource(args.replay_dir, day=args.replay_day, seed=args.seed)
+        symbols = [s.strip() for s in args.symbol_list.split(",") if s.strip()] or source.symbols()
+    else:
+        source = PriceSource(args.seed)
+        symbols = [s.strip() for s in args.symbol_list.split(",") if s.strip()] or default_symbols(args.symbols)
+    exchange = SimExchange(symbols, source=source, quote_balance=args.balance, seed=args.seed)
+    server = SimulatorServer(
+        exchange, host=args.host, rest_port=args.rest_port, ws_port=args.ws_port, rate=args.rate,
+        rest_limit_per_second=args.rest_limit,
+    )
+    server.start()
+    try:
+        while True:
+            time.sleep(10.0)
+            server.logger.info(f"Simulator stats: {server.stats()}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
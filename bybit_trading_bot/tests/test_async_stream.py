@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+websockets = pytest.importorskip("websockets")
+
+from bybit_trading_bot.handlers import websocket_handler as wsh
+from bybit_trading_bot.handlers.async_stream import AsyncStreamClient
+
+
+class FakeBybitStream:
+    """Minimal v5 public stream: acks subscribes, answers pings, pushes one ticker per topic."""
+
+    def __init__(self, drop_first_connection: bool = False) -> None:
+        self.drop_first_connection = drop_first_connection
+        self.connections = 0
+        self.subscribed = []
+        self.pings = 0
+        self.port = None
+        self._loop = None
+        self._ready = threading.Event()
+
+    async def _handler(self, ws) -> None:
+        self.connections += 1
+        conn = self.connections
+        async for raw in ws:
+            msg = json.loads(raw)
+            if msg.get("op") == "ping":
+                self.pings += 1
+                await ws.send(json.dumps({"op": "pong", "success": True}))
+                continue
+            if msg.get("op") == "subscribe":
+                self.subscribed.append((conn, list(msg["args"])))
+                await ws.send(json.dumps({"op": "subscribe", "success": True}))
+                for topic in msg["args"]:
+                    sym = topic.rpartition(".")[2]
+                    await ws.send(json.dumps({"topic": topic, "ts": 1, "data": {"symbol": sym, "lastPrice": str(conn)}}))
+                if self.drop_first_connection and conn == 1:
+                    await ws.close()
+                    return
+
+    def start(self) -> None:
+        def _run() -> None:
+            loop = asyncio.new_event_loop()
+            self._loop = loop
+
+            async def _main() -> None:
+                async with websockets.serve(self._handler, "127.0.0.1", 0) as server:
+                    self.port = server.sockets[0].getsockname()[1]
+                    self._ready.set()
+                    await asyncio.Future()
+
+            try:
+                loop.run_until_complete(_main())
+            except Exception:
+                pass
+
+        threading.Thread(target=_run, daemon=True).start()
+        self._ready.wait(5.0)
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}"
+
+
+def _wait(cond, timeout: float = 5.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if cond():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_async_stream_multiplexes_shards_on_one_thread():
+    server = FakeBybitStream()
+    server.start()
+    client = AsyncStreamClient("spot", url=server.url, topics_per_shard=25, ping_interval=0.2)
+    got = {}
+    threads_before = threading.active_count()
+    try:
+        client.subscribe([f"tickers.S{i}USDT" for i in range(60)], lambda msg: got.__setitem__(msg["topic"], msg))
+        assert _wait(lambda: len(got) == 60)
+        stats = client.stats()
+        assert stats["shards"] == 3 and stats["topics"] == 60
+        # One loop thread for all three connections
+        assert threading.active_count() - threads_before == 1
+        # Subscribe frames carry at most 10 topics
+        assert max(len(args) for _, args in server.subscribed) == 10
+        assert _wait(lambda: server.pings >= 3)
+    finally:
+        client.stop()
+
+
+def test_async_stream_reconnects_and_resubscribes():
+    server = FakeBybitStream(drop_first_connection=True)
+    server.start()
+    handler = wsh.WebSocketHandler(testnet=False)
+    handler._async = AsyncStreamClient("spot", url=server.url)
+    shard = None
+    try:
+        handler._async.subscribe(["tickers.BTCUSDT"], lambda msg: handler._on_raw_ticker(msg, "BTCUSDT", None))
+        shard = handler._async._shards[0]
+        shard.backoff_base = 0.05
+        assert _wait(lambda: handler._tick_mailboxes[0].stats()["coalesced"] == 1)
+        assert [args for _, args in server.subscribed] == [["tickers.BTCUSDT"], ["tickers.BTCUSDT"]]
+        # Latest value wins: the tick from the second connection replaced the first one
+        assert handler._tick_mailboxes[0].get(timeout=0)[1] == 2.0
+        assert handler._async.stats()["reconnects"] == 1
+    finally:
+        handler.stop()
+
+
+def test_async_stream_resubscribes_after_stop_and_start():
+    server = FakeBybitStream()
+    server.start()
+    client = AsyncStreamClient("spot", url=server.url)
+    got = []
+    try:
+        client.subscribe(["tickers.BTCUSDT"], got.append)
+        assert _wait(lambda: len(got) == 1)
+        client.stop()
+        assert client.stats()["shards"] == 0
+
+        client.subscribe(["tickers.BTCUSDT"], got.append)
+        assert _wait(lambda: len(got) == 2)
+        assert [conn for conn, _ in server.subscribed] == [1, 2]
+    finally:
+        client.stop()
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+
+import pytest
+
+from bybit_trading_bot.utils.db_manager import DBManager
+
+
+def test_readers_are_read_only_and_see_committed_writes(tmp_path):
+    db = DBManager(str(tmp_path / "db.sqlite"), read_pool_size=2)
+    sid = db.upsert_symbol("BTCUSDT", "BTCUSDT")
+    db.insert_price(sid, 100.0)
+    with db._read() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM price_data")
+        # nested read on the same thread reuses the checked-out connection
+        with db._read() as inner:
+            assert inner is conn
+    assert db.get_last_price(sid) == 100.0
+
+    stats = db.get_pool_stats()
+    assert stats["writer"]["queries"] > 0
+    assert sum(s["checkouts"] for n, s in stats.items() if n.startswith("reader")) >= 2
+
+
+def test_threads_share_pool_and_close_releases_connections(tmp_path):
+    db = DBManager(str(tmp_path / "db.sqlite"), read_pool_size=2)
+    sid = db.upsert_symbol("ETHUSDT", "ETHUSDT")
+
+    def work() -> None:
+        for i in range(20):
+            db.insert_price(sid, float(i))
+            db.get_last_price(sid)
+
+    threads = [threading.Thread(target=work) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len([n for n in db.get_pool_stats() if n.startswith("reader")]) <= 2
+    db.close()
+    assert db.get_pool_stats() == {}
+    # the pool reopens lazily after close
+    assert db.get_last_price(sid) is not None
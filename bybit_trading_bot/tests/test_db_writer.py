@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from bybit_trading_bot.utils.db_manager import DBManager
+
+
+def test_write_behind_batches_and_flushes(tmp_path):
+    db = DBManager(str(tmp_path / "db.sqlite"), write_behind=True, write_batch_size=50, write_flush_interval=5.0)
+    sid = db.upsert_symbol("BTCUSDT", "BTCUSDT")
+    for i in range(120):
+        db.insert_price(sid, 100.0 + i, ts=datetime.utcnow())
+    db.insert_oi(sid, 1000.0, oi_value=1000.0)
+    assert db.insert_signal(sid, 1.0, 2.0, "queued", wait=False) == 0
+
+    assert db.flush(timeout=5.0)
+    stats = db.get_writer_stats()
+    assert stats["written"] == 122
+    assert stats["failed"] == 0
+    assert stats["queue_depth"] == 0
+    assert db.get_last_price(sid) == 219.0
+    assert [v for _, v in db.get_recent_oi_series(sid, minutes=5)] == [1000.0]
+    assert db.get_last_signal_time_queued(sid) is not None
+    db.close()
+
+
+def test_synchronous_insert_returns_row_id(tmp_path):
+    db = DBManager(str(tmp_path / "db.sqlite"), write_behind=True)
+    sid = db.upsert_symbol("ETHUSDT", "ETHUSDT")
+    assert db.insert_signal(sid, 0.5, 0.5, "bought") > 0
+    assert db.get_writer_stats()["submitted"] == 0
+    db.close()
+
+
+def test_counters_are_exact_with_concurrent_producers(tmp_path):
+    import threading
+
+    db = DBManager(str(tmp_path / "db.sqlite"), write_behind=True, write_batch_size=64, write_flush_interval=0.01)
+    sid = db.upsert_symbol("SOLUSDT", "SOLUSDT")
+
+    def _produce() -> None:
+        for i in range(500):
+            db.insert_price(sid, 10.0 + i, ts=datetime.utcnow())
+
+    threads = [threading.Thread(target=_produce) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert db.flush(timeout=10.0)
+    stats = db.get_writer_stats()
+    assert stats["submitted"] == stats["written"] == 4000
+    db.close()
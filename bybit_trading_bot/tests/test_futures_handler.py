@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from collections import Counter
+
+from bybit_trading_bot.handlers.futures_handler import FuturesHandler
+
+
+class FakeHTTP:
+    def __init__(self) -> None:
+        self.calls = Counter()
+
+    def request(self, method_name: str, **kwargs):
+        self.calls[method_name] += 1
+        if method_name == "get_tickers":
+            rows = [{"symbol": "BTCUSDT", "markPrice": "50000"}, {"symbol": "ETHUSDT", "lastPrice": "2500"}]
+            if kwargs.get("symbol"):
+                rows = [r for r in rows if r["symbol"] == kwargs["symbol"]]
+            return {"retCode": 0, "result": {"list": rows}}
+        if method_name == "get_open_interest":
+            assert kwargs.get("limit") == 1
+            oi = {"BTCUSDT": "1000", "ETHUSDT": "20000"}.get(kwargs["symbol"])
+            rows = [{"openInterest": oi, "timestamp": "1700000000000"}] if oi else []
+            return {"retCode": 0, "result": {"list": rows}}
+        raise AssertionError(method_name)
+
+
+def _handler() -> FuturesHandler:
+    fh = FuturesHandler(testnet=False)
+    fh._http = FakeHTTP()
+    return fh
+
+
+def test_poll_cycle_is_one_bulk_ticker_plus_one_oi_call_per_symbol():
+    fh = _handler()
+    marks = fh.get_mark_prices()
+    assert marks == {"BTCUSDT": 50000.0, "ETHUSDT": 2500.0}
+
+    snaps = [fh.get_oi_snapshot(s, marks=marks) for s in ("BTCUSDT", "ETHUSDT", "XRPUSDT")]
+    assert fh._http.calls == {"get_tickers": 1, "get_open_interest": 3}
+
+    btc, eth, missing = snaps
+    assert missing is None
+    assert btc.oi_value == btc.oi_contracts == 1000.0 and btc.mark_price == 50000.0
+    assert btc.oi_tokens_mark == 1000.0 / 50000.0
+    assert eth.ts == 1_700_000_000.0
+
+
+def test_snapshot_without_marks_falls_back_to_symbol_ticker():
+    fh = _handler()
+    snap = fh.get_oi_snapshot("ETHUSDT")
+    assert snap.mark_price == 2500.0
+    assert fh._http.calls == {"get_open_interest": 1, "get_tickers": 1}
+    assert fh.get_open_interest("BTCUSDT") == 1000.0
+    assert fh._http.calls["get_tickers"] == 1
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from bybit_trading_bot.core.oi_poller import OIPoller
+from bybit_trading_bot.handlers.futures_handler import OISnapshot
+
+
+class FakeFutures:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.mark_calls = 0
+        self.polled = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get_mark_prices(self):
+        self.mark_calls += 1
+        return {"BTCUSDT": 50000.0}
+
+    def get_oi_snapshot(self, symbol, marks=None):
+        with self._lock:
+            self.polled.append(symbol)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        if symbol == "BADUSDT":
+            return None
+        return OISnapshot(symbol, 100.0, 100.0, (marks or {}).get(symbol), time.time())
+
+
+def _items(*symbols):
+    return [(f"rec-{s}", s) for s in symbols]
+
+
+def test_order_puts_hot_symbols_first_then_stalest():
+    poller = OIPoller(FakeFutures(), workers=1)
+    try:
+        poller._last_polled.update({"AUSDT": 30.0, "BUSDT": 10.0, "CUSDT": 20.0})
+        order = poller.order(_items("AUSDT", "BUSDT", "CUSDT", "DUSDT", "EUSDT"), {"DUSDT": 0.9, "EUSDT": 1.5, "AUSDT": 0.5})
+        # never-polled symbols count as stalest among the cold ones
+        assert [s for _, s in order] == ["EUSDT", "DUSDT", "BUSDT", "CUSDT", "AUSDT"]
+    finally:
+        poller.close()
+
+
+def test_cycle_runs_concurrently_and_reports_coverage():
+    fut = FakeFutures(delay=0.05)
+    poller = OIPoller(fut, workers=4)
+    stored = []
+    try:
+        syms = ["BTCUSDT", "BADUSDT"] + [f"S{i}USDT" for i in range(6)]
+        t0 = time.perf_counter()
+        stats = poller.run_cycle(_items(*syms), lambda rec, snap: stored.append((rec, snap.symbol)), deadline=time.time() + 10)
+        assert time.perf_counter() - t0 < 0.05 * len(syms)
+        assert fut.mark_calls == 1 and fut.max_in_flight > 1
+        assert stats["symbols"] == 8 and stats["polled"] == 7 and stats["failed"] == 1 and stats["skipped"] == 0
+        assert ("rec-BTCUSDT", "BTCUSDT") in stored and len(stored) == 7
+        assert poller.stats()["request_ms"]["count"] == 8
+    finally:
+        poller.close()
+
+
+def test_deadline_skips_remaining_symbols_keeping_hot_ones():
+    fut = FakeFutures(delay=0.1)
+    poller = OIPoller(fut, workers=1)
+    try:
+        syms = [f"S{i}USDT" for i in range(10)]
+        stats = poller.run_cycle(_items(*syms), lambda rec, snap: None, deadline=time.time() + 0.15, proximity={"S7USDT": 2.0})
+        assert fut.polled[0] == "S7USDT"
+        assert stats["skipped"] > 0 and stats["polled"] + stats["skipped"] == 10
+        assert stats["coverage"] < 1.0
+        # skipped symbols are the stalest next cycle
+        nxt = [s for _, s in poller.order(_items(*syms), {})]
+        assert set(nxt[: stats["skipped"]]).isdisjoint(fut.polled)
+    finally:
+        poller.close()
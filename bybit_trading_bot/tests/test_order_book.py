@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from bybit_trading_bot.utils.order_book import L2OrderBook, OrderBookStore
+
+
+def test_snapshot_and_deltas_keep_sorted_levels():
+    book = L2OrderBook("BTCUSDT")
+    book.apply_snapshot([["100", "1"], ["99", "2"], ["98", "3"]], [["101", "1"], ["102", "4"]], update_id=10)
+    assert (book.best_bid, book.best_ask) == (100.0, 101.0)
+    assert book.is_valid
+
+    # New better bid, delete the best ask, resize a level
+    assert book.apply_delta([["100.5", "0.5"], ["99", "5"]], [["101", "0"]], update_id=11)
+    assert (book.best_bid, book.best_ask) == (100.5, 102.0)
+    assert book.levels("bid", 3) == [(100.5, 0.5), (100.0, 1.0), (99.0, 5.0)]
+    assert book.depth("bid", 2) == 1.5
+    assert book.depth("ask", 5) == 4.0
+    assert abs(book.imbalance(2) - (1.5 - 4.0) / 5.5) < 1e-12
+    assert abs(book.spread_pct - 1.5 / 102.0) < 1e-12
+
+
+def test_gap_invalidates_until_next_snapshot():
+    store = OrderBookStore(max_levels=2)
+    book = store.apply("ETHUSDT", "snapshot", {"b": [["10", "1"], ["9", "1"], ["8", "1"]], "a": [["11", "1"]], "u": 5})
+    assert book.levels("bid", 5) == [(10.0, 1.0), (9.0, 1.0)]
+
+    # Duplicate ids are ignored; a skipped id drops the book
+    store.apply("ETHUSDT", "delta", {"b": [["10", "7"]], "a": [], "u": 5})
+    assert book.depth("bid", 1) == 1.0
+    store.apply("ETHUSDT", "delta", {"b": [], "a": [["11", "2"]], "u": 7})
+    assert not book.is_valid and book.gaps == 1
+    store.apply("ETHUSDT", "delta", {"b": [], "a": [["11", "3"]], "u": 8})
+    assert not book.is_valid
+
+    store.apply("ETHUSDT", "snapshot", {"b": [["10", "1"]], "a": [["12", "1"]], "u": 20})
+    assert book.is_valid and book.best_ask == 12.0
+    assert store.stats() == {"books": 1, "valid": 1, "snapshots": 2, "deltas": 0, "gaps": 1}
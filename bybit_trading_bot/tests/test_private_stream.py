@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from bybit_trading_bot.handlers.private_stream import OrderStateStore, shared_private_stream
+
+
+def test_order_rows_merge_and_open_orders_drop_terminal():
+    store = OrderStateStore()
+    store.apply("order", [{"orderId": "1", "category": "spot", "symbol": "BTCUSDT", "orderStatus": "New", "price": "100"}])
+    store.apply("order.spot", [{"orderId": "1", "category": "spot", "orderStatus": "PartiallyFilled", "cumExecQty": "0.5"}])
+    store.apply("order", [{"orderId": "2", "category": "linear", "orderStatus": "New"}])
+
+    row = store.get_order("1")
+    assert row["price"] == "100" and row["orderStatus"] == "PartiallyFilled" and row["cumExecQty"] == "0.5"
+    assert [o["orderId"] for o in store.open_orders("spot")] == ["1"]
+
+    store.apply("order", [{"orderId": "1", "category": "spot", "orderStatus": "Filled"}])
+    assert store.open_orders("spot") == []
+    assert len(store.open_orders()) == 1
+
+
+def test_rest_reconcile_overwrites_rows_and_drops_unlisted_open_orders():
+    store = OrderStateStore()
+    store.apply("order", [
+        {"orderId": "1", "category": "spot", "orderStatus": "New", "qty": "1"},
+        {"orderId": "2", "category": "spot", "orderStatus": "New"},
+        {"orderId": "3", "category": "spot", "orderStatus": "Filled"},
+        {"orderId": "4", "category": "linear", "orderStatus": "New"},
+    ])
+    store.reconcile_orders(
+        [{"orderId": "1", "category": "spot", "orderStatus": "PartiallyFilled"}, {"orderId": "5", "category": "spot", "orderStatus": "New"}],
+        category="spot",
+    )
+    assert store.get_order("1")["orderStatus"] == "PartiallyFilled" and store.get_order("1")["qty"] == "1"
+    # Open but unlisted: its terminal event was missed, so it is dropped; terminal rows and other categories stay
+    assert store.get_order("2") is None
+    assert store.get_order("3")["orderStatus"] == "Filled"
+    assert store.get_order("4") is not None
+    assert sorted(o["orderId"] for o in store.open_orders("spot")) == ["1", "5"]
+
+
+def test_open_rows_are_stale_after_reconnect_until_refreshed():
+    store = OrderStateStore()
+    store.apply("order", [{"orderId": "1", "orderStatus": "New"}, {"orderId": "2", "orderStatus": "Filled"}])
+    assert store.get_current_order("1")["orderStatus"] == "New"
+
+    time.sleep(0.01)
+    store.mark_reconnect()
+    assert store.get_current_order("1") is None
+    assert store.get_current_order("2")["orderStatus"] == "Filled"
+    assert store.stats()["reconnects"] == 1
+
+    time.sleep(0.01)
+    store.reconcile_orders([{"orderId": "1", "orderStatus": "New"}])
+    assert store.get_current_order("1")["orderStatus"] == "New"
+
+
+def test_wait_for_order_wakes_on_event_from_another_thread():
+    store = OrderStateStore()
+    store.apply("order", [{"orderId": "7", "orderStatus": "New"}])
+
+    def _fill():
+        time.sleep(0.05)
+        store.apply("order", [{"orderId": "7", "orderStatus": "Filled", "avgPrice": "101.5"}])
+
+    threading.Thread(target=_fill, daemon=True).start()
+    t0 = time.time()
+    row = store.wait_for_order("7", timeout=5.0)
+    assert row is not None and row["avgPrice"] == "101.5"
+    assert time.time() - t0 < 2.0
+
+
+def test_wait_for_order_returns_on_terminal_status_and_times_out():
+    store = OrderStateStore()
+    store.apply("order", [{"orderId": "8", "orderStatus": "Cancelled"}])
+    assert store.wait_for_order("8", statuses=("Filled",), timeout=0.01)["orderStatus"] == "Cancelled"
+    assert store.wait_for_order("missing", timeout=0.01) is None
+
+
+def test_positions_wallet_executions_and_listeners():
+    store = OrderStateStore(max_executions_per_order=2)
+    seen = []
+    store.add_listener("position", seen.append)
+    store.apply("position", [
+        {"category": "linear", "symbol": "ETHUSDT", "positionIdx": 1, "size": "0"},
+        {"category": "linear", "symbol": "ETHUSDT", "positionIdx": 2, "size": "3"},
+    ])
+    assert store.get_position("ETHUSDT")["positionIdx"] == 2
+    assert store.get_position("ETHUSDT", category="inverse") is None
+    assert len(seen) == 2
+
+    store.apply("wallet", [{"coin": [{"coin": "USDT", "walletBalance": "1000"}]}])
+    assert store.get_coin("USDT")["walletBalance"] == "1000"
+
+    store.apply("execution", [{"orderId": "1", "execQty": str(i)} for i in range(3)])
+    assert [e["execQty"] for e in store.executions("1")] == ["1", "2"]
+    assert store.stats()["execution_events"] == 3
+
+
+def test_wait_for_change_and_disabled_registry():
+    store = OrderStateStore()
+    v = store.version
+    assert store.wait_for_change(v, timeout=0.01) == v
+    threading.Timer(0.05, lambda: store.apply("order", [{"orderId": "1", "orderStatus": "New"}])).start()
+    assert store.wait_for_change(v, timeout=5.0) > v
+
+    class _Cfg:
+        private_ws_enabled = False
+        bybit_api_key = "k"
+        bybit_api_secret = "s"
+
+    assert shared_private_stream(_Cfg()) is None
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pybit")
+
+from bybit_trading_bot.utils import endpoints
+from bybit_trading_bot.utils.http_client import ACCOUNT, MARKET, TRADE, HeaderRateLimiter, endpoint_class
+from bybit_trading_bot.utils.rest_registry import RestClientRegistry
+
+
+class FakeHTTP:
+    def get_tickers(self, **kwargs):
+        return {"retCode": 0, "result": {"list": []}}
+
+    def place_order(self, **kwargs):
+        return {"retCode": 0, "result": {"orderId": "1"}}
+
+
+def test_endpoint_classes():
+    assert endpoint_class("get_tickers") == MARKET
+    assert endpoint_class("get_open_interest") == MARKET
+    assert endpoint_class("place_order") == TRADE
+    assert endpoint_class("set_trading_stop") == TRADE
+    assert endpoint_class("get_wallet_balance") == ACCOUNT
+    assert endpoint_class("get_positions") == ACCOUNT
+
+
+def test_clients_share_connections_per_host_and_pybit_client_per_key():
+    reg = RestClientRegistry()
+    a = reg.client("spot_orders", testnet=False, api_key="k", api_secret="s", recv_window=30000)
+    b = reg.client("oco", testnet=False, api_key="k", api_secret="s", recv_window=30000)
+    c = reg.client("symbol_mapper", testnet=False)
+    t = reg.client("symbol_mapper", testnet=True)
+    assert a.http is b.http and a.http is not c.http
+    assert a.http.client is c.http.client is reg.session("https://api.bybit.com")
+    assert t.http.client is not a.http.client
+    assert a._buckets is c._buckets and t._buckets is not a._buckets
+
+
+def test_shared_bucket_limits_aggregate_rate_and_counts_per_subsystem():
+    reg = RestClientRegistry(limits={MARKET: 10.0})
+    a = reg.client("futures_data", testnet=False)
+    b = reg.client("symbol_mapper", testnet=False)
+    a.http = b.http = FakeHTTP()
+    t0 = time.perf_counter()
+    # Burst is 30 market tokens for the host; 36 requests from two subsystems must wait ~0.6s
+    for _ in range(18):
+        a.request("get_tickers", category="spot")
+        b.request("get_tickers", category="spot")
+    assert time.perf_counter() - t0 >= 0.45
+    b.request("place_order", category="spot")  # trade bucket is separate and still full
+
+    usage = reg.stats()["usage"]
+    assert usage["futures_data"][MARKET] == 18 and usage["futures_data"]["total"] == 18
+    assert usage["symbol_mapper"][MARKET] == 18 and usage["symbol_mapper"][TRADE] == 1
+    assert usage["futures_data"]["wait_s"] + usage["symbol_mapper"]["wait_s"] >= 0.45
+
+
+def test_subsystem_cap_applies_on_top_of_shared_bucket():
+    reg = RestClientRegistry()
+    capped = reg.client("futures_data", testnet=False, cap_per_second=1.0)
+    capped.http = FakeHTTP()
+    t0 = time.perf_counter()
+    for _ in range(4):
+        capped.request("get_tickers", category="linear")
+    assert time.perf_counter() - t0 >= 0.8
+
+
+def test_header_limiter_blocks_until_reported_reset():
+    lim = HeaderRateLimiter()
+    assert lim.acquire("place_order") == 0.0  # unknown endpoint: not limited here
+    reset_ms = int((time.time() + 0.3) * 1000)
+    lim.observe("place_order", {"X-Bapi-Limit": "10", "X-Bapi-Limit-Status": "1", "X-Bapi-Limit-Reset-Timestamp": str(reset_ms)})
+    lim.release("place_order")
+    assert lim.acquire("place_order") == 0.0
+    lim.release("place_order")
+    waited = lim.acquire("place_order")  # window spent: wait for the reset, then a full window
+    assert 0.2 <= waited <= 0.6
+    snap = lim.snapshot()["place_order"]
+    assert snap["limit"] == 10 and snap["remaining"] == 9
+
+
+def test_learned_limits_keep_simulator_quota_without_rejections():
+    pytest.importorskip("websockets")
+    from bybit_trading_bot.simulator.exchange import SimExchange
+    from bybit_trading_bot.simulator.server import SimulatorServer
+
+    server = SimulatorServer(SimExchange(["BTCUSDT"], history_minutes=5, seed=1), rest_port=0, ws_port=0, rate=1.0, rest_limit_per_second=5)
+    server.start()
+    endpoints.set_endpoints(server.rest_url, server.ws_url)
+    codes = []
+    try:
+        # Static market budget far above the server's 5/s: only the headers keep us under it
+        reg = RestClientRegistry(limits={MARKET: 200.0})
+
+        def _worker() -> None:
+            client = reg.client("bench", testnet=False)
+            end = time.time() + 2.5
+            while time.time() < end:
+                codes.append(client.request("get_tickers", category="spot").get("retCode"))
+
+        threads = [threading.Thread(target=_worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        learned = reg.stats()["learned_limits"][server.rest_url]["get_tickers"]
+    finally:
+        endpoints.set_endpoints()
+        server.stop()
+    assert set(codes) == {0}
+    assert len(codes) >= 10  # ~5/s over 2.5s
+    assert learned["limit"] == 5 and learned["rejections"] == 0 and learned["rate_per_second"] == 5.0
+
+
+def test_config_arriving_after_default_registry_applies_its_limits(monkeypatch):
+    from bybit_trading_bot.utils import rest_registry
+
+    monkeypatch.setattr(rest_registry, "_shared", None)
+    monkeypatch.setattr(rest_registry, "_shared_configured", False)
+    reg = rest_registry.shared_rest_registry()
+    bucket = reg.buckets("https://api.bybit.com")[MARKET]
+    assert bucket.refill_rate == 20.0
+
+    class _Cfg:
+        rest_market_rate_per_second = 5.0
+
+    assert rest_registry.shared_rest_registry(_Cfg()) is reg
+    assert reg.limits[MARKET] == 5.0 and bucket.refill_rate == 5.0 and bucket.tokens <= bucket.capacity == 15.0
+
+    class _Other:
+        rest_market_rate_per_second = 50.0
+
+    # Only the first Config counts
+    rest_registry.shared_rest_registry(_Other())
+    assert bucket.refill_rate == 5.0
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from bybit_trading_bot.core.scalp5m_engine import Scalp5mEngine
+from bybit_trading_bot.handlers.private_stream import OrderStateStore
+
+
+class _Stream:
+    is_live = True
+
+    def __init__(self) -> None:
+        self.store = OrderStateStore()
+
+
+class _OrderManager:
+    def __init__(self, position_size: float = 0.0, history=None) -> None:
+        self.position_size = position_size
+        self.history = history or []
+        self.calls = 0
+
+    def get_position(self, symbol):
+        self.calls += 1
+        return {"size": str(self.position_size), "avgPrice": "10"}
+
+    def get_order_history(self, symbol, order_id):
+        return {"retCode": 0, "result": {"list": self.history}}
+
+
+def _engine(om: _OrderManager, stream: _Stream | None = None) -> Scalp5mEngine:
+    eng = Scalp5mEngine.__new__(Scalp5mEngine)
+    eng._private = stream
+    eng._om = om
+    eng._stop = False
+    return eng
+
+
+def test_partial_fill_then_cancel_counts_as_filled():
+    stream = _Stream()
+    stream.store.apply("order", [
+        {"orderId": "1", "orderStatus": "PartiallyFilledCanceled", "cumExecQty": "0.4", "avgPrice": "10.1"},
+    ])
+    assert _engine(_OrderManager(), stream)._wait_for_limit_fill("XUSDT", "1", "Buy", 1) == (True, 10.1, 0.4)
+
+
+def test_stream_timeout_always_checks_rest_once():
+    stream = _Stream()
+    stream.store.apply("order", [{"orderId": "2", "orderStatus": "PartiallyFilled", "cumExecQty": "0.3"}])
+    om = _OrderManager(position_size=0.3)
+    assert _engine(om, stream)._wait_for_limit_fill("XUSDT", "2", "Buy", 1) == (True, 10.0, 0.3)
+    assert om.calls == 1
+
+
+def test_rest_polling_returns_partial_fill_on_cancel():
+    om = _OrderManager(history=[{"orderStatus": "Cancelled", "cumExecQty": "0.2", "avgPrice": "9.9", "qty": "1"}])
+    assert _engine(om)._wait_for_limit_fill("XUSDT", "3", "Buy", 1) == (True, 9.9, 0.2)
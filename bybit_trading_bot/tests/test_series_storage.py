@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from bybit_trading_bot.utils.db_manager import DBManager, to_epoch_ms
+from bybit_trading_bot.utils.tick_buffer import TickBuffer
+
+
+def test_legacy_text_timestamps_are_backfilled_to_epoch_ms(tmp_path):
+    path = str(tmp_path / "db.sqlite")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE symbols (id INTEGER PRIMARY KEY, spot_symbol TEXT NOT NULL, futures_symbol TEXT NOT NULL,
+                              is_active BOOLEAN DEFAULT 1, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE TABLE price_data (id INTEGER PRIMARY KEY, symbol_id INTEGER, price REAL, timestamp TEXT);
+        INSERT INTO symbols (id, spot_symbol, futures_symbol) VALUES (1, 'BTCUSDT', 'BTCUSDT');
+        """
+    )
+    legacy = datetime.utcnow() - timedelta(minutes=1)
+    conn.execute("INSERT INTO price_data (symbol_id, price, timestamp) VALUES (1, 100.0, ?)", (legacy.isoformat(),))
+    conn.commit()
+    conn.close()
+
+    db = DBManager(path)
+    db.insert_price(1, 101.0)
+    ts_ms, prices = db.get_price_window(1, minutes=5)
+    assert prices.tolist() == [100.0, 101.0]
+    assert abs(ts_ms[0] - to_epoch_ms(legacy)) <= 1
+    assert db.get_last_price(1) == 101.0
+
+
+def test_oi_window_returns_primitive_arrays(tmp_path):
+    db = DBManager(str(tmp_path / "db.sqlite"))
+    sid = db.upsert_symbol("ETHUSDT", "ETHUSDT")
+    now = datetime.utcnow()
+    db.insert_oi(sid, 10.0, ts=now - timedelta(minutes=30))
+    db.insert_oi(sid, 11.0, ts=now - timedelta(minutes=10), oi_value=1100.0, noi_percent=40.0)
+    db.insert_oi(sid, 12.0, ts=now, noi_percent=60.0)
+
+    ts_ms, vals = db.get_oi_window(sid, minutes=15)
+    assert vals.typecode == "d" and ts_ms.typecode == "q"
+    assert vals.tolist() == [1100.0, 12.0]
+    assert ts_ms[-1] <= int(time.time() * 1000)
+    assert db.get_noi_window(sid, minutes=15)[1].tolist() == [40.0, 60.0]
+    assert [v for _, v in db.get_recent_oi_series(sid, minutes=15)] == [1100.0, 12.0]
+
+    with db._read() as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT ts_ms, price FROM price_data WHERE symbol_id = ? AND ts_ms >= ? ORDER BY ts_ms",
+            (sid, 0),
+        ).fetchall()
+    assert "COVERING INDEX idx_price_data_symbol_ts_ms" in " ".join(str(r[-1]) for r in plan)
+
+
+def test_retention_rolls_up_and_deletes_expired_rows(tmp_path):
+    db = DBManager(str(tmp_path / "db.sqlite"))
+    sid = db.upsert_symbol("BTCUSDT", "BTCUSDT")
+    base = datetime.utcnow() - timedelta(hours=3)
+    base = base.replace(minute=0, second=0, microsecond=0)
+    for i, px in enumerate([10.0, 12.0, 9.0, 11.0]):
+        db.insert_price(sid, px, ts=base + timedelta(seconds=10 * i))
+    db.insert_price(sid, 20.0, ts=base + timedelta(minutes=1))
+    db.insert_oi(sid, 5.0, ts=base)
+    db.insert_price(sid, 30.0)
+
+    report = db.run_retention(raw_horizon_minutes=60, chunk_rows=2)
+    assert report["price_data_deleted"] == 5
+    assert report["oi_data_deleted"] == 1
+    assert db.get_last_price(sid) == 30.0
+
+    with db._read() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT open, high, low, close, samples FROM price_ohlc_1m WHERE symbol_id = ? ORDER BY bucket_ms", (sid,))
+        assert [tuple(r) for r in cur.fetchall()] == [(10.0, 12.0, 9.0, 11.0, 4), (20.0, 20.0, 20.0, 20.0, 1)]
+        cur.execute("SELECT open, high, low, close, samples FROM price_ohlc_5m WHERE symbol_id = ?", (sid,))
+        assert [tuple(r) for r in cur.fetchall()] == [(10.0, 20.0, 9.0, 20.0, 5)]
+        cur.execute("SELECT close FROM oi_ohlc_5m WHERE symbol_id = ?", (sid,))
+        assert [r[0] for r in cur.fetchall()] == [5.0]
+    assert db.run_retention(raw_horizon_minutes=60)["price_data_deleted"] == 0
+
+
+def test_series_in_separate_file_do_not_wait_on_trade_writes(tmp_path):
+    main = str(tmp_path / "db.sqlite")
+    legacy = DBManager(main)
+    sid = legacy.upsert_symbol("BTCUSDT", "BTCUSDT")
+    legacy.insert_price(sid, 100.0, ts=datetime.utcnow() - timedelta(minutes=2))
+    legacy.close()
+
+    series = str(tmp_path / "series.sqlite")
+    db = DBManager(main, write_behind=True, series_path=series)
+    # A brand-new series file is seeded with recent raw rows from the main database
+    assert db.get_price_window(sid, minutes=5)[1].tolist() == [100.0]
+
+    db.insert_price(sid, 101.0)
+    db.insert_oi(sid, 5.0, oi_value=500.0)
+    db.flush()
+    held, release = threading.Event(), threading.Event()
+
+    def _trade_write() -> None:
+        with db._write():
+            held.set()
+            release.wait(5.0)
+
+    t = threading.Thread(target=_trade_write)
+    t.start()
+    held.wait(5.0)
+    try:
+        # Main-file writer held by another thread: series reads and writes still proceed
+        db.insert_price(sid, 102.0, ts=datetime.utcnow())
+        assert db.series.flush(timeout=1.0)
+        assert db.get_last_price(sid) == 102.0
+        assert db.get_oi_window(sid, minutes=5)[1].tolist() == [500.0]
+    finally:
+        release.set()
+        t.join()
+    stats = db.get_pool_stats()
+    assert "series.writer" in stats and "series.write_behind" in stats
+    db.close()
+
+    conn = sqlite3.connect(series)
+    assert conn.execute("SELECT COUNT(*) FROM price_data").fetchone()[0] == 3
+    conn.close()
+
+
+def test_series_file_is_seeded_from_baseline_schema_database(tmp_path):
+    main = str(tmp_path / "db.sqlite")
+    conn = sqlite3.connect(main)
+    conn.executescript(
+        """
+        CREATE TABLE symbols (id INTEGER PRIMARY KEY, spot_symbol TEXT NOT NULL, futures_symbol TEXT NOT NULL,
+                              is_active BOOLEAN DEFAULT 1, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE TABLE price_data (id INTEGER PRIMARY KEY, symbol_id INTEGER, price REAL NOT NULL,
+                                 timestamp TIMESTAMP NOT NULL);
+        CREATE TABLE oi_data (id INTEGER PRIMARY KEY, symbol_id INTEGER, open_interest REAL NOT NULL,
+                              timestamp TIMESTAMP NOT NULL, bar_ts BIGINT);
+        INSERT INTO symbols (id, spot_symbol, futures_symbol) VALUES (1, 'BTCUSDT', 'BTCUSDT');
+        """
+    )
+    recent = datetime.utcnow() - timedelta(minutes=2)
+    stale = datetime.utcnow() - timedelta(days=3)
+    conn.execute("INSERT INTO price_data (symbol_id, price, timestamp) VALUES (1, 99.0, ?)", (stale.isoformat(),))
+    conn.execute("INSERT INTO price_data (symbol_id, price, timestamp) VALUES (1, 100.0, ?)", (recent.isoformat(),))
+    conn.execute("INSERT INTO oi_data (symbol_id, open_interest, timestamp) VALUES (1, 7.0, ?)", (recent.isoformat(),))
+    conn.commit()
+    conn.close()
+
+    series = str(tmp_path / "series.sqlite")
+    db = DBManager(main, series_path=series)
+    assert db.series.is_seeded()
+    ts_ms, prices = db.get_price_window(1, minutes=5)
+    assert prices.tolist() == [100.0]
+    assert abs(ts_ms[0] - to_epoch_ms(recent)) <= 1
+    assert db.get_oi_window(1, minutes=5)[1].tolist() == [7.0]
+    db.close()
+
+    # Reopening a seeded file does not import the same rows again
+    db = DBManager(main, series_path=series)
+    assert db.get_price_window(1, minutes=5)[1].tolist() == [100.0]
+    db.close()
+
+
+def test_failed_seed_import_reports_the_original_error(tmp_path):
+    from bybit_trading_bot.utils.series_store import SQLiteSeriesStore
+
+    source = str(tmp_path / "db.sqlite")
+    conn = sqlite3.connect(source)
+    # price is NULL: the INSERT into the store's NOT NULL column fails mid-import
+    conn.execute("CREATE TABLE price_data (id INTEGER PRIMARY KEY, symbol_id INTEGER, price REAL, timestamp TEXT)")
+    conn.execute("INSERT INTO price_data (symbol_id, price, timestamp) VALUES (1, NULL, ?)", (datetime.utcnow().isoformat(),))
+    conn.commit()
+    conn.close()
+
+    store = SQLiteSeriesStore.open(str(tmp_path / "series.sqlite"), write_behind=False)
+    try:
+        store.import_recent(source, 0)
+        raise AssertionError("import should fail")
+    except sqlite3.IntegrityError as e:
+        assert "NOT NULL" in str(e)
+    assert not store.is_seeded()
+    # The legacy file was detached, so a retry can attach it again
+    with store._write_ctx() as wconn:
+        assert [r[1] for r in wconn.execute("PRAGMA database_list")] == ["main"]
+    store.close()
+
+
+def test_bulk_windows_match_single_symbol_queries(tmp_path):
+    db = DBManager(str(tmp_path / "db.sqlite"))
+    ids = [db.upsert_symbol(s, s) for s in ("AAAUSDT", "BBBUSDT", "CCCUSDT")]
+    now = datetime.utcnow()
+    for k, sid in enumerate(ids[:2]):
+        for i in range(4):
+            db.insert_price(sid, 10.0 * (k + 1) + i, ts=now - timedelta(minutes=4 - i))
+            db.insert_oi(sid, 100.0 + i, ts=now - timedelta(minutes=5 * (4 - i)))
+
+    prices = db.get_price_windows(ids, minutes=10)
+    assert sorted(prices) == ids[:2]  # symbols without rows are omitted
+    for sid in ids[:2]:
+        ts, vals = prices[sid]
+        assert ts.dtype == np.int64 and vals.dtype == np.float64 and vals.flags["C_CONTIGUOUS"]
+        single_ts, single_vals = db.get_price_window(sid, minutes=10)
+        assert ts.tolist() == single_ts.tolist() and vals.tolist() == single_vals.tolist()
+    oi = db.get_oi_windows(ids, minutes=30)
+    assert oi[ids[1]][1].tolist() == db.get_oi_window(ids[1], minutes=30)[1].tolist()
+
+    # Tick buffer still warming up: persisted history first, then buffered ticks
+    buf = TickBuffer(capacity=16, resolution_seconds=0.0)
+    db.attach_tick_buffer(buf)
+    buf.append(ids[0], 99.0, time.time())
+    assert db.get_price_windows(ids, minutes=10)[ids[0]][1].tolist() == [10.0, 11.0, 12.0, 13.0, 99.0]
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+websockets = pytest.importorskip("websockets")
+
+from bybit_trading_bot.handlers.async_stream import AsyncStreamClient
+from bybit_trading_bot.handlers.private_stream import PrivateStreamHandler
+from bybit_trading_bot.simulator.exchange import INSUFFICIENT_BALANCE_SPOT, SimExchange
+from bybit_trading_bot.simulator.server import SimulatorServer
+from bybit_trading_bot.utils import endpoints
+
+
+def _wait(pred, timeout: float = 5.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if pred():
+            return True
+        time.sleep(0.02)
+    return pred()
+
+
+def test_spot_limit_rests_then_fills_and_triggers_take_profit():
+    ex = SimExchange(["BTCUSDT"], quote_balance=1000.0, history_minutes=10, seed=1)
+    ex.on_trade("BTCUSDT", 100.0, 1.0, "Buy")
+    events = []
+    ex.add_private_listener(lambda topic, rows: events.append((topic, rows[0].get("orderStatus"))))
+
+    code, _, res = ex.place_order(category="spot", symbol="BTCUSDT", side="Buy", orderType="Limit", qty="2", price="95", takeProfit="110", stopLoss="90")
+    assert code == 0
+    assert [o["orderId"] for o in ex.get_open_orders("spot")[2]["list"]] == [res["orderId"]]
+
+    ex.on_trade("BTCUSDT", 94.0, 1.0, "Sell")
+    assert ex.get_order_history("spot", orderId=res["orderId"])[2]["list"][0]["orderStatus"] == "Filled"
+    assert ex.balances["BTC"] == pytest.approx(2.0)
+    statuses = {o["stopOrderType"]: o["orderStatus"] for o in ex.get_open_orders("spot")[2]["list"]}
+    assert statuses == {"TakeProfit": "Untriggered", "StopLoss": "Untriggered"}
+
+    ex.on_trade("BTCUSDT", 111.0, 1.0, "Buy")
+    assert ex.get_open_orders("spot")[2]["list"] == []
+    assert ex.balances["BTC"] == pytest.approx(0.0)
+    assert ("order", "Deactivated") in events and ("execution", None) in events
+
+    code, msg, _ = ex.place_order(category="spot", symbol="BTCUSDT", side="Buy", orderType="Market", qty="1000000")
+    assert code == INSUFFICIENT_BALANCE_SPOT
+
+
+def test_linear_position_pnl_and_trading_stop():
+    ex = SimExchange(["ETHUSDT"], quote_balance=1000.0, history_minutes=10, seed=2)
+    ex.on_trade("ETHUSDT", 100.0, 1.0, "Buy")
+    ex.place_order(category="linear", symbol="ETHUSDT", side="Buy", orderType="Market", qty="1")
+    pos = ex.get_positions("linear", "ETHUSDT")[2]["list"][0]
+    assert pos["side"] == "Buy" and float(pos["size"]) == 1.0
+
+    assert ex.set_trading_stop(category="linear", symbol="ETHUSDT", takeProfit="120")[0] == 0
+    before = ex.balances["USDT"]
+    ex.on_trade("ETHUSDT", 121.0, 1.0, "Buy")
+    pos = ex.get_positions("linear", "ETHUSDT")[2]["list"][0]
+    assert float(pos["size"]) == 0.0
+    assert ex.balances["USDT"] > before
+
+
+def test_clients_run_against_local_server():
+    ex = SimExchange(["BTCUSDT", "ETHUSDT"], history_minutes=30, seed=3)
+    server = SimulatorServer(ex, rest_port=0, ws_port=0, rate=50.0)
+    server.start()
+    endpoints.set_endpoints(server.rest_url, server.ws_url)
+    stream = None
+    client = None
+    try:
+        http = endpoints.HTTP(testnet=False, api_key="k", api_secret="s")
+        assert http.endpoint == server.rest_url
+        assert len(http.get_tickers(category="spot")["result"]["list"]) == 2
+        assert len(http.get_kline(category="linear", symbol="BTCUSDT", interval="5", limit=3)["result"]["list"]) == 3
+
+        client = AsyncStreamClient("spot", testnet=False)
+        assert client.url == f"{server.ws_url}/v5/public/spot"
+        got = []
+        client.subscribe(["tickers.BTCUSDT", "orderbook.50.ETHUSDT"], got.append)
+        assert _wait(lambda: {m["topic"] for m in got} == {"tickers.BTCUSDT", "orderbook.50.ETHUSDT"})
+        assert next(m for m in got if m["topic"].startswith("orderbook"))["type"] == "snapshot"
+
+        stream = PrivateStreamHandler(False, "k", "s")
+        assert stream.start()
+        assert _wait(lambda: stream.is_live)
+        time.sleep(0.2)  # auth + subscribe acks
+        oid = http.place_order(category="spot", symbol="BTCUSDT", side="Buy", orderType="Market", qty="100")["result"]["orderId"]
+        row = stream.store.wait_for_order(oid, timeout=5.0)
+        assert row is not None and row["orderStatus"] == "Filled"
+        assert _wait(lambda: stream.store.get_coin("USDT") is not None)
+    finally:
+        if stream is not None:
+            stream.stop()
+        if client is not None:
+            client.stop()
+        endpoints.set_endpoints()
+        server.stop()
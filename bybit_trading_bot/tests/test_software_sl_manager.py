@@ -28,7 +28,7 @@ class TestSoftwareSLManager(unittest.TestCase):
         rec = Mock()
         rec.id = 1
         rec.spot_symbol = "BTCUSDT"
-        self.db.get_active_symbols.return_value = [rec]
+        self.db.get_symbol_by_spot.return_value = rec
         self.db.get_last_price.return_value = 123.45
 
         p1 = self.sl_manager.get_current_price("BTCUSDT")
@@ -43,7 +43,7 @@ class TestSoftwareSLManager(unittest.TestCase):
         rec = Mock()
         rec.id = 1
         rec.spot_symbol = "BTCUSDT"
-        self.db.get_active_symbols.return_value = [rec]
+        self.db.get_symbol_by_spot.return_value = rec
         self.db.get_last_price.return_value = 48000.0
 
         # Stub order manager close called via SoftwareSLManager._execute_sl_exit
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from bybit_trading_bot.utils.db_manager import DBManager
+
+
+def test_symbol_lookups_are_cached_until_table_changes(tmp_path):
+    path = str(tmp_path / "db.sqlite")
+    db = DBManager(path)
+    btc = db.upsert_symbol("BTCUSDT", "BTCUSDT")
+    eth = db.upsert_symbol("ETHUSDT", "ETHUSDT")
+
+    assert db.get_symbol_by_spot("BTCUSDT").id == btc
+    assert db.get_symbol_by_futures("ETHUSDT").id == eth
+    assert db.get_symbol_by_id(eth).spot_symbol == "ETHUSDT"
+    loads = db._symbols.loads
+
+    # Re-upserting an unchanged symbol does not invalidate the snapshot
+    db.upsert_symbol("BTCUSDT", "BTCUSDT")
+    db.get_active_symbols()
+    assert db._symbols.loads == loads
+
+    # A second manager on the same file shares the registry and sees changes
+    other = DBManager(path)
+    other.set_symbol_active("ETHUSDT", False)
+    assert db.get_symbol_by_spot("ETHUSDT") is None
+    assert db.get_symbol_by_spot("ETHUSDT", include_inactive=True).id == eth
+    assert db.get_symbol_id("ETHUSDT") == eth
+    assert [r.spot_symbol for r in db.get_active_symbols()] == ["BTCUSDT"]
+    assert db._symbols.loads == loads + 1
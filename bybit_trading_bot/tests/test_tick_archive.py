@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import numpy as np
+
+from bybit_trading_bot.utils.tick_archive import TICK_DTYPE, TickArchive, TickArchiver
+
+
+DAY_MS = 86_400_000
+
+
+def test_archive_appends_grows_and_reads_zero_copy(tmp_path):
+    root = str(tmp_path / "ticks")
+    archiver = TickArchiver(root, initial_records=4)
+    base = 20_000 * DAY_MS
+    for i in range(10):
+        archiver.append("BTCUSDT", base + i * 1000, 100.0 + i, 0.5, "Buy" if i % 2 == 0 else "Sell")
+    archiver.append("BTCUSDT", (base + 1500) / 1000.0, 99.0, 1.0, None)  # seconds are accepted too
+
+    archive = TickArchive(root)
+    # Readers see published records while the writer still has the file open
+    live = archive.read_day("BTCUSDT", archive.days("BTCUSDT")[0])
+    assert len(live) == 11
+    archiver.close()
+
+    recs = archive.read_range("BTCUSDT", base + 2000, base + 5000)
+    assert recs.dtype == TICK_DTYPE
+    assert recs["price"].tolist() == [102.0, 103.0, 104.0]
+    assert recs["side"].tolist() == [1, -1, 1]
+    assert isinstance(recs.base, np.memmap) or isinstance(recs, np.memmap)
+    assert archive.read_day("BTCUSDT", archive.days("BTCUSDT")[0])["side"][-1] == 0
+
+
+def test_archive_rolls_over_by_utc_day(tmp_path):
+    root = str(tmp_path / "ticks")
+    archiver = TickArchiver(root)
+    base = 20_000 * DAY_MS
+    archiver.append("ETHUSDT", base + DAY_MS - 1, 10.0, 1.0, "Sell")
+    archiver.append("ETHUSDT", base + DAY_MS, 11.0, 2.0, "Buy")
+    archiver.close()
+
+    archive = TickArchive(root)
+    assert len(archive.days("ETHUSDT")) == 2
+    assert archive.read_range("ETHUSDT", base, base + 2 * DAY_MS)["price"].tolist() == [10.0, 11.0]
+    assert archive.symbols() == ["ETHUSDT"]
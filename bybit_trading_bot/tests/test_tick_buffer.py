@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import time
+
+from bybit_trading_bot.utils.db_manager import DBManager
+from bybit_trading_bot.utils.tick_buffer import PriceRingBuffer, TickBuffer
+
+
+def test_ring_buffer_wraps_and_keeps_order():
+    ring = PriceRingBuffer(capacity=4)
+    for i in range(6):
+        ring.append(float(i), 100.0 + i)
+    assert len(ring) == 4
+    ts, px = ring.since(0.0)
+    assert ts == [2.0, 3.0, 4.0, 5.0]
+    assert px == [102.0, 103.0, 104.0, 105.0]
+    assert ring.since(3.5) == ([4.0, 5.0], [104.0, 105.0])
+
+
+def test_ring_buffer_coalesces_within_resolution():
+    ring = PriceRingBuffer(capacity=8, resolution_seconds=1.0)
+    ring.append(10.1, 1.0)
+    ring.append(10.6, 2.0)
+    ring.append(11.2, 3.0)
+    assert len(ring) == 2
+    assert ring.since(0.0) == ([10.6, 11.2], [2.0, 3.0])
+
+
+def test_db_reads_prices_from_attached_buffer(tmp_path):
+    db = DBManager(str(tmp_path / "db.sqlite"))
+    sid = db.upsert_symbol("BTCUSDT", "BTCUSDT")
+    buf = TickBuffer(capacity=16, resolution_seconds=0.0)
+    db.attach_tick_buffer(buf)
+    now = time.time()
+    buf.append(sid, 100.0, now - 400.0)
+    buf.append(sid, 101.0, now - 10.0)
+    buf.append(sid, 102.0, now)
+    assert db.get_last_price(sid) == 102.0
+    assert [p for _, p in db.get_recent_price_series(sid, minutes=5)] == [101.0, 102.0]
+
+    db.insert_prices(buf.drain_latest())
+    assert buf.drain_latest() == []
+    db.attach_tick_buffer(None)
+    assert db.get_last_price(sid) == 102.0
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import threading
+
+from bybit_trading_bot.utils.tick_mailbox import TickMailbox
+
+
+def test_latest_value_wins_in_first_pending_order():
+    box = TickMailbox()
+    box.put("BTCUSDT", 1.0, 10.0)
+    box.put("ETHUSDT", 5.0, 10.5)
+    box.put("BTCUSDT", 2.0, 11.0)
+    box.put("BTCUSDT", 3.0, 12.0)
+
+    assert box.get(timeout=0) == ("BTCUSDT", 3.0, 12.0)
+    assert box.get(timeout=0) == ("ETHUSDT", 5.0, 10.5)
+    assert box.get(timeout=0.01) is None
+    stats = box.stats()
+    assert stats["coalesced"] == 2 and stats["delivered"] == 2 and stats["pending"] == 0
+
+
+def test_bounded_by_symbols_and_wakes_consumer():
+    box = TickMailbox(max_symbols=2)
+    assert box.put("A", 1.0, 1.0) and box.put("B", 1.0, 1.0)
+    assert not box.put("C", 1.0, 1.0)
+    assert box.put("A", 2.0, 2.0)  # pending symbols still refresh when full
+    assert box.stats()["dropped"] == 1 and box.qsize() == 2
+
+    box.clear()
+    got = []
+    consumer = threading.Thread(target=lambda: got.append(box.get(timeout=2.0)))
+    consumer.start()
+    box.put("D", 4.0, 4.0)
+    consumer.join(timeout=2.0)
+    assert got == [("D", 4.0, 4.0)]
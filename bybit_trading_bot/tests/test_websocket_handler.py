@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from bybit_trading_bot.handlers import websocket_handler as wsh
+
+
+class FakeSocket:
+    """Records subscribe frames like pybit: one frame per call, one callback per topic."""
+
+    frames = []
+    lock = threading.Lock()
+
+    def __init__(self, testnet: bool = False, channel_type: str = "spot") -> None:
+        self.callbacks = {}
+
+    def ticker_stream(self, symbol, callback) -> None:
+        symbols = symbol if isinstance(symbol, list) else [symbol]
+        with FakeSocket.lock:
+            FakeSocket.frames.append(list(symbols))
+        for s in symbols:
+            self.callbacks[f"tickers.{s}"] = callback
+
+    def orderbook_stream(self, depth, symbol, callback) -> None:
+        for s in symbol if isinstance(symbol, list) else [symbol]:
+            self.callbacks[f"orderbook.{depth}.{s}"] = callback
+
+    def trade_stream(self, symbol, callback) -> None:
+        for s in symbol if isinstance(symbol, list) else [symbol]:
+            self.callbacks[f"publicTrade.{s}"] = callback
+
+
+def test_tickers_are_batched_per_frame_and_time_to_live_is_measured(monkeypatch):
+    FakeSocket.frames = []
+    monkeypatch.setattr(wsh, "WebSocket", FakeSocket)
+    handler = wsh.WebSocketHandler(testnet=False)
+    handler._shard_size = 25
+    handler._subscribe_delay_per_frame = 0.0
+    symbols = [f"S{i}USDT" for i in range(60)]
+
+    handler._create_sharded_sockets_and_subscribe(symbols, on_ticker=None)
+
+    assert len(handler._sockets) == 3
+    assert sorted(len(f) for f in FakeSocket.frames) == [5, 5, 10, 10, 10, 10, 10]
+    assert sorted(s for f in FakeSocket.frames for s in f) == sorted(symbols)
+    stats = handler.get_subscription_stats()
+    assert stats["frames"] == 7 and stats["pending_symbols"] == 60
+
+    # First ticker message per symbol (routed by topic) completes the round
+    for ws in handler._sockets:
+        for topic, cb in ws.callbacks.items():
+            cb({"topic": topic, "data": {"lastPrice": "1.0"}})
+    stats = handler.get_subscription_stats()
+    assert stats["pending_symbols"] == 0
+    assert stats["time_to_full_subscription"] >= 0.0
+    assert handler._tick_mailboxes[0].qsize() == 60
+
+    # A second burst supersedes the pending ticks instead of queueing behind them
+    for ws in handler._sockets:
+        for topic, cb in ws.callbacks.items():
+            cb({"topic": topic, "data": {"lastPrice": "2.0"}})
+    ticks = handler.get_tick_stats()
+    assert ticks["pending"] == 60 and ticks["coalesced"] == 60
+    assert handler._tick_mailboxes[0].get(timeout=0)[1] == 2.0
+
+
+def test_orderbook_and_trades_are_balanced_across_shards(monkeypatch):
+    monkeypatch.setattr(wsh, "WebSocket", FakeSocket)
+    handler = wsh.WebSocketHandler(testnet=False)
+    handler._subscribe_delay_per_frame = 0.0
+    symbols = [f"S{i}USDT" for i in range(30)]
+    handler._create_sharded_sockets_and_subscribe(symbols, on_ticker=None)
+    assert len(handler._sockets) == 3
+
+    books = []
+    handler.subscribe_orderbook_and_trades(
+        symbols, on_orderbook=lambda *a: books.append(a[0]), on_trade=lambda *a: None
+    )
+    per_shard = [sum(1 for t in ws.callbacks if t.startswith("orderbook.")) for ws in handler._sockets]
+    assert per_shard == [10, 10, 10]
+
+    ws = handler._sockets[1]
+    topic = next(t for t in ws.callbacks if t.startswith("orderbook."))
+    symbol = topic.rsplit(".", 1)[1]
+    ws.callbacks[topic]({"topic": topic, "type": "snapshot", "data": {"s": symbol, "b": [["1.0", "2"]], "a": [["1.1", "3"]], "u": 5}})
+    assert books == [symbol]
+    assert handler.books.get(symbol).best_ask == 1.1
+    stats = handler.get_shard_stats()
+    assert [st["messages"] for st in stats] == [0, 1, 0]
+    assert all(st["topics"] == 10 for st in stats)
+
+    # A shard past its expected-rate budget spills onto a new socket
+    handler._max_shard_rate = 280.0
+    handler.subscribe_orderbook_and_trades(["NEWUSDT"], on_orderbook=lambda *a: None)
+    assert len(handler._sockets) == 4
+    assert "orderbook.50.NEWUSDT" in handler._sockets[3].callbacks
+
+
+def test_tick_workers_pin_symbols_and_isolate_slow_callbacks():
+    handler = wsh.WebSocketHandler(testnet=False, tick_workers=4)
+    slow = "S0USDT"
+    slow_worker = handler._tick_worker_of(slow)
+    assert all(handler._tick_worker_of(slow) == slow_worker for _ in range(5))
+    others = [f"S{i}USDT" for i in range(1, 40) if handler._tick_worker_of(f"S{i}USDT") != slow_worker]
+
+    release = threading.Event()
+    seen = []
+    lock = threading.Lock()
+
+    def on_ticker(symbol, price, ts):
+        if symbol == slow:
+            release.wait(5.0)
+        with lock:
+            seen.append(symbol)
+
+    handler._on_ticker = on_ticker
+    handler._start_tick_consumers()
+    try:
+        handler._on_raw_ticker({"data": {"lastPrice": "1"}}, slow, None)
+        for sym in others:
+            handler._on_raw_ticker({"data": {"lastPrice": "1"}}, sym, None)
+        deadline = time.time() + 5.0
+        while time.time() < deadline and len(seen) < len(others):
+            time.sleep(0.01)
+        # Everything not sharing the slow symbol's worker went through while it was blocked
+        assert sorted(seen) == sorted(others)
+    finally:
+        release.set()
+        handler.stop()
+
+    workers = handler.get_worker_stats()
+    assert len(workers) == 4
+    assert sum(w["callback_ms"]["count"] for w in workers) >= len(others)
+    assert handler.get_tick_stats()["delivered"] == len(others) + 1
+
+
+def test_silent_shard_is_reconnected_alone(monkeypatch):
+    monkeypatch.setattr(wsh, "WebSocket", FakeSocket)
+    handler = wsh.WebSocketHandler(testnet=False)
+    handler._subscribe_delay_per_frame = 0.0
+    symbols = [f"S{i}USDT" for i in range(30)]
+    handler._create_sharded_sockets_and_subscribe(symbols, on_ticker=None)
+    handler.subscribe_orderbook_and_trades(symbols, on_orderbook=lambda *a: None, on_trade=lambda *a: None)
+    before = list(handler._sockets)
+    old_topics = set(before[1].callbacks)
+
+    handler._shard_last_msg[1] -= handler._shard_stale_seconds + 1
+    handler._check_shard_health()
+
+    assert handler._sockets[0] is before[0] and handler._sockets[2] is before[2]
+    assert handler._sockets[1] is not before[1]
+    assert set(handler._sockets[1].callbacks) == old_topics
+    assert [st["reconnects"] for st in handler.get_shard_stats()] == [0, 1, 0]
+
+    # Still silent after the reconnect: the next attempt waits for the backoff instead of looping
+    handler._shard_last_msg[1] -= handler._shard_stale_seconds + 1
+    assert handler._dead_shards(time.time()) == []
+
+
+def test_failed_shard_open_keeps_its_slot_and_is_reopened(monkeypatch):
+    opens = []
+
+    class FlakySocket(FakeSocket):
+        def __init__(self, testnet: bool = False, channel_type: str = "spot") -> None:
+            with FakeSocket.lock:
+                opens.append(1)
+                if len(opens) == 2:
+                    raise ConnectionError("handshake timed out")
+            super().__init__(testnet, channel_type)
+
+    monkeypatch.setattr(wsh, "WebSocket", FlakySocket)
+    handler = wsh.WebSocketHandler(testnet=False)
+    handler._subscribe_delay_per_frame = 0.0
+    handler._max_parallel_shards = 1
+    symbols = [f"S{i}USDT" for i in range(30)]
+    opens.clear()
+    handler._create_sharded_sockets_and_subscribe(symbols, on_ticker=None)
+
+    # Shard indexes stay positional: the failed shard is a None slot, not shifted away
+    assert len(handler._sockets) == 3 and handler._sockets[1] is None
+    assert handler._dead_shards(time.time()) == [1]
+
+    handler._check_shard_health()
+    assert handler._sockets[1] is not None
+    assert set(handler._sockets[1].callbacks) == {f"tickers.{s}" for s in symbols[10:20]}
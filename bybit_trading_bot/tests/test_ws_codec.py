@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+
+from bybit_trading_bot.handlers.futures_ws import FuturesWS
+from bybit_trading_bot.utils import ws_codec
+
+
+class PybitLikeSocket:
+    def __init__(self) -> None:
+        self.callback_directory = {}
+        self.generic = []
+
+    def _on_message(self, raw) -> None:
+        self.generic.append(json.loads(raw))
+
+
+def test_fast_path_routes_topics_and_leaves_control_frames_to_pybit():
+    ws = PybitLikeSocket()
+    got = []
+    ws.callback_directory["tickers.BTCUSDT"] = got.append
+    assert ws_codec.install_fast_path(ws)
+
+    ws._on_message(json.dumps({"topic": "tickers.BTCUSDT", "ts": 5, "data": {"symbol": "BTCUSDT", "lastPrice": "101.5"}}))
+    ws._on_message(json.dumps({"op": "pong", "success": True}))
+    assert ws_codec.decode_ticker(got[0]) == ws_codec.Ticker("BTCUSDT", 101.5, 5.0)
+    assert ws.generic == [{"op": "pong", "success": True}]
+
+
+def test_decoders_read_v5_layouts():
+    trades = ws_codec.decode_trades(
+        {"topic": "publicTrade.ETHUSDT", "data": [{"T": 7, "s": "ETHUSDT", "S": "Sell", "v": "0.5", "p": "2000"}]}
+    )
+    assert trades == [ws_codec.Trade("ETHUSDT", 2000.0, 0.5, 7.0, "Sell")]
+    book = ws_codec.decode_book({"topic": "orderbook.50.ETHUSDT", "type": "snapshot", "data": {"s": "ETHUSDT", "b": [], "a": []}})
+    assert (book.symbol, book.type) == ("ETHUSDT", "snapshot")
+    # Linear ticker deltas without lastPrice carry no price update
+    assert ws_codec.decode_ticker({"topic": "tickers.ETHUSDT", "data": {"symbol": "ETHUSDT", "openInterest": "5"}}) is None
+
+    k = FuturesWS._extract_kline({
+        "topic": "kline.5.ETHUSDT",
+        "data": [{"start": 0, "end": 299999, "open": "1", "high": "2", "low": "0.5", "close": "1.5", "volume": "10", "confirm": False}],
+    })
+    assert k["close"] == 1.5 and k["confirm"] is True  # end is long past
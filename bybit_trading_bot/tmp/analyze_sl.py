@@ -3,6 +3,8 @@ from datetime import datetime, timedelta
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB = os.path.abspath(os.path.join(BASE_DIR, '..', 'storage', 'database.sqlite'))
+# price_data / oi_data live in the series file MarketMonitor writes to (see SERIES_DATABASE_PATH)
+SERIES_DB = os.path.abspath(os.getenv('SERIES_DATABASE_PATH', os.path.join(os.path.dirname(DB), 'market_series.sqlite')))
 res = {'error': None, 'rows': []}
 
 parser = argparse.ArgumentParser()
@@ -22,6 +24,10 @@ try:
         conn = sqlite3.connect(DB)
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
+        series = 'main'
+        if SERIES_DB != DB and os.path.exists(SERIES_DB):
+            cur.execute("ATTACH DATABASE ? AS series", (SERIES_DB,))
+            series = 'series'
 
         trades: list[dict] = []
         if args.trade_id is not None:
@@ -82,16 +88,16 @@ ORDER BY datetime(timestamp) DESC LIMIT 1
             start = (created - timedelta(minutes=20)).isoformat() if created else None
             end = (closed + timedelta(minutes=10)).isoformat() if closed else None
 
-            cur.execute("""
-SELECT timestamp, price FROM price_data
+            cur.execute(f"""
+SELECT timestamp, price FROM {series}.price_data
 WHERE symbol_id = ? AND timestamp BETWEEN ? AND ?
 ORDER BY timestamp ASC
             """, (symbol_id, start, end))
             prices = [(r['timestamp'], float(r['price'])) for r in cur.fetchall()]
 
-            cur.execute("""
+            cur.execute(f"""
 SELECT timestamp, COALESCE(oi_value, open_interest) AS oi
-FROM oi_data
+FROM {series}.oi_data
 WHERE symbol_id = ? AND timestamp BETWEEN ? AND ?
 ORDER BY timestamp ASC
             """, (symbol_id, start, end))
@@ -132,15 +138,15 @@ ORDER BY timestamp ASC
             # Find immediate 5m pre-entry deltas
             pre_start = (created - timedelta(minutes=5)).isoformat() if created else None
             pre_end = created.isoformat() if created else None
-            cur.execute("""
-SELECT timestamp, price FROM price_data WHERE symbol_id = ? AND timestamp BETWEEN ? AND ? ORDER BY timestamp ASC
+            cur.execute(f"""
+SELECT timestamp, price FROM {series}.price_data WHERE symbol_id = ? AND timestamp BETWEEN ? AND ? ORDER BY timestamp ASC
             """, (symbol_id, pre_start, pre_end))
             pre_prices = [float(r['price']) for r in cur.fetchall()]
             pre_price_chg = None
             if len(pre_prices) >= 2 and pre_prices[0] > 0:
                 pre_price_chg = (pre_prices[-1]/pre_prices[0]-1.0)*100.0
-            cur.execute("""
-SELECT timestamp, COALESCE(oi_value, open_interest) AS oi FROM oi_data WHERE symbol_id = ? AND timestamp BETWEEN ? AND ? ORDER BY timestamp ASC
+            cur.execute(f"""
+SELECT timestamp, COALESCE(oi_value, open_interest) AS oi FROM {series}.oi_data WHERE symbol_id = ? AND timestamp BETWEEN ? AND ? ORDER BY timestamp ASC
             """, (symbol_id, pre_start, pre_end))
             pre_ois = [float(r['oi']) for r in cur.fetchall() if r['oi'] is not None]
             pre_oi_chg = None
@@ -0,0 +1,57 @@
+"""Offline load test: public ticker stream from the local simulator into AsyncStreamClient.
+
+Starts SimulatorServer on free ports with N symbols at R trades/s each, subscribes tickers for
+every symbol and reports offered vs. received messages/sec.
+
+Usage: python bybit_trading_bot/tmp/bench_sim_stream.py [symbols] [rate] [seconds]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from bybit_trading_bot.handlers.async_stream import AsyncStreamClient
+from bybit_trading_bot.simulator.exchange import SimExchange, default_symbols
+from bybit_trading_bot.simulator.server import SimulatorServer
+
+
+def main(n_symbols: int = 500, rate: float = 10.0, seconds: float = 10.0) -> None:
+    symbols = default_symbols(n_symbols)
+    server = SimulatorServer(SimExchange(symbols, history_minutes=60, seed=1), rest_port=0, ws_port=0, rate=rate)
+    server.start()
+    received = [0]
+    lock = threading.Lock()
+
+    def _on_msg(_msg: dict) -> None:
+        with lock:
+            received[0] += 1
+
+    client = AsyncStreamClient("spot", url=f"{server.ws_url}/v5/public/spot", topics_per_shard=200)
+    try:
+        client.subscribe([f"tickers.{s}" for s in symbols], _on_msg)
+        time.sleep(1.0)  # let every shard connect and subscribe
+        r0, f0, t0 = received[0], server.stats().get("frames", 0), time.perf_counter()
+        time.sleep(seconds)
+        elapsed = time.perf_counter() - t0
+        got = (received[0] - r0) / elapsed
+        offered = (server.stats().get("frames", 0) - f0) / elapsed
+        print(f"symbols={n_symbols} rate={rate:g}/s target={n_symbols * rate:,.0f} msg/s")
+        print(f"offered:  {offered:>10,.0f} msg/s")
+        print(f"received: {got:>10,.0f} msg/s  shards={client.stats()['shards']}")
+    finally:
+        client.stop()
+        server.stop()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 500,
+        float(args[1]) if len(args) > 1 else 10.0,
+        float(args[2]) if len(args) > 2 else 10.0,
+    )
@@ -0,0 +1,143 @@
+"""Micro-benchmark: WS frame decode + dispatch + parse, messages/sec on one core.
+
+before: stdlib json.loads, pybit-style control-frame checks and callback lookup,
+        then the old key-probing parsers (lastPrice/lp/price, p/price, ...)
+after:  ws_codec fast decoder (orjson/msgspec when installed), topic lookup,
+        typed per-topic decoders
+
+Usage: python bybit_trading_bot/tmp/bench_ws_decode.py [messages]
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from bybit_trading_bot.utils.ws_codec import JSON_BACKEND, decode_book, decode_ticker, decode_trades, loads
+
+
+def _frames(n_symbols: int = 50) -> List[str]:
+    out: List[str] = []
+    for i in range(n_symbols):
+        sym = f"SYM{i}USDT"
+        out.append(json.dumps({
+            "topic": f"tickers.{sym}", "ts": 1700000000000, "type": "snapshot", "cs": 123,
+            "data": {"symbol": sym, "lastPrice": "1.2345", "highPrice24h": "1.3", "lowPrice24h": "1.1",
+                     "prevPrice24h": "1.2", "volume24h": "123456.7", "turnover24h": "150000.1", "price24hPcnt": "0.0287",
+                     "usdIndexPrice": "1.2344"},
+        }))
+        out.append(json.dumps({
+            "topic": f"publicTrade.{sym}", "ts": 1700000000001, "type": "snapshot",
+            "data": [{"i": "2290000000000000001", "T": 1700000000001, "p": "1.2346", "v": "12.5", "S": "Buy", "s": sym, "BT": False}],
+        }))
+        out.append(json.dumps({
+            "topic": f"orderbook.50.{sym}", "ts": 1700000000002, "type": "delta",
+            "data": {"s": sym, "b": [["1.2344", "100"], ["1.2340", "0"]], "a": [["1.2347", "80"]], "u": 1000 + i, "seq": 5000 + i},
+            "cts": 1700000000000,
+        }))
+    return out
+
+
+# ---- before ----
+def _legacy_price(message) -> float | None:
+    data = message.get("data") or message.get("result") or message
+    if isinstance(data, dict):
+        lp = data.get("lastPrice") or data.get("lp") or data.get("price")
+        if lp is not None:
+            try:
+                return float(lp)
+            except Exception:
+                return None
+    return None
+
+
+def _legacy_trades(message) -> int:
+    n = 0
+    data = message.get("data") or message.get("result") or message
+    rows = data if isinstance(data, list) else (data.get("list") or data.get("data") or [])
+    for row in rows:
+        try:
+            float(row.get("p") or row.get("price"))
+            float(row.get("v") or row.get("size") or row.get("qty") or 0.0)
+            float(row.get("T") or row.get("ts") or 0.0)
+            side_field = row.get("S") or row.get("side")
+            if isinstance(side_field, str) and side_field.strip().lower() in {"buy", "sell"}:
+                side_field.strip().lower().capitalize()
+            n += 1
+        except Exception:
+            continue
+    return n
+
+
+def _legacy_book(message) -> int:
+    data = message.get("data") or message.get("result") or message
+    levels = 0
+    for key in (("b", "bid", "bids"), ("a", "ask", "asks")):
+        rows = data.get(key[0]) or data.get(key[1]) or data.get(key[2])
+        for row in rows or []:
+            try:
+                float(row[0])
+                float(row[1])
+                levels += 1
+            except Exception:
+                continue
+    return levels
+
+
+def _pybit_like_dispatch(raw: str, directory: Dict[str, Callable]) -> None:
+    message = json.loads(raw)
+    if message.get("op") == "pong" or message.get("ret_msg") == "pong":
+        return
+    if message.get("op") == "auth" or message.get("type") == "AUTH_RESP":
+        return
+    if message.get("op") in ("subscribe", "unsubscribe") or message.get("type") == "COMMAND_RESP":
+        return
+    directory[message["topic"]](message)
+
+
+# ---- after ----
+def _fast_dispatch(raw: str, directory: Dict[str, Callable]) -> None:
+    msg = loads(raw)
+    cb = directory.get(msg.get("topic"))
+    if cb is not None:
+        cb(msg)
+
+
+def _directory(frames: List[str], fast: bool) -> Dict[str, Callable]:
+    d: Dict[str, Callable] = {}
+    for raw in frames:
+        topic = json.loads(raw)["topic"]
+        kind = topic.partition(".")[0]
+        if kind == "tickers":
+            d[topic] = decode_ticker if fast else _legacy_price
+        elif kind == "publicTrade":
+            d[topic] = decode_trades if fast else _legacy_trades
+        else:
+            d[topic] = decode_book if fast else _legacy_book
+    return d
+
+
+def _run(frames: List[str], n: int, dispatch, directory) -> float:
+    m = len(frames)
+    t0 = time.perf_counter()
+    for i in range(n):
+        dispatch(frames[i % m], directory)
+    return n / (time.perf_counter() - t0)
+
+
+def main(n: int = 300_000) -> None:
+    frames = _frames()
+    before = _run(frames, n, _pybit_like_dispatch, _directory(frames, fast=False))
+    after = _run(frames, n, _fast_dispatch, _directory(frames, fast=True))
+    print(f"decoder backend: {JSON_BACKEND}")
+    print(f"before: {before:>12,.0f} msg/s/core")
+    print(f"after:  {after:>12,.0f} msg/s/core  ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300_000)
@@ -3,12 +3,13 @@ from __future__ import annotations
 import os
 import sys
 from datetime import datetime, timedelta
-from typing import List, Tuple
+from typing import List
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 from bybit_trading_bot.config.settings import load_settings
-from bybit_trading_bot.utils.db_manager import DBManager
+from bybit_trading_bot.utils.db_manager import DBManager, to_epoch_ms
+from bybit_trading_bot.utils.tick_archive import TickArchive
 from bybit_trading_bot.momentum_enhancements.momentum_gradient import GradientMomentumDetector
 from bybit_trading_bot.momentum_enhancements.momentum_exhaustion import MomentumExhaustionDetector
 from bybit_trading_bot.indicators.technical import calculate_rsi
@@ -16,7 +17,7 @@ from bybit_trading_bot.indicators.technical import calculate_rsi
 
 def analyze_now(minutes: int = 10, top_n: int = 12) -> None:
     cfg = load_settings()
-    db = DBManager(cfg.database_path)
+    archive = TickArchive(cfg.tick_archive_dir)
     det = GradientMomentumDetector(cfg)
     ex = MomentumExhaustionDetector(cfg)
 
@@ -24,18 +25,26 @@ def analyze_now(minutes: int = 10, top_n: int = 12) -> None:
     since = now - timedelta(minutes=max(5, minutes))
 
     rows = []
-    try:
-        symbols = db.get_active_symbols()
-    except Exception:
-        symbols = []
+    # Trades come from the mmap tick archive (zero-copy NumPy views); SQLite only if the archive is empty
+    symbols = archive.symbols()
+    db = None
+    if not symbols:
+        db = DBManager(cfg.database_path, series_path=cfg.series_database_path)
+        try:
+            symbols = [rec.spot_symbol for rec in db.get_active_symbols()]
+        except Exception:
+            symbols = []
+    since_ms = to_epoch_ms(since)
 
-    for rec in symbols:
+    for symbol in symbols:
         try:
-            ps: List[Tuple[str, float]] = db.get_recent_price_data(rec.id, since)
-            if len(ps) < 6:
+            if db is None:
+                prices = archive.read_range(symbol, since_ms)["price"].tolist()
+            else:
+                rec = db.get_symbol_by_spot(symbol)
+                prices = db.get_price_window(rec.id, minutes=max(5, minutes))[1].tolist() if rec else []
+            if len(prices) < 6:
                 continue
-            # series as tuples (ts_iso, price)
-            prices = [p for (_, p) in ps]
             grad, acc = det.calculate_momentum_gradient([(i, p) for i, p in enumerate(prices)])
             # exhaustion inputs
             rsi_val = None
@@ -69,7 +78,7 @@ def analyze_now(minutes: int = 10, top_n: int = 12) -> None:
                 early_ok = False
 
             rows.append({
-                "symbol": rec.spot_symbol,
+                "symbol": symbol,
                 "grad": grad,
                 "acc": acc,
                 "rsi": rsi_val,
@@ -89,9 +98,10 @@ def analyze_now(minutes: int = 10, top_n: int = 12) -> None:
     print(f"Snapshot @ {now.isoformat(sep=' ', timespec='seconds')} | window={minutes}m | candidates={len(rows)} | allowed={len(allowed)} | blocked={len(blocked)}")
     print("Top candidates:")
     for r in rows[:top_n]:
+        bodyx = f"{r['body_ratio']:.2f}" if r["body_ratio"] else "NA"
         print(
             f"{r['symbol']:<12} grad={r['grad']:.4f} acc={r['acc'] if r['acc'] is not None else 'NA'} "
-            f"rsi={r['rsi'] if r['rsi'] is not None else 'NA'} bodyx={r['body_ratio']:.2f if r['body_ratio'] else 'NA'} "
+            f"rsi={r['rsi'] if r['rsi'] is not None else 'NA'} bodyx={bodyx} "
             f"blocks={'/'.join([k for k,v in [('RSI',r['rsi_block']),('Candle',r['candle_block'])] if v]) or '-'} "
             f"early_ok={r['early_ok']}"
         )
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from bybit_trading_bot.utils.http_client import RateLimitedHTTP, endpoint_class
+
+try:
+    import aiohttp
+except Exception:  # pragma: no cover - optional dependency (requirements.txt)
+    aiohttp = None  # type: ignore
+
+
+# pybit method name -> (HTTP verb, v5 path, signed)
+ROUTES: Dict[str, Tuple[str, str, bool]] = {
+    "get_server_time": ("GET", "/v5/market/time", False),
+    "get_tickers": ("GET", "/v5/market/tickers", False),
+    "get_instruments_info": ("GET", "/v5/market/instruments-info", False),
+    "get_kline": ("GET", "/v5/market/kline", False),
+    "get_orderbook": ("GET", "/v5/market/orderbook", False),
+    "place_order": ("POST", "/v5/order/create", True),
+    "cancel_order": ("POST", "/v5/order/cancel", True),
+    "get_open_orders": ("GET", "/v5/order/realtime", True),
+    "get_order_history": ("GET", "/v5/order/history", True),
+    "get_positions": ("GET", "/v5/position/list", True),
+    "set_leverage": ("POST", "/v5/position/set-leverage", True),
+    "set_trading_stop": ("POST", "/v5/position/trading-stop", True),
+    "get_wallet_balance": ("GET", "/v5/account/wallet-balance", True),
+}
+
+
+class AsyncRateLimitedHTTP(RateLimitedHTTP):
+    """Signed Bybit v5 REST over aiohttp with RateLimitedHTTP's limits and retry semantics.
+
+    - `await request(method_name, **params)` takes pybit method names and returns the JSON body
+    - Waits for tokens / quota resets and backs off with asyncio.sleep, so the loop never blocks
+    - Shares buckets, learned header limits and usage counters when built by RestClientRegistry
+    - One aiohttp session per client, opened lazily on the running loop; close() it on shutdown
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str = "",
+        api_secret: str = "",
+        recv_window: int = 5000,
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        **limits: Any,
+    ) -> None:
+        super().__init__(None, **limits)
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is not installed")
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key or ""
+        self.api_secret = api_secret or ""
+        self.recv_window = int(recv_window)
+        self.timeout = float(timeout)
+        self.max_connections = max(1, int(max_connections))
+        self._session: Optional[Any] = None
+
+    async def _get_session(self) -> Any:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=30),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"Content-Type": "application/json", "Accept": "application/json"},
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    # ---- Rate limiting ----
+    @staticmethod
+    async def _wait_for(try_acquire: Callable[[], float]) -> float:
+        waited = 0.0
+        while True:
+            sleep_time = try_acquire()
+            if sleep_time <= 0.0:
+                return waited
+            await asyncio.sleep(sleep_time)
+            waited += sleep_time
+
+    async def _acquire_token_async(self, method_name: str) -> None:
+        """Async twin of _acquire_token; pair with header_limiter.release() once the response is in."""
+        cls = endpoint_class(method_name)
+        waited = await self._wait_for(self._cap.try_acquire) if self._cap is not None else 0.0
+        if not self.header_limiter.knows(method_name):
+            waited += await self._wait_for(self._buckets.get(cls, self._bucket).try_acquire)
+        before = waited
+        waited += await self._wait_for(lambda: self.header_limiter.try_acquire(method_name, before))
+        self.usage.record(self.subsystem, cls, waited)
+
+    # ---- Signing + transport ----
+    def _auth_headers(self, payload: str) -> Dict[str, str]:
+        ts = str(int(time.time() * 1000))
+        sign = hmac.new(
+            self.api_secret.encode("utf-8"),
+            (ts + self.api_key + str(self.recv_window) + payload).encode("utf-8"),
+            hashlib.sha256,
+        ).hexdigest()
+        return {
+            "X-BAPI-API-KEY": self.api_key,
+            "X-BAPI-TIMESTAMP": ts,
+            "X-BAPI-RECV-WINDOW": str(self.recv_window),
+            "X-BAPI-SIGN": sign,
+            "X-BAPI-SIGN-TYPE": "2",
+        }
+
+    async def _send(self, method_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        verb, path, signed = ROUTES[method_name]
+        params = {k: v for k, v in params.items() if v is not None}
+        if verb == "GET":
+            payload = "&".join(f"{k}={v}" for k, v in params.items())
+            url = f"{self.base_url}{path}" + (f"?{payload}" if payload else "")
+            body = None
+        else:
+            payload = json.dumps(params, separators=(",", ":"))
+            url = f"{self.base_url}{path}"
+            body = payload
+        headers = self._auth_headers(payload) if signed else {}
+        session = await self._get_session()
+        async with session.request(verb, url, data=body, headers=headers) as resp:
+            self.header_limiter.observe(method_name, resp.headers)
+            if resp.status >= 400:
+                raise RuntimeError(f"HTTP {resp.status} from {path}: {(await resp.text())[:200]}")
+            data = await resp.json(content_type=None)
+        if isinstance(data, dict):
+            self.header_limiter.observe(method_name, None, data.get("time"))
+        return data
+
+    async def request(self, method_name: str, **kwargs) -> Any:  # type: ignore[override]
+        if method_name not in ROUTES:
+            raise ValueError(f"Unsupported async REST method: {method_name}")
+        attempt = 0
+        while True:
+            await self._acquire_token_async(method_name)
+            err: Optional[Exception] = None
+            resp = None
+            try:
+                resp = await self._send(method_name, kwargs)
+            except Exception as e:  # aiohttp errors, timeouts, HTTP 4xx/5xx
+                err = RuntimeError(f"request timeout: {method_name}") if isinstance(e, asyncio.TimeoutError) else e
+            finally:
+                self.header_limiter.release(method_name)
+
+            # Success
+            if err is None and isinstance(resp, dict) and int(resp.get("retCode", -1)) == 0:
+                return resp
+
+            delay = self._next_delay(method_name, resp, err, attempt)
+            if delay is None:
+                if err is not None:
+                    raise err
+                return resp
+            if delay > 0:
+                await asyncio.sleep(delay)
+            attempt += 1
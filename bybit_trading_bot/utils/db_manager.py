@@ -3,11 +3,20 @@ from __future__ import annotations
 import os
 import sqlite3
 import threading
+import time
+from array import array
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Iterable, List, Optional, Sequence, Tuple
+from datetime import datetime, timezone
+from typing import Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from bybit_trading_bot.utils.logger import get_logger
+from bybit_trading_bot.utils.db_pool import SQLitePool
+from bybit_trading_bot.utils.db_writer import WriteBehindWriter
+from bybit_trading_bot.utils.series_store import BulkSeries, SeriesArrays, SeriesStore, SQLiteSeriesStore
+from bybit_trading_bot.utils.tick_buffer import TickBuffer
 
 
 @dataclass(frozen=True)
@@ -18,6 +27,92 @@ class SymbolRecord:
     is_active: bool
 
 
+def to_epoch_ms(ts: datetime) -> int:
+    """Epoch milliseconds for a naive-UTC (as stored by this module) or aware datetime."""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return int(ts.timestamp() * 1000)
+
+
+@dataclass(frozen=True)
+class _SymbolSnapshot:
+    active: Tuple[SymbolRecord, ...]
+    by_id: Dict[int, SymbolRecord]
+    by_spot: Dict[str, SymbolRecord]
+    by_futures: Dict[str, SymbolRecord]
+
+
+class SymbolRegistry:
+    """Process-wide cache of the symbols table with O(1) lookups.
+
+    - One instance per database file, shared by every DBManager opened on it
+    - Loaded lazily on first access and reloaded only after invalidate()
+    - Readers get an immutable snapshot, so lookups never take a lock
+    """
+
+    _instances: Dict[str, "SymbolRegistry"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, db_path: str) -> "SymbolRegistry":
+        key = os.path.abspath(db_path)
+        with cls._instances_lock:
+            reg = cls._instances.get(key)
+            if reg is None:
+                reg = cls()
+                cls._instances[key] = reg
+            return reg
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._snapshot: Optional[_SymbolSnapshot] = None
+        self._generation = 0
+        self.loads = 0
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+
+    def snapshot(self, loader: Callable[[], List[SymbolRecord]]) -> _SymbolSnapshot:
+        snap = self._snapshot
+        if snap is not None:
+            return snap
+        with self._lock:
+            if self._snapshot is not None:
+                return self._snapshot
+            generation = self._generation
+        records = loader()
+        snap = self._build(records)
+        with self._lock:
+            # Only publish if nobody changed the table while we were reading it
+            if generation == self._generation:
+                self._snapshot = snap
+                self.loads += 1
+        return snap
+
+    @staticmethod
+    def _build(records: List[SymbolRecord]) -> _SymbolSnapshot:
+        by_id: Dict[int, SymbolRecord] = {}
+        by_spot: Dict[str, SymbolRecord] = {}
+        by_futures: Dict[str, SymbolRecord] = {}
+        for rec in records:
+            by_id[rec.id] = rec
+            # Prefer the active row when a symbol appears more than once
+            prev = by_spot.get(rec.spot_symbol)
+            if prev is None or (rec.is_active and not prev.is_active):
+                by_spot[rec.spot_symbol] = rec
+            prev = by_futures.get(rec.futures_symbol)
+            if prev is None or (rec.is_active and not prev.is_active):
+                by_futures[rec.futures_symbol] = rec
+        return _SymbolSnapshot(
+            active=tuple(r for r in records if r.is_active),
+            by_id=by_id,
+            by_spot=by_spot,
+            by_futures=by_futures,
+        )
+
+
 @dataclass(frozen=True)
 class TradeRecord:
     order_id: str
@@ -41,32 +136,85 @@ class DBManager:
     """SQLite database manager for the trading bot.
 
     - Creates schema on first use
-    - Provides thread-safe operations using a connection-per-thread model
+    - Provides thread-safe operations over a pooled single writer + read-only readers (SQLitePool)
     - Offers helpers to store and query data required by the bot
+    - Optionally hands market-data inserts to a write-behind thread (see WriteBehindWriter)
     """
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(
+        self,
+        db_path: str,
+        write_behind: bool = False,
+        write_batch_size: int = 500,
+        write_flush_interval: float = 0.25,
+        write_queue_size: int = 50000,
+        read_pool_size: int = 4,
+        series_path: Optional[str] = None,
+        series_store: Optional[SeriesStore] = None,
+    ) -> None:
         self.db_path = db_path
         self.logger = get_logger(self.__class__.__name__)
-        self._local = threading.local()
+        self._ensure_parent_directory()
+        self._pool = SQLitePool(db_path, readers=read_pool_size, configure_writer=self._configure_connection)
         self._signals_has_symbol: bool = False
         self._trades_has_symbol: bool = False
+        # Optional in-memory tick store; when attached it is the primary source for recent prices
+        self._tick_buffer: Optional[TickBuffer] = None
+        # Shared symbols cache; mutated only through upsert_symbol/set_symbol_active
+        self._symbols = SymbolRegistry.for_path(db_path)
+        # Write-behind thread for insert_price/insert_oi/insert_signal/insert_sp_signal
+        self._writer: Optional[WriteBehindWriter] = None
+        if write_behind:
+            self._writer = WriteBehindWriter(
+                self._write,
+                batch_size=write_batch_size,
+                flush_interval=write_flush_interval,
+                max_queue=write_queue_size,
+            )
+        # Background retention (see start_retention/run_retention)
+        self._retention_thread: Optional[threading.Thread] = None
+        self._retention_stop = threading.Event()
 
-        self._ensure_parent_directory()
         self._initialize_schema()
+        # Price/OI series backend: shares this file by default, or a dedicated store/file
+        if series_store is not None:
+            self.series: SeriesStore = series_store
+        elif series_path and os.path.abspath(series_path) != os.path.abspath(db_path):
+            self.series = self._open_series_file(
+                series_path,
+                read_pool_size=read_pool_size,
+                write_behind=write_behind,
+                write_batch_size=write_batch_size,
+                write_flush_interval=write_flush_interval,
+                write_queue_size=write_queue_size,
+            )
+        else:
+            shared = SQLiteSeriesStore(self._write, self._read, writer=self._writer)
+            shared.initialize_schema()
+            self.series = shared
 
     # ---- Connection management ----
-    def _get_conn(self) -> sqlite3.Connection:
-        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
-        if conn is None:
-            conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            conn.row_factory = sqlite3.Row
-            self._configure_connection(conn)
-            self._local.conn = conn
-        return conn
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Hold the single writer connection; an exception rolls back the open transaction."""
+        with self._pool.writer() as conn:
+            try:
+                yield conn
+            except BaseException:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                raise
+
+    def _read(self) -> ContextManager[sqlite3.Connection]:
+        """Check out a read-only connection (or reuse the one this thread already holds)."""
+        return self._pool.reader()
 
     def _configure_connection(self, conn: sqlite3.Connection) -> None:
         cur = conn.cursor()
+        # Only takes effect on a brand-new file; lets retention return freed pages via incremental_vacuum
+        cur.execute("PRAGMA auto_vacuum=INCREMENTAL;")
         cur.execute("PRAGMA journal_mode=WAL;")
         cur.execute("PRAGMA synchronous=NORMAL;")
         cur.execute("PRAGMA foreign_keys=ON;")
@@ -76,311 +224,334 @@ class DBManager:
         parent = os.path.dirname(os.path.abspath(self.db_path))
         os.makedirs(parent, exist_ok=True)
 
+    def _open_series_file(self, series_path: str, **kwargs) -> SeriesStore:
+        """Open a dedicated series database; until a seed commits, it is seeded with the last day of raw rows."""
+        store = SQLiteSeriesStore.open(series_path, **kwargs)
+        if not store.is_seeded():
+            try:
+                copied = store.import_recent(self.db_path, self._window_start_ms(24 * 60))
+                if copied:
+                    self.logger.info(f"Series store {series_path}: imported {copied} recent rows from {self.db_path}")
+            except Exception as e:
+                self.logger.warning(f"Series store import from {self.db_path} failed (retried on next start): {e}")
+        return store
+
     # ---- Schema ----
     def _initialize_schema(self) -> None:
-        conn = self._get_conn()
-        cur = conn.cursor()
+        with self._write() as conn:
+            cur = conn.cursor()
 
-        cur.executescript(
-            """
-            CREATE TABLE IF NOT EXISTS symbols (
-                id INTEGER PRIMARY KEY,
-                spot_symbol TEXT NOT NULL,
-                futures_symbol TEXT NOT NULL,
-                is_active BOOLEAN DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE TABLE IF NOT EXISTS price_data (
-                id INTEGER PRIMARY KEY,
-                symbol_id INTEGER,
-                price REAL NOT NULL,
-                timestamp TIMESTAMP NOT NULL,
-                FOREIGN KEY (symbol_id) REFERENCES symbols (id)
-            );
-
-            CREATE TABLE IF NOT EXISTS oi_data (
-                id INTEGER PRIMARY KEY,
-                symbol_id INTEGER,
-                open_interest REAL NOT NULL,
-                timestamp TIMESTAMP NOT NULL,
-                bar_ts BIGINT,
-                FOREIGN KEY (symbol_id) REFERENCES symbols (id)
-            );
-
-            CREATE TABLE IF NOT EXISTS trades (
-                id INTEGER PRIMARY KEY,
-                symbol_id INTEGER,
-                order_id TEXT,
-                tp_order_id TEXT,
-                close_order_id TEXT,
-                side TEXT,
-                quantity REAL,
-                entry_price REAL,
-                take_profit_price REAL,
-                close_price REAL,
-                fee_entry REAL,
-                fee_exit REAL,
-                sl_order_id TEXT,
-                sl_price REAL,
-                status TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                closed_at TIMESTAMP,
-                pnl REAL,
-                FOREIGN KEY (symbol_id) REFERENCES symbols (id)
-            );
-
-            CREATE TABLE IF NOT EXISTS signals (
-                id INTEGER PRIMARY KEY,
-                symbol_id INTEGER,
-                price_change_percent REAL,
-                oi_change_percent REAL,
-                action_taken TEXT,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (symbol_id) REFERENCES symbols (id)
-            );
-
-            CREATE INDEX IF NOT EXISTS idx_price_data_symbol_time ON price_data(symbol_id, timestamp);
-            CREATE INDEX IF NOT EXISTS idx_oi_data_symbol_time ON oi_data(symbol_id, timestamp);
-            CREATE INDEX IF NOT EXISTS idx_trades_symbol_status ON trades(symbol_id, status);
-            CREATE INDEX IF NOT EXISTS idx_trades_order_id ON trades(order_id);
-
-            -- Split mode tables (spike detector)
-            CREATE TABLE IF NOT EXISTS sp_signals (
-                id INTEGER PRIMARY KEY,
-                timestamp DATETIME,
-                symbol TEXT,
-                signal_type TEXT,
-                signal_strength REAL,
-                price REAL,
-                volume REAL,
-                rsi REAL,
-                macd REAL,
-                volume_spike_ratio REAL,
-                orderbook_imbalance REAL,
-                action_taken TEXT
-            );
-
-            CREATE TABLE IF NOT EXISTS sp_orders (
-                id INTEGER PRIMARY KEY,
-                signal_id INTEGER,
-                order_id TEXT,
-                symbol TEXT,
-                side TEXT,
-                quantity REAL,
-                price REAL,
-                status TEXT,
-                created_at DATETIME,
-                filled_at DATETIME,
-                profit_loss REAL,
-                FOREIGN KEY (signal_id) REFERENCES sp_signals (id)
-            );
-
-            CREATE TABLE IF NOT EXISTS sp_daily_stats (
-                date DATE PRIMARY KEY,
-                total_signals INTEGER,
-                orders_placed INTEGER,
-                profitable_trades INTEGER,
-                total_profit_loss REAL,
-                win_rate REAL
-            );
-
-            -- OCO orders table
-            CREATE TABLE IF NOT EXISTS oco_orders (
-                id INTEGER PRIMARY KEY,
-                symbol_id INTEGER,
-                symbol TEXT NOT NULL,
-                quantity REAL NOT NULL,
-                entry_price REAL NOT NULL,
-                tp_order_id TEXT NOT NULL,
-                sl_order_id TEXT NOT NULL,
-                tp_price REAL NOT NULL,
-                sl_price REAL NOT NULL,
-                status TEXT NOT NULL DEFAULT 'active',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                closed_at TIMESTAMP,
-                FOREIGN KEY (symbol_id) REFERENCES symbols (id)
-            );
-
-            CREATE INDEX IF NOT EXISTS idx_oco_orders_symbol_status ON oco_orders(symbol, status);
-            CREATE INDEX IF NOT EXISTS idx_oco_orders_tp_order_id ON oco_orders(tp_order_id);
-            CREATE INDEX IF NOT EXISTS idx_oco_orders_sl_order_id ON oco_orders(sl_order_id);
-            """
-        )
-        conn.commit()
+            cur.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS symbols (
+                    id INTEGER PRIMARY KEY,
+                    spot_symbol TEXT NOT NULL,
+                    futures_symbol TEXT NOT NULL,
+                    is_active BOOLEAN DEFAULT 1,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+
+                CREATE TABLE IF NOT EXISTS trades (
+                    id INTEGER PRIMARY KEY,
+                    symbol_id INTEGER,
+                    order_id TEXT,
+                    tp_order_id TEXT,
+                    close_order_id TEXT,
+                    side TEXT,
+                    quantity REAL,
+                    entry_price REAL,
+                    take_profit_price REAL,
+                    close_price REAL,
+                    fee_entry REAL,
+                    fee_exit REAL,
+                    sl_order_id TEXT,
+                    sl_price REAL,
+                    status TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    closed_at TIMESTAMP,
+                    pnl REAL,
+                    FOREIGN KEY (symbol_id) REFERENCES symbols (id)
+                );
+
+                CREATE TABLE IF NOT EXISTS signals (
+                    id INTEGER PRIMARY KEY,
+                    symbol_id INTEGER,
+                    price_change_percent REAL,
+                    oi_change_percent REAL,
+                    action_taken TEXT,
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (symbol_id) REFERENCES symbols (id)
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_trades_symbol_status ON trades(symbol_id, status);
+                CREATE INDEX IF NOT EXISTS idx_trades_order_id ON trades(order_id);
+
+                -- Split mode tables (spike detector)
+                CREATE TABLE IF NOT EXISTS sp_signals (
+                    id INTEGER PRIMARY KEY,
+                    timestamp DATETIME,
+                    symbol TEXT,
+                    signal_type TEXT,
+                    signal_strength REAL,
+                    price REAL,
+                    volume REAL,
+                    rsi REAL,
+                    macd REAL,
+                    volume_spike_ratio REAL,
+                    orderbook_imbalance REAL,
+                    action_taken TEXT
+                );
+
+                CREATE TABLE IF NOT EXISTS sp_orders (
+                    id INTEGER PRIMARY KEY,
+                    signal_id INTEGER,
+                    order_id TEXT,
+                    symbol TEXT,
+                    side TEXT,
+                    quantity REAL,
+                    price REAL,
+                    status TEXT,
+                    created_at DATETIME,
+                    filled_at DATETIME,
+                    profit_loss REAL,
+                    FOREIGN KEY (signal_id) REFERENCES sp_signals (id)
+                );
+
+                CREATE TABLE IF NOT EXISTS sp_daily_stats (
+                    date DATE PRIMARY KEY,
+                    total_signals INTEGER,
+                    orders_placed INTEGER,
+                    profitable_trades INTEGER,
+                    total_profit_loss REAL,
+                    win_rate REAL
+                );
+
+                -- OCO orders table
+                CREATE TABLE IF NOT EXISTS oco_orders (
+                    id INTEGER PRIMARY KEY,
+                    symbol_id INTEGER,
+                    symbol TEXT NOT NULL,
+                    quantity REAL NOT NULL,
+                    entry_price REAL NOT NULL,
+                    tp_order_id TEXT NOT NULL,
+                    sl_order_id TEXT NOT NULL,
+                    tp_price REAL NOT NULL,
+                    sl_price REAL NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'active',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    closed_at TIMESTAMP,
+                    FOREIGN KEY (symbol_id) REFERENCES symbols (id)
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_oco_orders_symbol_status ON oco_orders(symbol, status);
+                CREATE INDEX IF NOT EXISTS idx_oco_orders_tp_order_id ON oco_orders(tp_order_id);
+                CREATE INDEX IF NOT EXISTS idx_oco_orders_sl_order_id ON oco_orders(sl_order_id);
+                """
+            )
+            conn.commit()
 
-        # Migration: add spot_symbol to signals if missing
-        try:
-            cur.execute("PRAGMA table_info(signals)")
-            cols = [row[1] for row in cur.fetchall()]
-            if "spot_symbol" not in cols:
-                cur.execute("ALTER TABLE signals ADD COLUMN spot_symbol TEXT")
-                conn.commit()
-                self.logger.info("DB migration: added signals.spot_symbol column")
-            self._signals_has_symbol = True
-        except Exception as e:
-            self.logger.debug(f"signals spot_symbol detection failed: {e}")
-            self._signals_has_symbol = False
-
-        # Migration: add spot_symbol to trades if missing
-        try:
-            cur.execute("PRAGMA table_info(trades)")
-            tcols = [row[1] for row in cur.fetchall()]
-            if "spot_symbol" not in tcols:
-                cur.execute("ALTER TABLE trades ADD COLUMN spot_symbol TEXT")
-                conn.commit()
-                self.logger.info("DB migration: added trades.spot_symbol column")
-            if "stop_loss_price" not in tcols:
-                cur.execute("ALTER TABLE trades ADD COLUMN stop_loss_price REAL")
-                conn.commit()
-                self.logger.info("DB migration: added trades.stop_loss_price column")
-            if "tp_order_id" not in tcols:
-                cur.execute("ALTER TABLE trades ADD COLUMN tp_order_id TEXT")
-                conn.commit()
-                self.logger.info("DB migration: added trades.tp_order_id column")
-            if "close_order_id" not in tcols:
-                cur.execute("ALTER TABLE trades ADD COLUMN close_order_id TEXT")
-                conn.commit()
-                self.logger.info("DB migration: added trades.close_order_id column")
-            if "close_price" not in tcols:
-                cur.execute("ALTER TABLE trades ADD COLUMN close_price REAL")
-                conn.commit()
-                self.logger.info("DB migration: added trades.close_price column")
-            if "fee_entry" not in tcols:
-                cur.execute("ALTER TABLE trades ADD COLUMN fee_entry REAL")
-                conn.commit()
-                self.logger.info("DB migration: added trades.fee_entry column")
-            if "fee_exit" not in tcols:
-                cur.execute("ALTER TABLE trades ADD COLUMN fee_exit REAL")
-                conn.commit()
-                self.logger.info("DB migration: added trades.fee_exit column")
-            if "sl_order_id" not in tcols:
-                cur.execute("ALTER TABLE trades ADD COLUMN sl_order_id TEXT")
-                conn.commit()
-                self.logger.info("DB migration: added trades.sl_order_id column")
-            if "sl_price" not in tcols:
-                cur.execute("ALTER TABLE trades ADD COLUMN sl_price REAL")
-                conn.commit()
-                self.logger.info("DB migration: added trades.sl_price column")
-            if "is_oco_order" not in tcols:
-                cur.execute("ALTER TABLE trades ADD COLUMN is_oco_order BOOLEAN DEFAULT 0")
-                conn.commit()
-                self.logger.info("DB migration: added trades.is_oco_order column")
-            self._trades_has_symbol = True
-        except Exception as e:
-            self.logger.debug(f"trades columns detection failed: {e}")
-            self._trades_has_symbol = False
-
-        # Migration: add oi_value to oi_data if missing
-        try:
-            cur.execute("PRAGMA table_info(oi_data)")
-            ocols = [row[1] for row in cur.fetchall()]
-            if "bar_ts" not in ocols:
-                cur.execute("ALTER TABLE oi_data ADD COLUMN bar_ts BIGINT")
-                conn.commit()
-                self.logger.info("DB migration: added oi_data.bar_ts column")
-            # Create unique index if not exists and bar_ts column is present
+            # Migration: add spot_symbol to signals if missing
+            try:
+                cur.execute("PRAGMA table_info(signals)")
+                cols = [row[1] for row in cur.fetchall()]
+                if "spot_symbol" not in cols:
+                    cur.execute("ALTER TABLE signals ADD COLUMN spot_symbol TEXT")
+                    conn.commit()
+                    self.logger.info("DB migration: added signals.spot_symbol column")
+                self._signals_has_symbol = True
+            except Exception as e:
+                self.logger.debug(f"signals spot_symbol detection failed: {e}")
+                self._signals_has_symbol = False
+
+            # Migration: add spot_symbol to trades if missing
             try:
-                cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS oi_symbol_bar_ts_ux ON oi_data(symbol_id, bar_ts)")
-                conn.commit()
-            except Exception:
-                pass
-            if "oi_value" not in ocols:
-                cur.execute("ALTER TABLE oi_data ADD COLUMN oi_value REAL")
-                conn.commit()
-                self.logger.info("DB migration: added oi_data.oi_value column")
-            if "oi_tokens" not in ocols:
-                cur.execute("ALTER TABLE oi_data ADD COLUMN oi_tokens REAL")
-                conn.commit()
-                self.logger.info("DB migration: added oi_data.oi_tokens column")
-            if "oi_tokens_mark" not in ocols:
-                cur.execute("ALTER TABLE oi_data ADD COLUMN oi_tokens_mark REAL")
-                conn.commit()
-                self.logger.info("DB migration: added oi_data.oi_tokens_mark column")
-            if "noi_percent" not in ocols:
-                cur.execute("ALTER TABLE oi_data ADD COLUMN noi_percent REAL")
-                conn.commit()
-                self.logger.info("DB migration: added oi_data.noi_percent column")
-        except Exception as e:
-            self.logger.debug(f"oi_data columns detection failed: {e}")
+                cur.execute("PRAGMA table_info(trades)")
+                tcols = [row[1] for row in cur.fetchall()]
+                if "spot_symbol" not in tcols:
+                    cur.execute("ALTER TABLE trades ADD COLUMN spot_symbol TEXT")
+                    conn.commit()
+                    self.logger.info("DB migration: added trades.spot_symbol column")
+                if "stop_loss_price" not in tcols:
+                    cur.execute("ALTER TABLE trades ADD COLUMN stop_loss_price REAL")
+                    conn.commit()
+                    self.logger.info("DB migration: added trades.stop_loss_price column")
+                if "tp_order_id" not in tcols:
+                    cur.execute("ALTER TABLE trades ADD COLUMN tp_order_id TEXT")
+                    conn.commit()
+                    self.logger.info("DB migration: added trades.tp_order_id column")
+                if "close_order_id" not in tcols:
+                    cur.execute("ALTER TABLE trades ADD COLUMN close_order_id TEXT")
+                    conn.commit()
+                    self.logger.info("DB migration: added trades.close_order_id column")
+                if "close_price" not in tcols:
+                    cur.execute("ALTER TABLE trades ADD COLUMN close_price REAL")
+                    conn.commit()
+                    self.logger.info("DB migration: added trades.close_price column")
+                if "fee_entry" not in tcols:
+                    cur.execute("ALTER TABLE trades ADD COLUMN fee_entry REAL")
+                    conn.commit()
+                    self.logger.info("DB migration: added trades.fee_entry column")
+                if "fee_exit" not in tcols:
+                    cur.execute("ALTER TABLE trades ADD COLUMN fee_exit REAL")
+                    conn.commit()
+                    self.logger.info("DB migration: added trades.fee_exit column")
+                if "sl_order_id" not in tcols:
+                    cur.execute("ALTER TABLE trades ADD COLUMN sl_order_id TEXT")
+                    conn.commit()
+                    self.logger.info("DB migration: added trades.sl_order_id column")
+                if "sl_price" not in tcols:
+                    cur.execute("ALTER TABLE trades ADD COLUMN sl_price REAL")
+                    conn.commit()
+                    self.logger.info("DB migration: added trades.sl_price column")
+                if "is_oco_order" not in tcols:
+                    cur.execute("ALTER TABLE trades ADD COLUMN is_oco_order BOOLEAN DEFAULT 0")
+                    conn.commit()
+                    self.logger.info("DB migration: added trades.is_oco_order column")
+                self._trades_has_symbol = True
+            except Exception as e:
+                self.logger.debug(f"trades columns detection failed: {e}")
+                self._trades_has_symbol = False
+
+    def attach_tick_buffer(self, tick_buffer: Optional[TickBuffer]) -> None:
+        """Serve recent price windows and last prices from an in-memory TickBuffer."""
+        self._tick_buffer = tick_buffer
+
+    @property
+    def tick_buffer(self) -> Optional[TickBuffer]:
+        return self._tick_buffer
 
     # ---- Symbols ----
     def upsert_symbol(self, spot_symbol: str, futures_symbol: str, is_active: bool = True) -> int:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT id FROM symbols WHERE spot_symbol = ? AND futures_symbol = ?
-            """,
-            (spot_symbol, futures_symbol),
-        )
-        row = cur.fetchone()
-        if row:
+        with self._write() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT id, is_active FROM symbols WHERE spot_symbol = ? AND futures_symbol = ?
+                """,
+                (spot_symbol, futures_symbol),
+            )
+            row = cur.fetchone()
+            if row:
+                if bool(row["is_active"]) != bool(is_active):
+                    cur.execute(
+                        "UPDATE symbols SET is_active = ? WHERE id = ?",
+                        (1 if is_active else 0, row[0]),
+                    )
+                    conn.commit()
+                    self._symbols.invalidate()
+                return int(row[0])
             cur.execute(
-                "UPDATE symbols SET is_active = ? WHERE id = ?",
-                (1 if is_active else 0, row[0]),
+                """
+                INSERT INTO symbols (spot_symbol, futures_symbol, is_active) VALUES (?, ?, ?)
+                """,
+                (spot_symbol, futures_symbol, 1 if is_active else 0),
             )
             conn.commit()
-            return int(row[0])
-        cur.execute(
-            """
-            INSERT INTO symbols (spot_symbol, futures_symbol, is_active) VALUES (?, ?, ?)
-            """,
-            (spot_symbol, futures_symbol, 1 if is_active else 0),
-        )
-        conn.commit()
-        return int(cur.lastrowid)
+            self._symbols.invalidate()
+            return int(cur.lastrowid)
 
     def set_symbol_active(self, spot_symbol: str, is_active: bool) -> None:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
-            "UPDATE symbols SET is_active = ? WHERE spot_symbol = ?",
-            (1 if is_active else 0, spot_symbol),
-        )
-        conn.commit()
+        with self._write() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "UPDATE symbols SET is_active = ? WHERE spot_symbol = ? AND is_active != ?",
+                (1 if is_active else 0, spot_symbol, 1 if is_active else 0),
+            )
+            conn.commit()
+            if cur.rowcount:
+                self._symbols.invalidate()
+
+    def invalidate_symbols(self) -> None:
+        """Drop the cached symbols snapshot (next lookup reloads it from SQLite)."""
+        self._symbols.invalidate()
+
+    def _load_symbol_records(self) -> List[SymbolRecord]:
+        with self._read() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT id, spot_symbol, futures_symbol, is_active FROM symbols ORDER BY id")
+            return [
+                SymbolRecord(
+                    id=int(r["id"]),
+                    spot_symbol=str(r["spot_symbol"]),
+                    futures_symbol=str(r["futures_symbol"]),
+                    is_active=bool(r["is_active"]),
+                )
+                for r in cur.fetchall()
+            ]
+
+    def _symbol_snapshot(self) -> _SymbolSnapshot:
+        return self._symbols.snapshot(self._load_symbol_records)
 
     def get_active_symbols(self) -> List[SymbolRecord]:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT id, spot_symbol, futures_symbol, is_active FROM symbols WHERE is_active = 1"
-        )
-        rows = cur.fetchall()
-        return [
-            SymbolRecord(
-                id=int(r["id"]),
-                spot_symbol=str(r["spot_symbol"]),
-                futures_symbol=str(r["futures_symbol"]),
-                is_active=bool(r["is_active"]),
-            )
-            for r in rows
-        ]
+        return list(self._symbol_snapshot().active)
+
+    def get_symbol_by_spot(self, spot_symbol: str, include_inactive: bool = False) -> Optional[SymbolRecord]:
+        rec = self._symbol_snapshot().by_spot.get(spot_symbol)
+        return rec if rec is not None and (include_inactive or rec.is_active) else None
+
+    def get_symbol_by_futures(self, futures_symbol: str, include_inactive: bool = False) -> Optional[SymbolRecord]:
+        rec = self._symbol_snapshot().by_futures.get(futures_symbol)
+        return rec if rec is not None and (include_inactive or rec.is_active) else None
+
+    def get_symbol_by_id(self, symbol_id: int, include_inactive: bool = False) -> Optional[SymbolRecord]:
+        rec = self._symbol_snapshot().by_id.get(int(symbol_id))
+        return rec if rec is not None and (include_inactive or rec.is_active) else None
 
     def _get_spot_symbol_by_id(self, symbol_id: int) -> Optional[str]:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute("SELECT spot_symbol FROM symbols WHERE id = ?", (symbol_id,))
-        row = cur.fetchone()
-        return str(row["spot_symbol"]) if row else None
+        rec = self.get_symbol_by_id(symbol_id, include_inactive=True)
+        return rec.spot_symbol if rec else None
 
     def get_symbol_id(self, spot_symbol: str) -> Optional[int]:
         """Get symbol_id by spot_symbol."""
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute("SELECT id FROM symbols WHERE spot_symbol = ?", (spot_symbol,))
-        row = cur.fetchone()
-        return int(row["id"]) if row else None
+        rec = self.get_symbol_by_spot(spot_symbol, include_inactive=True)
+        return rec.id if rec else None
+
+    # ---- Write-behind ----
+    def _execute_write(self, sql: str, params: Sequence[object], wait: bool = False) -> Optional[int]:
+        """Run a single-row insert, deferring it to the writer thread unless wait=True.
+
+        Returns lastrowid for synchronous writes and None when the row was queued.
+        """
+        if self._writer is not None and not wait:
+            self._writer.submit(sql, params)
+            return None
+        with self._write() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            conn.commit()
+            return int(cur.lastrowid)
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Block until all queued writes are committed (no-op without write-behind)."""
+        ok = self.series.flush(timeout=timeout)
+        if self._writer is None:
+            return ok
+        return self._writer.flush(timeout=timeout) and ok
+
+    def close(self) -> None:
+        """Stop background work, flush queued writes and close all pooled connections."""
+        self.stop_retention()
+        self.series.close()
+        if self._writer is not None:
+            self._writer.close()
+        self._pool.close()
+
+    def get_writer_stats(self) -> Dict[str, float]:
+        return self._writer.stats() if self._writer is not None else {}
+
+    def get_pool_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-connection counters: statements, checkouts, busy waits, wait/held seconds."""
+        out = self._pool.stats()
+        out.update(self.series.stats())
+        return out
 
     # ---- Inserts ----
     def insert_price(self, symbol_id: int, price: float, ts: Optional[datetime] = None) -> None:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO price_data (symbol_id, price, timestamp) VALUES (?, ?, ?)",
-            (symbol_id, float(price), (ts or datetime.utcnow()).isoformat()),
-        )
-        conn.commit()
+        self.series.append_price(symbol_id, price, to_epoch_ms(ts or datetime.utcnow()))
+
+    def insert_prices(self, rows: Sequence[Tuple[int, float, float]]) -> None:
+        """Bulk insert (symbol_id, price, epoch_seconds) rows in a single transaction."""
+        self.series.append_prices(rows)
 
     def insert_oi(
         self,
@@ -392,103 +563,40 @@ class DBManager:
         oi_tokens_mark: Optional[float] = None,
         noi_percent: Optional[float] = None,
     ) -> None:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        try:
-            cur.execute("PRAGMA table_info(oi_data)")
-            cols = [row[1] for row in cur.fetchall()]
-        except Exception:
-            cols = ["symbol_id", "open_interest", "timestamp"]
-        # compute 5m bar_ts (ms since epoch // (5*60*1000)) if column exists
-        computed_ts = (ts or datetime.utcnow())
-        try:
-            epoch_ms = int(computed_ts.timestamp() * 1000)
-            bar_ts = epoch_ms // (5 * 60_000)
-        except Exception:
-            bar_ts = None
-        if "bar_ts" in cols and bar_ts is not None:
-            try:
-                cur.execute(
-                    "INSERT OR IGNORE INTO oi_data (symbol_id, open_interest, oi_value, oi_tokens, oi_tokens_mark, noi_percent, timestamp, bar_ts) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                    (
-                        symbol_id,
-                        float(open_interest),
-                        None if oi_value is None else float(oi_value),
-                        None if oi_tokens is None else float(oi_tokens),
-                        None if oi_tokens_mark is None else float(oi_tokens_mark),
-                        None if noi_percent is None else float(noi_percent),
-                        computed_ts.isoformat(),
-                        int(bar_ts),
-                    ),
-                )
-                conn.commit()
-                return
-            except Exception:
-                pass
-        if "oi_value" in cols and "oi_tokens" in cols and "oi_tokens_mark" in cols and "noi_percent" in cols:
-            cur.execute(
-                "INSERT INTO oi_data (symbol_id, open_interest, oi_value, oi_tokens, oi_tokens_mark, noi_percent, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (
-                    symbol_id,
-                    float(open_interest),
-                    None if oi_value is None else float(oi_value),
-                    None if oi_tokens is None else float(oi_tokens),
-                    None if oi_tokens_mark is None else float(oi_tokens_mark),
-                    None if noi_percent is None else float(noi_percent),
-                    computed_ts.isoformat(),
-                ),
-            )
-        elif "oi_value" in cols and "oi_tokens" in cols and "oi_tokens_mark" in cols:
-            cur.execute(
-                "INSERT INTO oi_data (symbol_id, open_interest, oi_value, oi_tokens, oi_tokens_mark, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
-                (
-                    symbol_id,
-                    float(open_interest),
-                    None if oi_value is None else float(oi_value),
-                    None if oi_tokens is None else float(oi_tokens),
-                    None if oi_tokens_mark is None else float(oi_tokens_mark),
-                    computed_ts.isoformat(),
-                ),
-            )
-        elif "oi_value" in cols:
-            cur.execute(
-                "INSERT INTO oi_data (symbol_id, open_interest, oi_value, timestamp) VALUES (?, ?, ?, ?)",
-                (
-                    symbol_id,
-                    float(open_interest),
-                    None if oi_value is None else float(oi_value),
-                    computed_ts.isoformat(),
-                ),
-            )
-        else:
-            cur.execute(
-                "INSERT INTO oi_data (symbol_id, open_interest, timestamp) VALUES (?, ?, ?)",
-                (symbol_id, float(open_interest), computed_ts.isoformat()),
-            )
-        conn.commit()
+        self.series.append_oi(
+            symbol_id,
+            to_epoch_ms(ts or datetime.utcnow()),
+            open_interest,
+            oi_value=oi_value,
+            oi_tokens=oi_tokens,
+            oi_tokens_mark=oi_tokens_mark,
+            noi_percent=noi_percent,
+        )
 
-    def insert_signal(self, symbol_id: int, price_change: float, oi_change: float, action_taken: str) -> int:
-        conn = self._get_conn()
-        cur = conn.cursor()
+    def insert_signal(
+        self, symbol_id: int, price_change: float, oi_change: float, action_taken: str, wait: bool = True
+    ) -> int:
+        """Insert a signal row; with wait=False it is queued and 0 is returned instead of the id."""
         spot_symbol = self._get_spot_symbol_by_id(symbol_id) if self._signals_has_symbol else None
         if self._signals_has_symbol and spot_symbol is not None:
-            cur.execute(
+            row_id = self._execute_write(
                 """
                 INSERT INTO signals (symbol_id, spot_symbol, price_change_percent, oi_change_percent, action_taken)
                 VALUES (?, ?, ?, ?, ?)
                 """,
                 (symbol_id, spot_symbol, float(price_change), float(oi_change), action_taken),
+                wait=wait,
             )
         else:
-            cur.execute(
+            row_id = self._execute_write(
                 """
                 INSERT INTO signals (symbol_id, price_change_percent, oi_change_percent, action_taken)
                 VALUES (?, ?, ?, ?)
                 """,
                 (symbol_id, float(price_change), float(oi_change), action_taken),
+                wait=wait,
             )
-        conn.commit()
-        return int(cur.lastrowid)
+        return int(row_id or 0)
 
     # ---- Split mode (Spike Detector) helpers ----
     def insert_sp_signal(
@@ -504,10 +612,10 @@ class DBManager:
         volume_spike_ratio: float | None = None,
         orderbook_imbalance: float | None = None,
         action_taken: str | None = None,
+        wait: bool = True,
     ) -> int:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
+        """Insert a split-mode signal; with wait=False it is queued and 0 is returned."""
+        row_id = self._execute_write(
             """
             INSERT INTO sp_signals (timestamp, symbol, signal_type, signal_strength, price, volume, rsi, macd, volume_spike_ratio, orderbook_imbalance, action_taken)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
@@ -525,9 +633,9 @@ class DBManager:
                 None if orderbook_imbalance is None else float(orderbook_imbalance),
                 action_taken,
             ),
+            wait=wait,
         )
-        conn.commit()
-        return int(cur.lastrowid)
+        return int(row_id or 0)
 
     def insert_sp_order(
         self,
@@ -539,52 +647,52 @@ class DBManager:
         price: float,
         status: str,
     ) -> int:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO sp_orders (signal_id, order_id, symbol, side, quantity, price, status, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                int(signal_id),
-                order_id,
-                symbol,
-                side,
-                float(quantity),
-                float(price),
-                status,
-                datetime.utcnow().isoformat(),
-            ),
-        )
-        conn.commit()
-        return int(cur.lastrowid)
+        with self._write() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO sp_orders (signal_id, order_id, symbol, side, quantity, price, status, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    int(signal_id),
+                    order_id,
+                    symbol,
+                    side,
+                    float(quantity),
+                    float(price),
+                    status,
+                    datetime.utcnow().isoformat(),
+                ),
+            )
+            conn.commit()
+            return int(cur.lastrowid)
 
     def count_open_sp_orders(self) -> int:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute("SELECT COUNT(*) AS c FROM sp_orders WHERE status IN ('placed','open')")
-        row = cur.fetchone()
-        return int(row[0]) if row else 0
+        with self._read() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT COUNT(*) AS c FROM sp_orders WHERE status IN ('placed','open')")
+            row = cur.fetchone()
+            return int(row[0]) if row else 0
 
     def update_sp_order_filled(self, order_id: str, filled_at: Optional[datetime] = None) -> None:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
-            "UPDATE sp_orders SET status = 'filled', filled_at = ? WHERE order_id = ?",
-            ((filled_at or datetime.utcnow()).isoformat(), order_id),
-        )
-        conn.commit()
+        with self._write() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "UPDATE sp_orders SET status = 'filled', filled_at = ? WHERE order_id = ?",
+                ((filled_at or datetime.utcnow()).isoformat(), order_id),
+            )
+            conn.commit()
 
     def get_last_sp_signal_time(self, symbol: str) -> Optional[datetime]:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT timestamp FROM sp_signals WHERE symbol = ? ORDER BY id DESC LIMIT 1",
-            (symbol,),
-        )
-        row = cur.fetchone()
-        return datetime.fromisoformat(row["timestamp"]) if row else None
+        with self._read() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT timestamp FROM sp_signals WHERE symbol = ? ORDER BY id DESC LIMIT 1",
+                (symbol,),
+            )
+            row = cur.fetchone()
+            return datetime.fromisoformat(row["timestamp"]) if row else None
 
     def insert_trade(
         self,
@@ -599,339 +707,404 @@ class DBManager:
         tp_order_id: Optional[str] = None,
         is_oco_order: bool = False,
     ) -> int:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        spot_symbol = self._get_spot_symbol_by_id(symbol_id) if self._trades_has_symbol else None
-        if self._trades_has_symbol and spot_symbol is not None:
-            cur.execute(
-                """
-                INSERT INTO trades (symbol_id, spot_symbol, order_id, tp_order_id, side, quantity, entry_price, take_profit_price, status, stop_loss_price, is_oco_order)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    symbol_id,
-                    spot_symbol,
-                    order_id,
-                    tp_order_id,
-                    side,
-                    float(quantity),
-                    float(entry_price),
-                    float(take_profit_price),
-                    status,
-                    None if stop_loss_price is None else float(stop_loss_price),
-                    1 if is_oco_order else 0,
-                ),
-            )
-        else:
-            cur.execute(
-                """
-                INSERT INTO trades (symbol_id, order_id, tp_order_id, side, quantity, entry_price, take_profit_price, status, stop_loss_price, is_oco_order)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    symbol_id,
-                    order_id,
-                    tp_order_id,
-                    side,
-                    float(quantity),
-                    float(entry_price),
-                    float(take_profit_price),
-                    status,
-                    None if stop_loss_price is None else float(stop_loss_price),
-                    1 if is_oco_order else 0,
-                ),
-            )
-        conn.commit()
-        return int(cur.lastrowid)
+        with self._write() as conn:
+            cur = conn.cursor()
+            spot_symbol = self._get_spot_symbol_by_id(symbol_id) if self._trades_has_symbol else None
+            if self._trades_has_symbol and spot_symbol is not None:
+                cur.execute(
+                    """
+                    INSERT INTO trades (symbol_id, spot_symbol, order_id, tp_order_id, side, quantity, entry_price, take_profit_price, status, stop_loss_price, is_oco_order)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        symbol_id,
+                        spot_symbol,
+                        order_id,
+                        tp_order_id,
+                        side,
+                        float(quantity),
+                        float(entry_price),
+                        float(take_profit_price),
+                        status,
+                        None if stop_loss_price is None else float(stop_loss_price),
+                        1 if is_oco_order else 0,
+                    ),
+                )
+            else:
+                cur.execute(
+                    """
+                    INSERT INTO trades (symbol_id, order_id, tp_order_id, side, quantity, entry_price, take_profit_price, status, stop_loss_price, is_oco_order)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        symbol_id,
+                        order_id,
+                        tp_order_id,
+                        side,
+                        float(quantity),
+                        float(entry_price),
+                        float(take_profit_price),
+                        status,
+                        None if stop_loss_price is None else float(stop_loss_price),
+                        1 if is_oco_order else 0,
+                    ),
+                )
+            conn.commit()
+            return int(cur.lastrowid)
 
     def trade_exists(self, order_id: str) -> bool:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute("SELECT 1 FROM trades WHERE order_id = ? LIMIT 1", (order_id,))
-        return cur.fetchone() is not None
+        with self._read() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT 1 FROM trades WHERE order_id = ? LIMIT 1", (order_id,))
+            return cur.fetchone() is not None
 
     def close_trade(self, order_id: str, pnl: float) -> None:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            UPDATE trades SET status = 'closed', closed_at = CURRENT_TIMESTAMP, pnl = ?
-            WHERE order_id = ?
-            """,
-            (float(pnl), order_id),
-        )
-        conn.commit()
-
-    def set_trade_status(self, order_id: str, status: str) -> None:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        if status == 'open':
-            cur.execute(
-                "UPDATE trades SET status = ?, closed_at = NULL WHERE order_id = ?",
-                (status, order_id),
-            )
-        else:
+        with self._write() as conn:
+            cur = conn.cursor()
             cur.execute(
-                "UPDATE trades SET status = ?, closed_at = CURRENT_TIMESTAMP WHERE order_id = ?",
-                (status, order_id),
+                """
+                UPDATE trades SET status = 'closed', closed_at = CURRENT_TIMESTAMP, pnl = ?
+                WHERE order_id = ?
+                """,
+                (float(pnl), order_id),
             )
-        conn.commit()
+            conn.commit()
+
+    def set_trade_status(self, order_id: str, status: str) -> None:
+        with self._write() as conn:
+            cur = conn.cursor()
+            if status == 'open':
+                cur.execute(
+                    "UPDATE trades SET status = ?, closed_at = NULL WHERE order_id = ?",
+                    (status, order_id),
+                )
+            else:
+                cur.execute(
+                    "UPDATE trades SET status = ?, closed_at = CURRENT_TIMESTAMP WHERE order_id = ?",
+                    (status, order_id),
+                )
+            conn.commit()
 
     # ---- Queries ----
+    @staticmethod
+    def _window_start_ms(minutes: float) -> int:
+        return int((time.time() - float(minutes) * 60.0) * 1000)
+
+    @staticmethod
+    def _as_datetime_series(arrays: SeriesArrays) -> List[Tuple[datetime, float]]:
+        ts_ms, vals = arrays
+        return [(datetime.utcfromtimestamp(t / 1000.0), v) for t, v in zip(ts_ms, vals)]
+
+    def get_price_window(self, symbol_id: int, minutes: float) -> SeriesArrays:
+        """Recent prices as (epoch_ms, price) arrays; tick buffer first, series store for older history."""
+        since_ms = self._window_start_ms(minutes)
+        buf = self._tick_buffer
+        if buf is not None and buf.has_symbol(symbol_id):
+            ts_list, px_list = buf.since(symbol_id, since_ms / 1000.0)
+            ts_out = array("q", (int(t * 1000) for t in ts_list))
+            px_out = array("d", px_list)
+            oldest = buf.oldest_ts(symbol_id)
+            if oldest is not None and oldest * 1000 <= since_ms:
+                return ts_out, px_out
+            # Warm-up (e.g. right after restart): prepend persisted history older than the buffer
+            until_ms = int(oldest * 1000) if oldest is not None else None
+            db_ts, db_px = self.series.price_window(symbol_id, since_ms, until_ms)
+            return db_ts + ts_out, db_px + px_out
+        return self.series.price_window(symbol_id, since_ms)
+
+    def get_oi_window(self, symbol_id: int, minutes: float) -> SeriesArrays:
+        """Recent OI as (epoch_ms, value) arrays, preferring monetary value over raw open_interest."""
+        return self.series.oi_window(symbol_id, self._window_start_ms(minutes))
+
+    def get_noi_window(self, symbol_id: int, minutes: float) -> SeriesArrays:
+        """Recent normalized OI percent (0..100) as (epoch_ms, value) arrays."""
+        return self.series.noi_window(symbol_id, self._window_start_ms(minutes))
+
+    def get_price_windows(self, symbol_ids: Sequence[int], minutes: float) -> BulkSeries:
+        """Price windows for many symbols as {symbol_id: (int64 epoch_ms, float64 price)} NumPy arrays.
+
+        Symbols fully covered by the tick buffer are served from memory; the rest share one
+        series-store query. Symbols without data are omitted.
+        """
+        since_ms = self._window_start_ms(minutes)
+        out: BulkSeries = {}
+        buf = self._tick_buffer
+        # symbol_id -> oldest buffered ms, for buffers still warming up
+        partial: Dict[int, int] = {}
+        missing: List[int] = []
+        for sid in symbol_ids:
+            if buf is None or not buf.has_symbol(sid):
+                missing.append(sid)
+                continue
+            oldest = buf.oldest_ts(sid)
+            ts_list, px_list = buf.since(sid, since_ms / 1000.0)
+            out[sid] = (np.array([int(t * 1000) for t in ts_list], dtype=np.int64), np.array(px_list, dtype=np.float64))
+            if oldest is None or oldest * 1000 > since_ms:
+                partial[sid] = int(oldest * 1000) if oldest is not None else 2 ** 62
+                missing.append(sid)
+        if missing:
+            stored = self.series.price_windows(missing, since_ms)
+            for sid, (ts, vals) in stored.items():
+                until = partial.get(sid)
+                if until is None:
+                    out[sid] = (ts, vals)
+                    continue
+                # Warm-up: persisted history older than the buffer, then the buffer itself
+                n = int(np.searchsorted(ts, until, side="left"))
+                buf_ts, buf_vals = out[sid]
+                out[sid] = (np.concatenate((ts[:n], buf_ts)), np.concatenate((vals[:n], buf_vals)))
+        return {sid: arrs for sid, arrs in out.items() if len(arrs[0])}
+
+    def get_oi_windows(self, symbol_ids: Sequence[int], minutes: float) -> BulkSeries:
+        """OI windows for many symbols in one query: {symbol_id: (int64 epoch_ms, float64 value)}."""
+        return self.series.oi_windows(symbol_ids, self._window_start_ms(minutes))
+
     def get_recent_price_series(self, symbol_id: int, minutes: int) -> List[Tuple[datetime, float]]:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        since = datetime.utcnow() - timedelta(minutes=minutes)
-        cur.execute(
-            """
-            SELECT timestamp, price FROM price_data
-            WHERE symbol_id = ? AND timestamp >= ?
-            ORDER BY timestamp ASC
-            """,
-            (symbol_id, since.isoformat()),
-        )
-        rows = cur.fetchall()
-        return [(datetime.fromisoformat(r["timestamp"]), float(r["price"])) for r in rows]
+        return self._as_datetime_series(self.get_price_window(symbol_id, minutes))
 
     def get_recent_oi_series(self, symbol_id: int, minutes: int) -> List[Tuple[datetime, float]]:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        since = datetime.utcnow() - timedelta(minutes=minutes)
-        # Prefer monetary value if available, but always coalesce to avoid NULLs
-        cur.execute(
-            """
-            SELECT timestamp, COALESCE(oi_value, open_interest) AS oi
-            FROM oi_data
-            WHERE symbol_id = ? AND timestamp >= ?
-            ORDER BY timestamp ASC
-            """,
-            (symbol_id, since.isoformat()),
-        )
-        rows = cur.fetchall()
-        out: List[Tuple[datetime, float]] = []
-        for r in rows:
-            ts = datetime.fromisoformat(r["timestamp"])
-            val = r["oi"]
-            try:
-                out.append((ts, float(val)))
-            except Exception:
-                # skip rows with unparseable values
-                continue
-        return out
+        return self._as_datetime_series(self.get_oi_window(symbol_id, minutes))
 
     def get_recent_noi_series(self, symbol_id: int, minutes: int) -> List[Tuple[datetime, float]]:
         """Return series of normalized OI percent (0..100) if available."""
-        conn = self._get_conn()
-        cur = conn.cursor()
-        since = datetime.utcnow() - timedelta(minutes=minutes)
-        try:
-            cur.execute(
-                """
-                SELECT timestamp, noi_percent FROM oi_data
-                WHERE symbol_id = ? AND timestamp >= ? AND noi_percent IS NOT NULL
-                ORDER BY timestamp ASC
-                """,
-                (symbol_id, since.isoformat()),
+        return self._as_datetime_series(self.get_noi_window(symbol_id, minutes))
+
+    # ---- Retention ----
+    def run_retention(self, raw_horizon_minutes: float, chunk_rows: int = 5000) -> Dict[str, int]:
+        """Roll raw price/OI rows older than the horizon into 1m/5m OHLC buckets (see SeriesStore.run_retention)."""
+        return self.series.run_retention(
+            self._window_start_ms(raw_horizon_minutes),
+            sorted(self._symbol_snapshot().by_id),
+            chunk_rows=chunk_rows,
+            should_stop=self._retention_stop.is_set,
+        )
+
+    def start_retention(self, raw_horizon_minutes: float, interval_seconds: float = 900.0, chunk_rows: int = 5000) -> None:
+        """Run run_retention() every interval_seconds on a daemon thread until stop_retention()."""
+        if self._retention_thread is not None and self._retention_thread.is_alive():
+            return
+        self._retention_stop.clear()
+
+        def _loop() -> None:
+            self.logger.info(
+                f"Retention worker started (raw horizon {raw_horizon_minutes:g}m, every {interval_seconds:g}s)"
             )
-            rows = cur.fetchall()
-            return [
-                (datetime.fromisoformat(r["timestamp"]), float(r["noi_percent"])) for r in rows
-            ]
-        except Exception:
-            return []
+            while not self._retention_stop.wait(max(1.0, float(interval_seconds))):
+                try:
+                    t0 = time.perf_counter()
+                    report = self.run_retention(raw_horizon_minutes, chunk_rows=chunk_rows)
+                    reclaimed = report["price_data_deleted"] + report["oi_data_deleted"]
+                    if reclaimed or report["pages_vacuumed"]:
+                        self.logger.info(
+                            f"Retention: reclaimed {reclaimed} raw rows (price={report['price_data_deleted']}"
+                            f" oi={report['oi_data_deleted']}) into {report['buckets']} OHLC buckets,"
+                            f" vacuumed {report['pages_vacuumed']} pages in {time.perf_counter() - t0:.2f}s"
+                        )
+                except Exception as e:
+                    self.logger.error(f"Retention error: {e}")
+            self.logger.info("Retention worker stopped")
+
+        self._retention_thread = threading.Thread(target=_loop, name="DBRetention", daemon=True)
+        self._retention_thread.start()
+
+    def stop_retention(self, timeout: float = 10.0) -> None:
+        self._retention_stop.set()
+        t = self._retention_thread
+        if t is not None and t.is_alive():
+            t.join(timeout=timeout)
+        self._retention_thread = None
+        self._retention_stop.clear()
 
     # ---- Helpers for trading/protections ----
     def count_open_positions(self) -> int:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute("SELECT COUNT(*) AS c FROM trades WHERE status = 'open'")
-        row = cur.fetchone()
-        return int(row[0]) if row else 0
+        with self._read() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT COUNT(*) AS c FROM trades WHERE status = 'open'")
+            row = cur.fetchone()
+            return int(row[0]) if row else 0
 
     def has_open_position(self, symbol_id: int) -> bool:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT 1 FROM trades WHERE symbol_id = ? AND status = 'open' LIMIT 1",
-            (symbol_id,),
-        )
-        return cur.fetchone() is not None
+        with self._read() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT 1 FROM trades WHERE symbol_id = ? AND status = 'open' LIMIT 1",
+                (symbol_id,),
+            )
+            return cur.fetchone() is not None
 
     def get_open_trades(self) -> List[TradeRecord]:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT order_id, symbol_id, side, quantity, entry_price, take_profit_price, status, tp_order_id, close_order_id, close_price, fee_entry, fee_exit, sl_order_id, sl_price, is_oco_order
-            FROM trades WHERE status = 'open'
-            """
-        )
-        rows = cur.fetchall()
-        trades = [
-            TradeRecord(
-                order_id=str(r["order_id"]),
-                symbol_id=int(r["symbol_id"]),
-                side=str(r["side"]),
-                quantity=float(r["quantity"]),
-                entry_price=float(r["entry_price"]),
-                take_profit_price=float(r["take_profit_price"]),
-                status=str(r["status"]),
-                tp_order_id=(str(r["tp_order_id"]) if r["tp_order_id"] is not None else None),
-                close_order_id=(str(r["close_order_id"]) if r["close_order_id"] is not None else None),
-                close_price=(float(r["close_price"]) if r["close_price"] is not None else None),
-                fee_entry=(float(r["fee_entry"]) if r["fee_entry"] is not None else None),
-                fee_exit=(float(r["fee_exit"]) if r["fee_exit"] is not None else None),
-                sl_order_id=(str(r["sl_order_id"]) if r["sl_order_id"] is not None else None),
-                sl_price=(float(r["sl_price"]) if r["sl_price"] is not None else None),
-                is_oco_order=bool(r["is_oco_order"]),
+        with self._read() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT order_id, symbol_id, side, quantity, entry_price, take_profit_price, status, tp_order_id, close_order_id, close_price, fee_entry, fee_exit, sl_order_id, sl_price, is_oco_order
+                FROM trades WHERE status = 'open'
+                """
             )
-            for r in rows
-        ]
+            rows = cur.fetchall()
+            trades = [
+                TradeRecord(
+                    order_id=str(r["order_id"]),
+                    symbol_id=int(r["symbol_id"]),
+                    side=str(r["side"]),
+                    quantity=float(r["quantity"]),
+                    entry_price=float(r["entry_price"]),
+                    take_profit_price=float(r["take_profit_price"]),
+                    status=str(r["status"]),
+                    tp_order_id=(str(r["tp_order_id"]) if r["tp_order_id"] is not None else None),
+                    close_order_id=(str(r["close_order_id"]) if r["close_order_id"] is not None else None),
+                    close_price=(float(r["close_price"]) if r["close_price"] is not None else None),
+                    fee_entry=(float(r["fee_entry"]) if r["fee_entry"] is not None else None),
+                    fee_exit=(float(r["fee_exit"]) if r["fee_exit"] is not None else None),
+                    sl_order_id=(str(r["sl_order_id"]) if r["sl_order_id"] is not None else None),
+                    sl_price=(float(r["sl_price"]) if r["sl_price"] is not None else None),
+                    is_oco_order=bool(r["is_oco_order"]),
+                )
+                for r in rows
+            ]
         
-        return trades
+            return trades
 
     def set_trade_tp_order(self, order_id: str, tp_order_id: str) -> None:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
-            "UPDATE trades SET tp_order_id = ? WHERE order_id = ?",
-            (tp_order_id, order_id),
-        )
-        conn.commit()
-
-    def update_trade_entry_qty(self, order_id: str, entry_price: float, quantity: float) -> None:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
-            "UPDATE trades SET entry_price = ?, quantity = ? WHERE order_id = ?",
-            (float(entry_price), float(quantity), order_id),
-        )
-        conn.commit()
-
-    def update_trade_fees(self, order_id: str, fee_entry: Optional[float] = None, fee_exit: Optional[float] = None) -> None:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        if fee_entry is not None and fee_exit is not None:
+        with self._write() as conn:
+            cur = conn.cursor()
             cur.execute(
-                "UPDATE trades SET fee_entry = ?, fee_exit = ? WHERE order_id = ?",
-                (float(fee_entry), float(fee_exit), order_id),
+                "UPDATE trades SET tp_order_id = ? WHERE order_id = ?",
+                (tp_order_id, order_id),
             )
-        elif fee_entry is not None:
-            cur.execute(
-                "UPDATE trades SET fee_entry = ? WHERE order_id = ?",
-                (float(fee_entry), order_id),
-            )
-        elif fee_exit is not None:
+            conn.commit()
+
+    def update_trade_entry_qty(self, order_id: str, entry_price: float, quantity: float) -> None:
+        with self._write() as conn:
+            cur = conn.cursor()
             cur.execute(
-                "UPDATE trades SET fee_exit = ? WHERE order_id = ?",
-                (float(fee_exit), order_id),
+                "UPDATE trades SET entry_price = ?, quantity = ? WHERE order_id = ?",
+                (float(entry_price), float(quantity), order_id),
             )
-        conn.commit()
+            conn.commit()
+
+    def update_trade_fees(self, order_id: str, fee_entry: Optional[float] = None, fee_exit: Optional[float] = None) -> None:
+        with self._write() as conn:
+            cur = conn.cursor()
+            if fee_entry is not None and fee_exit is not None:
+                cur.execute(
+                    "UPDATE trades SET fee_entry = ?, fee_exit = ? WHERE order_id = ?",
+                    (float(fee_entry), float(fee_exit), order_id),
+                )
+            elif fee_entry is not None:
+                cur.execute(
+                    "UPDATE trades SET fee_entry = ? WHERE order_id = ?",
+                    (float(fee_entry), order_id),
+                )
+            elif fee_exit is not None:
+                cur.execute(
+                    "UPDATE trades SET fee_exit = ? WHERE order_id = ?",
+                    (float(fee_exit), order_id),
+                )
+            conn.commit()
 
     def set_trade_close_info(self, order_id: str, close_order_id: str, close_price: float) -> None:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
-            "UPDATE trades SET close_order_id = ?, close_price = ? WHERE order_id = ?",
-            (close_order_id, float(close_price), order_id),
-        )
-        conn.commit()
+        with self._write() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "UPDATE trades SET close_order_id = ?, close_price = ? WHERE order_id = ?",
+                (close_order_id, float(close_price), order_id),
+            )
+            conn.commit()
 
     def set_trade_sl_order(self, order_id: str, sl_order_id: str, sl_price: float) -> None:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
-            "UPDATE trades SET sl_order_id = ?, sl_price = ? WHERE order_id = ?",
-            (sl_order_id, float(sl_price), order_id),
-        )
-        conn.commit()
+        with self._write() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "UPDATE trades SET sl_order_id = ?, sl_price = ? WHERE order_id = ?",
+                (sl_order_id, float(sl_price), order_id),
+            )
+            conn.commit()
 
     def get_last_signal_time(self, symbol_id: int) -> Optional[datetime]:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT timestamp FROM signals WHERE symbol_id = ? ORDER BY timestamp DESC LIMIT 1
-            """,
-            (symbol_id,),
-        )
-        row = cur.fetchone()
-        return datetime.fromisoformat(row["timestamp"]) if row else None
+        with self._read() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT timestamp FROM signals WHERE symbol_id = ? ORDER BY timestamp DESC LIMIT 1
+                """,
+                (symbol_id,),
+            )
+            row = cur.fetchone()
+            return datetime.fromisoformat(row["timestamp"]) if row else None
 
     def get_last_trade_time(self, symbol_id: int) -> Optional[datetime]:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT created_at FROM trades WHERE symbol_id = ? ORDER BY id DESC LIMIT 1
-            """,
-            (symbol_id,),
-        )
-        row = cur.fetchone()
-        return datetime.fromisoformat(row["created_at"]) if row and row["created_at"] else None
+        with self._read() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT created_at FROM trades WHERE symbol_id = ? ORDER BY id DESC LIMIT 1
+                """,
+                (symbol_id,),
+            )
+            row = cur.fetchone()
+            return datetime.fromisoformat(row["created_at"]) if row and row["created_at"] else None
 
     def get_last_price(self, symbol_id: int) -> Optional[float]:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT price FROM price_data WHERE symbol_id = ? ORDER BY timestamp DESC LIMIT 1",
-            (symbol_id,),
-        )
-        row = cur.fetchone()
-        return float(row["price"]) if row else None
+        buf = self._tick_buffer
+        if buf is not None:
+            px = buf.get_last_price(symbol_id)
+            if px is not None:
+                return px
+        return self.series.last_price(symbol_id)
 
     def get_last_closed_pnls(self, limit: int) -> List[float]:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT pnl FROM trades
-            WHERE status = 'closed' AND pnl IS NOT NULL
-            ORDER BY closed_at DESC
-            LIMIT ?
-            """,
-            (int(limit),),
-        )
-        rows = cur.fetchall()
-        return [float(r["pnl"]) for r in rows]
+        with self._read() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT pnl FROM trades
+                WHERE status = 'closed' AND pnl IS NOT NULL
+                ORDER BY closed_at DESC
+                LIMIT ?
+                """,
+                (int(limit),),
+            )
+            rows = cur.fetchall()
+            return [float(r["pnl"]) for r in rows]
 
     def get_today_pnl(self) -> float:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        # Filter by UTC date of 'closed_at'
-        cur.execute(
-            """
-            SELECT COALESCE(SUM(pnl), 0) AS d
-            FROM trades
-            WHERE status = 'closed' AND pnl IS NOT NULL AND DATE(closed_at) = DATE('now')
-            """
-        )
-        row = cur.fetchone()
-        return float(row["d"]) if row and row["d"] is not None else 0.0
+        with self._read() as conn:
+            cur = conn.cursor()
+            # Filter by UTC date of 'closed_at'
+            cur.execute(
+                """
+                SELECT COALESCE(SUM(pnl), 0) AS d
+                FROM trades
+                WHERE status = 'closed' AND pnl IS NOT NULL AND DATE(closed_at) = DATE('now')
+                """
+            )
+            row = cur.fetchone()
+            return float(row["d"]) if row and row["d"] is not None else 0.0
 
     def get_last_signal_time_queued(self, symbol_id: int) -> Optional[datetime]:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT timestamp FROM signals
-            WHERE symbol_id = ? AND action_taken = 'queued'
-            ORDER BY timestamp DESC LIMIT 1
-            """,
-            (symbol_id,),
-        )
-        row = cur.fetchone()
-        return datetime.fromisoformat(row["timestamp"]) if row else None 
+        with self._read() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT timestamp FROM signals
+                WHERE symbol_id = ? AND action_taken = 'queued'
+                ORDER BY timestamp DESC LIMIT 1
+                """,
+                (symbol_id,),
+            )
+            row = cur.fetchone()
+            return datetime.fromisoformat(row["timestamp"]) if row else None 
 
     def get_total_pnl(self) -> float:
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT COALESCE(SUM(pnl), 0) AS total_pnl
-            FROM trades
-            WHERE status = 'closed' AND pnl IS NOT NULL
-            """
-        )
-        row = cur.fetchone()
-        return float(row["total_pnl"]) if row and row["total_pnl"] is not None else 0.0 
\ No newline at end of file
+        with self._read() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT COALESCE(SUM(pnl), 0) AS total_pnl
+                FROM trades
+                WHERE status = 'closed' AND pnl IS NOT NULL
+                """
+            )
+            row = cur.fetchone()
+            return float(row["total_pnl"]) if row and row["total_pnl"] is not None else 0.0 
\ No newline at end of file
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+
+from bybit_trading_bot.utils.logger import get_logger
+
+
+@dataclass
+class ConnectionStats:
+    name: str
+    queries: int = 0
+    checkouts: int = 0
+    busy_waits: int = 0
+    wait_seconds: float = 0.0
+    held_seconds: float = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "queries": self.queries,
+            "checkouts": self.checkouts,
+            "busy_waits": self.busy_waits,
+            "wait_seconds": round(self.wait_seconds, 6),
+            "held_seconds": round(self.held_seconds, 6),
+        }
+
+
+class _PooledConnection:
+    __slots__ = ("conn", "stats")
+
+    def __init__(self, conn: sqlite3.Connection, stats: ConnectionStats) -> None:
+        self.conn = conn
+        self.stats = stats
+
+
+class SQLitePool:
+    """One serialized writer connection plus up to N read-only connections for a WAL database.
+
+    - writer(): reentrant lock around the single read-write connection
+    - reader(): checks out a `mode=ro` + `query_only` connection; a thread that already
+      holds a reader gets the same one back, so nested helpers never self-deadlock
+    - Connections are opened lazily and closed by close(); the pool reopens on next use
+    - Per-connection statistics: statements executed, checkouts, waits, time held
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        readers: int = 4,
+        configure_writer: Optional[Callable[[sqlite3.Connection], None]] = None,
+        timeout: float = 5.0,
+    ) -> None:
+        self.db_path = db_path
+        self.max_readers = max(1, int(readers))
+        self.timeout = float(timeout)
+        self._configure_writer = configure_writer
+        self.logger = get_logger(self.__class__.__name__)
+
+        self._writer: Optional[_PooledConnection] = None
+        self._writer_lock = threading.RLock()
+        self._writer_owner: Optional[int] = None
+
+        self._idle: "queue.LifoQueue[_PooledConnection]" = queue.LifoQueue()
+        self._readers: List[_PooledConnection] = []
+        self._readers_lock = threading.Lock()
+        self._held = threading.local()
+
+    # ---- Connections ----
+    def _track(self, conn: sqlite3.Connection, name: str) -> _PooledConnection:
+        stats = ConnectionStats(name=name)
+
+        def _count(_stmt: str) -> None:
+            stats.queries += 1
+
+        conn.set_trace_callback(_count)
+        return _PooledConnection(conn, stats)
+
+    def _open_writer(self) -> _PooledConnection:
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        if self._configure_writer is not None:
+            self._configure_writer(conn)
+        return self._track(conn, "writer")
+
+    def _open_reader(self, index: int) -> _PooledConnection:
+        conn = sqlite3.connect(
+            f"file:{self.db_path}?mode=ro", uri=True, timeout=self.timeout, check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only=ON;")
+        return self._track(conn, f"reader-{index}")
+
+    # ---- Checkout ----
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        t0 = time.perf_counter()
+        contended = not self._writer_lock.acquire(blocking=False)
+        if contended:
+            self._writer_lock.acquire()
+        try:
+            if self._writer is None:
+                self._writer = self._open_writer()
+            pc = self._writer
+            outer = self._writer_owner is None
+            if outer:
+                self._writer_owner = threading.get_ident()
+                pc.stats.checkouts += 1
+                if contended:
+                    pc.stats.busy_waits += 1
+                    pc.stats.wait_seconds += time.perf_counter() - t0
+            t_held = time.perf_counter()
+            try:
+                yield pc.conn
+            finally:
+                if outer:
+                    pc.stats.held_seconds += time.perf_counter() - t_held
+                    self._writer_owner = None
+        finally:
+            self._writer_lock.release()
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        held: Optional[_PooledConnection] = getattr(self._held, "reader", None)
+        if held is not None:
+            yield held.conn
+            return
+        # The writer's own thread reads through the writer so it sees its uncommitted rows
+        if self._writer_owner == threading.get_ident() and self._writer is not None:
+            yield self._writer.conn
+            return
+        pc = self._checkout_reader()
+        self._held.reader = pc
+        t_held = time.perf_counter()
+        try:
+            yield pc.conn
+        finally:
+            pc.stats.held_seconds += time.perf_counter() - t_held
+            self._held.reader = None
+            with self._readers_lock:
+                alive = pc in self._readers
+            if alive:
+                self._idle.put(pc)
+            else:
+                try:
+                    pc.conn.close()
+                except Exception:
+                    pass
+
+    def _checkout_reader(self) -> _PooledConnection:
+        try:
+            pc = self._idle.get_nowait()
+            pc.stats.checkouts += 1
+            return pc
+        except queue.Empty:
+            pass
+        with self._readers_lock:
+            if len(self._readers) < self.max_readers:
+                # The file (and WAL) must exist before a read-only open; the writer creates it
+                if self._writer is None:
+                    with self.writer():
+                        pass
+                pc = self._open_reader(len(self._readers))
+                self._readers.append(pc)
+                pc.stats.checkouts += 1
+                return pc
+        t0 = time.perf_counter()
+        pc = self._idle.get()
+        pc.stats.checkouts += 1
+        pc.stats.busy_waits += 1
+        pc.stats.wait_seconds += time.perf_counter() - t0
+        return pc
+
+    # ---- Lifecycle / stats ----
+    def close(self) -> None:
+        """Close every connection; in-use readers are closed when returned to the pool."""
+        with self._writer_lock:
+            if self._writer is not None:
+                try:
+                    self._writer.conn.close()
+                except Exception:
+                    pass
+                self._writer = None
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+            while True:
+                try:
+                    self._idle.get_nowait()
+                except queue.Empty:
+                    break
+        for pc in readers:
+            try:
+                pc.conn.close()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        out: Dict[str, Dict[str, float]] = {}
+        if self._writer is not None:
+            out[self._writer.stats.name] = self._writer.stats.as_dict()
+        for pc in list(self._readers):
+            out[pc.stats.name] = pc.stats.as_dict()
+        return out
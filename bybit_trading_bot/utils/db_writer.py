@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Sequence, Tuple
+
+from bybit_trading_bot.utils.logger import get_logger
+
+
+_Statement = Tuple[str, Sequence[Any]]
+
+
+class WriteBehindWriter:
+    """Background SQLite writer that turns single-row inserts into executemany batches.
+
+    - Producers call submit() and return immediately; rows are grouped per statement
+    - A batch is committed once batch_size rows are pending or flush_interval elapses
+    - When the queue is full, submit() blocks (backpressure) and the stall is counted
+    - flush() waits until everything submitted before it is committed
+    """
+
+    def __init__(
+        self,
+        connection: Callable[[], ContextManager[sqlite3.Connection]],
+        batch_size: int = 500,
+        flush_interval: float = 0.25,
+        max_queue: int = 50000,
+        name: str = "DBWriter",
+    ) -> None:
+        # Checked out per batch so other writers can interleave between batches
+        self._connection = connection
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = max(0.01, float(flush_interval))
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._name = name
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self.logger = get_logger(self.__class__.__name__)
+        # Producers and the writer thread both update _stats
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, float] = {
+            "submitted": 0,
+            "written": 0,
+            "failed": 0,
+            "batches": 0,
+            "blocked_submits": 0,
+            "blocked_seconds": 0.0,
+            "max_depth": 0,
+            "last_batch_rows": 0,
+            "last_batch_ms": 0.0,
+        }
+
+    # ---- Lifecycle ----
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+            self._thread.start()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush pending rows and stop the writer thread."""
+        if not self.is_running:
+            return
+        self.flush(timeout=timeout)
+        self._stop_event.set()
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    # ---- Producer side ----
+    def submit(self, sql: str, params: Sequence[Any]) -> None:
+        self._ensure_started()
+        item = (sql, params)
+        blocked = None
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            t0 = time.perf_counter()
+            self._queue.put(item)
+            blocked = time.perf_counter() - t0
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            if blocked is not None:
+                self._stats["blocked_submits"] += 1
+                self._stats["blocked_seconds"] += blocked
+            self._stats["submitted"] += 1
+            if depth > self._stats["max_depth"]:
+                self._stats["max_depth"] = depth
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Block until every row submitted before this call is committed."""
+        if not self.is_running:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def stats(self) -> Dict[str, float]:
+        with self._stats_lock:
+            out = dict(self._stats)
+        out["queue_depth"] = self._queue.qsize()
+        return out
+
+    # ---- Writer thread ----
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if self._stop_event.is_set():
+                    break
+                continue
+            if first is None:
+                break
+            batch: List[_Statement] = []
+            waiters: List[threading.Event] = []
+            self._take(first, batch, waiters)
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size and not waiters:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                self._take(item, batch, waiters)
+            # A flush request ends the batch early: everything queued before it is already in hand
+            if batch:
+                try:
+                    with self._connection() as conn:
+                        self._write_batch(conn, batch)
+                except Exception as e:
+                    with self._stats_lock:
+                        self._stats["failed"] += len(batch)
+                    self.logger.error(f"Writer could not obtain a connection, dropped {len(batch)} rows: {e}")
+            for ev in waiters:
+                ev.set()
+            if stop:
+                break
+
+    @staticmethod
+    def _take(item: Any, batch: List[_Statement], waiters: List[threading.Event]) -> None:
+        if isinstance(item, threading.Event):
+            waiters.append(item)
+        else:
+            batch.append(item)
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[_Statement]) -> None:
+        if not batch:
+            return
+        t0 = time.perf_counter()
+        grouped: Dict[str, List[Sequence[Any]]] = {}
+        for sql, params in batch:
+            grouped.setdefault(sql, []).append(params)
+        try:
+            cur = conn.cursor()
+            for sql, rows in grouped.items():
+                cur.executemany(sql, rows)
+            conn.commit()
+            with self._stats_lock:
+                self._stats["written"] += len(batch)
+        except Exception as e:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            self.logger.warning(f"Batch write failed ({len(batch)} rows), retrying row by row: {e}")
+            self._write_rows(conn, batch)
+        with self._stats_lock:
+            self._stats["batches"] += 1
+            self._stats["last_batch_rows"] = len(batch)
+            self._stats["last_batch_ms"] = (time.perf_counter() - t0) * 1000.0
+
+    def _write_rows(self, conn: sqlite3.Connection, batch: List[_Statement]) -> None:
+        cur = conn.cursor()
+        written = failed = 0
+        for sql, params in batch:
+            try:
+                cur.execute(sql, params)
+                written += 1
+            except Exception as e:
+                failed += 1
+                self.logger.error(f"Dropped row for '{sql.split('(')[0].strip()}': {e}")
+        with self._stats_lock:
+            self._stats["written"] += written
+            self._stats["failed"] += failed
+        try:
+            conn.commit()
+        except Exception as e:
+            self.logger.error(f"Commit failed after row-by-row retry: {e}")
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Dict
+
+try:
+    from pybit.unified_trading import HTTP as _PybitHTTP, WebSocket as _PybitWebSocket
+except Exception:  # pragma: no cover - allows running without pybit installed at dev time
+    _PybitHTTP = None  # type: ignore
+    _PybitWebSocket = None  # type: ignore
+
+
+# Base URLs replacing api.bybit.com / stream.bybit.com, e.g. http://127.0.0.1:8600 and
+# ws://127.0.0.1:8601 for the local simulator (python -m bybit_trading_bot.simulator.server).
+# Empty means the live (or testnet) Bybit hosts.
+_overrides: Dict[str, str] = {
+    "rest": os.getenv("BYBIT_REST_URL", "").rstrip("/"),
+    "ws": os.getenv("BYBIT_WS_URL", "").rstrip("/"),
+}
+
+
+def set_endpoints(rest_url: str = "", ws_url: str = "") -> None:
+    _overrides["rest"] = (rest_url or "").rstrip("/")
+    _overrides["ws"] = (ws_url or "").rstrip("/")
+
+
+def configure(config: Any) -> None:
+    """Apply BYBIT_REST_URL / BYBIT_WS_URL from Config to every client created afterwards."""
+    set_endpoints(getattr(config, "bybit_rest_url", "") or "", getattr(config, "bybit_ws_url", "") or "")
+
+
+def is_overridden() -> bool:
+    return bool(_overrides["rest"] or _overrides["ws"])
+
+
+def rest_url(testnet: bool = False) -> str:
+    if _overrides["rest"]:
+        return _overrides["rest"]
+    return "https://api-testnet.bybit.com" if testnet else "https://api.bybit.com"
+
+
+def ws_url(path: str, testnet: bool = False) -> str:
+    """Stream URL for a v5 path such as 'public/spot' or 'private'."""
+    base = _overrides["ws"] or ("wss://stream-testnet.bybit.com" if testnet else "wss://stream.bybit.com")
+    return f"{base}/v5/{path}"
+
+
+if _PybitHTTP is not None:
+
+    class HTTP(_PybitHTTP):  # type: ignore[misc,valid-type]
+        """pybit HTTP session honouring the REST endpoint override."""
+
+        def __post_init__(self) -> None:
+            super().__post_init__()
+            if _overrides["rest"]:
+                self.endpoint = _overrides["rest"]
+
+    class WebSocket(_PybitWebSocket):  # type: ignore[misc,valid-type]
+        """pybit WebSocket honouring the stream endpoint override (also on pybit's reconnects)."""
+
+        def _connect(self, url):
+            if _overrides["ws"]:
+                url = ws_url(self.WS_URL.split("/v5/", 1)[1], testnet=self.testnet)
+            return super()._connect(url)
+
+else:  # pragma: no cover
+    HTTP = None  # type: ignore
+    WebSocket = None  # type: ignore
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Dict, Optional, Sequence
+
+
+# Upper bounds (inclusive) for callback/request latencies in milliseconds
+LATENCY_MS_BOUNDS = (1.0, 2.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 5000.0)
+# Upper bounds (inclusive) for job/cycle durations in seconds
+DURATION_S_BOUNDS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+# Upper bounds (inclusive) for queue depths
+DEPTH_BOUNDS = (0.0, 1.0, 5.0, 10.0, 50.0, 100.0, 500.0, 1000.0, 5000.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram: O(log buckets) observe, cheap snapshots for periodic logging."""
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(sorted(float(b) for b in bounds))
+        self._counts = [0] * (len(self.bounds) + 1)  # last bucket is +inf
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self.bounds, value)
+        with self._lock:
+            self._counts[i] += 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (max for the overflow bucket)."""
+        with self._lock:
+            if not self.count:
+                return None
+            rank = max(1, int(round(q * self.count)))
+            seen = 0
+            for i, n in enumerate(self._counts):
+                seen += n
+                if seen >= rank:
+                    return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            buckets = {f"le_{b:g}": n for b, n in zip(self.bounds, self._counts)}
+            buckets["inf"] = self._counts[-1]
+            count, total, peak = self.count, self.total, self.max
+        return {
+            "count": count,
+            "mean": (total / count) if count else 0.0,
+            "max": peak,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": buckets,
+        }
@@ -3,17 +3,310 @@ from __future__ import annotations
 import random
 import threading
 import time
-from typing import Any, Callable, Optional
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional, Set
 
 from bybit_trading_bot.utils.logger import get_logger
 
 
+# Bybit rate limits apply per endpoint group; requests are classified by pybit method name
+MARKET = "market"
+TRADE = "trade"
+ACCOUNT = "account"
+
+_ENDPOINT_CLASS: Dict[str, str] = {
+    "get_server_time": MARKET,
+    "get_kline": MARKET,
+    "get_tickers": MARKET,
+    "get_orderbook": MARKET,
+    "get_instruments_info": MARKET,
+    "get_open_interest": MARKET,
+    "get_public_trade_history": MARKET,
+    "get_funding_rate_history": MARKET,
+    "place_order": TRADE,
+    "amend_order": TRADE,
+    "cancel_order": TRADE,
+    "cancel_all_orders": TRADE,
+    "place_batch_order": TRADE,
+    "set_trading_stop": TRADE,
+    "set_leverage": TRADE,
+}
+
+
+def endpoint_class(method_name: str) -> str:
+    """Endpoint group of a pybit method; unknown reads count as account, unknown writes as trade."""
+    cls = _ENDPOINT_CLASS.get(method_name)
+    if cls is not None:
+        return cls
+    return ACCOUNT if method_name.startswith("get_") else TRADE
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `max_requests` burst, refilled at max_requests/per_seconds."""
+
+    def __init__(self, max_requests: float, per_seconds: float) -> None:
+        self.capacity = float(max_requests)
+        self.tokens = float(max_requests)
+        self.refill_rate = float(max_requests) / float(per_seconds)
+        self.last_refill = time.time()
+        self._lock = threading.Lock()
+
+    def set_rate(self, max_requests: float, per_seconds: float) -> None:
+        """Change burst and refill rate in place; clients holding this bucket pick it up immediately."""
+        with self._lock:
+            self._refill()
+            self.capacity = float(max_requests)
+            self.tokens = min(self.tokens, self.capacity)
+            self.refill_rate = float(max_requests) / float(per_seconds)
+
+    def _refill(self) -> None:
+        now = time.time()
+        elapsed = now - self.last_refill
+        if elapsed <= 0:
+            return
+        self.tokens = min(self.capacity, self.tokens + elapsed * (self.refill_rate))
+        self.last_refill = now
+
+    def try_acquire(self) -> float:
+        """Take one token if available (returns 0.0), else return seconds until one is."""
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return 0.0
+            # Not enough tokens; compute sleep until 1 token available
+            needed = 1.0 - self.tokens
+            return max(needed / self.refill_rate, 0.005)
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until available; returns seconds waited."""
+        waited = 0.0
+        while True:
+            sleep_time = self.try_acquire()
+            if sleep_time <= 0.0:
+                return waited
+            time.sleep(sleep_time)
+            waited += sleep_time
+
+
+# Bybit quota headers: limit per window, requests left in it, epoch ms when it resets
+LIMIT_HEADER = "X-Bapi-Limit"
+STATUS_HEADER = "X-Bapi-Limit-Status"
+RESET_HEADER = "X-Bapi-Limit-Reset-Timestamp"
+RATE_LIMIT_CODE = 10006  # "Too many visits"
+
+
+def _header(headers: Any, name: str) -> Optional[str]:
+    if not headers:
+        return None
+    try:
+        v = headers.get(name)
+        if v is None:
+            v = headers.get(name.lower())
+        return v
+    except Exception:
+        return None
+
+
+class EndpointLimit:
+    """Quota window learned from one endpoint's headers.
+
+    Requests take from `remaining`; it is clamped to the server's count on every response
+    (local in-flight requests are already deducted) and refilled to `limit` at the reset time.
+    The window length is learned from successive reset timestamps (default 1s).
+    """
+
+    DEFAULT_WINDOW = 1.0
+    RESET_GUARD = 0.02  # wait this long past the server reset before spending the new window
+
+    def __init__(self, limit: int, reserve: int = 0) -> None:
+        self.limit = int(limit)
+        self.reserve = max(0, int(reserve))
+        self.remaining = float(self.limit - self.reserve)
+        self.reset_at = 0.0  # server clock, seconds
+        self.window: Optional[float] = None
+        self.throttled_s = 0.0
+        self.rejections = 0
+        self.observed = 0
+
+    def window_s(self) -> float:
+        return self.window or self.DEFAULT_WINDOW
+
+    def roll(self, server_now: float) -> None:
+        if self.reset_at and server_now >= self.reset_at + self.RESET_GUARD:
+            w = self.window_s()
+            windows = int((server_now - self.reset_at) // w) + 1
+            self.reset_at += windows * w
+            self.remaining = float(self.limit - self.reserve)
+
+    def observe(self, limit: int, status: int, reset_at: float, others_in_flight: int = 0) -> None:
+        self.observed += 1
+        if limit > 0:
+            self.limit = limit
+        # Requests already sent but not yet counted in `status` are deducted too
+        left = float(status - self.reserve - others_in_flight)
+        tol = 0.25 * self.window_s()
+        if reset_at > self.reset_at + tol:
+            if self.reset_at:
+                delta = reset_at - self.reset_at
+                if 0.05 <= delta <= 60.0:
+                    self.window = delta if self.window is None else min(self.window, delta)
+            self.reset_at = reset_at
+            self.remaining = left
+        elif reset_at >= self.reset_at - tol:
+            self.remaining = min(self.remaining, left)
+        # else: late response from an earlier window
+
+    def snapshot(self, server_now: float) -> Dict[str, float]:
+        return {
+            "limit": self.limit,
+            "window_s": round(self.window_s(), 3),
+            "rate_per_second": round(self.limit / self.window_s(), 3),
+            "remaining": max(0, int(self.remaining)),
+            "reset_in_s": round(max(0.0, self.reset_at - server_now), 3),
+            "throttled_s": round(self.throttled_s, 3),
+            "rejections": self.rejections,
+            "observed": self.observed,
+        }
+
+
+class HeaderRateLimiter:
+    """Per-endpoint limits learned from Bybit's X-Bapi-Limit* response headers.
+
+    - Endpoints are keyed by pybit method name (Bybit quotas are per endpoint)
+    - Until an endpoint has answered once, one request at a time probes it (a cold-start burst
+      could otherwise overrun a quota we have not seen yet); endpoints answering without headers
+      are not limited here afterwards (static buckets apply)
+    - Server clock offset is estimated from the response `time` field, so reset timestamps
+      are compared on the exchange clock
+    """
+
+    def __init__(self, reserve: int = 0) -> None:
+        self.reserve = max(0, int(reserve))
+        self._limits: Dict[str, EndpointLimit] = {}
+        self._in_flight: Dict[str, int] = defaultdict(int)
+        self._probed: Set[str] = set()
+        self._lock = threading.Lock()
+        self._offset: Optional[float] = None  # server minus local clock, seconds
+
+    def _server_now(self) -> float:
+        return time.time() + (self._offset or 0.0)
+
+    def knows(self, method_name: str) -> bool:
+        return method_name in self._limits
+
+    def try_acquire(self, method_name: str, waited: float = 0.0) -> float:
+        """Take one request if the window allows (returns 0.0), else return seconds until reset.
+
+        `waited` is the time already spent waiting for this request (for throttled_s).
+        """
+        with self._lock:
+            lim = self._limits.get(method_name)
+            if lim is None:
+                if method_name not in self._probed and self._in_flight[method_name] > 0:
+                    return 0.02  # wait for the probe's headers
+                self._in_flight[method_name] += 1
+                return 0.0
+            now = self._server_now()
+            lim.roll(now)
+            if lim.remaining >= 1.0:
+                lim.remaining -= 1.0
+                self._in_flight[method_name] += 1
+                lim.throttled_s += waited
+                return 0.0
+            return max(lim.reset_at + EndpointLimit.RESET_GUARD - now, 0.005)
+
+    def acquire(self, method_name: str) -> float:
+        """Take one request from the endpoint's learned window; returns seconds waited.
+
+        Every acquire must be paired with release() once the response (or error) is in; requests
+        are counted in flight even before the endpoint's limit is known.
+        """
+        waited = 0.0
+        while True:
+            sleep_time = self.try_acquire(method_name, waited)
+            if sleep_time <= 0.0:
+                return waited
+            time.sleep(sleep_time)
+            waited += sleep_time
+
+    def observe(self, method_name: str, headers: Any, server_time_ms: Any = None) -> None:
+        """Feed one response's headers (and body `time`, if any) into the endpoint's state."""
+        if server_time_ms:
+            try:
+                sample = float(server_time_ms) / 1000.0 - time.time()
+                with self._lock:
+                    self._offset = sample if self._offset is None else 0.8 * self._offset + 0.2 * sample
+            except (TypeError, ValueError):
+                pass
+        limit, status, reset = (_header(headers, h) for h in (LIMIT_HEADER, STATUS_HEADER, RESET_HEADER))
+        if limit is None or status is None or reset is None:
+            return
+        try:
+            limit_i, status_i, reset_at = int(limit), int(status), int(reset) / 1000.0
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            lim = self._limits.get(method_name)
+            if lim is None:
+                lim = self._limits[method_name] = EndpointLimit(limit_i, self.reserve)
+            # Called before release(): this response's own request is still counted in flight
+            lim.observe(limit_i, status_i, reset_at, max(0, self._in_flight[method_name] - 1))
+
+    def release(self, method_name: str) -> None:
+        with self._lock:
+            self._probed.add(method_name)
+            if self._in_flight[method_name] > 0:
+                self._in_flight[method_name] -= 1
+
+    def rejected(self, method_name: str) -> None:
+        """Count a 10006 and spend the rest of the window (headers usually arrive with it)."""
+        with self._lock:
+            lim = self._limits.get(method_name)
+            if lim is not None:
+                lim.rejections += 1
+                lim.remaining = 0.0
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Learned limits per endpoint (exported via RestClientRegistry.stats)."""
+        with self._lock:
+            now = self._server_now()
+            return {name: lim.snapshot(now) for name, lim in sorted(self._limits.items())}
+
+
+class TokenUsage:
+    """Tokens consumed and seconds spent waiting, per (subsystem, endpoint class)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tokens: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._wait_s: Dict[str, float] = defaultdict(float)
+
+    def record(self, subsystem: str, cls: str, waited: float) -> None:
+        with self._lock:
+            self._tokens[subsystem][cls] += 1
+            self._wait_s[subsystem] += waited
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            out: Dict[str, Dict[str, float]] = {}
+            for sub, by_cls in self._tokens.items():
+                row: Dict[str, float] = dict(by_cls)
+                row["total"] = sum(by_cls.values())
+                row["wait_s"] = round(self._wait_s[sub], 3)
+                out[sub] = row
+            return out
+
+
 class RateLimitedHTTP:
     """Thin wrapper over pybit HTTP client with token-bucket rate limiting and backoff.
 
-    - Limits average request rate (token bucket)
+    - Limits average request rate (token bucket); with `buckets` the bucket is picked per endpoint
+      class and may be shared with other clients (see RestClientRegistry), `cap` adds a private limit
+    - Endpoints that report X-Bapi-Limit* headers are paced by the learned quota instead of the
+      static class bucket (pybit must be created with return_response_headers=True)
     - Retries on transient/rate-limit errors with exponential backoff and jitter
-    - Logs rate events
+    - Logs rate events; tokens taken are recorded in `usage` under `subsystem`
     """
 
     def __init__(
@@ -24,16 +317,22 @@ class RateLimitedHTTP:
         max_retries: int = 5,
         base_backoff: float = 0.2,
         backoff_cap: float = 3.0,
+        buckets: Optional[Dict[str, TokenBucket]] = None,
+        cap: Optional[TokenBucket] = None,
+        subsystem: str = "default",
+        usage: Optional[TokenUsage] = None,
+        header_limiter: Optional[HeaderRateLimiter] = None,
     ) -> None:
         self.http = http_client
         self.logger = get_logger(self.__class__.__name__)
 
-        # Token bucket
-        self.capacity = float(max_requests)
-        self.tokens = float(max_requests)
-        self.refill_rate = float(max_requests) / float(per_seconds)
-        self.last_refill = time.time()
-        self._lock = threading.Lock()
+        # Token buckets: own bucket for every endpoint class unless shared ones are given
+        self._bucket = TokenBucket(max_requests, per_seconds)
+        self._buckets = buckets or {}
+        self._cap = cap
+        self.subsystem = subsystem
+        self.usage = usage if usage is not None else TokenUsage()
+        self.header_limiter = header_limiter if header_limiter is not None else HeaderRateLimiter()
 
         # Backoff
         self.max_retries = max_retries
@@ -41,25 +340,23 @@ class RateLimitedHTTP:
         self.backoff_cap = backoff_cap
 
     # ---- Rate limiting ----
-    def _refill(self) -> None:
-        now = time.time()
-        elapsed = now - self.last_refill
-        if elapsed <= 0:
-            return
-        self.tokens = min(self.capacity, self.tokens + elapsed * (self.refill_rate))
-        self.last_refill = now
+    def _acquire_token(self, method_name: str = "") -> None:
+        """Wait for quota; pair with header_limiter.release() once the response is in."""
+        cls = endpoint_class(method_name)
+        waited = self._cap.acquire() if self._cap is not None else 0.0
+        if not self.header_limiter.knows(method_name):
+            waited += self._buckets.get(cls, self._bucket).acquire()
+        waited += self.header_limiter.acquire(method_name)
+        self.usage.record(self.subsystem, cls, waited)
 
-    def _acquire_token(self) -> None:
-        while True:
-            with self._lock:
-                self._refill()
-                if self.tokens >= 1.0:
-                    self.tokens -= 1.0
-                    return
-                # Not enough tokens; compute sleep until 1 token available
-                needed = 1.0 - self.tokens
-                sleep_time = max(needed / self.refill_rate, 0.005)
-            time.sleep(sleep_time)
+    def _unwrap(self, method_name: str, resp: Any) -> Any:
+        """Strip pybit's (json, elapsed, headers) tuple and learn the quota from the headers."""
+        if isinstance(resp, tuple) and resp and isinstance(resp[0], dict):
+            body = resp[0]
+            headers = resp[2] if len(resp) >= 3 else None
+            self.header_limiter.observe(method_name, headers, body.get("time"))
+            return body
+        return resp
 
     # ---- Backoff + request ----
     def _should_retry(self, resp: Any, err: Optional[Exception]) -> bool:
@@ -82,41 +379,58 @@ class RateLimitedHTTP:
                 code = int(code)
             except Exception:
                 return False
-            # Retry on timestamp errors (10002) and other transient errors
-            return code != 0 and code in [10002, 10003, 10004]  # Common timestamp/server errors
+            # Retry on timestamp errors (10002), rate limit (10006) and other transient errors
+            return code != 0 and code in [10002, 10003, 10004, RATE_LIMIT_CODE]
         return False
 
     def request(self, method_name: str, **kwargs) -> Any:
         attempt = 0
         while True:
-            self._acquire_token()
+            self._acquire_token(method_name)
             err: Optional[Exception] = None
             resp = None
             try:
                 method: Callable[..., Any] = getattr(self.http, method_name)
-                resp = method(**kwargs)
+                resp = self._unwrap(method_name, method(**kwargs))
             except Exception as e:  # pybit FailedRequestError or network issues
                 err = e
+                self.header_limiter.observe(method_name, getattr(e, "resp_headers", None))
+            finally:
+                self.header_limiter.release(method_name)
 
             # Success
             if err is None and isinstance(resp, dict) and int(resp.get("retCode", -1)) == 0:
                 return resp
 
-            # Retry?
-            if attempt >= self.max_retries or not self._should_retry(resp, err):
+            delay = self._next_delay(method_name, resp, err, attempt)
+            if delay is None:
                 if err is not None:
                     raise err
                 return resp
+            if delay > 0:
+                time.sleep(delay)
+            attempt += 1
 
-            # Backoff with jitter - increased base backoff for timestamp errors
-            base_backoff = self.base_backoff
-            if isinstance(resp, dict) and resp.get("retCode") == 10002:
-                base_backoff = 1.0  # Longer base backoff for timestamp errors
-            
-            backoff = min(self.backoff_cap, base_backoff * (2 ** attempt))
-            backoff *= 0.5 + random.random()  # jitter 0.5x..1.5x
-            self.logger.warning(
-                f"Rate/backoff: method={method_name} attempt={attempt+1} sleeping={backoff:.2f}s"
-            )
-            time.sleep(backoff)
-            attempt += 1 
\ No newline at end of file
+    def _next_delay(self, method_name: str, resp: Any, err: Optional[Exception], attempt: int) -> Optional[float]:
+        """Seconds to back off before retrying a failed attempt, or None to give up."""
+        # Retry?
+        if attempt >= self.max_retries or not self._should_retry(resp, err):
+            return None
+
+        # Rate limited: the learned window already blocks until reset, no blind backoff
+        if isinstance(resp, dict) and resp.get("retCode") == RATE_LIMIT_CODE and self.header_limiter.knows(method_name):
+            self.header_limiter.rejected(method_name)
+            self.logger.warning(f"Rate limit hit: method={method_name} attempt={attempt+1}, waiting for quota reset")
+            return 0.0
+
+        # Backoff with jitter - increased base backoff for timestamp errors
+        base_backoff = self.base_backoff
+        if isinstance(resp, dict) and resp.get("retCode") == 10002:
+            base_backoff = 1.0  # Longer base backoff for timestamp errors
+
+        backoff = min(self.backoff_cap, base_backoff * (2 ** attempt))
+        backoff *= 0.5 + random.random()  # jitter 0.5x..1.5x
+        self.logger.warning(
+            f"Rate/backoff: method={method_name} attempt={attempt+1} sleeping={backoff:.2f}s"
+        )
+        return backoff
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class L2OrderBook:
+    """Local price-level book maintained from Bybit v5 orderbook snapshot/delta messages.
+
+    - Each side is a pair of sorted arrays (price keys, sizes); bids are keyed by -price so
+      both sides sort ascending and level 0 is the best quote
+    - Deltas touch only the changed levels (bisect + in-place update); size 0 deletes a level
+    - Update ids must be consecutive; a gap or crossed book invalidates the book until the
+      next snapshot
+    - best_bid/best_ask are plain attributes refreshed after every update (O(1) reads)
+    """
+
+    def __init__(self, symbol: str, max_levels: int = 200) -> None:
+        self.symbol = symbol
+        self.max_levels = max(1, int(max_levels))
+        self._lock = threading.Lock()
+        self._bid_keys: List[float] = []
+        self._bid_sizes: List[float] = []
+        self._ask_keys: List[float] = []
+        self._ask_sizes: List[float] = []
+        self.best_bid: Optional[float] = None
+        self.best_ask: Optional[float] = None
+        self.update_id: Optional[int] = None
+        self.seq: Optional[int] = None
+        self.is_valid = False
+        self.snapshots = 0
+        self.deltas = 0
+        self.gaps = 0
+        self.last_update_ts = 0.0
+
+    # ---- Updates ----
+    def apply_snapshot(
+        self, bids: Iterable[Sequence], asks: Iterable[Sequence], update_id: Optional[int] = None, seq: Optional[int] = None
+    ) -> None:
+        with self._lock:
+            self._bid_keys, self._bid_sizes = self._load_side(bids, -1.0)
+            self._ask_keys, self._ask_sizes = self._load_side(asks, 1.0)
+            self.update_id = update_id
+            self.seq = seq
+            self.snapshots += 1
+            self._refresh()
+
+    def apply_delta(
+        self, bids: Iterable[Sequence], asks: Iterable[Sequence], update_id: Optional[int] = None, seq: Optional[int] = None
+    ) -> bool:
+        """Apply changed levels; returns False (and invalidates) on a sequence gap."""
+        with self._lock:
+            # Before the first snapshot or after a gap: wait for a snapshot
+            if not self.is_valid:
+                return False
+            if update_id is not None and self.update_id is not None and update_id != self.update_id + 1:
+                if update_id <= self.update_id:
+                    # Duplicate/replayed message
+                    return self.is_valid
+                self.gaps += 1
+                self.is_valid = False
+                return False
+            for row in bids:
+                self._set_level(self._bid_keys, self._bid_sizes, -float(row[0]), float(row[1]))
+            for row in asks:
+                self._set_level(self._ask_keys, self._ask_sizes, float(row[0]), float(row[1]))
+            if update_id is not None:
+                self.update_id = update_id
+            if seq is not None:
+                self.seq = seq
+            self.deltas += 1
+            self._refresh()
+            return self.is_valid
+
+    def _load_side(self, rows: Iterable[Sequence], sign: float) -> Tuple[List[float], List[float]]:
+        levels = sorted((sign * float(r[0]), float(r[1])) for r in rows if float(r[1]) > 0.0)
+        del levels[self.max_levels:]
+        return [k for k, _ in levels], [q for _, q in levels]
+
+    def _set_level(self, keys: List[float], sizes: List[float], key: float, size: float) -> None:
+        i = bisect_left(keys, key)
+        found = i < len(keys) and keys[i] == key
+        if size <= 0.0:
+            if found:
+                del keys[i]
+                del sizes[i]
+        elif found:
+            sizes[i] = size
+        elif i < self.max_levels:
+            keys.insert(i, key)
+            sizes.insert(i, size)
+            if len(keys) > self.max_levels:
+                keys.pop()
+                sizes.pop()
+
+    def _refresh(self) -> None:
+        self.best_bid = -self._bid_keys[0] if self._bid_keys else None
+        self.best_ask = self._ask_keys[0] if self._ask_keys else None
+        # A crossed book means we missed an update: wait for the next snapshot
+        crossed = self.best_bid is not None and self.best_ask is not None and self.best_bid >= self.best_ask
+        if crossed:
+            self.gaps += 1
+        self.is_valid = self.best_bid is not None and self.best_ask is not None and not crossed
+        self.last_update_ts = time.time()
+
+    # ---- Reads ----
+    @property
+    def mid(self) -> Optional[float]:
+        bid, ask = self.best_bid, self.best_ask
+        if bid is None or ask is None:
+            return None
+        return (bid + ask) / 2.0
+
+    @property
+    def spread_pct(self) -> Optional[float]:
+        bid, ask = self.best_bid, self.best_ask
+        if bid is None or ask is None or ask <= 0:
+            return None
+        return (ask - bid) / ask
+
+    def depth(self, side: str, levels: int) -> float:
+        """Summed size of the best `levels` levels on 'bid' or 'ask'."""
+        with self._lock:
+            sizes = self._bid_sizes if side == "bid" else self._ask_sizes
+            return sum(sizes[: max(0, int(levels))])
+
+    def imbalance(self, levels: int = 5) -> Optional[float]:
+        """(bid depth - ask depth) / total over the top levels, in [-1, 1]."""
+        with self._lock:
+            n = max(0, int(levels))
+            bvol = sum(self._bid_sizes[:n])
+            avol = sum(self._ask_sizes[:n])
+        total = bvol + avol
+        if total <= 0:
+            return None
+        return (bvol - avol) / total
+
+    def levels(self, side: str, levels: int) -> List[Tuple[float, float]]:
+        """Top levels as (price, size), best first."""
+        with self._lock:
+            n = max(0, int(levels))
+            if side == "bid":
+                return [(-k, q) for k, q in zip(self._bid_keys[:n], self._bid_sizes[:n])]
+            return list(zip(self._ask_keys[:n], self._ask_sizes[:n]))
+
+
+class OrderBookStore:
+    """Per-symbol L2OrderBook registry fed with raw v5 orderbook messages."""
+
+    def __init__(self, max_levels: int = 200) -> None:
+        self.max_levels = max_levels
+        self._books: Dict[str, L2OrderBook] = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str) -> Optional[L2OrderBook]:
+        return self._books.get(symbol)
+
+    def symbols(self) -> List[str]:
+        return list(self._books)
+
+    def apply(self, symbol: str, msg_type: str, data: dict) -> L2OrderBook:
+        """Apply one message payload ({'b': [[p, q]...], 'a': [...], 'u': .., 'seq': ..})."""
+        book = self._books.get(symbol)
+        if book is None:
+            with self._lock:
+                book = self._books.setdefault(symbol, L2OrderBook(symbol, self.max_levels))
+        update_id = data.get("u")
+        seq = data.get("seq")
+        update_id = int(update_id) if update_id is not None else None
+        seq = int(seq) if seq is not None else None
+        bids = data.get("b") or []
+        asks = data.get("a") or []
+        # u == 1 is a snapshot after a service restart even when typed as delta
+        if msg_type == "snapshot" or update_id == 1:
+            book.apply_snapshot(bids, asks, update_id, seq)
+        else:
+            book.apply_delta(bids, asks, update_id, seq)
+        return book
+
+    def stats(self) -> Dict[str, int]:
+        books = list(self._books.values())
+        return {
+            "books": len(books),
+            "valid": sum(1 for b in books if b.is_valid),
+            "snapshots": sum(b.snapshots for b in books),
+            "deltas": sum(b.deltas for b in books),
+            "gaps": sum(b.gaps for b in books),
+        }
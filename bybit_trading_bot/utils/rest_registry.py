@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from bybit_trading_bot.utils import endpoints
+from bybit_trading_bot.utils.http_client import (
+    ACCOUNT,
+    MARKET,
+    RATE_LIMIT_CODE,
+    TRADE,
+    HeaderRateLimiter,
+    RateLimitedHTTP,
+    TokenBucket,
+    TokenUsage,
+)
+from bybit_trading_bot.utils.logger import get_logger
+
+if TYPE_CHECKING:  # pragma: no cover
+    from bybit_trading_bot.utils.async_http_client import AsyncRateLimitedHTTP
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry  # type: ignore
+except Exception:  # pragma: no cover
+    requests = None  # type: ignore
+    HTTPAdapter = None  # type: ignore
+
+
+# Requests/second per endpoint class shared by all clients of one host (burst = 3s worth)
+DEFAULT_LIMITS: Dict[str, float] = {MARKET: 20.0, TRADE: 10.0, ACCOUNT: 10.0}
+BURST_SECONDS = 3.0
+# pybit's default retry codes minus 10006: rate-limit waits are left to the learned header limits
+_PYBIT_RETRY_CODES = {10002, 30034, 30035, 130035, 130150}
+
+
+class RestClientRegistry:
+    """Process-wide Bybit REST clients sharing connections and one rate-limit budget.
+
+    - One keep-alive requests.Session per host, reused by every pybit HTTP instance
+    - One pybit HTTP per (host, api key, recv_window); subsystems get their own RateLimitedHTTP
+      wrapper over it so retries/backoff and usage counters stay per caller
+    - One TokenBucket per (host, endpoint class): market data, trade, account
+    - One HeaderRateLimiter per (host, api key): endpoints reporting X-Bapi-Limit* headers are
+      paced by the learned quota instead of the class bucket; see stats()["learned_limits"]
+    """
+
+    def __init__(self, limits: Optional[Dict[str, float]] = None, pool_maxsize: int = 100) -> None:
+        self.logger = get_logger(self.__class__.__name__)
+        self.limits = dict(DEFAULT_LIMITS)
+        self.limits.update(limits or {})
+        self.pool_maxsize = max(1, int(pool_maxsize))
+        self.usage = TokenUsage()
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, Any] = {}
+        self._buckets: Dict[str, Dict[str, TokenBucket]] = {}
+        self._raw: Dict[Tuple[str, str, int], Any] = {}
+        self._header_limiters: Dict[Tuple[str, str], HeaderRateLimiter] = {}
+
+    def session(self, host: str) -> Any:
+        """Keep-alive session for `host` (None when requests is unavailable)."""
+        if requests is None:
+            return None
+        with self._lock:
+            sess = self._sessions.get(host)
+            if sess is None:
+                sess = requests.Session()
+                if HTTPAdapter is not None:
+                    adapter = HTTPAdapter(
+                        pool_connections=10,
+                        pool_maxsize=self.pool_maxsize,
+                        max_retries=Retry(total=2, backoff_factor=0.1),
+                    )
+                    sess.mount("https://", adapter)
+                    sess.mount("http://", adapter)
+                sess.headers.update({"Content-Type": "application/json", "Accept": "application/json"})
+                self._sessions[host] = sess
+            return sess
+
+    def buckets(self, host: str) -> Dict[str, TokenBucket]:
+        with self._lock:
+            b = self._buckets.get(host)
+            if b is None:
+                b = {
+                    cls: TokenBucket(max(1.0, rate * BURST_SECONDS), BURST_SECONDS)
+                    for cls, rate in self.limits.items()
+                }
+                self._buckets[host] = b
+            return b
+
+    def apply_limits(self, limits: Dict[str, float]) -> None:
+        """Update per-class rates, including the buckets existing clients already draw from."""
+        with self._lock:
+            self.limits.update(limits)
+            for b in self._buckets.values():
+                for cls, rate in self.limits.items():
+                    burst = max(1.0, rate * BURST_SECONDS)
+                    if cls in b:
+                        b[cls].set_rate(burst, BURST_SECONDS)
+                    else:
+                        b[cls] = TokenBucket(burst, BURST_SECONDS)
+
+    def header_limiter(self, host: str, api_key: str = "") -> HeaderRateLimiter:
+        """Learned limits are per account (UID) and host, shared by every subsystem using them."""
+        with self._lock:
+            return self._header_limiters.setdefault((host, api_key or ""), HeaderRateLimiter())
+
+    def raw_http(self, testnet: bool, api_key: str = "", api_secret: str = "", recv_window: int = 5000) -> Any:
+        """Shared pybit HTTP for the host/credentials (signing happens per request)."""
+        if endpoints.HTTP is None:
+            raise RuntimeError("pybit is not installed")
+        host = endpoints.rest_url(testnet)
+        key = (host, api_key or "", int(recv_window))
+        with self._lock:
+            http = self._raw.get(key)
+        if http is not None:
+            return http
+        http = endpoints.HTTP(
+            testnet=testnet,
+            api_key=api_key or "",
+            api_secret=api_secret or "",
+            recv_window=int(recv_window),
+            return_response_headers=True,
+            retry_codes=set(_PYBIT_RETRY_CODES),
+            ignore_codes={RATE_LIMIT_CODE},
+        )
+        sess = self.session(host)
+        if sess is not None:
+            http.client = sess
+        with self._lock:
+            return self._raw.setdefault(key, http)
+
+    def client(
+        self,
+        subsystem: str,
+        testnet: bool,
+        api_key: str = "",
+        api_secret: str = "",
+        recv_window: int = 5000,
+        cap_per_second: Optional[float] = None,
+    ) -> RateLimitedHTTP:
+        """Rate-limited client drawing from the shared buckets; `cap_per_second` adds a subsystem limit."""
+        raw = self.raw_http(testnet, api_key, api_secret, recv_window)
+        host = endpoints.rest_url(testnet)
+        cap = None
+        if cap_per_second is not None and cap_per_second > 0:
+            cap = TokenBucket(max(1.0, cap_per_second * BURST_SECONDS), BURST_SECONDS)
+        return RateLimitedHTTP(
+            raw,
+            buckets=self.buckets(host),
+            cap=cap,
+            subsystem=subsystem,
+            usage=self.usage,
+            header_limiter=self.header_limiter(host, api_key),
+        )
+
+    def async_client(
+        self,
+        subsystem: str,
+        testnet: bool,
+        api_key: str = "",
+        api_secret: str = "",
+        recv_window: int = 5000,
+        cap_per_second: Optional[float] = None,
+    ) -> "AsyncRateLimitedHTTP":
+        """aiohttp client for asyncio code, drawing from the same buckets and learned limits."""
+        from bybit_trading_bot.utils.async_http_client import AsyncRateLimitedHTTP
+
+        host = endpoints.rest_url(testnet)
+        cap = None
+        if cap_per_second is not None and cap_per_second > 0:
+            cap = TokenBucket(max(1.0, cap_per_second * BURST_SECONDS), BURST_SECONDS)
+        return AsyncRateLimitedHTTP(
+            host,
+            api_key=api_key,
+            api_secret=api_secret,
+            recv_window=recv_window,
+            buckets=self.buckets(host),
+            cap=cap,
+            subsystem=subsystem,
+            usage=self.usage,
+            header_limiter=self.header_limiter(host, api_key),
+        )
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            hosts = sorted(self._sessions)
+            clients = len(self._raw)
+            limiters = dict(self._header_limiters)
+        learned: Dict[str, object] = {}
+        for (host, key), lim in sorted(limiters.items()):
+            label = host if not key else f"{host} key=...{key[-4:]}"
+            learned[label] = lim.snapshot()
+        return {
+            "hosts": hosts,
+            "pybit_clients": clients,
+            "limits_per_second": dict(self.limits),
+            "learned_limits": learned,
+            "usage": self.usage.snapshot(),
+        }
+
+
+_shared_lock = threading.Lock()
+_shared: Optional[RestClientRegistry] = None
+_shared_configured = False
+
+
+def _config_limits(config: Any) -> Dict[str, float]:
+    return {
+        MARKET: float(getattr(config, "rest_market_rate_per_second", DEFAULT_LIMITS[MARKET])),
+        TRADE: float(getattr(config, "rest_trade_rate_per_second", DEFAULT_LIMITS[TRADE])),
+        ACCOUNT: float(getattr(config, "rest_account_rate_per_second", DEFAULT_LIMITS[ACCOUNT])),
+    }
+
+
+def shared_rest_registry(config: Any = None) -> RestClientRegistry:
+    """Process-wide registry; limits come from the first Config passed (REST_*_RATE_PER_SECOND).
+
+    If the registry was created without a Config, the first Config that arrives later still
+    applies its limits, including to buckets of clients created before it.
+    """
+    global _shared, _shared_configured
+    with _shared_lock:
+        if _shared is None:
+            _shared = RestClientRegistry(_config_limits(config) if config is not None else None)
+            _shared_configured = config is not None
+        elif config is not None and not _shared_configured:
+            _shared.apply_limits(_config_limits(config))
+            _shared_configured = True
+        return _shared
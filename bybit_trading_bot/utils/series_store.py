@@ -0,0 +1,679 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from array import array
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, ContextManager, Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from bybit_trading_bot.utils.db_pool import SQLitePool
+from bybit_trading_bot.utils.db_writer import WriteBehindWriter
+from bybit_trading_bot.utils.logger import get_logger
+
+
+# (epoch_ms, value) columns as returned by the window helpers
+SeriesArrays = Tuple["array[int]", "array[float]"]
+
+# Per-symbol contiguous (int64 epoch_ms, float64 value) NumPy arrays from the bulk helpers
+BulkSeries = Dict[int, Tuple[np.ndarray, np.ndarray]]
+
+_ConnectionContext = Callable[[], ContextManager[sqlite3.Connection]]
+
+
+def _bulk_from_single(window: Callable[[int, int], SeriesArrays], symbol_ids: Sequence[int], since_ms: int) -> BulkSeries:
+    out: BulkSeries = {}
+    for sid in symbol_ids:
+        ts, vals = window(sid, since_ms)
+        if len(ts):
+            out[sid] = (np.frombuffer(ts, dtype=np.int64), np.frombuffer(vals, dtype=np.float64))
+    return out
+
+
+class SeriesStore(ABC):
+    """Storage interface for append-only market series (spot prices and open interest).
+
+    DBManager keeps trade state itself and delegates every price/OI write, window read
+    and retention pass to a SeriesStore, so the backend can live apart from the
+    transactional tables. Timestamps are epoch milliseconds throughout.
+    """
+
+    def append_price(self, symbol_id: int, price: float, ts_ms: int) -> None:
+        self.append_prices([(symbol_id, price, ts_ms / 1000.0)])
+
+    @abstractmethod
+    def append_prices(self, rows: Sequence[Tuple[int, float, float]]) -> None:
+        """Append (symbol_id, price, epoch_seconds) rows."""
+
+    @abstractmethod
+    def append_oi(
+        self,
+        symbol_id: int,
+        ts_ms: int,
+        open_interest: float,
+        oi_value: Optional[float] = None,
+        oi_tokens: Optional[float] = None,
+        oi_tokens_mark: Optional[float] = None,
+        noi_percent: Optional[float] = None,
+    ) -> None:
+        ...
+
+    @abstractmethod
+    def price_window(self, symbol_id: int, since_ms: int, until_ms: Optional[int] = None) -> SeriesArrays:
+        ...
+
+    @abstractmethod
+    def oi_window(self, symbol_id: int, since_ms: int) -> SeriesArrays:
+        ...
+
+    @abstractmethod
+    def noi_window(self, symbol_id: int, since_ms: int) -> SeriesArrays:
+        ...
+
+    @abstractmethod
+    def last_price(self, symbol_id: int) -> Optional[float]:
+        ...
+
+    def price_windows(self, symbol_ids: Sequence[int], since_ms: int) -> BulkSeries:
+        """price_window for many symbols at once; symbols without rows are omitted."""
+        return _bulk_from_single(self.price_window, symbol_ids, since_ms)
+
+    def oi_windows(self, symbol_ids: Sequence[int], since_ms: int) -> BulkSeries:
+        return _bulk_from_single(self.oi_window, symbol_ids, since_ms)
+
+    def run_retention(
+        self,
+        cutoff_ms: int,
+        symbol_ids: Sequence[int],
+        chunk_rows: int = 5000,
+        should_stop: Callable[[], bool] = lambda: False,
+    ) -> Dict[str, int]:
+        """Compact raw rows older than cutoff_ms; returns reclaimed-row counters."""
+        return {"price_data_deleted": 0, "oi_data_deleted": 0, "buckets": 0, "pages_vacuumed": 0}
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {}
+
+
+class SQLiteSeriesStore(SeriesStore):
+    """SeriesStore on SQLite tables price_data / oi_data with 1m/5m OHLC roll-ups.
+
+    - Shared mode: runs on DBManager's own writer/readers (the historical single-file layout)
+    - open(path): a separate SQLite file with its own pool, write-behind writer and pragmas
+      tuned for append-and-scan, so trade writes never queue behind series writes
+    """
+
+    # Full oi_data row layout produced by append_oi; the prepared statement picks a subset
+    _OI_COLUMNS: Tuple[str, ...] = (
+        "symbol_id", "open_interest", "oi_value", "oi_tokens", "oi_tokens_mark", "noi_percent", "timestamp", "bar_ts",
+        "ts_ms",
+    )
+    # (raw table, bucket ms) -> aggregate table
+    _ROLLUP_TABLES: Dict[Tuple[str, int], str] = {
+        ("price_data", 60_000): "price_ohlc_1m",
+        ("price_data", 300_000): "price_ohlc_5m",
+        ("oi_data", 60_000): "oi_ohlc_1m",
+        ("oi_data", 300_000): "oi_ohlc_5m",
+    }
+    _ROLLUP_VALUES: Dict[str, str] = {
+        "price_data": "price",
+        "oi_data": "COALESCE(oi_value, open_interest)",
+    }
+
+    def __init__(
+        self,
+        write: _ConnectionContext,
+        read: _ConnectionContext,
+        writer: Optional[WriteBehindWriter] = None,
+        pool: Optional[SQLitePool] = None,
+    ) -> None:
+        self.logger = get_logger(self.__class__.__name__)
+        self._write_ctx = write
+        self._read = read
+        self._writer = writer
+        # Set only when this store owns its connections (separate file)
+        self._pool = pool
+        # oi_data insert statement, resolved once against the actual schema in initialize_schema
+        self._oi_insert_sql: str = "INSERT INTO oi_data (symbol_id, open_interest, timestamp) VALUES (?, ?, ?)"
+        self._oi_insert_idx: Tuple[int, ...] = (0, 1, 6)
+
+    @classmethod
+    def open(
+        cls,
+        path: str,
+        read_pool_size: int = 4,
+        write_behind: bool = True,
+        write_batch_size: int = 500,
+        write_flush_interval: float = 0.25,
+        write_queue_size: int = 50000,
+    ) -> "SQLiteSeriesStore":
+        """Open (creating if needed) a dedicated series database file."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        pool = SQLitePool(path, readers=read_pool_size, configure_writer=cls._configure_dedicated)
+
+        @contextmanager
+        def _write() -> Iterator[sqlite3.Connection]:
+            with pool.writer() as conn:
+                try:
+                    yield conn
+                except BaseException:
+                    try:
+                        conn.rollback()
+                    except Exception:
+                        pass
+                    raise
+
+        writer = None
+        if write_behind:
+            writer = WriteBehindWriter(
+                _write,
+                batch_size=write_batch_size,
+                flush_interval=write_flush_interval,
+                max_queue=write_queue_size,
+                name="SeriesWriter",
+            )
+        store = cls(_write, pool.reader, writer=writer, pool=pool)
+        store.initialize_schema()
+        return store
+
+    @staticmethod
+    def _configure_dedicated(conn: sqlite3.Connection) -> None:
+        cur = conn.cursor()
+        cur.execute("PRAGMA auto_vacuum=INCREMENTAL;")
+        cur.execute("PRAGMA journal_mode=WAL;")
+        # Series rows are re-derivable market data: trade a little durability for throughput
+        cur.execute("PRAGMA synchronous=NORMAL;")
+        cur.execute("PRAGMA temp_store=MEMORY;")
+        cur.execute("PRAGMA cache_size=-65536;")
+        cur.execute("PRAGMA mmap_size=268435456;")
+        cur.execute("PRAGMA wal_autocheckpoint=4000;")
+        conn.commit()
+
+    @property
+    def is_dedicated(self) -> bool:
+        return self._pool is not None
+
+    # ---- Schema ----
+    def initialize_schema(self) -> None:
+        with self._write_ctx() as conn:
+            cur = conn.cursor()
+            cur.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS price_data (
+                    id INTEGER PRIMARY KEY,
+                    symbol_id INTEGER,
+                    price REAL NOT NULL,
+                    timestamp TIMESTAMP NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS oi_data (
+                    id INTEGER PRIMARY KEY,
+                    symbol_id INTEGER,
+                    open_interest REAL NOT NULL,
+                    timestamp TIMESTAMP NOT NULL,
+                    bar_ts BIGINT
+                );
+
+                CREATE TABLE IF NOT EXISTS series_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                """
+            )
+            conn.commit()
+
+            # Migration: add oi_value to oi_data if missing
+            try:
+                cur.execute("PRAGMA table_info(oi_data)")
+                ocols = [row[1] for row in cur.fetchall()]
+                if "bar_ts" not in ocols:
+                    cur.execute("ALTER TABLE oi_data ADD COLUMN bar_ts BIGINT")
+                    conn.commit()
+                    self.logger.info("DB migration: added oi_data.bar_ts column")
+                # Create unique index if not exists and bar_ts column is present
+                try:
+                    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS oi_symbol_bar_ts_ux ON oi_data(symbol_id, bar_ts)")
+                    conn.commit()
+                except Exception:
+                    pass
+                for col in ("oi_value", "oi_tokens", "oi_tokens_mark", "noi_percent"):
+                    if col not in ocols:
+                        cur.execute(f"ALTER TABLE oi_data ADD COLUMN {col} REAL")
+                        conn.commit()
+                        self.logger.info(f"DB migration: added oi_data.{col} column")
+            except Exception as e:
+                self.logger.debug(f"oi_data columns detection failed: {e}")
+            # Migration: INTEGER epoch-ms timestamps with covering (symbol_id, ts_ms, value) indexes,
+            # so window scans are index-only range reads without parsing ISO text
+            self._ensure_epoch_ms_column(conn, cur, "price_data")
+            self._ensure_epoch_ms_column(conn, cur, "oi_data")
+            try:
+                cur.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_price_data_symbol_ts_ms ON price_data(symbol_id, ts_ms, price)"
+                )
+                cur.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_oi_data_symbol_ts_ms"
+                    " ON oi_data(symbol_id, ts_ms, oi_value, open_interest, noi_percent)"
+                )
+                conn.commit()
+            except Exception as e:
+                self.logger.debug(f"ts_ms index creation failed: {e}")
+            # Rolled-up history for raw rows past the retention horizon (see run_retention)
+            try:
+                for table in self._ROLLUP_TABLES.values():
+                    cur.execute(
+                        f"""
+                        CREATE TABLE IF NOT EXISTS {table} (
+                            symbol_id INTEGER NOT NULL,
+                            bucket_ms INTEGER NOT NULL,
+                            open REAL NOT NULL,
+                            high REAL NOT NULL,
+                            low REAL NOT NULL,
+                            close REAL NOT NULL,
+                            samples INTEGER NOT NULL,
+                            PRIMARY KEY (symbol_id, bucket_ms)
+                        ) WITHOUT ROWID
+                        """
+                    )
+                conn.commit()
+            except Exception as e:
+                self.logger.debug(f"rollup tables creation failed: {e}")
+            self._prepare_oi_insert(cur)
+
+    def _ensure_epoch_ms_column(self, conn: sqlite3.Connection, cur: sqlite3.Cursor, table: str) -> None:
+        try:
+            cur.execute(f"PRAGMA table_info({table})")
+            if "ts_ms" in {row[1] for row in cur.fetchall()}:
+                return
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN ts_ms INTEGER")
+            # Backfill from the ISO text column (julianday understands the isoformat() output)
+            cur.execute(
+                f"UPDATE {table} SET ts_ms = CAST(ROUND((julianday(timestamp) - 2440587.5) * 86400000.0) AS INTEGER)"
+                " WHERE ts_ms IS NULL AND timestamp IS NOT NULL"
+            )
+            conn.commit()
+            self.logger.info(f"DB migration: added {table}.ts_ms column (backfilled {cur.rowcount} rows)")
+        except Exception as e:
+            self.logger.debug(f"{table}.ts_ms migration failed: {e}")
+
+    def _prepare_oi_insert(self, cur: sqlite3.Cursor) -> None:
+        """Pick the oi_data insert statement once for this database's column set."""
+        try:
+            cur.execute("PRAGMA table_info(oi_data)")
+            present = {row[1] for row in cur.fetchall()}
+        except Exception:
+            present = {"symbol_id", "open_interest", "timestamp"}
+        idx = tuple(i for i, c in enumerate(self._OI_COLUMNS) if c in present)
+        cols = [self._OI_COLUMNS[i] for i in idx]
+        # bar_ts carries a unique (symbol_id, bar_ts) index: keep the first sample per 5m bar
+        verb = "INSERT OR IGNORE" if "bar_ts" in present else "INSERT"
+        self._oi_insert_idx = idx
+        self._oi_insert_sql = (
+            f"{verb} INTO oi_data ({', '.join(cols)}) VALUES ({', '.join('?' for _ in cols)})"
+        )
+
+    # Epoch-ms expression for legacy rows that predate the ts_ms column (same formula as the backfill)
+    _TS_MS_FROM_TEXT = "CAST(ROUND((julianday(timestamp) - 2440587.5) * 86400000.0) AS INTEGER)"
+
+    def is_seeded(self) -> bool:
+        """True once import_recent has committed (the marker is written in the same transaction)."""
+        try:
+            with self._read() as conn:
+                row = conn.execute("SELECT 1 FROM series_meta WHERE key = 'seeded_from'").fetchone()
+            return row is not None
+        except Exception:
+            return False
+
+    def import_recent(self, source_path: str, since_ms: int) -> int:
+        """Copy raw price/OI rows newer than since_ms from another database (one-time migration).
+
+        The source may be a baseline-schema file: ts_ms is derived from the ISO timestamp and
+        missing OI columns are copied as NULL. Rows at or after the earliest row already stored
+        are skipped, so a retry after a failed seed does not duplicate live samples.
+        """
+        copied = 0
+        with self._write_ctx() as conn:
+            cur = conn.cursor()
+            cur.execute("ATTACH DATABASE ? AS legacy", (source_path,))
+            try:
+                cur.execute("SELECT name FROM legacy.sqlite_master WHERE type = 'table'")
+                tables = {row[0] for row in cur.fetchall()}
+                for table, columns, verb in (
+                    ("price_data", ("symbol_id", "price", "timestamp"), "INSERT"),
+                    ("oi_data", self._OI_COLUMNS[:-1], "INSERT OR IGNORE"),
+                ):
+                    if table not in tables:
+                        continue
+                    cur.execute(f"PRAGMA legacy.table_info({table})")
+                    present = {row[1] for row in cur.fetchall()}
+                    ts_expr = "ts_ms" if "ts_ms" in present else self._TS_MS_FROM_TEXT
+                    select = ", ".join(c if c in present else "NULL" for c in columns)
+                    cur.execute(f"SELECT MIN(ts_ms) FROM main.{table}")
+                    until = cur.fetchone()[0]
+                    cur.execute(
+                        f"""
+                        {verb} INTO main.{table} ({', '.join(columns)}, ts_ms)
+                        SELECT * FROM (SELECT {select}, {ts_expr} AS ts_ms FROM legacy.{table})
+                        WHERE ts_ms >= ? AND (? IS NULL OR ts_ms < ?)
+                        """,
+                        (since_ms, until, until),
+                    )
+                    copied += max(0, cur.rowcount)
+                cur.execute(
+                    "INSERT OR REPLACE INTO series_meta (key, value) VALUES ('seeded_from', ?)", (source_path,)
+                )
+                conn.commit()
+            except BaseException:
+                # DETACH fails while the failed import's transaction is open; end it first
+                conn.rollback()
+                raise
+            finally:
+                try:
+                    cur.execute("DETACH DATABASE legacy")
+                except sqlite3.Error as e:
+                    self.logger.debug(f"DETACH legacy failed: {e}")
+        return copied
+
+    # ---- Writes ----
+    def _execute_write(self, sql: str, params: Sequence[object]) -> None:
+        if self._writer is not None:
+            self._writer.submit(sql, params)
+            return
+        with self._write_ctx() as conn:
+            conn.execute(sql, params)
+            conn.commit()
+
+    def append_price(self, symbol_id: int, price: float, ts_ms: int) -> None:
+        self._execute_write(
+            "INSERT INTO price_data (symbol_id, price, timestamp, ts_ms) VALUES (?, ?, ?, ?)",
+            (symbol_id, float(price), datetime.utcfromtimestamp(ts_ms / 1000.0).isoformat(), int(ts_ms)),
+        )
+
+    def append_prices(self, rows: Sequence[Tuple[int, float, float]]) -> None:
+        if not rows:
+            return
+        with self._write_ctx() as conn:
+            conn.executemany(
+                "INSERT INTO price_data (symbol_id, price, timestamp, ts_ms) VALUES (?, ?, ?, ?)",
+                [
+                    (int(sid), float(px), datetime.utcfromtimestamp(float(ts)).isoformat(), int(float(ts) * 1000))
+                    for sid, px, ts in rows
+                ],
+            )
+            conn.commit()
+
+    def append_oi(
+        self,
+        symbol_id: int,
+        ts_ms: int,
+        open_interest: float,
+        oi_value: Optional[float] = None,
+        oi_tokens: Optional[float] = None,
+        oi_tokens_mark: Optional[float] = None,
+        noi_percent: Optional[float] = None,
+    ) -> None:
+        row = (
+            symbol_id,
+            float(open_interest),
+            None if oi_value is None else float(oi_value),
+            None if oi_tokens is None else float(oi_tokens),
+            None if oi_tokens_mark is None else float(oi_tokens_mark),
+            None if noi_percent is None else float(noi_percent),
+            datetime.utcfromtimestamp(ts_ms / 1000.0).isoformat(),
+            # 5m bar index: ms since epoch // (5*60*1000)
+            int(ts_ms) // (5 * 60_000),
+            int(ts_ms),
+        )
+        self._execute_write(self._oi_insert_sql, tuple(row[i] for i in self._oi_insert_idx))
+
+    # ---- Reads ----
+    def _select_window(self, sql: str, params: Tuple[object, ...]) -> SeriesArrays:
+        with self._read() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        ts_out: "array[int]" = array("q")
+        val_out: "array[float]" = array("d")
+        for t, v in rows:
+            if t is None or v is None:
+                continue
+            ts_out.append(int(t))
+            val_out.append(float(v))
+        return ts_out, val_out
+
+    def price_window(self, symbol_id: int, since_ms: int, until_ms: Optional[int] = None) -> SeriesArrays:
+        if until_ms is not None:
+            return self._select_window(
+                """
+                SELECT ts_ms, price FROM price_data
+                WHERE symbol_id = ? AND ts_ms >= ? AND ts_ms < ?
+                ORDER BY ts_ms ASC
+                """,
+                (symbol_id, since_ms, until_ms),
+            )
+        return self._select_window(
+            """
+            SELECT ts_ms, price FROM price_data
+            WHERE symbol_id = ? AND ts_ms >= ?
+            ORDER BY ts_ms ASC
+            """,
+            (symbol_id, since_ms),
+        )
+
+    def oi_window(self, symbol_id: int, since_ms: int) -> SeriesArrays:
+        # Prefer monetary value if available, but always coalesce to avoid NULLs
+        return self._select_window(
+            """
+            SELECT ts_ms, COALESCE(oi_value, open_interest) FROM oi_data
+            WHERE symbol_id = ? AND ts_ms >= ?
+            ORDER BY ts_ms ASC
+            """,
+            (symbol_id, since_ms),
+        )
+
+    def noi_window(self, symbol_id: int, since_ms: int) -> SeriesArrays:
+        try:
+            return self._select_window(
+                """
+                SELECT ts_ms, noi_percent FROM oi_data
+                WHERE symbol_id = ? AND ts_ms >= ? AND noi_percent IS NOT NULL
+                ORDER BY ts_ms ASC
+                """,
+                (symbol_id, since_ms),
+            )
+        except Exception:
+            return array("q"), array("d")
+
+    def _select_bulk(self, sql: str, symbol_ids: Sequence[int], since_ms: int) -> BulkSeries:
+        """One ordered (symbol_id, ts_ms, value) scan split into per-symbol NumPy arrays."""
+        ids = sorted({int(s) for s in symbol_ids})
+        if not ids:
+            return {}
+        out: BulkSeries = {}
+        # Stay well under SQLITE_MAX_VARIABLE_NUMBER; normally this is a single statement
+        for i in range(0, len(ids), 900):
+            part = ids[i:i + 900]
+            with self._read() as conn:
+                cur = conn.cursor()
+                # Plain tuples: much cheaper to convert than sqlite3.Row
+                cur.row_factory = None
+                cur.execute(sql.format(ids=", ".join("?" for _ in part)), (since_ms, *part))
+                rows = cur.fetchall()
+            if not rows:
+                continue
+            data = np.array(rows, dtype=np.float64)
+            sids = data[:, 0].astype(np.int64)
+            ts = data[:, 1].astype(np.int64)
+            vals = np.ascontiguousarray(data[:, 2])
+            # Rows are ordered by symbol: split at the boundaries
+            bounds = np.flatnonzero(np.diff(sids)) + 1
+            for lo, hi in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(sids)]))):
+                out[int(sids[lo])] = (ts[lo:hi], vals[lo:hi])
+        return out
+
+    def price_windows(self, symbol_ids: Sequence[int], since_ms: int) -> BulkSeries:
+        return self._select_bulk(
+            """
+            SELECT symbol_id, ts_ms, price FROM price_data
+            WHERE ts_ms >= ? AND symbol_id IN ({ids})
+            ORDER BY symbol_id, ts_ms
+            """,
+            symbol_ids,
+            since_ms,
+        )
+
+    def oi_windows(self, symbol_ids: Sequence[int], since_ms: int) -> BulkSeries:
+        return self._select_bulk(
+            """
+            SELECT symbol_id, ts_ms, COALESCE(oi_value, open_interest) FROM oi_data
+            WHERE ts_ms >= ? AND symbol_id IN ({ids}) AND COALESCE(oi_value, open_interest) IS NOT NULL
+            ORDER BY symbol_id, ts_ms
+            """,
+            symbol_ids,
+            since_ms,
+        )
+
+    def last_price(self, symbol_id: int) -> Optional[float]:
+        with self._read() as conn:
+            row = conn.execute(
+                "SELECT price FROM price_data WHERE symbol_id = ? ORDER BY ts_ms DESC LIMIT 1",
+                (symbol_id,),
+            ).fetchone()
+        return float(row[0]) if row else None
+
+    # ---- Retention ----
+    def run_retention(
+        self,
+        cutoff_ms: int,
+        symbol_ids: Sequence[int],
+        chunk_rows: int = 5000,
+        should_stop: Callable[[], bool] = lambda: False,
+    ) -> Dict[str, int]:
+        """Roll raw price/OI rows older than cutoff_ms into 1m/5m OHLC tables and delete them.
+
+        The cutoff is aligned down to a 5m boundary so every rolled bucket is complete. Work is
+        done per symbol in slices of about chunk_rows rows to keep write locks short.
+        Returns counters: rows deleted per raw table, buckets upserted, pages vacuumed.
+        """
+        cutoff_ms -= cutoff_ms % 300_000
+        chunk = max(100, int(chunk_rows))
+        report: Dict[str, int] = {"price_data_deleted": 0, "oi_data_deleted": 0, "buckets": 0, "pages_vacuumed": 0}
+        for raw, value in self._ROLLUP_VALUES.items():
+            for sid in symbol_ids:
+                if should_stop():
+                    break
+                try:
+                    buckets, deleted = self._retain_symbol(raw, value, sid, cutoff_ms, chunk, should_stop)
+                    report["buckets"] += buckets
+                    report[f"{raw}_deleted"] += deleted
+                except Exception as e:
+                    self.logger.warning(f"Retention failed for {raw} symbol_id={sid}: {e}")
+        try:
+            with self._write_ctx() as conn:
+                cur = conn.cursor()
+                cur.execute("PRAGMA auto_vacuum")
+                if int(cur.fetchone()[0]) == 2:
+                    cur.execute("PRAGMA freelist_count")
+                    report["pages_vacuumed"] = int(cur.fetchone()[0])
+                    cur.execute("PRAGMA incremental_vacuum")
+                    cur.fetchall()
+                cur.execute("PRAGMA wal_checkpoint(PASSIVE)")
+                cur.fetchall()
+        except Exception as e:
+            self.logger.debug(f"Retention vacuum/checkpoint failed: {e}")
+        return report
+
+    def _retain_symbol(
+        self, raw: str, value: str, symbol_id: int, cutoff_ms: int, chunk: int, should_stop: Callable[[], bool]
+    ) -> Tuple[int, int]:
+        """Roll up and delete one symbol's expired rows in 5m-aligned slices of about `chunk` rows.
+
+        Each slice is rolled up and deleted in the same transaction, so a crash never
+        leaves rows that were already aggregated (and would be counted twice).
+        """
+        buckets = 0
+        deleted = 0
+        while not should_stop():
+            # One writer checkout per slice so live inserts interleave between slices
+            with self._write_ctx() as conn:
+                cur = conn.cursor()
+                cur.execute(f"SELECT MIN(ts_ms) FROM {raw} WHERE symbol_id = ? AND ts_ms < ?", (symbol_id, cutoff_ms))
+                row = cur.fetchone()
+                if row is None or row[0] is None:
+                    break
+                first = int(row[0])
+                cur.execute(
+                    f"SELECT ts_ms FROM {raw} WHERE symbol_id = ? AND ts_ms < ? ORDER BY ts_ms LIMIT 1 OFFSET ?",
+                    (symbol_id, cutoff_ms, chunk),
+                )
+                row = cur.fetchone()
+                slice_end = cutoff_ms
+                if row is not None and row[0] is not None:
+                    slice_end = int(row[0]) - int(row[0]) % 300_000
+                    if slice_end <= first:
+                        slice_end = first - first % 300_000 + 300_000
+                    slice_end = min(slice_end, cutoff_ms)
+                for (table_raw, bucket_ms), agg in self._ROLLUP_TABLES.items():
+                    if table_raw != raw:
+                        continue
+                    # WHERE 1 keeps the upsert unambiguous after a SELECT (see SQLite UPSERT docs)
+                    cur.execute(
+                        f"""
+                        INSERT INTO {agg} (symbol_id, bucket_ms, open, high, low, close, samples)
+                        SELECT ?, bucket_ms, open, MAX(v), MIN(v), close, COUNT(*) FROM (
+                            SELECT (ts_ms / {bucket_ms}) * {bucket_ms} AS bucket_ms, {value} AS v,
+                                   FIRST_VALUE({value}) OVER w AS open,
+                                   LAST_VALUE({value}) OVER w AS close
+                            FROM {raw}
+                            WHERE symbol_id = ? AND ts_ms < ? AND {value} IS NOT NULL
+                            WINDOW w AS (
+                                PARTITION BY ts_ms / {bucket_ms} ORDER BY ts_ms
+                                ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+                            )
+                        )
+                        WHERE 1
+                        GROUP BY bucket_ms
+                        ON CONFLICT(symbol_id, bucket_ms) DO UPDATE SET
+                            high = MAX(high, excluded.high),
+                            low = MIN(low, excluded.low),
+                            close = excluded.close,
+                            samples = samples + excluded.samples
+                        """,
+                        (symbol_id, symbol_id, slice_end),
+                    )
+                    buckets += max(0, cur.rowcount)
+                cur.execute(f"DELETE FROM {raw} WHERE symbol_id = ? AND ts_ms < ?", (symbol_id, slice_end))
+                deleted += max(0, cur.rowcount)
+                conn.commit()
+                if slice_end >= cutoff_ms:
+                    break
+        return buckets, deleted
+
+    # ---- Lifecycle ----
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        if self._writer is None or not self.is_dedicated:
+            # In shared mode the writer belongs to DBManager, which flushes it
+            return True
+        return self._writer.flush(timeout=timeout)
+
+    def close(self) -> None:
+        if not self.is_dedicated:
+            return
+        if self._writer is not None:
+            self._writer.close()
+        self._pool.close()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        if not self.is_dedicated:
+            return {}
+        out = {f"series.{name}": st for name, st in self._pool.stats().items()}
+        if self._writer is not None:
+            out["series.write_behind"] = self._writer.stats()
+        return out
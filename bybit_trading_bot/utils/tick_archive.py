@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from bybit_trading_bot.utils.logger import get_logger
+
+
+# One trade per record: epoch ms, price, quantity, side (+1 buy, -1 sell, 0 unknown); aligned to 32 bytes
+TICK_DTYPE = np.dtype([("ts", "<i8"), ("price", "<f8"), ("qty", "<f8"), ("side", "i1")], align=True)
+
+_MAGIC = b"BBTICK01"
+# magic, version, record size, record count
+_HEADER = struct.Struct("<8sIIQ")
+HEADER_SIZE = 64
+_COUNT_OFFSET = 16
+_DAY_MS = 86_400_000
+
+
+def _day_key(ts_ms: int) -> str:
+    return datetime.fromtimestamp(ts_ms / 1000.0, tz=timezone.utc).strftime("%Y%m%d")
+
+
+def _side_code(side: Optional[str]) -> int:
+    if isinstance(side, str):
+        s = side.strip().lower()
+        if s == "buy":
+            return 1
+        if s == "sell":
+            return -1
+    return 0
+
+
+def _read_count(path: str) -> int:
+    with open(path, "rb") as f:
+        head = f.read(_HEADER.size)
+    if len(head) < _HEADER.size:
+        return 0
+    magic, _version, rec_size, count = _HEADER.unpack(head)
+    if magic != _MAGIC or rec_size != TICK_DTYPE.itemsize:
+        raise ValueError(f"{path}: not a tick archive file")
+    return int(count)
+
+
+class _DayFile:
+    """Append handle for one symbol-day file: header + preallocated, memory-mapped record area."""
+
+    def __init__(self, path: str, initial_records: int = 65536) -> None:
+        self.path = path
+        fresh = not os.path.exists(path)
+        self._fh = open(path, "w+b" if fresh else "r+b")
+        if fresh:
+            self._fh.write(_HEADER.pack(_MAGIC, 1, TICK_DTYPE.itemsize, 0).ljust(HEADER_SIZE, b"\0"))
+            self._fh.flush()
+            self.count = 0
+        else:
+            self.count = _read_count(path)
+        self._mm: Optional[mmap.mmap] = None
+        self._records: Optional[np.ndarray] = None
+        self._map(max(initial_records, self.count))
+
+    def _map(self, capacity: int) -> None:
+        self._unmap()
+        self._fh.truncate(HEADER_SIZE + capacity * TICK_DTYPE.itemsize)
+        self._mm = mmap.mmap(self._fh.fileno(), 0)
+        self._records = np.ndarray((capacity,), dtype=TICK_DTYPE, buffer=self._mm, offset=HEADER_SIZE)
+        self.capacity = capacity
+
+    def _unmap(self) -> None:
+        # Drop the array view first: mmap.close() refuses while exported buffers exist
+        self._records = None
+        if self._mm is not None:
+            self._mm.flush()
+            self._mm.close()
+            self._mm = None
+
+    def append(self, ts_ms: int, price: float, qty: float, side: int) -> None:
+        if self.count >= self.capacity:
+            self._map(self.capacity + min(self.capacity, 1 << 20))
+        self._records[self.count] = (ts_ms, price, qty, side)
+        self.count += 1
+        # Publish after the record is in place so a concurrent reader never sees a torn row
+        struct.pack_into("<Q", self._mm, _COUNT_OFFSET, self.count)
+
+    def flush(self) -> None:
+        if self._mm is not None:
+            self._mm.flush()
+
+    def close(self) -> None:
+        self._unmap()
+        # Trim the unused preallocation
+        self._fh.truncate(HEADER_SIZE + self.count * TICK_DTYPE.itemsize)
+        self._fh.close()
+
+
+class TickArchiver:
+    """Append-only sink writing public trades into {root}/{SYMBOL}/{YYYYMMDD}.ticks.
+
+    - Fixed-width TICK_DTYPE records in a memory-mapped file, grown in chunks
+    - One open file per symbol; rolls over at the UTC day boundary
+    - Safe to call from several WS threads; an append is a memcpy into the mapping
+    """
+
+    def __init__(self, root: str, initial_records: int = 65536) -> None:
+        self.root = root
+        self.initial_records = max(1, int(initial_records))
+        self.logger = get_logger(self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._open: Dict[str, Tuple[str, _DayFile]] = {}
+        self._closed = False
+        self.records = 0
+        self.errors = 0
+        os.makedirs(root, exist_ok=True)
+
+    def append(self, symbol: str, ts: float, price: float, qty: float, side: Optional[str] = None) -> None:
+        # WS trade timestamps are ms; tolerate seconds
+        ts_ms = int(ts) if ts > 1e11 else int(ts * 1000)
+        day = _day_key(ts_ms)
+        with self._lock:
+            if self._closed:
+                return
+            try:
+                entry = self._open.get(symbol)
+                if entry is None or entry[0] != day:
+                    if entry is not None:
+                        entry[1].close()
+                    path = os.path.join(self.root, symbol, f"{day}.ticks")
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    entry = (day, _DayFile(path, self.initial_records))
+                    self._open[symbol] = entry
+                entry[1].append(ts_ms, float(price), float(qty), _side_code(side))
+                self.records += 1
+            except Exception as e:
+                self.errors += 1
+                self.logger.debug(f"Tick archive append failed for {symbol}: {e}")
+
+    def flush(self) -> None:
+        with self._lock:
+            for _, f in self._open.values():
+                f.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            for _, f in self._open.values():
+                try:
+                    f.close()
+                except Exception as e:
+                    self.logger.debug(f"Tick archive close failed for {f.path}: {e}")
+            self._open.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"records": self.records, "errors": self.errors, "open_files": len(self._open)}
+
+
+class TickArchive:
+    """Read side of the tick archive: zero-copy NumPy views over the day files."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def symbols(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(d for d in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, d)))
+
+    def days(self, symbol: str) -> List[str]:
+        folder = os.path.join(self.root, symbol)
+        if not os.path.isdir(folder):
+            return []
+        return sorted(name[:-6] for name in os.listdir(folder) if name.endswith(".ticks"))
+
+    def read_day(self, symbol: str, day: str) -> np.ndarray:
+        """All records of one symbol-day as a read-only memmap (no copy)."""
+        path = os.path.join(self.root, symbol, f"{day}.ticks")
+        if not os.path.exists(path):
+            return np.empty(0, dtype=TICK_DTYPE)
+        count = _read_count(path)
+        if count == 0:
+            return np.empty(0, dtype=TICK_DTYPE)
+        return np.memmap(path, dtype=TICK_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+
+    def read_range(self, symbol: str, start_ms: int, end_ms: Optional[int] = None) -> np.ndarray:
+        """Records with start_ms <= ts < end_ms.
+
+        A range inside one day is a slice of the memmap (no copy); spanning days concatenates.
+        """
+        if end_ms is None:
+            end_ms = int(datetime.now(timezone.utc).timestamp() * 1000) + 1
+        parts: List[np.ndarray] = []
+        day_ms = start_ms - start_ms % _DAY_MS
+        while day_ms < end_ms:
+            recs = self.read_day(symbol, _day_key(day_ms))
+            if len(recs):
+                ts = recs["ts"]
+                lo = int(np.searchsorted(ts, start_ms, side="left"))
+                hi = int(np.searchsorted(ts, end_ms, side="left"))
+                if hi > lo:
+                    parts.append(recs[lo:hi])
+            day_ms += _DAY_MS
+        if not parts:
+            return np.empty(0, dtype=TICK_DTYPE)
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts)
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+class PriceRingBuffer:
+    """Fixed-capacity ring of (epoch seconds, price) samples backed by flat arrays.
+
+    - Ticks falling into the same resolution bucket overwrite the newest slot,
+      so a bursty symbol cannot evict its own history faster than the window needs
+    - Oldest samples are overwritten once capacity is reached
+    """
+
+    __slots__ = ("capacity", "resolution", "_ts", "_px", "_head", "_count", "_lock")
+
+    def __init__(self, capacity: int, resolution_seconds: float = 0.0) -> None:
+        self.capacity = max(2, int(capacity))
+        self.resolution = max(0.0, float(resolution_seconds))
+        self._ts = array("d", bytes(8 * self.capacity))
+        self._px = array("d", bytes(8 * self.capacity))
+        self._head = 0  # next write position
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, ts: float, price: float) -> None:
+        with self._lock:
+            if self._count:
+                last = (self._head - 1) % self.capacity
+                last_ts = self._ts[last]
+                if ts < last_ts:
+                    # out-of-order tick: keep series monotonic
+                    return
+                if self.resolution > 0 and int(ts // self.resolution) == int(last_ts // self.resolution):
+                    self._ts[last] = ts
+                    self._px[last] = price
+                    return
+            self._ts[self._head] = ts
+            self._px[self._head] = price
+            self._head = (self._head + 1) % self.capacity
+            if self._count < self.capacity:
+                self._count += 1
+
+    def last(self) -> Optional[Tuple[float, float]]:
+        with self._lock:
+            if not self._count:
+                return None
+            i = (self._head - 1) % self.capacity
+            return self._ts[i], self._px[i]
+
+    def oldest_ts(self) -> Optional[float]:
+        with self._lock:
+            if not self._count:
+                return None
+            return self._ts[(self._head - self._count) % self.capacity]
+
+    def since(self, since_ts: float) -> Tuple[List[float], List[float]]:
+        """Return (timestamps, prices) with ts >= since_ts in ascending order."""
+        with self._lock:
+            n = self._count
+            if not n:
+                return [], []
+            start = (self._head - n) % self.capacity
+            # binary search over the logical (unwrapped) index space
+            lo, hi = 0, n
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._ts[(start + mid) % self.capacity] < since_ts:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            first = (start + lo) % self.capacity
+            k = n - lo
+            if first + k <= self.capacity:
+                return self._ts[first:first + k].tolist(), self._px[first:first + k].tolist()
+            tail = self.capacity - first
+            return (
+                self._ts[first:].tolist() + self._ts[: k - tail].tolist(),
+                self._px[first:].tolist() + self._px[: k - tail].tolist(),
+            )
+
+
+class TickBuffer:
+    """Per-symbol in-memory price store used as the primary source for recent price windows.
+
+    - One PriceRingBuffer per symbol_id, created lazily on first tick
+    - Tracks which symbols changed since the last drain for downsampled persistence
+    """
+
+    def __init__(self, capacity: int = 2048, resolution_seconds: float = 0.25) -> None:
+        self.capacity = max(2, int(capacity))
+        self.resolution_seconds = max(0.0, float(resolution_seconds))
+        self._rings: Dict[int, PriceRingBuffer] = {}
+        self._dirty: Dict[int, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def append(self, symbol_id: int, price: float, ts: Optional[float] = None) -> None:
+        ts_f = float(ts) if ts is not None else time.time()
+        ring = self._rings.get(symbol_id)
+        if ring is None:
+            with self._lock:
+                ring = self._rings.get(symbol_id)
+                if ring is None:
+                    ring = PriceRingBuffer(self.capacity, self.resolution_seconds)
+                    self._rings[symbol_id] = ring
+        ring.append(ts_f, float(price))
+        # best-effort: a write racing drain_latest() is picked up by the next tick
+        self._dirty[symbol_id] = (ts_f, float(price))
+
+    def has_symbol(self, symbol_id: int) -> bool:
+        ring = self._rings.get(symbol_id)
+        return ring is not None and len(ring) > 0
+
+    def oldest_ts(self, symbol_id: int) -> Optional[float]:
+        ring = self._rings.get(symbol_id)
+        return ring.oldest_ts() if ring is not None else None
+
+    def get_last_price(self, symbol_id: int) -> Optional[float]:
+        ring = self._rings.get(symbol_id)
+        if ring is None:
+            return None
+        last = ring.last()
+        return last[1] if last else None
+
+    def since(self, symbol_id: int, since_ts: float) -> Tuple[List[float], List[float]]:
+        """Return (epoch seconds, prices) for samples with ts >= since_ts."""
+        ring = self._rings.get(symbol_id)
+        if ring is None:
+            return [], []
+        return ring.since(since_ts)
+
+    def get_recent_series(self, symbol_id: int, minutes: float) -> List[Tuple[datetime, float]]:
+        ring = self._rings.get(symbol_id)
+        if ring is None:
+            return []
+        ts_list, px_list = ring.since(time.time() - float(minutes) * 60.0)
+        return [(datetime.utcfromtimestamp(t), p) for t, p in zip(ts_list, px_list)]
+
+    def drain_latest(self) -> List[Tuple[int, float, float]]:
+        """Return and reset the latest (symbol_id, price, ts) per symbol updated since last drain."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        return [(sid, px, ts) for sid, (ts, px) in dirty.items()]
+
+    def stats(self) -> Dict[str, int]:
+        rings = list(self._rings.values())
+        return {
+            "symbols": len(rings),
+            "samples": sum(len(r) for r in rings),
+            "capacity_per_symbol": self.capacity,
+        }
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+Tick = Tuple[str, float, float]
+
+
+class TickMailbox:
+    """Latest-value-wins mailbox of ticker updates keyed by symbol.
+
+    - At most one pending (price, ts) per symbol: a newer tick overwrites the pending one
+      in place and keeps the symbol's position in line (counted as coalesced)
+    - Symbols are handed out in the order they first became pending, so a hot symbol
+      cannot starve the others
+    - Memory is bounded by max_symbols; a tick for a new symbol beyond that is dropped
+    """
+
+    def __init__(self, max_symbols: int = 10000) -> None:
+        self.max_symbols = max(1, int(max_symbols))
+        self._pending: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._cond = threading.Condition(threading.Lock())
+        self.received = 0
+        self.delivered = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.max_pending = 0
+
+    def put(self, symbol: str, price: float, ts: float) -> bool:
+        """Offer a tick; returns False only when it was dropped."""
+        with self._cond:
+            self.received += 1
+            pending = self._pending
+            if symbol in pending:
+                pending[symbol] = (price, ts)
+                self.coalesced += 1
+                return True
+            if len(pending) >= self.max_symbols:
+                self.dropped += 1
+                return False
+            pending[symbol] = (price, ts)
+            if len(pending) > self.max_pending:
+                self.max_pending = len(pending)
+            self._cond.notify()
+            return True
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Tick]:
+        """Freshest tick of the longest-waiting symbol, or None on timeout."""
+        with self._cond:
+            if not self._pending and not self._cond.wait_for(lambda: bool(self._pending), timeout):
+                return None
+            symbol, (price, ts) = self._pending.popitem(last=False)
+            self.delivered += 1
+            return symbol, price, ts
+
+    def qsize(self) -> int:
+        return len(self._pending)
+
+    def clear(self) -> None:
+        with self._cond:
+            self._pending.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "max_pending": self.max_pending,
+                "received": self.received,
+                "delivered": self.delivered,
+                "coalesced": self.coalesced,
+                "dropped": self.dropped,
+            }
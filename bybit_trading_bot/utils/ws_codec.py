@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Fastest available JSON decoder: orjson > msgspec > stdlib
+try:
+    import orjson as _orjson  # type: ignore
+
+    loads: Callable[[Any], Any] = _orjson.loads
+    JSON_BACKEND = "orjson"
+except Exception:  # pragma: no cover
+    try:
+        import msgspec as _msgspec  # type: ignore
+
+        loads = _msgspec.json.Decoder().decode
+        JSON_BACKEND = "msgspec"
+    except Exception:
+        loads = json.loads
+        JSON_BACKEND = "json"
+
+
+class Ticker(NamedTuple):
+    symbol: str
+    last_price: float
+    ts: float  # exchange push time, epoch ms (0 if absent)
+
+
+class Trade(NamedTuple):
+    symbol: str
+    price: float
+    qty: float
+    ts: float  # trade time, epoch ms
+    side: Optional[str]  # 'Buy' / 'Sell'
+
+
+class BookUpdate(NamedTuple):
+    symbol: str
+    type: str  # 'snapshot' or 'delta'
+    data: Dict[str, Any]  # raw v5 payload: {'s', 'b', 'a', 'u', 'seq'}
+
+
+class Kline(NamedTuple):
+    start: float
+    end: float
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    confirm: bool
+
+
+def topic_symbol(topic: str) -> str:
+    """'tickers.BTCUSDT' / 'orderbook.50.BTCUSDT' / 'kline.5.BTCUSDT' -> 'BTCUSDT'."""
+    return topic.rpartition(".")[2]
+
+
+# ---- Per-topic decoders (Bybit v5 public stream layouts only) ----
+def decode_ticker(msg: Dict[str, Any]) -> Optional[Ticker]:
+    data = msg.get("data")
+    if isinstance(data, list):
+        data = data[-1] if data else None
+    if not isinstance(data, dict):
+        return None
+    lp = data.get("lastPrice")
+    if lp is None:
+        # Linear ticker deltas omit unchanged fields
+        return None
+    return Ticker(data.get("symbol") or topic_symbol(msg.get("topic", "")), float(lp), float(msg.get("ts") or 0.0))
+
+
+def decode_trades(msg: Dict[str, Any]) -> List[Trade]:
+    rows = msg.get("data")
+    if not isinstance(rows, list):
+        return []
+    out: List[Trade] = []
+    for row in rows:
+        side = row.get("S")
+        out.append(
+            Trade(
+                row.get("s") or topic_symbol(msg.get("topic", "")),
+                float(row["p"]),
+                float(row.get("v") or 0.0),
+                float(row.get("T") or 0.0),
+                side if side in ("Buy", "Sell") else None,
+            )
+        )
+    return out
+
+
+def decode_book(msg: Dict[str, Any]) -> Optional[BookUpdate]:
+    data = msg.get("data")
+    if not isinstance(data, dict):
+        return None
+    return BookUpdate(data.get("s") or topic_symbol(msg.get("topic", "")), msg.get("type") or "delta", data)
+
+
+def decode_klines(msg: Dict[str, Any]) -> List[Kline]:
+    rows = msg.get("data")
+    if not isinstance(rows, list):
+        return []
+    return [
+        Kline(
+            float(r["start"]),
+            float(r["end"]),
+            float(r["open"]),
+            float(r["high"]),
+            float(r["low"]),
+            float(r["close"]),
+            float(r["volume"]),
+            bool(r.get("confirm")),
+        )
+        for r in rows
+    ]
+
+
+class TopicRouter:
+    """Decode raw WS frames once and route them by topic string.
+
+    Exact topics are looked up first, then the topic prefix ('tickers', 'orderbook', ...).
+    Frames without a routed topic (pongs, subscribe/auth acks) are reported as unhandled so
+    the caller can pass them to its generic path.
+    """
+
+    def __init__(self) -> None:
+        self._exact: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+        self._prefix: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+        self.routed = 0
+        self.unrouted = 0
+
+    def route(self, topic: str, handler: Callable[[Dict[str, Any]], None]) -> None:
+        self._exact[topic] = handler
+
+    def route_prefix(self, prefix: str, handler: Callable[[Dict[str, Any]], None]) -> None:
+        self._prefix[prefix] = handler
+
+    def lookup(self, topic: str) -> Optional[Callable[[Dict[str, Any]], None]]:
+        handler = self._exact.get(topic)
+        if handler is None and self._prefix:
+            handler = self._prefix.get(topic.partition(".")[0])
+        return handler
+
+    def dispatch(self, raw) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Returns (handled, decoded message)."""
+        msg = loads(raw)
+        topic = msg.get("topic") if isinstance(msg, dict) else None
+        handler = self.lookup(topic) if topic else None
+        if handler is None:
+            self.unrouted += 1
+            return False, msg
+        self.routed += 1
+        handler(msg)
+        return True, msg
+
+
+def install_fast_path(ws, router: Optional[TopicRouter] = None) -> bool:
+    """Take over raw frame handling of a pybit WebSocket.
+
+    Data frames are decoded with the fast decoder and delivered straight to the callback that
+    pybit registered for their topic (or to `router`), skipping pybit's json.loads, control-frame
+    checks and orderbook merge/deepcopy. Control frames fall through to pybit unchanged.
+    """
+    if getattr(ws, "_fast_path", False):
+        return True
+    on_message = getattr(ws, "_on_message", None)
+    directory = getattr(ws, "callback_directory", None)
+    if not callable(on_message) or not isinstance(directory, dict):
+        return False
+
+    def _on_message(raw) -> None:
+        try:
+            msg = loads(raw)
+        except Exception:
+            on_message(raw)
+            return
+        topic = msg.get("topic") if isinstance(msg, dict) else None
+        if topic:
+            cb = router.lookup(topic) if router is not None else None
+            if cb is None:
+                cb = directory.get(topic)
+            if cb is not None:
+                cb(msg)
+                return
+        on_message(raw)
+
+    ws._on_message = _on_message
+    ws._fast_path = True
+    return True